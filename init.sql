@@ -2,6 +2,10 @@
 -- This script creates the schema for the GEX data collection system
 
 -- Create the main gex_table with proper schema
+-- Range partitioned on "greeks.updated_at" (one partition per day or month,
+-- GEX_PARTITION_INTERVAL). Partitions are created ahead of time by
+-- scripts/manage_partitions.py / the scheduler; rows outside every partition
+-- land in gex_table_default until their partition is created.
 CREATE TABLE IF NOT EXISTS gex_table (
     -- Primary key columns (composite index)
     "greeks.updated_at" TIMESTAMP NOT NULL,
@@ -93,6 +97,14 @@ CREATE TABLE IF NOT EXISTS gex_table (
     "greeks.smv_vol_pct_change" REAL,
     gex_pct_change REAL,
 
+    -- Changes since the session open and the prior close
+    "greeks.gamma_diff_open" REAL,
+    "greeks.gamma_diff_prior_close" REAL,
+    gex_diff_open REAL,
+    gex_diff_prior_close REAL,
+    "greeks.mid_iv_diff_open" REAL,
+    "greeks.mid_iv_diff_prior_close" REAL,
+
     -- Metadata for differences
     prev_timestamp TIMESTAMP,
     has_previous_data BOOLEAN,
@@ -109,27 +121,80 @@ CREATE TABLE IF NOT EXISTS gex_table (
     spx_change_pct REAL,
     spx_prevclose REAL,
 
+    -- Refresh tier tracking (REFRESH_TIERS)
+    refresh_tier TEXT,
+    chain_fetched_at TIMESTAMP,
+    greeks_reported_at TIMESTAMP,
+
     -- Composite primary key
     PRIMARY KEY ("greeks.updated_at", expiration_date, option_type, strike)
-);
+) PARTITION BY RANGE ("greeks.updated_at");
 
--- Create indexes for performance
-CREATE INDEX IF NOT EXISTS idx_gex_table_updated_at ON gex_table("greeks.updated_at");
-CREATE INDEX IF NOT EXISTS idx_gex_table_expiration ON gex_table(expiration_date);
-CREATE INDEX IF NOT EXISTS idx_gex_table_strike ON gex_table(strike);
-CREATE INDEX IF NOT EXISTS idx_gex_table_option_type ON gex_table(option_type);
-CREATE INDEX IF NOT EXISTS idx_gex_table_gex ON gex_table(gex);
-CREATE INDEX IF NOT EXISTS idx_gex_table_spx_price ON gex_table(spx_price);
+CREATE TABLE IF NOT EXISTS gex_table_default PARTITION OF gex_table DEFAULT;
 
--- Create composite index matching the original SQLite index
-CREATE INDEX IF NOT EXISTS idx_gex_table_composite
-ON gex_table("greeks.updated_at", expiration_date, option_type, strike);
+-- Indexes
+-- The primary key leads with "greeks.updated_at", which covers snapshot and
+-- date-range lookups; partition pruning handles the rest. The former
+-- single-column indexes and the composite duplicate of the primary key are
+-- intentionally not created - each added a b-tree to maintain on every insert.
 
 -- Add comments for documentation
 COMMENT ON TABLE gex_table IS 'Main table storing SPX option chain data with Greeks and GEX calculations';
 COMMENT ON COLUMN gex_table."greeks.updated_at" IS 'Timestamp when Greek values were calculated';
 COMMENT ON COLUMN gex_table.gex IS 'Gamma Exposure: Strike * Gamma * Open Interest * 100 (negative for puts)';
 COMMENT ON COLUMN gex_table.spx_price IS 'SPX spot price at time of Greek calculation';
+COMMENT ON COLUMN gex_table.greeks_reported_at IS 'greeks.updated_at as reported by Tradier when the row was stored under a tiered collection''s snapshot timestamp';
 
 -- Grant permissions
 GRANT ALL PRIVILEGES ON TABLE gex_table TO gexuser;
+
+-- Net GEX by strike per snapshot, written by the collector at save time
+-- (src/calculations/gex_aggregates.py). DTE buckets are disjoint:
+-- 0DTE, 1-2DTE, 3-7DTE, 8+DTE.
+CREATE TABLE IF NOT EXISTS gex_strike_agg (
+    snapshot_ts TIMESTAMP NOT NULL,
+    underlying TEXT NOT NULL,
+    dte_bucket TEXT NOT NULL,
+    strike REAL NOT NULL,
+    call_gex REAL,
+    put_gex REAL,
+    net_gex REAL,
+    call_oi BIGINT,
+    put_oi BIGINT,
+    PRIMARY KEY (snapshot_ts, underlying, dte_bucket, strike)
+);
+
+COMMENT ON TABLE gex_strike_agg IS 'Call, put and net GEX plus open interest per strike, snapshot and DTE bucket';
+
+GRANT ALL PRIVILEGES ON TABLE gex_strike_agg TO gexuser;
+
+-- Headline levels per snapshot and timeframe (0dte, short_term <= 2 DTE,
+-- weekly <= 7 DTE, all), written alongside gex_strike_agg. Walls are ordered
+-- strongest first.
+CREATE TABLE IF NOT EXISTS gex_snapshot_summary (
+    snapshot_ts TIMESTAMP NOT NULL,
+    underlying TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    max_dte INTEGER,
+    spot_price REAL,
+    zero_gex_level REAL,
+    call_wall_1 REAL,
+    call_wall_2 REAL,
+    call_wall_3 REAL,
+    put_wall_1 REAL,
+    put_wall_2 REAL,
+    put_wall_3 REAL,
+    total_call_gex REAL,
+    total_put_gex REAL,
+    net_gex REAL,
+    net_gex_at_price REAL,
+    contract_count INTEGER,
+    call_oi BIGINT,
+    put_oi BIGINT,
+    PRIMARY KEY (snapshot_ts, underlying, timeframe)
+);
+
+COMMENT ON TABLE gex_snapshot_summary IS 'Spot, interpolated zero-gamma level, call/put walls and GEX totals per snapshot and timeframe';
+COMMENT ON COLUMN gex_snapshot_summary.zero_gex_level IS 'Net GEX zero crossing closest to spot, linearly interpolated between strikes';
+
+GRANT ALL PRIVILEGES ON TABLE gex_snapshot_summary TO gexuser;
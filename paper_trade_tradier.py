@@ -26,6 +26,8 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from src.api.http_transport import get_transport
+
 load_dotenv()
 
 # Tradier API Configuration
@@ -104,6 +106,8 @@ class TradierAPI:
             'Authorization': f'Bearer {self.api_key}',
             'Accept': 'application/json'
         }
+        # Shared pooled session; status codes are checked by each caller
+        self.transport = get_transport()
 
     def get_option_chain(self, symbol: str = 'SPX', expiration: str = None) -> Optional[Dict]:
         """Get option chain for a symbol"""
@@ -115,7 +119,7 @@ class TradierAPI:
         }
 
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.transport.get(url, headers=self.headers, params=params, raise_for_status=False)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -131,7 +135,7 @@ class TradierAPI:
         params = {'symbols': symbol, 'greeks': 'true'}
 
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.transport.get(url, headers=self.headers, params=params, raise_for_status=False)
             if response.status_code == 200:
                 data = response.json()
                 quotes = data.get('quotes', {}).get('quote', [])
@@ -179,7 +183,8 @@ class TradierAPI:
             data['price'] = f"{price:.2f}"
 
         try:
-            response = requests.post(url, headers=self.headers, data=data)
+            response = self.transport.post(url, headers=self.headers, data=data,
+                                           max_retries=1, raise_for_status=False)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -195,7 +200,7 @@ class TradierAPI:
         url = f'{self.base_url}/accounts/{self.account}/orders/{order_id}'
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers, raise_for_status=False)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -210,7 +215,7 @@ class TradierAPI:
         url = f'{self.base_url}/accounts/{self.account}/positions'
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers, raise_for_status=False)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -225,7 +230,7 @@ class TradierAPI:
         url = f'{self.base_url}/accounts/{self.account}/balances'
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.transport.get(url, headers=self.headers, raise_for_status=False)
             if response.status_code == 200:
                 return response.json()
             else:
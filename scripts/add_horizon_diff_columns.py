@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Add Horizon Difference Columns
+
+This script adds the columns holding changes in gamma, GEX and mid IV since
+the session open and the prior close, written by GreekDifferenceCalculator:
+
+- greeks.gamma_diff_open, greeks.gamma_diff_prior_close
+- gex_diff_open, gex_diff_prior_close
+- greeks.mid_iv_diff_open, greeks.mid_iv_diff_prior_close
+"""
+
+import sys
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.calculations.greek_diff_calculator import GreekDifferenceCalculator
+
+
+def main():
+    load_dotenv()
+    config = Config()
+
+    print("=" * 80)
+    print("ADD HORIZON DIFFERENCE COLUMNS")
+    print("=" * 80)
+    print(f"\nDatabase Type: {config.database_type}\n")
+
+    if config.database_type != 'postgresql':
+        print("ERROR: Only PostgreSQL is supported")
+        return False
+
+    # Connect to database
+    conn_string = (
+        f"postgresql://{config.postgres_user}:{config.postgres_password}@"
+        f"{config.postgres_host}:{config.postgres_port}/{config.postgres_db}"
+    )
+    engine = create_engine(conn_string)
+
+    columns = [
+        f'{col}_diff_{horizon}'
+        for col in GreekDifferenceCalculator.HORIZON_COLUMNS
+        for horizon in GreekDifferenceCalculator.HORIZONS
+    ]
+
+    print("1. Creating new columns...")
+
+    with engine.begin() as conn:
+        for column in columns:
+            conn.execute(text(f'ALTER TABLE gex_table ADD COLUMN IF NOT EXISTS "{column}" REAL'))
+        print(f"   [OK] {len(columns)} columns added")
+
+    print("\n2. Verifying columns...")
+
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_name = 'gex_table'
+              AND column_name = ANY(:columns)
+            ORDER BY column_name
+        """), {'columns': columns})
+        for row in result:
+            print(f"   {row[0]}: {row[1]}")
+
+    print()
+    print("=" * 80)
+    print("[SUCCESS] HORIZON DIFFERENCE COLUMNS READY")
+    print("=" * 80)
+    print()
+    print("Next steps:")
+    print("  1. Restart collector: docker compose restart scheduler")
+    print()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
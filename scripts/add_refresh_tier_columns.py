@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Add Refresh Tier Columns
+
+This script adds the columns recording which refresh tier and fetch each
+row came from when collecting with REFRESH_TIERS:
+
+- refresh_tier      Tier name, e.g. '0-1DTE', '2-7DTE', '8+DTE'
+- chain_fetched_at  When the expiration's chain was fetched
+- greeks_reported_at  greeks.updated_at as reported by Tradier (rows reused
+                      from the tier cache are stored under the newest
+                      snapshot's greeks.updated_at)
+"""
+
+import sys
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+
+
+def main():
+    load_dotenv()
+    config = Config()
+
+    print("=" * 80)
+    print("ADD REFRESH TIER COLUMNS")
+    print("=" * 80)
+    print(f"\nDatabase Type: {config.database_type}\n")
+
+    if config.database_type != 'postgresql':
+        print("ERROR: Only PostgreSQL is supported")
+        return False
+
+    # Connect to database
+    conn_string = (
+        f"postgresql://{config.postgres_user}:{config.postgres_password}@"
+        f"{config.postgres_host}:{config.postgres_port}/{config.postgres_db}"
+    )
+    engine = create_engine(conn_string)
+
+    print("1. Creating new columns...")
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE gex_table ADD COLUMN IF NOT EXISTS refresh_tier TEXT"))
+        conn.execute(text("ALTER TABLE gex_table ADD COLUMN IF NOT EXISTS chain_fetched_at TIMESTAMP"))
+        conn.execute(text("ALTER TABLE gex_table ADD COLUMN IF NOT EXISTS greeks_reported_at TIMESTAMP"))
+        print("   [OK] Columns added")
+
+    print("\n2. Verifying columns...")
+
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_name = 'gex_table'
+              AND column_name IN ('refresh_tier', 'chain_fetched_at', 'greeks_reported_at')
+            ORDER BY column_name
+        """))
+        for row in result:
+            print(f"   {row[0]}: {row[1]}")
+
+    print()
+    print("=" * 80)
+    print("[SUCCESS] REFRESH TIER COLUMNS READY")
+    print("=" * 80)
+    print()
+    print("Next steps:")
+    print("  1. Set REFRESH_TIERS in .env, e.g. REFRESH_TIERS=0-1:2,2-7:10,8-:30")
+    print("  2. Restart collector: docker compose restart scheduler")
+    print()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Backfill Greek Differences
+
+Recomputes *_diff, *_pct_change, prev_timestamp and has_previous_data in
+gex_table for a date range, plus the *_diff_open / *_diff_prior_close
+columns (session open and prior close), one day per database pass:
+
+    python scripts/backfill_greek_differences.py --start 2025-01-01 --end 2025-03-31
+    python scripts/backfill_greek_differences.py --start 2025-01-01 --end 2025-03-31 --workers 8
+
+Completed days are recorded in the progress file, so re-running the same
+command after an interruption continues with the remaining days. Use
+--restart to recompute every day.
+"""
+
+import sys
+import os
+import argparse
+from datetime import date
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.database import create_database_from_config
+from src.calculations.diff_backfill import DiffBackfill
+
+DEFAULT_PROGRESS_FILE = 'logs/greek_diff_backfill.json'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Recompute Greek differences (previous snapshot, session open and prior close) for a date range'
+    )
+    parser.add_argument('--start', required=True, type=date.fromisoformat, help='First day (YYYY-MM-DD)')
+    parser.add_argument('--end', default=None, type=date.fromisoformat, help='Last day (default: today)')
+    parser.add_argument('--workers', type=int, default=4, help='Days processed in parallel (PostgreSQL)')
+    parser.add_argument('--progress-file', default=DEFAULT_PROGRESS_FILE,
+                        help=f'Resume file (default: {DEFAULT_PROGRESS_FILE})')
+    parser.add_argument('--restart', action='store_true', help='Ignore completed days in the progress file')
+    args = parser.parse_args()
+
+    load_dotenv()
+    config = Config()
+    end = args.end or date.today()
+
+    print("=" * 80)
+    print("BACKFILL GREEK DIFFERENCES")
+    print("=" * 80)
+    print(f"\nDatabase Type: {config.database_type}")
+    print(f"Range: {args.start} to {end}\n")
+
+    db = create_database_from_config(config)
+    backfill = DiffBackfill(
+        db,
+        lookback_hours=config.greek_diff_lookback_hours,
+        workers=args.workers,
+        progress_path=args.progress_file
+    )
+
+    summary = backfill.run(args.start, end, restart=args.restart)
+    db.close()
+
+    print(f"\nDays backfilled: {summary['days']}")
+    print(f"Days skipped (already done): {summary['skipped']}")
+    print(f"Rows updated: {summary['rows_updated']:,}")
+
+    if summary['failed']:
+        print(f"\n[ERROR] {len(summary['failed'])} day(s) failed: "
+              f"{', '.join(str(day) for day in summary['failed'])}")
+        print("Re-run the same command to retry them")
+        return False
+
+    print()
+    print("=" * 80)
+    print("[SUCCESS] GREEK DIFFERENCES BACKFILLED")
+    print("=" * 80)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -21,8 +21,9 @@ from typing import Dict, List, Tuple, Optional
 import sys
 sys.path.append(os.path.dirname(__file__))
 from backtest_strangle_intraday import (
-    IntradayStrangleBacktester, OptionLeg, LegType, LegStatus
+    IntradayStrangleBacktester, OptionLeg, LegType, LegStatus, CHECKPOINT_DIR
 )
+from src.backtesting.result_cache import ResultCache
 
 load_dotenv()
 
@@ -91,7 +92,10 @@ class HedgedStrangleBacktester(IntradayStrangleBacktester):
 
     def backtest_hedged(self, start_date: str, end_date: str,
                        profit_target_pct: float = 25.0,
-                       stop_loss_pct: float = 40.0) -> pd.DataFrame:
+                       stop_loss_pct: float = 40.0,
+                       preload: bool = True,
+                       checkpoint_dir: Optional[str] = None,
+                       cache: Optional[ResultCache] = None) -> pd.DataFrame:
         """
         Run hedged strangle backtest
 
@@ -100,6 +104,13 @@ class HedgedStrangleBacktester(IntradayStrangleBacktester):
             end_date: End date
             profit_target_pct: Profit target %
             stop_loss_pct: Stop loss %
+            preload: Load the date range into memory with one query first
+                and release it when the run ends (ignored if a store is
+                already set)
+            checkpoint_dir: Save state after every day here and resume from
+                the latest checkpoint whose data is unchanged (None = off)
+            cache: Return stored results when this configuration has already
+                run over the same data, and store new results
 
         Returns:
             DataFrame with results
@@ -113,186 +124,198 @@ class HedgedStrangleBacktester(IntradayStrangleBacktester):
         print(f"Stop loss: {stop_loss_pct}%")
         print(f"{'='*80}\n")
 
-        # Get trading dates
-        trading_dates_query = """
-        SELECT DISTINCT DATE("greeks.updated_at") as trade_date
-        FROM gex_table
-        WHERE DATE("greeks.updated_at") >= %s
-        AND DATE("greeks.updated_at") <= %s
-        ORDER BY trade_date
-        """
-
-        trading_dates = pd.read_sql(trading_dates_query, self.db,
-                                    params=(start_date, end_date))
+        params = {
+            'profit_target_pct': profit_target_pct,
+            'stop_loss_pct': stop_loss_pct
+        }
 
-        print(f"Found {len(trading_dates)} trading dates\n")
+        cache_key = None
+        if cache is not None:
+            cache_key = self.cache_key(start_date, end_date, params)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print("Loaded cached results (data unchanged)\n")
+                return cached
 
-        all_legs = []
-        leg_counter = 0
+        checkpoints, first_date, all_legs, leg_counter = self.resume(
+            checkpoint_dir, start_date, end_date, params)
 
-        for i, row in trading_dates.iterrows():
-            trade_date = str(row['trade_date'])
+        # A store loaded here only covers this run's range and data
+        owns_store = preload and self.store is None and first_date <= end_date
+        if owns_store:
+            self.preload(first_date, end_date)
 
-            # Get snapshots
-            snapshots = self.get_intraday_snapshots(trade_date)
+        try:
+            # Get trading dates
+            trading_dates = self.get_trading_dates(first_date, end_date)
 
-            if len(snapshots) == 0:
-                # Close overnight positions
-                for leg_id, leg in list(self.active_legs.items()):
-                    leg.exit_date = trade_date
-                    leg.exit_time = "09:30:00"
-                    leg.status = LegStatus.CLOSED
-                    leg.exit_reason = "overnight_close_no_data"
-                    all_legs.append(leg)
-                    del self.active_legs[leg_id]
-                continue
-
-            print(f"[{trade_date}] Processing {len(snapshots)} snapshots")
-
-            # Close overnight positions
-            if len(self.active_legs) > 0 and len(snapshots) > 0:
-                first_snapshot_time = snapshots.iloc[0]['snapshot_time']
-                first_snapshot_df = self.get_snapshot_data(first_snapshot_time)
-
-                if len(first_snapshot_df) > 0:
-                    for leg_id, leg in list(self.active_legs.items()):
-                        if leg.entry_date != trade_date:
-                            exit_price = self.get_option_price(
-                                first_snapshot_df, leg.strike, leg.leg_type.value
-                            )
+            print(f"Found {len(trading_dates)} trading dates\n")
 
-                            if exit_price:
-                                leg.exit_date = trade_date
-                                leg.exit_time = pd.to_datetime(first_snapshot_time).strftime('%H:%M:%S')
-                                leg.exit_spx_price = first_snapshot_df['spx_price'].iloc[0]
-                                leg.exit_price = exit_price
-                                leg.status = LegStatus.CLOSED
-                                leg.exit_reason = "overnight_close"
-                                leg.pnl = exit_price - leg.entry_price
-                                leg.pnl_pct = (leg.pnl / leg.entry_price) * 100
-
-                                print(f"  [OPEN] CLOSE overnight {leg.leg_type.value.upper()} ${leg.strike}: "
-                                      f"${leg.entry_price:.2f} -> ${exit_price:.2f} = {leg.pnl_pct:+.1f}%")
-
-                                all_legs.append(leg)
-                                del self.active_legs[leg_id]
-
-            # Process intraday snapshots
-            for _, snapshot_row in snapshots.iterrows():
-                snapshot_time = snapshot_row['snapshot_time']
-
-                try:
-                    df = self.get_snapshot_data(snapshot_time)
-                    if len(df) == 0:
-                        continue
+            for trade_date in trading_dates:
 
-                    # Filter for tradeable options
-                    df['expiration_date'] = pd.to_datetime(df['expiration_date'])
-                    snapshot_date = pd.to_datetime(snapshot_time).date()
-                    df['days_to_expiry'] = (df['expiration_date'].dt.date - snapshot_date).apply(lambda x: x.days)
-                    df_tradeable = df[df['days_to_expiry'] <= 1].copy()
+                # Get snapshots
+                snapshots = self.get_intraday_snapshots(trade_date)
 
-                    if len(df_tradeable) == 0:
-                        continue
-
-                    current_price = df_tradeable['spx_price'].iloc[0]
-                    zero_gex = self.calculate_zero_gex(df_tradeable)
-                    call_wall, put_wall = self.find_gex_walls(df_tradeable, current_price)
-                    gex_signal = self.get_gex_signal(df_tradeable, current_price)
-
-                    # 1. Check exits (PDT-protected)
+                if len(snapshots) == 0:
+                    # Close overnight positions
                     for leg_id, leg in list(self.active_legs.items()):
-                        should_exit, reason = self.should_exit_leg(
-                            leg, current_price, df_tradeable, trade_date,
-                            profit_target_pct, stop_loss_pct, avoid_pdt=True
-                        )
+                        leg.exit_date = trade_date
+                        leg.exit_time = "09:30:00"
+                        leg.status = LegStatus.CLOSED
+                        leg.exit_reason = "overnight_close_no_data"
+                        all_legs.append(leg)
+                        del self.active_legs[leg_id]
+                    continue
 
-                        if should_exit:
-                            exit_price = self.get_option_price(
-                                df_tradeable, leg.strike, leg.leg_type.value
-                            )
+                print(f"[{trade_date}] Processing {len(snapshots)} snapshots")
 
-                            if exit_price:
-                                leg.exit_date = trade_date
-                                leg.exit_time = pd.to_datetime(snapshot_time).strftime('%H:%M:%S')
-                                leg.exit_spx_price = current_price
-                                leg.exit_price = exit_price
-                                leg.status = LegStatus.CLOSED
-                                leg.exit_reason = reason
-                                leg.pnl = exit_price - leg.entry_price
-                                leg.pnl_pct = (leg.pnl / leg.entry_price) * 100
-
-                                print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] EXIT {leg.leg_type.value.upper()} ${leg.strike}: "
-                                      f"${leg.entry_price:.2f} -> ${exit_price:.2f} = {leg.pnl_pct:+.1f}% ({reason})")
-
-                                all_legs.append(leg)
-                                del self.active_legs[leg_id]
-
-                    # 2. Check for new entries (hedged approach)
-                    has_active_call = any(leg.leg_type == LegType.CALL for leg in self.active_legs.values())
-                    has_active_put = any(leg.leg_type == LegType.PUT for leg in self.active_legs.values())
-
-                    # Try to enter call
-                    should_enter, call_strike = self.should_enter_call_hedged(
-                        df_tradeable, current_price, call_wall, gex_signal, has_active_call
-                    )
-
-                    if should_enter and call_strike:
-                        call_price = self.get_option_price(df_tradeable, call_strike, 'call')
-
-                        if call_price and call_price > 0:
-                            leg_counter += 1
-                            leg = OptionLeg(
-                                leg_id=f"{trade_date}_call_{leg_counter}",
-                                leg_type=LegType.CALL,
-                                entry_date=trade_date,
-                                entry_time=pd.to_datetime(snapshot_time).strftime('%H:%M:%S'),
-                                entry_spx_price=current_price,
-                                strike=call_strike,
-                                entry_price=call_price,
-                                zero_gex_at_entry=zero_gex,
-                                gex_signal_at_entry=gex_signal
+                # Close overnight positions
+                if len(self.active_legs) > 0 and len(snapshots) > 0:
+                    first_snapshot_time = snapshots.iloc[0]['snapshot_time']
+                    first_snapshot_df = self.get_snapshot_data(first_snapshot_time)
+
+                    if len(first_snapshot_df) > 0:
+                        for leg_id, leg in list(self.active_legs.items()):
+                            if leg.entry_date != trade_date:
+                                exit_price = self.get_option_price(
+                                    first_snapshot_df, leg.strike, leg.leg_type.value
+                                )
+
+                                if exit_price:
+                                    leg.exit_date = trade_date
+                                    leg.exit_time = pd.to_datetime(first_snapshot_time).strftime('%H:%M:%S')
+                                    leg.exit_spx_price = first_snapshot_df['spx_price'].iloc[0]
+                                    leg.exit_price = exit_price
+                                    leg.status = LegStatus.CLOSED
+                                    leg.exit_reason = "overnight_close"
+                                    leg.pnl = exit_price - leg.entry_price
+                                    leg.pnl_pct = (leg.pnl / leg.entry_price) * 100
+
+                                    print(f"  [OPEN] CLOSE overnight {leg.leg_type.value.upper()} ${leg.strike}: "
+                                          f"${leg.entry_price:.2f} -> ${exit_price:.2f} = {leg.pnl_pct:+.1f}%")
+
+                                    all_legs.append(leg)
+                                    del self.active_legs[leg_id]
+
+                # Process intraday snapshots
+                for _, snapshot_row in snapshots.iterrows():
+                    snapshot_time = snapshot_row['snapshot_time']
+
+                    try:
+                        df = self.get_snapshot_data(snapshot_time)
+                        if len(df) == 0:
+                            continue
+
+                        # Filter for tradeable options
+                        df_tradeable = self.tradeable_options(df)
+
+                        if len(df_tradeable) == 0:
+                            continue
+
+                        current_price = df_tradeable['spx_price'].iloc[0]
+                        zero_gex = self.calculate_zero_gex(df_tradeable)
+                        call_wall, put_wall = self.find_gex_walls(df_tradeable, current_price)
+                        gex_signal = self.get_gex_signal(df_tradeable, current_price)
+
+                        # 1. Check exits (PDT-protected)
+                        for leg_id, leg in list(self.active_legs.items()):
+                            should_exit, reason = self.should_exit_leg(
+                                leg, current_price, df_tradeable, trade_date,
+                                profit_target_pct, stop_loss_pct, avoid_pdt=True
                             )
 
-                            self.active_legs[leg.leg_id] = leg
-                            hedge_note = " (HEDGE)" if has_active_put else ""
-                            print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] ENTER CALL ${call_strike}: ${call_price:.2f}{hedge_note} (SPX=${current_price:.2f}, Signal={gex_signal})")
-
-                    # Try to enter put
-                    should_enter, put_strike = self.should_enter_put_hedged(
-                        df_tradeable, current_price, put_wall, gex_signal, has_active_put, has_active_call
-                    )
-
-                    if should_enter and put_strike:
-                        put_price = self.get_option_price(df_tradeable, put_strike, 'put')
-
-                        if put_price and put_price > 0:
-                            leg_counter += 1
-                            leg = OptionLeg(
-                                leg_id=f"{trade_date}_put_{leg_counter}",
-                                leg_type=LegType.PUT,
-                                entry_date=trade_date,
-                                entry_time=pd.to_datetime(snapshot_time).strftime('%H:%M:%S'),
-                                entry_spx_price=current_price,
-                                strike=put_strike,
-                                entry_price=put_price,
-                                zero_gex_at_entry=zero_gex,
-                                gex_signal_at_entry=gex_signal
-                            )
+                            if should_exit:
+                                exit_price = self.get_option_price(
+                                    df_tradeable, leg.strike, leg.leg_type.value
+                                )
+
+                                if exit_price:
+                                    leg.exit_date = trade_date
+                                    leg.exit_time = pd.to_datetime(snapshot_time).strftime('%H:%M:%S')
+                                    leg.exit_spx_price = current_price
+                                    leg.exit_price = exit_price
+                                    leg.status = LegStatus.CLOSED
+                                    leg.exit_reason = reason
+                                    leg.pnl = exit_price - leg.entry_price
+                                    leg.pnl_pct = (leg.pnl / leg.entry_price) * 100
+
+                                    print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] EXIT {leg.leg_type.value.upper()} ${leg.strike}: "
+                                          f"${leg.entry_price:.2f} -> ${exit_price:.2f} = {leg.pnl_pct:+.1f}% ({reason})")
+
+                                    all_legs.append(leg)
+                                    del self.active_legs[leg_id]
+
+                        # 2. Check for new entries (hedged approach)
+                        has_active_call = any(leg.leg_type == LegType.CALL for leg in self.active_legs.values())
+                        has_active_put = any(leg.leg_type == LegType.PUT for leg in self.active_legs.values())
+
+                        # Try to enter call
+                        should_enter, call_strike = self.should_enter_call_hedged(
+                            df_tradeable, current_price, call_wall, gex_signal, has_active_call
+                        )
+
+                        if should_enter and call_strike:
+                            call_price = self.get_option_price(df_tradeable, call_strike, 'call')
+
+                            if call_price and call_price > 0:
+                                leg_counter += 1
+                                leg = OptionLeg(
+                                    leg_id=f"{trade_date}_call_{leg_counter}",
+                                    leg_type=LegType.CALL,
+                                    entry_date=trade_date,
+                                    entry_time=pd.to_datetime(snapshot_time).strftime('%H:%M:%S'),
+                                    entry_spx_price=current_price,
+                                    strike=call_strike,
+                                    entry_price=call_price,
+                                    zero_gex_at_entry=zero_gex,
+                                    gex_signal_at_entry=gex_signal
+                                )
+
+                                self.active_legs[leg.leg_id] = leg
+                                hedge_note = " (HEDGE)" if has_active_put else ""
+                                print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] ENTER CALL ${call_strike}: ${call_price:.2f}{hedge_note} (SPX=${current_price:.2f}, Signal={gex_signal})")
+
+                        # Try to enter put
+                        should_enter, put_strike = self.should_enter_put_hedged(
+                            df_tradeable, current_price, put_wall, gex_signal, has_active_put, has_active_call
+                        )
 
-                            self.active_legs[leg.leg_id] = leg
-                            hedge_note = " (HEDGE)" if has_active_call else ""
-                            print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] ENTER PUT ${put_strike}: ${put_price:.2f}{hedge_note} (SPX=${current_price:.2f}, Signal={gex_signal})")
+                        if should_enter and put_strike:
+                            put_price = self.get_option_price(df_tradeable, put_strike, 'put')
+
+                            if put_price and put_price > 0:
+                                leg_counter += 1
+                                leg = OptionLeg(
+                                    leg_id=f"{trade_date}_put_{leg_counter}",
+                                    leg_type=LegType.PUT,
+                                    entry_date=trade_date,
+                                    entry_time=pd.to_datetime(snapshot_time).strftime('%H:%M:%S'),
+                                    entry_spx_price=current_price,
+                                    strike=put_strike,
+                                    entry_price=put_price,
+                                    zero_gex_at_entry=zero_gex,
+                                    gex_signal_at_entry=gex_signal
+                                )
+
+                                self.active_legs[leg.leg_id] = leg
+                                hedge_note = " (HEDGE)" if has_active_call else ""
+                                print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] ENTER PUT ${put_strike}: ${put_price:.2f}{hedge_note} (SPX=${current_price:.2f}, Signal={gex_signal})")
+
+                    except Exception as e:
+                        print(f"  [{snapshot_time}] Error: {e}")
+                        continue
 
-                except Exception as e:
-                    print(f"  [{snapshot_time}] Error: {e}")
-                    continue
+                if checkpoints is not None:
+                    checkpoints.save(trade_date, self.checkpoint_state(all_legs, leg_counter))
 
-        # Close remaining positions
-        for leg_id, leg in self.active_legs.items():
-            leg.status = LegStatus.CLOSED
-            leg.exit_reason = "end_of_backtest"
-            all_legs.append(leg)
+            # Close remaining positions
+            for leg_id, leg in self.active_legs.items():
+                leg.status = LegStatus.CLOSED
+                leg.exit_reason = "end_of_backtest"
+                all_legs.append(leg)
+        finally:
+            if owns_store:
+                self.store = None
 
         # Convert to DataFrame
         results_df = pd.DataFrame([{
@@ -312,6 +335,9 @@ class HedgedStrangleBacktester(IntradayStrangleBacktester):
             'gex_signal_at_entry': leg.gex_signal_at_entry
         } for leg in all_legs])
 
+        if cache_key is not None:
+            cache.put(cache_key, results_df)
+
         return results_df
 
 
@@ -332,7 +358,9 @@ def main():
         start_date='2025-03-18',
         end_date='2025-11-28',
         profit_target_pct=25.0,
-        stop_loss_pct=40.0
+        stop_loss_pct=40.0,
+        checkpoint_dir=CHECKPOINT_DIR,
+        cache=ResultCache()
     )
 
     # Save results
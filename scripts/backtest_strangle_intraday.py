@@ -16,14 +16,26 @@ import pandas as pd
 import numpy as np
 from dotenv import load_dotenv
 import os
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import json
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backtesting.checkpoint import BacktestCheckpoints
+from src.backtesting.result_cache import ResultCache, result_key
+from src.backtesting.snapshot_store import SnapshotStore, load_day_fingerprints
+from src.backtesting.snapshot_view import SnapshotView
+
 load_dotenv()
 
+# Where main() keeps per-day state so reruns only process new days
+CHECKPOINT_DIR = 'output/checkpoints'
+
 
 class LegType(Enum):
     """Option leg type"""
@@ -77,10 +89,127 @@ class IntradayTrade:
 class IntradayStrangleBacktester:
     """Backtest strangle strategy with intraday independent leg trading"""
 
-    def __init__(self, db_connection):
+    # Options expiring within this many days are tradeable
+    MAX_DAYS_TO_EXPIRY = 1
+
+    def __init__(self, db_connection, store: Optional[SnapshotStore] = None):
+        """
+        Initialize backtester
+
+        Args:
+            db_connection: psycopg2 connection
+            store: Preloaded snapshots; when set, snapshot data for every
+                backtest range is read from memory instead of gex_table
+        """
         self.db = db_connection
+        self.store = store
         self.trades: List[IntradayTrade] = []
         self.active_legs: Dict[str, OptionLeg] = {}  # leg_id -> OptionLeg
+        self._view: Optional[SnapshotView] = None
+
+    def preload(self, start_date: str, end_date: str) -> SnapshotStore:
+        """Load every tradeable option snapshot in the date range with one query"""
+        self.store = SnapshotStore.load(self.db, start_date, end_date,
+                                        max_days_to_expiry=self.MAX_DAYS_TO_EXPIRY)
+        return self.store
+
+    def get_trading_dates(self, start_date: str, end_date: str) -> List[str]:
+        """Days with data between start_date and end_date (inclusive)"""
+        if self.store is not None:
+            return [day for day in self.store.trade_dates() if start_date <= day <= end_date]
+
+        trading_dates_query = """
+        SELECT DISTINCT DATE("greeks.updated_at") as trade_date
+        FROM gex_table
+        WHERE "greeks.updated_at" >= %s::date
+        AND "greeks.updated_at" < %s::date + 1
+        ORDER BY trade_date
+        """
+
+        trading_dates = pd.read_sql(trading_dates_query, self.db,
+                                    params=(start_date, end_date))
+        return [str(day) for day in trading_dates['trade_date']]
+
+    def day_fingerprints(self, start_date: str, end_date: str) -> Dict[str, Tuple[int, str]]:
+        """Snapshot count and last snapshot time per day (from the store if set)"""
+        if self.store is not None:
+            return {day: fingerprint for day, fingerprint in self.store.day_fingerprints().items()
+                    if start_date <= day <= end_date}
+        return load_day_fingerprints(self.db, start_date, end_date)
+
+    def cache_key(self, start_date: str, end_date: str, params: Dict) -> str:
+        """Result cache key for a run with these strategy parameters over the current data"""
+        return result_key(type(self).__name__, {'max_days_to_expiry': self.MAX_DAYS_TO_EXPIRY, **params},
+                          start_date, end_date, self.day_fingerprints(start_date, end_date))
+
+    def checkpoint_state(self, all_legs: List[OptionLeg], leg_counter: int) -> Dict:
+        """Backtest state after a day, as JSON-serializable data"""
+        def leg_to_dict(leg: OptionLeg) -> Dict:
+            data = asdict(leg)
+            data['leg_type'] = LegType(leg.leg_type).value
+            data['status'] = LegStatus(leg.status).value
+            return data
+
+        return {
+            'leg_counter': leg_counter,
+            'active_legs': [leg_to_dict(leg) for leg in self.active_legs.values()],
+            'closed_legs': [leg_to_dict(leg) for leg in all_legs]
+        }
+
+    def restore_state(self, state: Dict) -> Tuple[List[OptionLeg], int]:
+        """Restore active legs from checkpoint_state data; returns (closed legs, leg counter)"""
+        def leg_from_dict(data: Dict) -> OptionLeg:
+            return OptionLeg(**{**data, 'leg_type': LegType(data['leg_type']),
+                                'status': LegStatus(data['status'])})
+
+        self.active_legs = {leg.leg_id: leg for leg in map(leg_from_dict, state['active_legs'])}
+        return [leg_from_dict(data) for data in state['closed_legs']], state['leg_counter']
+
+    def resume(self, checkpoint_dir: Optional[str], start_date: str, end_date: str,
+               params: Dict) -> Tuple[Optional[BacktestCheckpoints], str, List[OptionLeg], int]:
+        """
+        Pick up a backtest from its latest valid checkpoint
+
+        Open legs left over from an earlier run on this instance are
+        dropped either way.
+
+        Args:
+            checkpoint_dir: Checkpoint directory (None = no checkpoints)
+            start_date: Backtest start date
+            end_date: Backtest end date
+            params: Strategy parameters (part of the checkpoint key)
+
+        Returns:
+            Tuple of (checkpoints or None, first date still to process,
+            closed legs so far, leg counter)
+        """
+        self.active_legs = {}
+        if checkpoint_dir is None:
+            return None, start_date, [], 0
+
+        checkpoints = BacktestCheckpoints(checkpoint_dir, type(self).__name__, {
+            'start_date': start_date,
+            'max_days_to_expiry': self.MAX_DAYS_TO_EXPIRY,
+            **params
+        })
+        day, state = checkpoints.resume(self.day_fingerprints(start_date, end_date))
+        if state is None:
+            return checkpoints, start_date, [], 0
+
+        all_legs, leg_counter = self.restore_state(state)
+        print(f"Resuming after {day} checkpoint ({len(all_legs)} closed legs, "
+              f"{len(self.active_legs)} open)\n")
+        next_day = (pd.to_datetime(day) + timedelta(days=1)).strftime('%Y-%m-%d')
+        return checkpoints, next_day, all_legs, leg_counter
+
+    def tradeable_options(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Options expiring within MAX_DAYS_TO_EXPIRY days of their snapshot"""
+        if 'days_to_expiry' not in df.columns:
+            expiration = pd.to_datetime(df['expiration_date']).to_numpy(dtype='datetime64[D]')
+            snapshot = pd.to_datetime(df['greeks.updated_at']).to_numpy(dtype='datetime64[D]')
+            df = df.assign(days_to_expiry=(expiration - snapshot).astype(int))
+
+        return df[df['days_to_expiry'] <= self.MAX_DAYS_TO_EXPIRY].copy()
 
     def get_intraday_snapshots(self, trade_date: str) -> pd.DataFrame:
         """
@@ -92,14 +221,18 @@ class IntradayStrangleBacktester:
         Returns:
             DataFrame with all snapshots and their timestamps
         """
+        if self.store is not None:
+            return pd.DataFrame({'snapshot_time': self.store.snapshot_times(trade_date)})
+
         query = """
         SELECT DISTINCT "greeks.updated_at" as snapshot_time
         FROM gex_table
-        WHERE DATE("greeks.updated_at") = %s
+        WHERE "greeks.updated_at" >= %s::date
+        AND "greeks.updated_at" < %s::date + 1
         ORDER BY snapshot_time
         """
 
-        return pd.read_sql(query, self.db, params=(trade_date,))
+        return pd.read_sql(query, self.db, params=(trade_date, trade_date))
 
     def get_snapshot_data(self, snapshot_time: str) -> pd.DataFrame:
         """
@@ -111,6 +244,9 @@ class IntradayStrangleBacktester:
         Returns:
             DataFrame with options data
         """
+        if self.store is not None:
+            return self.store.snapshot(snapshot_time)
+
         query = """
         SELECT
             "greeks.updated_at",
@@ -173,26 +309,15 @@ class IntradayStrangleBacktester:
         else:
             return "NEUTRAL"
 
-    def get_option_price(self, df: pd.DataFrame, strike: float, option_type: str) -> Optional[float]:
-        """Get option price (prioritize last traded price)"""
-        option = df[(df['strike'] == strike) & (df['option_type'] == option_type)]
-
-        if len(option) == 0:
-            return None
-
-        # Prioritize last traded price
-        last_price = option['option_price'].iloc[0]
-        if pd.notna(last_price) and last_price > 0:
-            return last_price
+    def snapshot_view(self, df: pd.DataFrame) -> SnapshotView:
+        """Lookup index for a snapshot, built once and reused while df is unchanged"""
+        if self._view is None or self._view.frame is not df:
+            self._view = SnapshotView(df)
+        return self._view
 
-        # Fallback to mid price (bid + ask) / 2
-        bid = option['bid'].iloc[0]
-        ask = option['ask'].iloc[0]
-
-        if pd.notna(bid) and pd.notna(ask) and bid > 0 and ask > 0:
-            return (bid + ask) / 2
-
-        return None
+    def get_option_price(self, df: pd.DataFrame, strike: float, option_type: str) -> Optional[float]:
+        """Get option price (prioritize last traded price, else bid/ask mid)"""
+        return self.snapshot_view(df).price(strike, option_type)
 
     def should_enter_call(self, df: pd.DataFrame, current_price: float,
                          call_wall: Optional[float], gex_signal: str) -> Tuple[bool, Optional[float]]:
@@ -316,7 +441,10 @@ class IntradayStrangleBacktester:
     def backtest_intraday(self, start_date: str, end_date: str,
                          profit_target_pct: float = 25.0,
                          stop_loss_pct: float = 40.0,
-                         max_legs_per_type: int = 2) -> pd.DataFrame:
+                         max_legs_per_type: int = 2,
+                         preload: bool = True,
+                         checkpoint_dir: Optional[str] = None,
+                         cache: Optional[ResultCache] = None) -> pd.DataFrame:
         """
         Run intraday backtest with independent leg trading
 
@@ -326,6 +454,13 @@ class IntradayStrangleBacktester:
             profit_target_pct: Take profit at this % gain
             stop_loss_pct: Cut losses at this % loss
             max_legs_per_type: Maximum number of legs per type (call/put) at once
+            preload: Load the date range into memory with one query first
+                and release it when the run ends (ignored if a store is
+                already set)
+            checkpoint_dir: Save state after every day here and resume from
+                the latest checkpoint whose data is unchanged (None = off)
+            cache: Return stored results when this configuration has already
+                run over the same data, and store new results
 
         Returns:
             DataFrame with all leg results
@@ -339,192 +474,203 @@ class IntradayStrangleBacktester:
         print(f"Max legs per type: {max_legs_per_type}")
         print(f"{'='*80}\n")
 
-        # Get all trading dates
-        trading_dates_query = """
-        SELECT DISTINCT DATE("greeks.updated_at") as trade_date
-        FROM gex_table
-        WHERE DATE("greeks.updated_at") >= %s
-        AND DATE("greeks.updated_at") <= %s
-        ORDER BY trade_date
-        """
-
-        trading_dates = pd.read_sql(trading_dates_query, self.db,
-                                    params=(start_date, end_date))
+        params = {
+            'profit_target_pct': profit_target_pct,
+            'stop_loss_pct': stop_loss_pct,
+            'max_legs_per_type': max_legs_per_type
+        }
 
-        print(f"Found {len(trading_dates)} trading dates\n")
+        cache_key = None
+        if cache is not None:
+            cache_key = self.cache_key(start_date, end_date, params)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print("Loaded cached results (data unchanged)\n")
+                return cached
 
-        all_legs = []
-        leg_counter = 0
+        checkpoints, first_date, all_legs, leg_counter = self.resume(
+            checkpoint_dir, start_date, end_date, params)
 
-        for i, row in trading_dates.iterrows():
-            trade_date = str(row['trade_date'])
+        # A store loaded here only covers this run's range and data
+        owns_store = preload and self.store is None and first_date <= end_date
+        if owns_store:
+            self.preload(first_date, end_date)
 
-            # Get all snapshots for this day first
-            snapshots = self.get_intraday_snapshots(trade_date)
+        try:
+            # Get all trading dates
+            trading_dates = self.get_trading_dates(first_date, end_date)
 
-            if len(snapshots) == 0:
-                # No snapshots today, but close any overnight positions anyway
-                for leg_id, leg in list(self.active_legs.items()):
-                    print(f"[{trade_date}] Closing overnight position (no data): {leg.leg_type.value} at ${leg.strike}")
-                    leg.exit_date = trade_date
-                    leg.exit_time = "09:30:00"
-                    leg.status = LegStatus.CLOSED
-                    leg.exit_reason = "overnight_close_no_data"
-                    all_legs.append(leg)
-                    del self.active_legs[leg_id]
-                continue
+            print(f"Found {len(trading_dates)} trading dates\n")
 
-            print(f"[{trade_date}] Processing {len(snapshots)} snapshots")
+            for trade_date in trading_dates:
 
-            # Close overnight positions using first snapshot of the day
-            if len(self.active_legs) > 0 and len(snapshots) > 0:
-                first_snapshot_time = snapshots.iloc[0]['snapshot_time']
-                first_snapshot_df = self.get_snapshot_data(first_snapshot_time)
+                # Get all snapshots for this day first
+                snapshots = self.get_intraday_snapshots(trade_date)
 
-                if len(first_snapshot_df) > 0:
+                if len(snapshots) == 0:
+                    # No snapshots today, but close any overnight positions anyway
                     for leg_id, leg in list(self.active_legs.items()):
-                        # Only close if opened on a previous day
-                        if leg.entry_date != trade_date:
-                            exit_price = self.get_option_price(
-                                first_snapshot_df, leg.strike, leg.leg_type.value
-                            )
+                        print(f"[{trade_date}] Closing overnight position (no data): {leg.leg_type.value} at ${leg.strike}")
+                        leg.exit_date = trade_date
+                        leg.exit_time = "09:30:00"
+                        leg.status = LegStatus.CLOSED
+                        leg.exit_reason = "overnight_close_no_data"
+                        all_legs.append(leg)
+                        del self.active_legs[leg_id]
+                    continue
 
-                            if exit_price:
-                                leg.exit_date = trade_date
-                                leg.exit_time = pd.to_datetime(first_snapshot_time).strftime('%H:%M:%S')
-                                leg.exit_spx_price = first_snapshot_df['spx_price'].iloc[0]
-                                leg.exit_price = exit_price
-                                leg.status = LegStatus.CLOSED
-                                leg.exit_reason = "overnight_close"
-                                leg.pnl = exit_price - leg.entry_price
-                                leg.pnl_pct = (leg.pnl / leg.entry_price) * 100
+                print(f"[{trade_date}] Processing {len(snapshots)} snapshots")
 
-                                print(f"  [OPEN] CLOSE overnight {leg.leg_type.value.upper()} ${leg.strike}: "
-                                      f"${leg.entry_price:.2f} -> ${exit_price:.2f} = {leg.pnl_pct:+.1f}%")
+                # Close overnight positions using first snapshot of the day
+                if len(self.active_legs) > 0 and len(snapshots) > 0:
+                    first_snapshot_time = snapshots.iloc[0]['snapshot_time']
+                    first_snapshot_df = self.get_snapshot_data(first_snapshot_time)
 
-                                all_legs.append(leg)
-                                del self.active_legs[leg_id]
+                    if len(first_snapshot_df) > 0:
+                        for leg_id, leg in list(self.active_legs.items()):
+                            # Only close if opened on a previous day
+                            if leg.entry_date != trade_date:
+                                exit_price = self.get_option_price(
+                                    first_snapshot_df, leg.strike, leg.leg_type.value
+                                )
 
-            for _, snapshot_row in snapshots.iterrows():
-                snapshot_time = snapshot_row['snapshot_time']
+                                if exit_price:
+                                    leg.exit_date = trade_date
+                                    leg.exit_time = pd.to_datetime(first_snapshot_time).strftime('%H:%M:%S')
+                                    leg.exit_spx_price = first_snapshot_df['spx_price'].iloc[0]
+                                    leg.exit_price = exit_price
+                                    leg.status = LegStatus.CLOSED
+                                    leg.exit_reason = "overnight_close"
+                                    leg.pnl = exit_price - leg.entry_price
+                                    leg.pnl_pct = (leg.pnl / leg.entry_price) * 100
 
-                try:
-                    # Get data for this snapshot
-                    df = self.get_snapshot_data(snapshot_time)
+                                    print(f"  [OPEN] CLOSE overnight {leg.leg_type.value.upper()} ${leg.strike}: "
+                                          f"${leg.entry_price:.2f} -> ${exit_price:.2f} = {leg.pnl_pct:+.1f}%")
 
-                    if len(df) == 0:
-                        continue
+                                    all_legs.append(leg)
+                                    del self.active_legs[leg_id]
 
-                    # Filter for next-day or 0DTE options
-                    df['expiration_date'] = pd.to_datetime(df['expiration_date'])
-                    snapshot_date = pd.to_datetime(snapshot_time).date()
+                for _, snapshot_row in snapshots.iterrows():
+                    snapshot_time = snapshot_row['snapshot_time']
 
-                    # Include 0DTE and 1DTE
-                    df['days_to_expiry'] = (df['expiration_date'].dt.date - snapshot_date).apply(lambda x: x.days)
-                    df_tradeable = df[df['days_to_expiry'] <= 1].copy()
+                    try:
+                        # Get data for this snapshot
+                        df = self.get_snapshot_data(snapshot_time)
 
-                    if len(df_tradeable) == 0:
-                        continue
+                        if len(df) == 0:
+                            continue
 
-                    current_price = df_tradeable['spx_price'].iloc[0]
-                    zero_gex = self.calculate_zero_gex(df_tradeable)
-                    call_wall, put_wall = self.find_gex_walls(df_tradeable, current_price)
-                    gex_signal = self.get_gex_signal(df_tradeable, current_price)
+                        # Include 0DTE and 1DTE
+                        df_tradeable = self.tradeable_options(df)
 
-                    # 1. Check if we should exit any active legs
-                    for leg_id, leg in list(self.active_legs.items()):
-                        should_exit, reason = self.should_exit_leg(
-                            leg, current_price, df_tradeable, trade_date,
-                            profit_target_pct, stop_loss_pct, avoid_pdt=True
-                        )
-
-                        if should_exit:
-                            exit_price = self.get_option_price(
-                                df_tradeable, leg.strike, leg.leg_type.value
+                        if len(df_tradeable) == 0:
+                            continue
+
+                        current_price = df_tradeable['spx_price'].iloc[0]
+                        zero_gex = self.calculate_zero_gex(df_tradeable)
+                        call_wall, put_wall = self.find_gex_walls(df_tradeable, current_price)
+                        gex_signal = self.get_gex_signal(df_tradeable, current_price)
+
+                        # 1. Check if we should exit any active legs
+                        for leg_id, leg in list(self.active_legs.items()):
+                            should_exit, reason = self.should_exit_leg(
+                                leg, current_price, df_tradeable, trade_date,
+                                profit_target_pct, stop_loss_pct, avoid_pdt=True
                             )
 
-                            if exit_price:
-                                leg.exit_date = trade_date
-                                leg.exit_time = pd.to_datetime(snapshot_time).strftime('%H:%M:%S')
-                                leg.exit_spx_price = current_price
-                                leg.exit_price = exit_price
-                                leg.status = LegStatus.CLOSED
-                                leg.exit_reason = reason
-                                leg.pnl = exit_price - leg.entry_price
-                                leg.pnl_pct = (leg.pnl / leg.entry_price) * 100
-
-                                print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] EXIT {leg.leg_type.value.upper()} ${leg.strike}: "
-                                      f"${leg.entry_price:.2f} -> ${exit_price:.2f} = {leg.pnl_pct:+.1f}% ({reason})")
-
-                                all_legs.append(leg)
-                                del self.active_legs[leg_id]
-
-                    # 2. Check if we should enter new legs
-                    # Count active legs by type
-                    active_calls = sum(1 for leg in self.active_legs.values() if leg.leg_type == LegType.CALL)
-                    active_puts = sum(1 for leg in self.active_legs.values() if leg.leg_type == LegType.PUT)
-
-                    # Try to enter a call
-                    if active_calls < max_legs_per_type:
-                        should_enter, call_strike = self.should_enter_call(
-                            df_tradeable, current_price, call_wall, gex_signal
-                        )
-
-                        if should_enter and call_strike:
-                            call_price = self.get_option_price(df_tradeable, call_strike, 'call')
-
-                            if call_price and call_price > 0:
-                                leg_counter += 1
-                                leg = OptionLeg(
-                                    leg_id=f"{trade_date}_call_{leg_counter}",
-                                    leg_type=LegType.CALL,
-                                    entry_date=trade_date,
-                                    entry_time=pd.to_datetime(snapshot_time).strftime('%H:%M:%S'),
-                                    entry_spx_price=current_price,
-                                    strike=call_strike,
-                                    entry_price=call_price,
-                                    zero_gex_at_entry=zero_gex,
-                                    gex_signal_at_entry=gex_signal
+                            if should_exit:
+                                exit_price = self.get_option_price(
+                                    df_tradeable, leg.strike, leg.leg_type.value
                                 )
 
-                                self.active_legs[leg.leg_id] = leg
-                                print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] ENTER CALL ${call_strike}: ${call_price:.2f} (SPX=${current_price:.2f}, Signal={gex_signal})")
-
-                    # Try to enter a put
-                    if active_puts < max_legs_per_type:
-                        should_enter, put_strike = self.should_enter_put(
-                            df_tradeable, current_price, put_wall, gex_signal
-                        )
-
-                        if should_enter and put_strike:
-                            put_price = self.get_option_price(df_tradeable, put_strike, 'put')
-
-                            if put_price and put_price > 0:
-                                leg_counter += 1
-                                leg = OptionLeg(
-                                    leg_id=f"{trade_date}_put_{leg_counter}",
-                                    leg_type=LegType.PUT,
-                                    entry_date=trade_date,
-                                    entry_time=pd.to_datetime(snapshot_time).strftime('%H:%M:%S'),
-                                    entry_spx_price=current_price,
-                                    strike=put_strike,
-                                    entry_price=put_price,
-                                    zero_gex_at_entry=zero_gex,
-                                    gex_signal_at_entry=gex_signal
-                                )
+                                if exit_price:
+                                    leg.exit_date = trade_date
+                                    leg.exit_time = pd.to_datetime(snapshot_time).strftime('%H:%M:%S')
+                                    leg.exit_spx_price = current_price
+                                    leg.exit_price = exit_price
+                                    leg.status = LegStatus.CLOSED
+                                    leg.exit_reason = reason
+                                    leg.pnl = exit_price - leg.entry_price
+                                    leg.pnl_pct = (leg.pnl / leg.entry_price) * 100
+
+                                    print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] EXIT {leg.leg_type.value.upper()} ${leg.strike}: "
+                                          f"${leg.entry_price:.2f} -> ${exit_price:.2f} = {leg.pnl_pct:+.1f}% ({reason})")
+
+                                    all_legs.append(leg)
+                                    del self.active_legs[leg_id]
+
+                        # 2. Check if we should enter new legs
+                        # Count active legs by type
+                        active_calls = sum(1 for leg in self.active_legs.values() if leg.leg_type == LegType.CALL)
+                        active_puts = sum(1 for leg in self.active_legs.values() if leg.leg_type == LegType.PUT)
+
+                        # Try to enter a call
+                        if active_calls < max_legs_per_type:
+                            should_enter, call_strike = self.should_enter_call(
+                                df_tradeable, current_price, call_wall, gex_signal
+                            )
 
-                                self.active_legs[leg.leg_id] = leg
-                                print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] ENTER PUT ${put_strike}: ${put_price:.2f} (SPX=${current_price:.2f}, Signal={gex_signal})")
+                            if should_enter and call_strike:
+                                call_price = self.get_option_price(df_tradeable, call_strike, 'call')
+
+                                if call_price and call_price > 0:
+                                    leg_counter += 1
+                                    leg = OptionLeg(
+                                        leg_id=f"{trade_date}_call_{leg_counter}",
+                                        leg_type=LegType.CALL,
+                                        entry_date=trade_date,
+                                        entry_time=pd.to_datetime(snapshot_time).strftime('%H:%M:%S'),
+                                        entry_spx_price=current_price,
+                                        strike=call_strike,
+                                        entry_price=call_price,
+                                        zero_gex_at_entry=zero_gex,
+                                        gex_signal_at_entry=gex_signal
+                                    )
+
+                                    self.active_legs[leg.leg_id] = leg
+                                    print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] ENTER CALL ${call_strike}: ${call_price:.2f} (SPX=${current_price:.2f}, Signal={gex_signal})")
+
+                        # Try to enter a put
+                        if active_puts < max_legs_per_type:
+                            should_enter, put_strike = self.should_enter_put(
+                                df_tradeable, current_price, put_wall, gex_signal
+                            )
 
-                except Exception as e:
-                    print(f"  [{snapshot_time}] Error: {e}")
-                    continue
+                            if should_enter and put_strike:
+                                put_price = self.get_option_price(df_tradeable, put_strike, 'put')
+
+                                if put_price and put_price > 0:
+                                    leg_counter += 1
+                                    leg = OptionLeg(
+                                        leg_id=f"{trade_date}_put_{leg_counter}",
+                                        leg_type=LegType.PUT,
+                                        entry_date=trade_date,
+                                        entry_time=pd.to_datetime(snapshot_time).strftime('%H:%M:%S'),
+                                        entry_spx_price=current_price,
+                                        strike=put_strike,
+                                        entry_price=put_price,
+                                        zero_gex_at_entry=zero_gex,
+                                        gex_signal_at_entry=gex_signal
+                                    )
+
+                                    self.active_legs[leg.leg_id] = leg
+                                    print(f"  [{pd.to_datetime(snapshot_time).strftime('%H:%M')}] ENTER PUT ${put_strike}: ${put_price:.2f} (SPX=${current_price:.2f}, Signal={gex_signal})")
+
+                    except Exception as e:
+                        print(f"  [{snapshot_time}] Error: {e}")
+                        continue
 
-        # Close any remaining open legs
-        for leg_id, leg in self.active_legs.items():
-            leg.status = LegStatus.CLOSED
-            leg.exit_reason = "end_of_backtest"
-            all_legs.append(leg)
+                if checkpoints is not None:
+                    checkpoints.save(trade_date, self.checkpoint_state(all_legs, leg_counter))
+
+            # Close any remaining open legs
+            for leg_id, leg in self.active_legs.items():
+                leg.status = LegStatus.CLOSED
+                leg.exit_reason = "end_of_backtest"
+                all_legs.append(leg)
+        finally:
+            if owns_store:
+                self.store = None
 
         # Convert to DataFrame
         results_df = pd.DataFrame([asdict(leg) for leg in all_legs])
@@ -534,6 +680,9 @@ class IntradayStrangleBacktester:
             results_df['leg_type'] = results_df['leg_type'].apply(lambda x: x if isinstance(x, str) else x.value)
             results_df['status'] = results_df['status'].apply(lambda x: x if isinstance(x, str) else x.value)
 
+        if cache_key is not None:
+            cache.put(cache_key, results_df)
+
         return results_df
 
     def generate_performance_report(self, results_df: pd.DataFrame) -> Dict:
@@ -609,7 +758,9 @@ def main():
         end_date='2025-11-28',
         profit_target_pct=25.0,
         stop_loss_pct=40.0,
-        max_legs_per_type=2
+        max_legs_per_type=2,
+        checkpoint_dir=CHECKPOINT_DIR,
+        cache=ResultCache()
     )
 
     # Save results
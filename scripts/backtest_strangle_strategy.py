@@ -14,12 +14,20 @@ import pandas as pd
 import numpy as np
 from dotenv import load_dotenv
 import os
+import sys
 from datetime import datetime, timedelta, time
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 import json
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backtesting.result_cache import ResultCache, result_key
+from src.backtesting.snapshot_store import SnapshotStore, load_day_fingerprints
+from src.backtesting.snapshot_view import SnapshotView
+
 load_dotenv()
 
 
@@ -83,65 +91,203 @@ class StranglePosition:
 class StrangleBacktester:
     """Backtester for options strangle strategies"""
 
-    def __init__(self, db_connection):
+    def __init__(self, db_connection, store: Optional[SnapshotStore] = None,
+                 snapshot_times: Optional[Dict[Tuple[str, int], pd.Timestamp]] = None,
+                 preloaded_range: Optional[Tuple[str, str]] = None):
         """
         Initialize backtester
 
         Args:
             db_connection: PostgreSQL database connection
+            store: Preloaded snapshots (see preload)
+            snapshot_times: (trade date, target hour) -> snapshot held in store
+            preloaded_range: First and last day covered by store
         """
         self.db = db_connection
         self.positions: List[StranglePosition] = []
+        self.store = store
+        self.snapshot_times = snapshot_times or {}
+        self.preloaded_range = preloaded_range
+        self._view: Optional[SnapshotView] = None
 
-    def get_eod_snapshot(self, trade_date: str, target_hour: int = 15) -> pd.DataFrame:
+    def preload(self, start_date: str, end_date: str, hours: Iterable[int]) -> SnapshotStore:
         """
-        Get end-of-day snapshot for a given date
+        Load the snapshots closest to each hour on every trading day once
+
+        Covers the day after end_date as well, since exits are evaluated on
+        the day after entry. Later get_eod_snapshot calls in the range are
+        answered from memory.
 
         Args:
-            trade_date: Date in YYYY-MM-DD format
-            target_hour: Target hour for EOD (default: 15 = 3pm ET)
+            start_date: First day (YYYY-MM-DD)
+            end_date: Last entry day (YYYY-MM-DD)
+            hours: Target hours that will be requested (entry and exit)
 
         Returns:
-            DataFrame with EOD options data
+            SnapshotStore
+        """
+        last_date = (pd.to_datetime(end_date) + timedelta(days=1)).strftime('%Y-%m-%d')
+
+        rows, snapshot_times = self.get_eod_snapshots(start_date, last_date, hours)
+
+        self.store = SnapshotStore.from_frame(rows)
+        self.snapshot_times = snapshot_times
+        self.preloaded_range = (start_date, last_date)
+        return self.store
+
+    def get_eod_snapshots(self, start_date: str, end_date: str, hours: Iterable[int]
+                          ) -> Tuple[pd.DataFrame, Dict[Tuple[str, int], pd.Timestamp]]:
+        """
+        Snapshots closest to each target hour on every day in a range, in one query
+
+        Uses the same rule as get_eod_snapshot (smallest hour difference,
+        latest snapshot on ties, only options expiring after the trade date).
+        Days are found with a range scan on "greeks.updated_at" rather than
+        a per-day DATE() filter, and a snapshot chosen for several hours is
+        returned once.
+
+        Args:
+            start_date: First day (YYYY-MM-DD)
+            end_date: Last day (YYYY-MM-DD, inclusive)
+            hours: Target hours
+
+        Returns:
+            Tuple of (rows of every selected snapshot ordered by snapshot,
+            expiration, strike and type; (trade date, hour) -> snapshot time)
         """
         query = """
-        WITH snapshots_today AS (
-            SELECT
-                "greeks.updated_at",
-                EXTRACT(HOUR FROM "greeks.updated_at") as hour,
-                ABS(EXTRACT(HOUR FROM "greeks.updated_at") - %s) as hour_diff
+        WITH snapshots AS (
+            SELECT DISTINCT "greeks.updated_at" AS snapshot_time
             FROM gex_table
-            WHERE DATE("greeks.updated_at") = %s
+            WHERE "greeks.updated_at" >= %(start)s::date
+            AND "greeks.updated_at" < %(end)s::date + 1
         ),
-        closest_snapshot AS (
-            SELECT "greeks.updated_at"
-            FROM snapshots_today
-            ORDER BY hour_diff ASC, "greeks.updated_at" DESC
-            LIMIT 1
+        closest AS (
+            SELECT DISTINCT ON (snapshot_time::date, target_hour)
+                snapshot_time,
+                snapshot_time::date AS trade_date,
+                target_hour
+            FROM snapshots
+            CROSS JOIN UNNEST(%(hours)s::int[]) AS target_hour
+            ORDER BY snapshot_time::date, target_hour,
+                     ABS(EXTRACT(HOUR FROM snapshot_time) - target_hour) ASC,
+                     snapshot_time DESC
+        ),
+        selected AS (
+            SELECT snapshot_time, trade_date, ARRAY_AGG(target_hour ORDER BY target_hour) AS target_hours
+            FROM closest
+            GROUP BY snapshot_time, trade_date
         )
         SELECT
-            "greeks.updated_at",
-            expiration_date,
-            strike,
-            option_type,
-            last as option_price,
-            bid,
-            ask,
-            volume,
-            open_interest,
-            gex,
-            "greeks.delta",
-            "greeks.gamma",
-            "greeks.theta",
-            "greeks.vega",
-            spx_price
+            s.target_hours,
+            g."greeks.updated_at",
+            g.expiration_date,
+            g.strike,
+            g.option_type,
+            g.last as option_price,
+            g.bid,
+            g.ask,
+            g.volume,
+            g.open_interest,
+            g.gex,
+            g."greeks.delta",
+            g."greeks.gamma",
+            g."greeks.theta",
+            g."greeks.vega",
+            g.spx_price
+        FROM selected s
+        JOIN gex_table g ON g."greeks.updated_at" = s.snapshot_time
+        WHERE g.expiration_date > TO_CHAR(s.trade_date, 'YYYY-MM-DD')
+        ORDER BY g."greeks.updated_at", g.expiration_date, g.strike, g.option_type
+        """
+
+        params = {'start': start_date, 'end': end_date, 'hours': sorted(set(hours))}
+        rows = pd.read_sql(query, self.db, params=params)
+
+        snapshot_times = {}
+        for _, row in rows.drop_duplicates('greeks.updated_at').iterrows():
+            snapshot_time = pd.Timestamp(row['greeks.updated_at'])
+            for hour in row['target_hours']:
+                snapshot_times[(snapshot_time.strftime('%Y-%m-%d'), int(hour))] = snapshot_time
+
+        return rows.drop(columns='target_hours'), snapshot_times
+
+    def get_trading_dates(self, start_date: str, end_date: str) -> List[str]:
+        """Days with data between start_date and end_date (inclusive)"""
+        if self.store is not None and self._is_preloaded(start_date) and self._is_preloaded(end_date):
+            days = sorted({trade_date for trade_date, _ in self.snapshot_times})
+            return [day for day in days if start_date <= day <= end_date]
+
+        trading_dates_query = """
+        SELECT DISTINCT DATE("greeks.updated_at") as trade_date
         FROM gex_table
-        WHERE "greeks.updated_at" = (SELECT "greeks.updated_at" FROM closest_snapshot)
-        AND expiration_date > %s
-        ORDER BY expiration_date, strike, option_type
+        WHERE "greeks.updated_at" >= %s::date
+        AND "greeks.updated_at" < %s::date + 1
+        ORDER BY trade_date
         """
 
-        return pd.read_sql(query, self.db, params=(target_hour, trade_date, trade_date))
+        trading_dates = pd.read_sql(trading_dates_query, self.db,
+                                    params=(start_date, end_date))
+        return [str(day) for day in trading_dates['trade_date']]
+
+    def day_fingerprints(self, start_date: str, end_date: str) -> Dict[str, Tuple[int, str]]:
+        """Snapshot count and last snapshot time per day in gex_table"""
+        return load_day_fingerprints(self.db, start_date, end_date)
+
+    @staticmethod
+    def run_params(strike_method: StrikeSelectionMethod, exit_strategy: str,
+                   strike_params: Optional[Dict], entry_hour: int, exit_hour: int) -> Dict:
+        """Parameters that determine a backtest's results (result cache key)"""
+        return {
+            'strike_method': strike_method.value,
+            'exit_strategy': exit_strategy,
+            'strike_params': strike_params or {},
+            'entry_hour': entry_hour,
+            'exit_hour': exit_hour
+        }
+
+    def cache_key(self, start_date: str, end_date: str, params: Dict,
+                  fingerprints: Optional[Dict[str, Tuple[int, str]]] = None) -> str:
+        """
+        Result cache key for a backtest run
+
+        Args:
+            start_date: Start date
+            end_date: End date
+            params: run_params() of the run
+            fingerprints: Day fingerprints through the day after end_date
+                (queried if not given)
+        """
+        if fingerprints is None:
+            last_date = (pd.to_datetime(end_date) + timedelta(days=1)).strftime('%Y-%m-%d')
+            fingerprints = self.day_fingerprints(start_date, last_date)
+        return result_key(type(self).__name__, params, start_date, end_date, fingerprints)
+
+    def _is_preloaded(self, trade_date: str) -> bool:
+        return self.preloaded_range is not None and \
+            self.preloaded_range[0] <= trade_date <= self.preloaded_range[1]
+
+    def get_eod_snapshot(self, trade_date: str, target_hour: int = 15) -> pd.DataFrame:
+        """
+        Get end-of-day snapshot for a given date
+
+        Args:
+            trade_date: Date in YYYY-MM-DD format
+            target_hour: Target hour for EOD (default: 15 = 3pm ET)
+
+        Returns:
+            DataFrame with EOD options data
+        """
+        if self.store is not None and self._is_preloaded(trade_date):
+            snapshot_time = self.snapshot_times.get((trade_date, target_hour))
+            if snapshot_time is not None:
+                return self.store.snapshot(snapshot_time)
+            if not any(day == trade_date for day, _ in self.snapshot_times):
+                # No data that day
+                return pd.DataFrame(columns=list(self.store.columns))
+
+        rows, _ = self.get_eod_snapshots(trade_date, trade_date, [target_hour])
+        return rows
 
     def get_open_snapshot(self, trade_date: str, target_hour: int = 10) -> pd.DataFrame:
         """
@@ -234,13 +380,12 @@ class StrangleBacktester:
             # Select by delta (e.g., 0.30 delta)
             target_delta = params.get('target_delta', 0.30)
 
-            calls = df[(df['option_type'] == 'call') & (df['greeks.delta'].notna())]
-            puts = df[(df['option_type'] == 'put') & (df['greeks.delta'].notna())]
+            view = self.snapshot_view(df)
+            call_strike = view.nearest_delta(target_delta, 'call')
+            put_strike = view.nearest_delta(-target_delta, 'put')
 
-            if len(calls) > 0 and len(puts) > 0:
-                call_strike = calls.iloc[(calls['greeks.delta'] - target_delta).abs().argsort()[0]]['strike']
-                put_strike = puts.iloc[(puts['greeks.delta'] + target_delta).abs().argsort()[0]]['strike']
-                return float(call_strike), float(put_strike)
+            if call_strike is not None and put_strike is not None:
+                return call_strike, put_strike
 
         elif method == StrikeSelectionMethod.ATM_OFFSET:
             # Fixed percentage offset from ATM
@@ -260,34 +405,19 @@ class StrangleBacktester:
     def _round_to_strike(self, df: pd.DataFrame, target_strike: float,
                         option_type: str) -> float:
         """Round to nearest available strike"""
-        options = df[df['option_type'] == option_type]
-        if len(options) == 0:
-            return target_strike
+        strike = self.snapshot_view(df).nearest_strike(target_strike, option_type)
+        return target_strike if strike is None else strike
 
-        closest = options.iloc[(options['strike'] - target_strike).abs().argsort()[0]]
-        return float(closest['strike'])
+    def snapshot_view(self, df: pd.DataFrame) -> SnapshotView:
+        """Lookup index for a snapshot, built once and reused while df is unchanged"""
+        if self._view is None or self._view.frame is not df:
+            self._view = SnapshotView(df)
+        return self._view
 
     def get_option_price(self, df: pd.DataFrame, strike: float,
                         option_type: str) -> Optional[float]:
-        """Get option price for a given strike"""
-        option = df[(df['strike'] == strike) & (df['option_type'] == option_type)]
-
-        if len(option) == 0:
-            return None
-
-        # Prioritize last traded price
-        last_price = option['option_price'].iloc[0]
-        if pd.notna(last_price) and last_price > 0:
-            return last_price
-
-        # Fallback to mid price (bid + ask) / 2
-        bid = option['bid'].iloc[0]
-        ask = option['ask'].iloc[0]
-
-        if pd.notna(bid) and pd.notna(ask) and bid > 0 and ask > 0:
-            return (bid + ask) / 2
-
-        return None
+        """Get option price for a given strike (last traded, else bid/ask mid)"""
+        return self.snapshot_view(df).price(strike, option_type)
 
     def evaluate_exit_signal(self, position: StranglePosition,
                             current_df: pd.DataFrame,
@@ -350,7 +480,9 @@ class StrangleBacktester:
                 exit_strategy: str = 'technical',
                 strike_params: Optional[Dict] = None,
                 entry_hour: int = 15,
-                exit_hour: int = 10) -> pd.DataFrame:
+                exit_hour: int = 10,
+                preload: bool = True,
+                cache: Optional[ResultCache] = None) -> pd.DataFrame:
         """
         Run backtest over date range
 
@@ -362,6 +494,10 @@ class StrangleBacktester:
             strike_params: Parameters for strike selection
             entry_hour: Hour to enter positions (default 15 = 3pm)
             exit_hour: Hour to evaluate exits (default 10 = 10am)
+            preload: Load the entry and exit snapshots for the whole range
+                with one query first (ignored if a store is already set)
+            cache: Return stored results when this configuration has already
+                run over the same data, and store new results
 
         Returns:
             DataFrame with backtest results
@@ -379,22 +515,26 @@ class StrangleBacktester:
         print(f"Exit evaluation: {exit_hour}:00 ET")
         print(f"{'='*80}\n")
 
-        # Get all trading dates
-        trading_dates_query = """
-        SELECT DISTINCT DATE("greeks.updated_at") as trade_date
-        FROM gex_table
-        WHERE DATE("greeks.updated_at") >= %s
-        AND DATE("greeks.updated_at") <= %s
-        ORDER BY trade_date
-        """
+        cache_key = None
+        if cache is not None:
+            cache_key = self.cache_key(start_date, end_date, self.run_params(
+                strike_method, exit_strategy, strike_params, entry_hour, exit_hour))
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print("Loaded cached results (data unchanged)\n")
+                return cached
 
-        trading_dates = pd.read_sql(trading_dates_query, self.db,
-                                    params=(start_date, end_date))
+        self.positions = []
+
+        if preload and self.store is None:
+            self.preload(start_date, end_date, [entry_hour, exit_hour])
+
+        # Get all trading dates
+        trading_dates = self.get_trading_dates(start_date, end_date)
 
         print(f"Found {len(trading_dates)} trading dates\n")
 
-        for i, row in trading_dates.iterrows():
-            trade_date = str(row['trade_date'])
+        for trade_date in trading_dates:
 
             # Get EOD snapshot for entry
             try:
@@ -495,6 +635,9 @@ class StrangleBacktester:
         # Convert to DataFrame
         results_df = pd.DataFrame([asdict(p) for p in self.positions])
 
+        if cache_key is not None:
+            cache.put(cache_key, results_df)
+
         return results_df
 
     def generate_performance_report(self, results_df: pd.DataFrame) -> Dict:
@@ -571,7 +714,8 @@ def main():
         strike_method=StrikeSelectionMethod.GEX_WALLS,
         exit_strategy='technical',
         entry_hour=15,
-        exit_hour=10
+        exit_hour=10,
+        cache=ResultCache()
     )
 
     # Save results
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark Snapshot Store
+
+Runs the intraday strangle backtest over the same date range twice, once
+with per-date/per-snapshot gex_table queries and once from a preloaded
+SnapshotStore, checks the legs match and prints the timings:
+
+    python scripts/benchmark_snapshot_store.py --start 2025-09-01 --end 2025-11-28
+"""
+
+import sys
+import os
+import io
+import time
+import argparse
+import contextlib
+import psycopg2
+import pandas as pd
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(__file__))
+from backtest_strangle_intraday import IntradayStrangleBacktester
+
+load_dotenv()
+
+
+def run(conn, start: str, end: str, preload: bool):
+    backtester = IntradayStrangleBacktester(conn)
+    began = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = backtester.backtest_intraday(start, end, preload=preload)
+    return results, time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-snapshot queries with a preloaded snapshot store')
+    parser.add_argument('--start', required=True, help='First day (YYYY-MM-DD)')
+    parser.add_argument('--end', required=True, help='Last day (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        host=os.getenv('POSTGRES_HOST', 'localhost'),
+        port=os.getenv('POSTGRES_PORT', 5432),
+        database=os.getenv('POSTGRES_DB', 'gexdb'),
+        user=os.getenv('POSTGRES_USER', 'gexuser'),
+        password=os.getenv('POSTGRES_PASSWORD')
+    )
+
+    print("=" * 80)
+    print("SNAPSHOT STORE BENCHMARK")
+    print("=" * 80)
+    print(f"\nRange: {args.start} to {args.end}\n")
+
+    queried, query_time = run(conn, args.start, args.end, preload=False)
+    preloaded, store_time = run(conn, args.start, args.end, preload=True)
+    conn.close()
+
+    print(f"Per-snapshot queries: {query_time:8.1f} s")
+    print(f"Preloaded store:      {store_time:8.1f} s  ({query_time / store_time:.1f}x faster)")
+    print(f"Legs: {len(queried)} / {len(preloaded)}")
+
+    try:
+        pd.testing.assert_frame_equal(preloaded, queried)
+    except AssertionError as e:
+        print(f"\n[ERROR] Results differ: {e}")
+        return False
+
+    print("\n[SUCCESS] Results match")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compute GEX Level History
+
+Zero-gamma level and call/put walls for every snapshot in a date range.
+Days already summarized in gex_snapshot_summary are read from it; the rest
+take one gex_table query per day:
+
+    python scripts/compute_gex_levels.py --start 2025-01-01 --end 2025-03-31 --output output/gex_levels.csv
+    python scripts/compute_gex_levels.py --start 2025-01-01 --timeframe 0dte --persist
+
+--persist also writes the full summaries of recomputed days to
+gex_snapshot_summary (snapshots that already have a summary are left
+unchanged), so the next run reads those days from the table.
+"""
+
+import sys
+import os
+import argparse
+from datetime import date
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.database import create_database_from_config
+from src.calculations.gex_aggregates import SUMMARY_TIMEFRAMES
+from src.calculations.level_history import LevelHistory
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute zero-gamma and wall history for a date range')
+    parser.add_argument('--start', required=True, type=date.fromisoformat, help='First day (YYYY-MM-DD)')
+    parser.add_argument('--end', default=None, type=date.fromisoformat, help='Last day (default: today)')
+    parser.add_argument('--timeframe', action='append', choices=list(SUMMARY_TIMEFRAMES),
+                        help='Timeframe to keep (repeatable, default: all)')
+    parser.add_argument('--workers', type=int, default=4, help='Days processed in parallel (PostgreSQL)')
+    parser.add_argument('--output', default=None, help='Write the time series to this CSV file')
+    parser.add_argument('--persist', action='store_true', help='Also write gex_snapshot_summary rows')
+    args = parser.parse_args()
+
+    load_dotenv()
+    config = Config()
+    end = args.end or date.today()
+
+    print("=" * 80)
+    print("COMPUTE GEX LEVEL HISTORY")
+    print("=" * 80)
+    print(f"\nDatabase Type: {config.database_type}")
+    print(f"Range: {args.start} to {end}\n")
+
+    db = create_database_from_config(config)
+    history = LevelHistory(db, workers=args.workers)
+    levels = history.run(args.start, end, timeframes=args.timeframe, persist=args.persist)
+    db.close()
+
+    print(f"\nSnapshots: {levels['snapshot_ts'].nunique():,}")
+    print(f"Rows: {len(levels):,}")
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        levels.to_csv(args.output, index=False)
+        print(f"Saved: {args.output}")
+
+    if history.failed_days:
+        print(f"\n[ERROR] {len(history.failed_days)} day(s) failed: "
+              f"{', '.join(str(day) for day in history.failed_days)}")
+        return False
+
+    print()
+    print("=" * 80)
+    print("[SUCCESS] GEX LEVEL HISTORY COMPUTED")
+    print("=" * 80)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
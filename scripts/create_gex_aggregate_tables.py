@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Create GEX Aggregate Tables
+
+Creates the per-snapshot aggregate tables written by the collector:
+
+- gex_strike_agg        Call/put/net GEX and open interest per strike and DTE bucket
+- gex_snapshot_summary  Spot, zero-gamma level, walls and totals per timeframe
+
+With --backfill-days, rebuilds both for existing history one day at a time
+(each distinct greeks.updated_at becomes one snapshot).
+"""
+
+import sys
+import os
+import argparse
+from datetime import date, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.database import create_database_from_config
+from src.calculations.gex_aggregates import (
+    STRIKE_AGG_TABLE, STRIKE_AGG_KEY, SUMMARY_TABLE, SUMMARY_KEY, WALL_COUNT,
+    aggregate_strike_gex, summarize_snapshots
+)
+
+CREATE_TABLES = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {STRIKE_AGG_TABLE} (
+        snapshot_ts TIMESTAMP NOT NULL,
+        underlying TEXT NOT NULL,
+        dte_bucket TEXT NOT NULL,
+        strike REAL NOT NULL,
+        call_gex REAL,
+        put_gex REAL,
+        net_gex REAL,
+        call_oi BIGINT,
+        put_oi BIGINT,
+        PRIMARY KEY (snapshot_ts, underlying, dte_bucket, strike)
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {SUMMARY_TABLE} (
+        snapshot_ts TIMESTAMP NOT NULL,
+        underlying TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        max_dte INTEGER,
+        spot_price REAL,
+        zero_gex_level REAL,
+        {', '.join(f'call_wall_{i} REAL' for i in range(1, WALL_COUNT + 1))},
+        {', '.join(f'put_wall_{i} REAL' for i in range(1, WALL_COUNT + 1))},
+        total_call_gex REAL,
+        total_put_gex REAL,
+        net_gex REAL,
+        net_gex_at_price REAL,
+        contract_count INTEGER,
+        call_oi BIGINT,
+        put_oi BIGINT,
+        PRIMARY KEY (snapshot_ts, underlying, timeframe)
+    )
+    """,
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create and backfill GEX aggregate tables')
+    parser.add_argument('--backfill-days', type=int, default=0,
+                        help='Rebuild aggregates for this many days of history (0 = none)')
+    args = parser.parse_args()
+
+    load_dotenv()
+    config = Config()
+
+    print("=" * 80)
+    print("CREATE GEX AGGREGATE TABLES")
+    print("=" * 80)
+    print(f"\nDatabase Type: {config.database_type}\n")
+
+    if config.database_type != 'postgresql':
+        print("ERROR: Only PostgreSQL is supported")
+        return False
+
+    db = create_database_from_config(config)
+
+    print("1. Creating tables...")
+
+    with db.engine.begin() as conn:
+        for statement in CREATE_TABLES:
+            conn.execute(text(statement))
+        for table in (STRIKE_AGG_TABLE, SUMMARY_TABLE):
+            conn.execute(text(f"GRANT ALL PRIVILEGES ON TABLE {table} TO {config.postgres_user}"))
+    print(f"   [OK] {STRIKE_AGG_TABLE} and {SUMMARY_TABLE} ready")
+
+    if args.backfill_days > 0:
+        print(f"\n2. Backfilling {args.backfill_days} days...")
+
+        query = """
+        SELECT "greeks.updated_at", underlying, expiration_date, option_type, strike,
+               gex, open_interest, spx_price
+        FROM gex_table
+        WHERE "greeks.updated_at" >= %(day)s::date AND "greeks.updated_at" < %(day)s::date + 1
+        """
+        total_agg = total_summary = 0
+        day = date.today() - timedelta(days=args.backfill_days)
+        while day <= date.today():
+            rows = db.read_sql(query, {'day': day.isoformat()})
+            if not rows.empty:
+                strike_agg = aggregate_strike_gex(rows)
+                summary = summarize_snapshots(rows, strike_agg)
+                total_agg += db.bulk_upsert(strike_agg, STRIKE_AGG_TABLE, conflict_columns=STRIKE_AGG_KEY)
+                total_summary += db.bulk_upsert(summary, SUMMARY_TABLE, conflict_columns=SUMMARY_KEY)
+                print(f"   {day}: {len(rows):,} contracts, {summary['snapshot_ts'].nunique()} snapshots")
+            day += timedelta(days=1)
+        print(f"   [OK] {total_agg:,} strike rows and {total_summary:,} summary rows written")
+
+    db.close()
+
+    print()
+    print("=" * 80)
+    print("[SUCCESS] GEX AGGREGATE TABLES READY")
+    print("=" * 80)
+    print()
+    print("Next steps:")
+    print("  1. Restart collector: docker compose restart scheduler")
+    print()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
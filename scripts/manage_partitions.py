@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Manage gex_table Partitions
+
+Maintenance command for the time-partitioned gex_table:
+
+    python scripts/manage_partitions.py --list
+    python scripts/manage_partitions.py --ensure --ahead 3
+    python scripts/manage_partitions.py --retain-days 365 --archive-schema gex_archive
+    python scripts/manage_partitions.py --retain-days 365 --drop
+
+The collector also pre-creates partitions and applies GEX_RETENTION_DAYS once
+a day, so this is mainly for manual maintenance and cron jobs.
+"""
+
+import sys
+import os
+import argparse
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.database import create_database_from_config
+from src.partition_manager import PartitionManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage gex_table partitions')
+    parser.add_argument('--list', action='store_true', help='List partitions')
+    parser.add_argument('--ensure', action='store_true', help='Pre-create upcoming partitions')
+    parser.add_argument('--ahead', type=int, default=None,
+                        help='Future partitions to create (default: GEX_PARTITIONS_AHEAD)')
+    parser.add_argument('--interval', choices=['daily', 'monthly'], default=None,
+                        help='Partition interval (default: GEX_PARTITION_INTERVAL)')
+    parser.add_argument('--retain-days', type=int, default=None,
+                        help='Detach partitions older than this many days')
+    parser.add_argument('--archive-schema', default=None,
+                        help='Move detached partitions into this schema')
+    parser.add_argument('--drop', action='store_true',
+                        help='Drop detached partitions (permanently deletes data)')
+    args = parser.parse_args()
+
+    load_dotenv()
+    config = Config()
+
+    if config.database_type != 'postgresql':
+        print("ERROR: Only PostgreSQL is supported")
+        return False
+
+    db = create_database_from_config(config)
+    manager = PartitionManager(
+        db.engine,
+        interval=args.interval or config.partition_interval
+    )
+
+    if not manager.is_partitioned():
+        print("ERROR: gex_table is not partitioned")
+        print("Run scripts/migrate_to_partitioned_gex_table.py first")
+        return False
+
+    if args.ensure:
+        ahead = args.ahead if args.ahead is not None else config.partitions_ahead
+        created = manager.ensure_partitions(ahead=ahead)
+        print(f"Created {len(created)} partition(s)")
+        for name in created:
+            print(f"  {name}")
+
+    if args.retain_days is not None:
+        detached = manager.apply_retention(
+            args.retain_days,
+            archive_schema=args.archive_schema,
+            drop=args.drop
+        )
+        print(f"Detached {len(detached)} partition(s) older than {args.retain_days} days")
+        for name in detached:
+            print(f"  {name}")
+
+    if args.list or not (args.ensure or args.retain_days is not None):
+        partitions = manager.list_partitions()
+        print(f"\ngex_table partitions ({len(partitions)}):")
+        for _, row in partitions.iterrows():
+            if row['is_default']:
+                print(f"  {row['partition_name']:<28} DEFAULT")
+            else:
+                print(f"  {row['partition_name']:<28} {row['range_start'].date()} to {row['range_end'].date()}")
+
+    db.close()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
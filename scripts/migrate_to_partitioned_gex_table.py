@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Migrate gex_table to a Time-Partitioned Table
+
+Converts the existing heap gex_table into a table range partitioned on
+"greeks.updated_at":
+
+1. Rename gex_table to gex_table_legacy
+2. Create the partitioned gex_table with the same columns and primary key,
+   plus a DEFAULT partition
+3. Create partitions covering the legacy data and the next few intervals
+4. Copy data one partition at a time
+5. Verify row counts
+
+The redundant single-column indexes and the composite index duplicating the
+primary key are not recreated. gex_table_legacy is kept until you drop it.
+"""
+
+import sys
+import os
+import argparse
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.database import create_database_from_config
+from src.partition_manager import PartitionManager
+
+TABLE_NAME = 'gex_table'
+LEGACY_TABLE = 'gex_table_legacy'
+PK_COLUMNS = '"greeks.updated_at", expiration_date, option_type, strike'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate gex_table to range partitions')
+    parser.add_argument('--interval', choices=['daily', 'monthly'], default=None,
+                        help='Partition interval (default: GEX_PARTITION_INTERVAL)')
+    args = parser.parse_args()
+
+    load_dotenv()
+    config = Config()
+
+    print("=" * 80)
+    print("MIGRATE GEX_TABLE TO TIME PARTITIONS")
+    print("=" * 80)
+    print(f"\nDatabase Type: {config.database_type}\n")
+
+    if config.database_type != 'postgresql':
+        print("ERROR: Only PostgreSQL is supported")
+        return False
+
+    db = create_database_from_config(config)
+    engine = db.engine
+    manager = PartitionManager(engine, table_name=TABLE_NAME,
+                               interval=args.interval or config.partition_interval)
+
+    if manager.is_partitioned():
+        print("gex_table is already partitioned - nothing to do")
+        return True
+
+    print("1. Renaming gex_table to gex_table_legacy...")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {TABLE_NAME} RENAME TO {LEGACY_TABLE}"))
+        # Free the primary key name for the new table
+        pk_name = conn.execute(text("""
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = CAST(:table AS regclass) AND contype = 'p'
+        """), {'table': LEGACY_TABLE}).scalar()
+        if pk_name:
+            conn.execute(text(f"ALTER TABLE {LEGACY_TABLE} RENAME CONSTRAINT {pk_name} TO {LEGACY_TABLE}_pkey"))
+    print("   [OK] Renamed")
+
+    print(f"\n2. Creating partitioned gex_table ({manager.interval} partitions)...")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            CREATE TABLE {TABLE_NAME} (LIKE {LEGACY_TABLE} INCLUDING DEFAULTS INCLUDING COMMENTS)
+            PARTITION BY RANGE ("greeks.updated_at")
+        """))
+        conn.execute(text(f"ALTER TABLE {TABLE_NAME} ADD PRIMARY KEY ({PK_COLUMNS})"))
+        conn.execute(text(f"CREATE TABLE {TABLE_NAME}_default PARTITION OF {TABLE_NAME} DEFAULT"))
+    print("   [OK] Created")
+
+    print("\n3. Creating partitions...")
+
+    with engine.connect() as conn:
+        first_ts, last_ts, legacy_count = conn.execute(text(f"""
+            SELECT MIN("greeks.updated_at"), MAX("greeks.updated_at"), COUNT(*) FROM {LEGACY_TABLE}
+        """)).fetchone()
+
+    created = []
+    if first_ts is not None:
+        created.extend(manager.ensure_partitions_between(first_ts.date(), last_ts.date()))
+    created.extend(manager.ensure_partitions(ahead=config.partitions_ahead))
+    print(f"   [OK] Created {len(created)} partitions")
+
+    print(f"\n4. Copying {legacy_count:,} rows...")
+
+    partitions = manager.list_partitions()
+    partitions = partitions[~partitions['is_default']].sort_values('range_start')
+    for _, partition in partitions.iterrows():
+        with engine.begin() as conn:
+            result = conn.execute(text(f"""
+                INSERT INTO {TABLE_NAME}
+                SELECT * FROM {LEGACY_TABLE}
+                WHERE "greeks.updated_at" >= :range_start AND "greeks.updated_at" < :range_end
+            """), {'range_start': partition['range_start'], 'range_end': partition['range_end']})
+        if result.rowcount:
+            print(f"   {partition['partition_name']}: {result.rowcount:,} rows")
+
+    print("\n5. Verifying migration...")
+
+    with engine.connect() as conn:
+        new_count = conn.execute(text(f"SELECT COUNT(*) FROM {TABLE_NAME}")).scalar()
+
+    if new_count != legacy_count:
+        print(f"   [ERROR] Row count mismatch: legacy {legacy_count:,}, partitioned {new_count:,}")
+        print(f"   {LEGACY_TABLE} has been kept; investigate before dropping it")
+        return False
+
+    print(f"   [OK] {new_count:,} rows in partitioned gex_table")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"GRANT ALL PRIVILEGES ON TABLE {TABLE_NAME} TO {config.postgres_user}"))
+
+    print()
+    print("=" * 80)
+    print("[SUCCESS] GEX_TABLE IS NOW PARTITIONED")
+    print("=" * 80)
+    print()
+    print("Next steps:")
+    print("  1. Restart collector: docker compose restart scheduler")
+    print("  2. Check partitions: python scripts/manage_partitions.py --list")
+    print(f"  3. Once verified, drop the old table: DROP TABLE {LEGACY_TABLE};")
+    print()
+
+    db.close()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -10,7 +10,6 @@ import sys
 import os
 import argparse
 from datetime import datetime
-from io import StringIO
 import pandas as pd
 from dotenv import load_dotenv
 import psycopg2
@@ -180,46 +179,7 @@ def migrate_data_chunked(sqlite_conn, postgres_conn, total_rows):
         # Write chunk to PostgreSQL using COPY to temp table then INSERT with conflict handling
         print(f"      Writing to PostgreSQL...", end=' ')
         try:
-            # Convert boolean columns to proper format for PostgreSQL
-            if 'has_previous_data' in chunk_df.columns:
-                chunk_df['has_previous_data'] = chunk_df['has_previous_data'].map({1.0: 't', 0.0: 'f', 1: 't', 0: 'f', True: 't', False: 'f'})
-
-            # Convert DataFrame to CSV in memory
-            buffer = StringIO()
-            chunk_df.to_csv(buffer, index=False, header=False, sep='\t', na_rep='\\N')
-            buffer.seek(0)
-
-            # Get raw psycopg2 connection
-            conn = postgres_conn.engine.raw_connection()
-            try:
-                cursor = conn.cursor()
-
-                # Create temporary table for this chunk
-                temp_table = f"{TABLE_NAME}_temp_{chunk_num}"
-                col_list = ', '.join([f'"{col}"' for col in chunk_df.columns])
-                cursor.execute(f"CREATE TEMP TABLE {temp_table} (LIKE {TABLE_NAME} INCLUDING DEFAULTS)")
-
-                # COPY to temp table (fast)
-                cursor.copy_from(
-                    buffer,
-                    temp_table,
-                    sep='\t',
-                    null='\\N',
-                    columns=list(chunk_df.columns)
-                )
-
-                # INSERT from temp to real table with conflict handling (skip duplicates)
-                cursor.execute(f"""
-                    INSERT INTO {TABLE_NAME} ({col_list})
-                    SELECT {col_list} FROM {temp_table}
-                    ON CONFLICT ("greeks.updated_at", expiration_date, option_type, strike) DO NOTHING
-                """)
-
-                rows_inserted = cursor.rowcount
-                cursor.execute(f"DROP TABLE {temp_table}")
-                conn.commit()
-            finally:
-                conn.close()
+            rows_inserted = postgres_conn.bulk_upsert(chunk_df, TABLE_NAME, conflict_columns=pk_cols)
 
             print(f"[OK] ({rows_inserted:,} inserted, {len(chunk_df) - rows_inserted:,} skipped as duplicates)")
             total_migrated += rows_inserted
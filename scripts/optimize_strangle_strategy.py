@@ -10,24 +10,224 @@ import pandas as pd
 import numpy as np
 from dotenv import load_dotenv
 import os
+import io
+import shutil
+import tempfile
+import contextlib
 import json
 from itertools import product
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
 from backtest_strangle_strategy import (
     StrangleBacktester, StrikeSelectionMethod
 )
+from src.backtesting.result_cache import ResultCache
+from src.backtesting.snapshot_store import SnapshotStore
 
 load_dotenv()
 
+# Per-process state for pool workers (set by _init_worker)
+_worker_state: Dict = {}
+
+
+def _init_worker(store_path: str, snapshot_times: Dict, preloaded_range: Tuple[str, str]):
+    """Open the shared snapshot store read-only (memory-mapped) in a pool worker"""
+    _worker_state['store'] = SnapshotStore.open(store_path, mmap=True)
+    _worker_state['snapshot_times'] = snapshot_times
+    _worker_state['preloaded_range'] = preloaded_range
+
+
+def _run_config(config: Dict, start_date: str, end_date: str) -> pd.DataFrame:
+    """Run one backtest configuration against the worker's snapshot store"""
+    backtester = StrangleBacktester(
+        None,
+        store=_worker_state['store'],
+        snapshot_times=_worker_state['snapshot_times'],
+        preloaded_range=_worker_state['preloaded_range']
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = backtester.backtest(
+            start_date=start_date,
+            end_date=end_date,
+            strike_method=config['method'],
+            strike_params=config['params'],
+            exit_strategy=config['exit_strategy'],
+            entry_hour=config['entry_hour'],
+            exit_hour=config['exit_hour']
+        )
+    return results
+
+
+def _config(label: str, method=StrikeSelectionMethod.GEX_WALLS, params: Optional[Dict] = None,
+            exit_strategy: str = 'technical', entry_hour: int = 15, exit_hour: int = 10) -> Dict:
+    return {
+        'label': label,
+        'method': method,
+        'params': params or {},
+        'exit_strategy': exit_strategy,
+        'entry_hour': entry_hour,
+        'exit_hour': exit_hour
+    }
+
 
 class StrategyOptimizer:
     """Optimize strangle strategy parameters"""
 
-    def __init__(self, db_connection):
+    def __init__(self, db_connection, workers: Optional[int] = None,
+                 cache: Optional[ResultCache] = None):
+        """
+        Initialize optimizer
+
+        Args:
+            db_connection: PostgreSQL database connection
+            workers: Backtests run in parallel (default: CPU count)
+            cache: Reuse results of configurations already run over the
+                same data, and store new ones
+        """
         self.db = db_connection
         self.backtester = StrangleBacktester(db_connection)
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
         self.optimization_results = []
 
+    def strike_selection_configs(self) -> List[Dict]:
+        """Strike selection methods to compare"""
+        return [
+            _config('GEX Walls (Call/Put Walls)', StrikeSelectionMethod.GEX_WALLS),
+            _config('Zero GEX +/- 1.0%', StrikeSelectionMethod.ZERO_GEX_OFFSET,
+                    {'call_offset_pct': 1.0, 'put_offset_pct': 1.0}),
+            _config('Zero GEX +/- 1.5%', StrikeSelectionMethod.ZERO_GEX_OFFSET,
+                    {'call_offset_pct': 1.5, 'put_offset_pct': 1.5}),
+            _config('Zero GEX +/- 2.0%', StrikeSelectionMethod.ZERO_GEX_OFFSET,
+                    {'call_offset_pct': 2.0, 'put_offset_pct': 2.0}),
+            _config('ATM +/- 1.5%', StrikeSelectionMethod.ATM_OFFSET, {'offset_pct': 1.5}),
+            _config('ATM +/- 2.0%', StrikeSelectionMethod.ATM_OFFSET, {'offset_pct': 2.0}),
+            _config('ATM +/- 2.5%', StrikeSelectionMethod.ATM_OFFSET, {'offset_pct': 2.5}),
+            _config('0.25 Delta', StrikeSelectionMethod.DELTA_BASED, {'target_delta': 0.25}),
+            _config('0.30 Delta', StrikeSelectionMethod.DELTA_BASED, {'target_delta': 0.30}),
+        ]
+
+    def exit_strategy_configs(self) -> List[Dict]:
+        """Exit strategies to compare"""
+        return [
+            _config(strategy, exit_strategy=strategy)
+            for strategy in ['technical', 'profit_target', 'stop_loss']
+        ]
+
+    def entry_time_configs(self) -> List[Dict]:
+        """Entry hours to compare (2pm, 3pm, 4pm ET)"""
+        return [_config(f"{hour}:00 ET", entry_hour=hour) for hour in [14, 15, 16]]
+
+    def run_configs(self, configs: List[Dict], start_date: str,
+                    end_date: str) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Backtest configurations in parallel over one shared data load
+
+        The snapshots every configuration needs are loaded once, written to
+        a temporary columnar store and memory-mapped read-only by each
+        worker process. Results are yielded as backtests complete;
+        configurations found in the result cache are yielded first without
+        loading any snapshots for them.
+
+        Args:
+            configs: Backtest configurations
+            start_date: Start date for backtesting
+            end_date: End date for backtesting
+
+        Yields:
+            (config, performance report) in completion order
+        """
+        pending = configs
+        cache_keys = {}
+        if self.cache is not None:
+            last_date = (pd.to_datetime(end_date) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+            fingerprints = self.backtester.day_fingerprints(start_date, last_date)
+
+            pending = []
+            for config in configs:
+                params = StrangleBacktester.run_params(
+                    config['method'], config['exit_strategy'], config['params'],
+                    config['entry_hour'], config['exit_hour'])
+                key = self.backtester.cache_key(start_date, end_date, params, fingerprints)
+                results = self.cache.get(key)
+                if results is None:
+                    cache_keys[id(config)] = key
+                    pending.append(config)
+                else:
+                    yield config, self.backtester.generate_performance_report(results)
+
+        if not pending:
+            return
+
+        hours = {config['entry_hour'] for config in pending} | {config['exit_hour'] for config in pending}
+        loader = self.backtester
+        store = loader.preload(start_date, end_date, hours)
+
+        store_path = tempfile.mkdtemp(prefix='strangle_snapshots_')
+        try:
+            store.save(store_path)
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(pending)),
+                initializer=_init_worker,
+                initargs=(store_path, loader.snapshot_times, loader.preloaded_range)
+            ) as executor:
+                futures = {executor.submit(_run_config, config, start_date, end_date): config
+                           for config in pending}
+                for future in as_completed(futures):
+                    config = futures[future]
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        yield config, {'error': str(e)}
+                        continue
+
+                    if id(config) in cache_keys:
+                        self.cache.put(cache_keys[id(config)], results)
+                    yield config, self.backtester.generate_performance_report(results)
+        finally:
+            shutil.rmtree(store_path, ignore_errors=True)
+
+    def run_grid(self, grids: Dict[str, Tuple[str, List[Dict]]], start_date: str,
+                 end_date: str) -> Dict[str, pd.DataFrame]:
+        """
+        Run several grids of configurations in one pool
+
+        Args:
+            grids: Grid name -> (label column, configurations)
+            start_date: Start date for backtesting
+            end_date: End date for backtesting
+
+        Returns:
+            Grid name -> DataFrame with one row per successful configuration,
+            in configuration order
+        """
+        configs = [config for _, grid_configs in grids.values() for config in grid_configs]
+
+        performances = {}
+        for config, performance in self.run_configs(configs, start_date, end_date):
+            print(f"\nCompleted: {config['label']}")
+            print("-" * 40)
+
+            if 'error' in performance:
+                print(f"  Error: {performance['error']}")
+                continue
+
+            performances[id(config)] = performance
+            print(f"  Total Trades: {performance['total_trades']}")
+            print(f"  Win Rate: {performance['win_rate']:.1%}")
+            print(f"  Total P&L: ${performance['total_pnl']:.2f}")
+            print(f"  Avg P&L%: {performance['avg_pnl_pct']:.1f}%")
+            print(f"  Profit Factor: {performance['profit_factor']:.2f}x")
+
+        return {
+            name: pd.DataFrame([
+                {label_column: config['label'], **performances[id(config)]}
+                for config in grid_configs if id(config) in performances
+            ])
+            for name, (label_column, grid_configs) in grids.items()
+        }
+
     def optimize_strike_selection(self, start_date: str, end_date: str) -> pd.DataFrame:
         """
         Test different strike selection methods
@@ -43,91 +243,8 @@ class StrategyOptimizer:
         print("OPTIMIZING STRIKE SELECTION METHODS")
         print("="*80 + "\n")
 
-        methods_to_test = [
-            {
-                'method': StrikeSelectionMethod.GEX_WALLS,
-                'params': {},
-                'label': 'GEX Walls (Call/Put Walls)'
-            },
-            {
-                'method': StrikeSelectionMethod.ZERO_GEX_OFFSET,
-                'params': {'call_offset_pct': 1.0, 'put_offset_pct': 1.0},
-                'label': 'Zero GEX +/- 1.0%'
-            },
-            {
-                'method': StrikeSelectionMethod.ZERO_GEX_OFFSET,
-                'params': {'call_offset_pct': 1.5, 'put_offset_pct': 1.5},
-                'label': 'Zero GEX +/- 1.5%'
-            },
-            {
-                'method': StrikeSelectionMethod.ZERO_GEX_OFFSET,
-                'params': {'call_offset_pct': 2.0, 'put_offset_pct': 2.0},
-                'label': 'Zero GEX +/- 2.0%'
-            },
-            {
-                'method': StrikeSelectionMethod.ATM_OFFSET,
-                'params': {'offset_pct': 1.5},
-                'label': 'ATM +/- 1.5%'
-            },
-            {
-                'method': StrikeSelectionMethod.ATM_OFFSET,
-                'params': {'offset_pct': 2.0},
-                'label': 'ATM +/- 2.0%'
-            },
-            {
-                'method': StrikeSelectionMethod.ATM_OFFSET,
-                'params': {'offset_pct': 2.5},
-                'label': 'ATM +/- 2.5%'
-            },
-            {
-                'method': StrikeSelectionMethod.DELTA_BASED,
-                'params': {'target_delta': 0.25},
-                'label': '0.25 Delta'
-            },
-            {
-                'method': StrikeSelectionMethod.DELTA_BASED,
-                'params': {'target_delta': 0.30},
-                'label': '0.30 Delta'
-            }
-        ]
-
-        results = []
-
-        for config in methods_to_test:
-            print(f"\nTesting: {config['label']}")
-            print("-" * 40)
-
-            try:
-                # Run backtest
-                backtest_results = self.backtester.backtest(
-                    start_date=start_date,
-                    end_date=end_date,
-                    strike_method=config['method'],
-                    strike_params=config['params'],
-                    exit_strategy='technical',
-                    entry_hour=15,
-                    exit_hour=10
-                )
-
-                # Calculate performance
-                performance = self.backtester.generate_performance_report(backtest_results)
-
-                if 'error' not in performance:
-                    results.append({
-                        'method': config['label'],
-                        **performance
-                    })
-
-                    print(f"  Total Trades: {performance['total_trades']}")
-                    print(f"  Win Rate: {performance['win_rate']:.1%}")
-                    print(f"  Total P&L: ${performance['total_pnl']:.2f}")
-                    print(f"  Avg P&L%: {performance['avg_pnl_pct']:.1f}%")
-                    print(f"  Profit Factor: {performance['profit_factor']:.2f}x")
-
-            except Exception as e:
-                print(f"  Error: {e}")
-
-        return pd.DataFrame(results)
+        grids = {'strike_selection': ('method', self.strike_selection_configs())}
+        return self.run_grid(grids, start_date, end_date)['strike_selection']
 
     def optimize_exit_strategy(self, start_date: str, end_date: str) -> pd.DataFrame:
         """
@@ -144,47 +261,8 @@ class StrategyOptimizer:
         print("OPTIMIZING EXIT STRATEGIES")
         print("="*80 + "\n")
 
-        exit_strategies = [
-            'technical',
-            'profit_target',
-            'stop_loss'
-        ]
-
-        results = []
-
-        for strategy in exit_strategies:
-            print(f"\nTesting Exit Strategy: {strategy}")
-            print("-" * 40)
-
-            try:
-                # Run backtest
-                backtest_results = self.backtester.backtest(
-                    start_date=start_date,
-                    end_date=end_date,
-                    strike_method=StrikeSelectionMethod.GEX_WALLS,
-                    exit_strategy=strategy,
-                    entry_hour=15,
-                    exit_hour=10
-                )
-
-                # Calculate performance
-                performance = self.backtester.generate_performance_report(backtest_results)
-
-                if 'error' not in performance:
-                    results.append({
-                        'exit_strategy': strategy,
-                        **performance
-                    })
-
-                    print(f"  Total Trades: {performance['total_trades']}")
-                    print(f"  Win Rate: {performance['win_rate']:.1%}")
-                    print(f"  Total P&L: ${performance['total_pnl']:.2f}")
-                    print(f"  Avg P&L%: {performance['avg_pnl_pct']:.1f}%")
-
-            except Exception as e:
-                print(f"  Error: {e}")
-
-        return pd.DataFrame(results)
+        grids = {'exit_strategy': ('exit_strategy', self.exit_strategy_configs())}
+        return self.run_grid(grids, start_date, end_date)['exit_strategy']
 
     def optimize_entry_time(self, start_date: str, end_date: str) -> pd.DataFrame:
         """
@@ -201,42 +279,8 @@ class StrategyOptimizer:
         print("OPTIMIZING ENTRY TIME")
         print("="*80 + "\n")
 
-        entry_hours = [14, 15, 16]  # 2pm, 3pm, 4pm ET
-
-        results = []
-
-        for hour in entry_hours:
-            print(f"\nTesting Entry Time: {hour}:00 ET")
-            print("-" * 40)
-
-            try:
-                # Run backtest
-                backtest_results = self.backtester.backtest(
-                    start_date=start_date,
-                    end_date=end_date,
-                    strike_method=StrikeSelectionMethod.GEX_WALLS,
-                    exit_strategy='technical',
-                    entry_hour=hour,
-                    exit_hour=10
-                )
-
-                # Calculate performance
-                performance = self.backtester.generate_performance_report(backtest_results)
-
-                if 'error' not in performance:
-                    results.append({
-                        'entry_hour': f"{hour}:00 ET",
-                        **performance
-                    })
-
-                    print(f"  Total Trades: {performance['total_trades']}")
-                    print(f"  Win Rate: {performance['win_rate']:.1%}")
-                    print(f"  Total P&L: ${performance['total_pnl']:.2f}")
-
-            except Exception as e:
-                print(f"  Error: {e}")
-
-        return pd.DataFrame(results)
+        grids = {'entry_time': ('entry_hour', self.entry_time_configs())}
+        return self.run_grid(grids, start_date, end_date)['entry_time']
 
     def run_full_optimization(self, start_date: str, end_date: str) -> Dict:
         """
@@ -254,19 +298,16 @@ class StrategyOptimizer:
         print(f"Date Range: {start_date} to {end_date}")
         print("="*80)
 
-        results = {}
-
-        # 1. Optimize strike selection
-        strike_results = self.optimize_strike_selection(start_date, end_date)
-        results['strike_selection'] = strike_results
-
-        # 2. Optimize exit strategy
-        exit_results = self.optimize_exit_strategy(start_date, end_date)
-        results['exit_strategy'] = exit_results
+        # Every grid shares one data load and one worker pool
+        results = self.run_grid({
+            'strike_selection': ('method', self.strike_selection_configs()),
+            'exit_strategy': ('exit_strategy', self.exit_strategy_configs()),
+            'entry_time': ('entry_hour', self.entry_time_configs()),
+        }, start_date, end_date)
 
-        # 3. Optimize entry time
-        entry_time_results = self.optimize_entry_time(start_date, end_date)
-        results['entry_time'] = entry_time_results
+        strike_results = results['strike_selection']
+        exit_results = results['exit_strategy']
+        entry_time_results = results['entry_time']
 
         # Find best configuration
         if not strike_results.empty:
@@ -297,7 +338,7 @@ def main():
     )
 
     # Create optimizer
-    optimizer = StrategyOptimizer(conn)
+    optimizer = StrategyOptimizer(conn, cache=ResultCache())
 
     # Run optimization
     results = optimizer.run_full_optimization(
@@ -23,6 +23,7 @@ import pandas as pd
 import numpy as np
 from dotenv import load_dotenv
 import os
+import sys
 from datetime import datetime, time
 import pytz
 import json
@@ -32,6 +33,11 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backtesting.snapshot_view import SnapshotView
+
 load_dotenv()
 
 # Set up logging
@@ -102,6 +108,7 @@ class PaperTradingEngine:
         self.active_legs: Dict[str, PaperTradeLeg] = {}
         self.closed_legs: List[PaperTradeLeg] = []
         self.leg_counter = 0
+        self._view: Optional[SnapshotView] = None
 
         # Trading parameters (from backtest)
         self.profit_target_pct = 25.0
@@ -264,26 +271,15 @@ class PaperTradingEngine:
         else:
             return "NEUTRAL"
 
-    def get_option_price(self, df: pd.DataFrame, strike: float, option_type: str) -> Optional[float]:
-        """Get option price (prioritize last traded price)"""
-        option = df[(df['strike'] == strike) & (df['option_type'] == option_type)]
-
-        if len(option) == 0:
-            return None
+    def snapshot_view(self, df: pd.DataFrame) -> SnapshotView:
+        """Lookup index for a snapshot, built once and reused while df is unchanged"""
+        if self._view is None or self._view.frame is not df:
+            self._view = SnapshotView(df)
+        return self._view
 
-        # Prioritize last traded price
-        last_price = option['option_price'].iloc[0]
-        if pd.notna(last_price) and last_price > 0:
-            return last_price
-
-        # Fallback to mid price
-        bid = option['bid'].iloc[0]
-        ask = option['ask'].iloc[0]
-
-        if pd.notna(bid) and pd.notna(ask) and bid > 0 and ask > 0:
-            return (bid + ask) / 2
-
-        return None
+    def get_option_price(self, df: pd.DataFrame, strike: float, option_type: str) -> Optional[float]:
+        """Get option price (prioritize last traded price, else bid/ask mid)"""
+        return self.snapshot_view(df).price(strike, option_type)
 
     def should_enter_call(self, df: pd.DataFrame, current_price: float,
                          call_wall: Optional[float], gex_signal: str,
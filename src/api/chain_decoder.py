@@ -0,0 +1,175 @@
+"""
+Option Chain Decoder
+
+Decodes Tradier option chain responses straight into column arrays instead
+of going through response.json() and pd.json_normalize. Only the configured
+column set is materialised and greeks are flattened to 'greeks.*' columns
+as they are read. orjson is used for parsing when it is installed.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger('gex_collector')
+
+# Every field returned by the chains endpoint (with greeks flattened)
+ALL_CHAIN_COLUMNS = [
+    'symbol', 'description', 'exch', 'type', 'last', 'change', 'volume',
+    'open', 'high', 'low', 'close', 'bid', 'ask', 'underlying', 'strike',
+    'change_percentage', 'average_volume', 'last_volume', 'trade_date',
+    'prevclose', 'week_52_high', 'week_52_low', 'bidsize', 'bidexch',
+    'bid_date', 'asksize', 'askexch', 'ask_date', 'open_interest',
+    'contract_size', 'expiration_date', 'expiration_type', 'option_type',
+    'root_symbol', 'greeks.delta', 'greeks.gamma', 'greeks.theta',
+    'greeks.vega', 'greeks.rho', 'greeks.phi', 'greeks.bid_iv',
+    'greeks.mid_iv', 'greeks.ask_iv', 'greeks.smv_vol', 'greeks.updated_at'
+]
+
+# Fields never read by GEX, greek difference or signal calculations
+UNUSED_CHAIN_COLUMNS = [
+    'description', 'exch', 'type', 'week_52_high', 'week_52_low',
+    'bidexch', 'askexch', 'average_volume', 'last_volume'
+]
+
+DEFAULT_CHAIN_COLUMNS = [c for c in ALL_CHAIN_COLUMNS if c not in UNUSED_CHAIN_COLUMNS]
+
+# Numeric fields decoded directly to float64 arrays (None -> NaN)
+FLOAT_COLUMNS = {
+    'last', 'change', 'bid', 'ask', 'strike', 'change_percentage', 'prevclose',
+    'week_52_high', 'week_52_low', 'greeks.delta', 'greeks.gamma', 'greeks.theta',
+    'greeks.vega', 'greeks.rho', 'greeks.phi', 'greeks.bid_iv', 'greeks.mid_iv',
+    'greeks.ask_iv', 'greeks.smv_vol'
+}
+
+# Epoch millisecond timestamps
+MS_DATE_COLUMNS = ['trade_date', 'bid_date', 'ask_date']
+
+GREEKS_PREFIX = 'greeks.'
+
+
+def parse_json(content: bytes):
+    """Parse a JSON response body, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def resolve_chain_columns(spec: Optional[str]) -> Optional[List[str]]:
+    """
+    Resolve a CHAIN_COLUMNS setting to a column list
+
+    Args:
+        spec: 'default' (or blank), 'all', or a comma-separated column list
+
+    Returns:
+        List of columns to keep, or None to keep every field
+    """
+    spec = (spec or '').strip()
+    if spec == '' or spec.lower() == 'default':
+        return list(DEFAULT_CHAIN_COLUMNS)
+    if spec.lower() == 'all':
+        return None
+
+    columns = [c.strip() for c in spec.split(',') if c.strip()]
+    # Fields the collector itself depends on
+    for required in ('strike', 'option_type', 'expiration_date', 'open_interest',
+                     'greeks.gamma', 'greeks.updated_at'):
+        if required not in columns:
+            columns.append(required)
+    return columns
+
+
+class ChainDecoder:
+    """Builds chain DataFrames from the options.option list of a chains response"""
+
+    def __init__(self, columns: Optional[List[str]] = DEFAULT_CHAIN_COLUMNS):
+        """
+        Initialize decoder
+
+        Args:
+            columns: Columns to keep ('greeks.*' for greeks), or None for every field
+        """
+        self.columns = list(columns) if columns is not None else None
+
+    def decode(self, content: bytes) -> pd.DataFrame:
+        """
+        Decode a raw chains response body
+
+        Args:
+            content: Response body bytes
+
+        Returns:
+            DataFrame with one row per contract (empty if no contracts)
+        """
+        json_response = parse_json(content)
+        chains = json_response.get('options', {}) if json_response else {}
+        chains = chains if chains is not None else {}
+        data = chains.get('option', [])
+        data = data if isinstance(data, list) else [data]
+        return self.decode_options(data)
+
+    def decode_options(self, options: List[Dict]) -> pd.DataFrame:
+        """
+        Build a DataFrame from a list of option records
+
+        Args:
+            options: Option dicts as returned under options.option
+
+        Returns:
+            DataFrame with the projected columns
+        """
+        if len(options) == 0:
+            return self.empty_frame()
+
+        columns = self.columns if self.columns is not None else self._discover_columns(options)
+        greeks = [option.get('greeks') or {} for option in options]
+
+        data = {}
+        for column in columns:
+            if column.startswith(GREEKS_PREFIX):
+                field = column[len(GREEKS_PREFIX):]
+                values = [g.get(field) for g in greeks]
+            else:
+                values = [option.get(column) for option in options]
+
+            if column in FLOAT_COLUMNS:
+                data[column] = np.array(values, dtype=float)
+            else:
+                data[column] = values
+
+        df = pd.DataFrame(data)
+
+        for column in MS_DATE_COLUMNS:
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column], unit='ms')
+        if 'greeks.updated_at' in df.columns:
+            df['greeks.updated_at'] = pd.to_datetime(df['greeks.updated_at'])
+
+        return df
+
+    def empty_frame(self) -> pd.DataFrame:
+        """Empty DataFrame with the projected columns"""
+        return pd.DataFrame(columns=self.columns if self.columns is not None else ALL_CHAIN_COLUMNS)
+
+    @staticmethod
+    def _discover_columns(options: List[Dict]) -> List[str]:
+        """Every field present in the records, in response order, greeks flattened"""
+        columns = {}
+        for option in options:
+            for key, value in option.items():
+                if key == 'greeks':
+                    for field in (value or {}):
+                        columns[GREEKS_PREFIX + field] = None
+                else:
+                    columns[key] = None
+        return list(columns)
@@ -0,0 +1,136 @@
+"""
+Option Expiration Calendar
+
+Loads the listed expirations for each underlying from Tradier's
+options/expirations endpoint and caches them for the trading day, so the
+collector only requests chains for dates that actually have contracts.
+"""
+
+import logging
+from datetime import datetime, date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .tradier_api import TradierAPI
+
+logger = logging.getLogger('gex_collector')
+
+# User-facing names mapped to Tradier's expiration_type values
+EXPIRATION_TYPE_ALIASES = {
+    'weekly': 'weeklys',
+    'weeklies': 'weeklys',
+    'weeklys': 'weeklys',
+    'monthly': 'standard',
+    'monthlies': 'standard',
+    'standard': 'standard',
+    'quarterly': 'quarterlys',
+    'quarterlies': 'quarterlys',
+    'quarterlys': 'quarterlys',
+    'eom': 'eom',
+    'end_of_month': 'eom',
+}
+
+
+def normalize_expiration_types(types: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """
+    Map expiration type names (weeklies, monthlies, quarterlies, eom) to Tradier values
+
+    Args:
+        types: Iterable of type names, or None for all types
+
+    Returns:
+        List of Tradier expiration_type values, or None if no filter
+    """
+    if not types:
+        return None
+
+    normalized = []
+    for name in types:
+        key = name.strip().lower()
+        if not key:
+            continue
+        if key not in EXPIRATION_TYPE_ALIASES:
+            raise ValueError(f"Unknown expiration type: {name}. "
+                             f"Use one of: weekly, monthly, quarterly, eom")
+        normalized.append(EXPIRATION_TYPE_ALIASES[key])
+
+    return sorted(set(normalized)) or None
+
+
+class ExpirationCalendar:
+    """Per-underlying expiration list cached for the current trading day"""
+
+    def __init__(self, api: TradierAPI, timezone):
+        """
+        Initialize calendar
+
+        Args:
+            api: Tradier API client
+            timezone: Market timezone used to decide when the cache expires
+        """
+        self.api = api
+        self.timezone = timezone
+        self._cache: Dict[str, Tuple[date, pd.DataFrame]] = {}
+
+    def _today(self) -> date:
+        return datetime.now(self.timezone).date()
+
+    def load(self, symbol: str, refresh: bool = False) -> pd.DataFrame:
+        """
+        Get all listed expirations for a symbol, using the daily cache
+
+        Args:
+            symbol: Underlying symbol
+            refresh: Ignore the cache and reload from the API
+
+        Returns:
+            DataFrame with 'date' and 'expiration_type' columns
+        """
+        symbol = symbol.upper()
+        today = self._today()
+        cached = self._cache.get(symbol)
+
+        if not refresh and cached is not None and cached[0] == today:
+            return cached[1]
+
+        expirations = self.api.get_expirations(symbol)
+
+        if expirations.empty:
+            logger.warning(f"No expirations returned for {symbol}")
+            # Keep serving yesterday's list rather than nothing
+            return cached[1] if cached is not None else expirations
+
+        self._cache[symbol] = (today, expirations)
+        return expirations
+
+    def get_expirations(self, symbol: str, min_dte: int = 0, max_dte: Optional[int] = 30,
+                        types: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Get expiration dates to collect for a symbol
+
+        Args:
+            symbol: Underlying symbol
+            min_dte: Minimum days to expiration (inclusive)
+            max_dte: Maximum days to expiration (inclusive, None = no limit)
+            types: Expiration types to keep (weekly, monthly, quarterly, eom; None = all)
+
+        Returns:
+            Sorted list of expiration dates (YYYY-MM-DD)
+        """
+        expirations = self.load(symbol)
+        if expirations.empty:
+            return []
+
+        dates = pd.to_datetime(expirations['date'])
+        dte = (dates - pd.Timestamp(self._today())).dt.days
+
+        mask = dte >= min_dte
+        if max_dte is not None:
+            mask &= dte <= max_dte
+
+        type_filter = normalize_expiration_types(types)
+        if type_filter is not None:
+            mask &= expirations['expiration_type'].isin(type_filter)
+
+        return expirations.loc[mask, 'date'].tolist()
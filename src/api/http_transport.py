@@ -0,0 +1,255 @@
+"""
+Shared HTTP Transport for Tradier Clients
+
+Provides a single pooled, keep-alive requests.Session used by every Tradier
+client in the process (TradierAPI, the tradier_funcs helpers and the paper
+trading wrapper). Requests go through the rate limiter of their endpoint
+family (Tradier limits market data, trading and account endpoints
+separately), are retried with jittered exponential backoff, and record
+per-endpoint latency and retry histograms that can be read at runtime via
+get_metrics().
+"""
+
+import os
+import random
+import threading
+import time
+import logging
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger('gex_collector')
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, float('inf')]
+
+# Tradier requests per minute by endpoint family
+RATE_LIMITS = {
+    'market_data': 120,
+    'trading': 60,
+    'standard': 120,
+}
+
+
+def endpoint_family(url: str) -> str:
+    """
+    Tradier rate limit family of a request URL
+
+    Returns:
+        'market_data' for /markets/ endpoints, 'trading' for order
+        endpoints, 'standard' for everything else (user, accounts)
+    """
+    parts = urlparse(url).path.strip('/').split('/')
+    if 'markets' in parts:
+        return 'market_data'
+    if 'orders' in parts:
+        return 'trading'
+    return 'standard'
+
+
+class EndpointMetrics:
+    """Latency and retry statistics for a single endpoint"""
+
+    def __init__(self, max_samples: int = 1000):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency_ms = 0.0
+        self.latency_histogram = [0] * len(LATENCY_BUCKETS_MS)
+        # Retries needed per request: index 0 = first attempt succeeded
+        self.retry_histogram: Dict[int, int] = {}
+        self.recent_latencies_ms = deque(maxlen=max_samples)
+
+    def record_attempt(self, latency_ms: float, error: bool):
+        """Record a single HTTP attempt"""
+        self.total_latency_ms += latency_ms
+        self.recent_latencies_ms.append(latency_ms)
+        for i, upper in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= upper:
+                self.latency_histogram[i] += 1
+                break
+        if error:
+            self.errors += 1
+
+    def record_request(self, retries: int):
+        """Record a completed logical request and how many retries it took"""
+        self.requests += 1
+        self.retries += retries
+        self.retry_histogram[retries] = self.retry_histogram.get(retries, 0) + 1
+
+    def snapshot(self) -> Dict:
+        """Return a point-in-time copy of the statistics"""
+        attempts = sum(self.latency_histogram)
+        recent = np.array(self.recent_latencies_ms) if self.recent_latencies_ms else None
+        return {
+            'requests': self.requests,
+            'attempts': attempts,
+            'errors': self.errors,
+            'retries': self.retries,
+            'avg_latency_ms': self.total_latency_ms / attempts if attempts else None,
+            'p50_latency_ms': float(np.percentile(recent, 50)) if recent is not None else None,
+            'p95_latency_ms': float(np.percentile(recent, 95)) if recent is not None else None,
+            'latency_histogram': {
+                (f'<={upper:g}ms' if upper != float('inf') else f'>{LATENCY_BUCKETS_MS[-2]:g}ms'): count
+                for upper, count in zip(LATENCY_BUCKETS_MS, self.latency_histogram)
+            },
+            'retry_histogram': dict(sorted(self.retry_histogram.items())),
+        }
+
+
+class HTTPTransport:
+    """Pooled keep-alive HTTP session with rate limiting, backoff and metrics"""
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 rate_limiters: Optional[Dict[str, RateLimiter]] = None):
+        """
+        Initialize transport
+
+        Args:
+            pool_size: Keep-alive connections kept per host (size to the fetch concurrency)
+            max_retries: Default number of attempts per request
+            backoff_base: Base delay (seconds) for exponential backoff
+            backoff_max: Maximum backoff delay (seconds)
+            rate_limiters: Token bucket per endpoint family (missing families
+                are created from RATE_LIMITS)
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiters: Dict[str, RateLimiter] = dict(rate_limiters or {})
+        self._limiters_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+
+        self._metrics: Dict[str, EndpointMetrics] = {}
+        self._metrics_lock = threading.Lock()
+
+    def _endpoint_metrics(self, url: str) -> EndpointMetrics:
+        """Get (or create) the metrics bucket for a URL's path"""
+        endpoint = urlparse(url).path
+        with self._metrics_lock:
+            if endpoint not in self._metrics:
+                self._metrics[endpoint] = EndpointMetrics()
+            return self._metrics[endpoint]
+
+    def rate_limiter(self, url: str) -> RateLimiter:
+        """Get (or create) the token bucket for a URL's endpoint family"""
+        family = endpoint_family(url)
+        with self._limiters_lock:
+            if family not in self.rate_limiters:
+                self.rate_limiters[family] = RateLimiter(requests_per_minute=RATE_LIMITS[family])
+            return self.rate_limiters[family]
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for the given attempt (1-based)"""
+        cap = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+    def request(self, method: str, url: str, params: Optional[dict] = None,
+                data: Optional[dict] = None, headers: Optional[dict] = None,
+                timeout: float = 30, max_retries: Optional[int] = None,
+                raise_for_status: bool = True) -> requests.Response:
+        """
+        Send an HTTP request with retries
+
+        Args:
+            method: HTTP method ('GET', 'POST', ...)
+            url: Full request URL
+            params: Query string parameters
+            data: Form body
+            headers: Per-request headers (merged with session headers)
+            timeout: Request timeout in seconds
+            max_retries: Attempts before giving up (defaults to transport setting)
+            raise_for_status: Treat HTTP error status codes as failures to retry
+
+        Returns:
+            requests.Response
+        """
+        max_retries = max_retries if max_retries is not None else self.max_retries
+        metrics = self._endpoint_metrics(url)
+        rate_limiter = self.rate_limiter(url)
+        attempts = 0
+
+        while True:
+            attempts += 1
+            rate_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, params=params, data=data,
+                                                headers=headers, timeout=timeout)
+                rate_limiter.update_from_headers(response.headers)
+                if raise_for_status:
+                    response.raise_for_status()
+                metrics.record_attempt((time.perf_counter() - start) * 1000, error=False)
+                metrics.record_request(attempts - 1)
+                return response
+            except requests.RequestException as e:
+                metrics.record_attempt((time.perf_counter() - start) * 1000, error=True)
+                logger.warning(f"Request attempt {attempts} failed: {str(e)}")
+                if attempts >= max_retries:
+                    metrics.record_request(attempts - 1)
+                    logger.error(f"Max retries ({max_retries}) exceeded for {url}")
+                    raise
+                delay = self._backoff_delay(attempts)
+                logger.info(f"Retrying in {delay:.2f} seconds...")
+                time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request"""
+        return self.request('POST', url, **kwargs)
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """
+        Get per-endpoint latency and retry statistics
+
+        Returns:
+            Dict mapping endpoint path to its statistics snapshot
+        """
+        with self._metrics_lock:
+            endpoints = dict(self._metrics)
+        return {endpoint: m.snapshot() for endpoint, m in sorted(endpoints.items())}
+
+    def reset_metrics(self):
+        """Clear all collected metrics"""
+        with self._metrics_lock:
+            self._metrics = {}
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """
+    Get the process-wide shared transport
+
+    The connection pool is sized from HTTP_POOL_SIZE, defaulting to the
+    FETCH_WORKERS concurrency level (minimum 10).
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            fetch_workers = int(os.getenv('FETCH_WORKERS', '4'))
+            pool_size = int(os.getenv('HTTP_POOL_SIZE', str(max(10, fetch_workers))))
+            _transport = HTTPTransport(pool_size=pool_size)
+        return _transport
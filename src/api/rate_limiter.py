@@ -0,0 +1,93 @@
+"""
+Tradier Rate Limiter
+
+Token bucket shared by all threads issuing requests to one family of
+Tradier endpoints (market data, trading or account). The bucket
+refills at a steady rate and is re-synchronised from the
+X-Ratelimit-Available / X-Ratelimit-Expiry headers returned by the API,
+so concurrent fetches slow down before Tradier starts rejecting them.
+"""
+
+import threading
+import time
+import logging
+from typing import Mapping, Optional
+
+logger = logging.getLogger('gex_collector')
+
+
+class RateLimiter:
+    """Thread-safe token bucket driven by Tradier rate limit headers"""
+
+    def __init__(self, requests_per_minute: int = 120, burst: Optional[int] = None):
+        """
+        Initialize rate limiter
+
+        Args:
+            requests_per_minute: Sustained request rate (Tradier market data default: 120/min)
+            burst: Maximum tokens held at once (defaults to requests_per_minute)
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else requests_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add tokens accrued since the last update"""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def acquire(self):
+        """Block until a request token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+
+            logger.debug(f"Rate limiter waiting {wait:.2f}s for a request token")
+            time.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Synchronise the bucket with Tradier's view of the rate limit window
+
+        Args:
+            headers: Response headers containing X-Ratelimit-* values
+        """
+        available = headers.get('X-Ratelimit-Available')
+        expiry = headers.get('X-Ratelimit-Expiry')
+
+        if available is None:
+            return
+
+        try:
+            available = int(available)
+        except (TypeError, ValueError):
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Never hold more tokens than the server says are left
+            self.tokens = min(self.tokens, float(available))
+
+            if available <= 0 and expiry:
+                try:
+                    reset_in = int(expiry) / 1000 - time.time()
+                except (TypeError, ValueError):
+                    return
+                if reset_in > 0:
+                    self.blocked_until = max(self.blocked_until, now + reset_in)
+                    logger.warning(f"Rate limit exhausted, pausing requests for {reset_in:.0f}s")
@@ -2,9 +2,12 @@ import requests
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor
 import time
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Dict, Tuple
 import logging
 
+from .http_transport import HTTPTransport, get_transport
+from .chain_decoder import ChainDecoder
+
 logger = logging.getLogger('gex_collector')
 
 BASE_URL = 'https://api.tradier.com/'
@@ -13,30 +16,26 @@ BASE_URL = 'https://api.tradier.com/'
 class TradierAPI:
     """Production-ready Tradier API client with error handling and logging"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: Optional[HTTPTransport] = None,
+                 decoder: Optional[ChainDecoder] = None):
         self.api_key = api_key
         self.headers = {
             'Accept': 'application/json',
             'Authorization': f'Bearer {api_key}',
         }
+        # Pooled keep-alive session and rate limiter shared by all clients
+        self.transport = transport or get_transport()
+        # Option chain response decoder (column projection)
+        self.decoder = decoder or ChainDecoder()
     
-    def _fetch_url(self, url: str, params: Optional[dict] = None, max_retries: int = 3, sleep: float = 2):
-        """Fetch URL with retry logic and error handling"""
-        attempts = 0
-        while attempts < max_retries:
-            try:
-                response = requests.get(url, params=params, headers=self.headers, timeout=30)
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
-                attempts += 1
-                logger.warning(f"Request attempt {attempts} failed: {str(e)}")
-                if attempts < max_retries:
-                    logger.info(f"Retrying in {sleep} seconds...")
-                    time.sleep(sleep)
-                else:
-                    logger.error(f"Max retries ({max_retries}) exceeded for {url}")
-                    raise
+    def _fetch_url(self, url: str, params: Optional[dict] = None, max_retries: int = 3):
+        """Fetch URL with retry logic (jittered exponential backoff) and error handling"""
+        return self.transport.get(url, params=params, headers=self.headers,
+                                  timeout=30, max_retries=max_retries)
+
+    def get_request_metrics(self) -> Dict[str, Dict]:
+        """Get per-endpoint latency and retry statistics from the shared transport"""
+        return self.transport.get_metrics()
     
     def _handle_api_response(self, response, symbol: str, data_type: str):
         """Handle API response and log rate limit information"""
@@ -229,18 +228,9 @@ class TradierAPI:
             self._handle_api_response(response, symbol, f'option chain for {expiration}')
             
             if response.status_code == 200:
-                json_response = response.json()
-                chains = json_response.get('options', {})
-                chains = chains if chains is not None else {}
-                data = chains.get('option', [])
-                data = data if isinstance(data, list) else [data]
-                
-                if len(data) > 0:
-                    df = pd.json_normalize(data)
-                    df['trade_date'] = pd.to_datetime(df['trade_date'], unit='ms')
-                    df['bid_date'] = pd.to_datetime(df['bid_date'], unit='ms')
-                    df['ask_date'] = pd.to_datetime(df['ask_date'], unit='ms')
-                    df['greeks.updated_at'] = pd.to_datetime(df['greeks.updated_at'])
+                df = self.decoder.decode(response.content)
+
+                if len(df) > 0:
                     logger.info(f"Retrieved {len(df)} option contracts for {symbol} {expiration}")
                     return df
         
@@ -248,16 +238,94 @@ class TradierAPI:
             logger.error(f"Error fetching option chain for {symbol} {expiration}: {str(e)}")
         
         # Return empty DataFrame with expected columns
-        columns = ['symbol', 'description', 'exch', 'type', 'last', 'change', 'volume', 
-                  'open', 'high', 'low', 'close', 'bid', 'ask', 'underlying', 'strike', 
-                  'change_percentage', 'average_volume', 'last_volume', 'trade_date', 
-                  'prevclose', 'week_52_high', 'week_52_low', 'bidsize', 'bidexch', 
-                  'bid_date', 'asksize', 'askexch', 'ask_date', 'open_interest', 
-                  'contract_size', 'expiration_date', 'expiration_type', 'option_type', 
-                  'root_symbol', 'greeks.delta', 'greeks.gamma', 'greeks.theta', 
-                  'greeks.vega', 'greeks.rho', 'greeks.phi', 'greeks.bid_iv', 
-                  'greeks.mid_iv', 'greeks.ask_iv', 'greeks.smv_vol', 'greeks.updated_at']
-        
+        return self.decoder.empty_frame()
+
+    def get_chains_batch(self, requests_list: List[Tuple[str, str]], max_workers: int = 4,
+                         greeks: bool = True) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """
+        Get option chains for many (symbol, expiration) pairs concurrently
+
+        Requests share the client's rate limiter, so the worker count only
+        bounds concurrency; throughput is still capped by the Tradier quota.
+
+        Args:
+            requests_list: List of (symbol, expiration) tuples
+            max_workers: Number of concurrent requests (1 = sequential)
+            greeks: Whether to include greeks
+
+        Returns:
+            Dict mapping (symbol, expiration) to the chain DataFrame
+        """
+        if not requests_list:
+            return {}
+
+        if max_workers <= 1:
+            return {
+                (symbol, expiration): self.get_chains(symbol, expiration, greeks)
+                for symbol, expiration in requests_list
+            }
+
+        logger.info(f"Fetching {len(requests_list)} option chains with {max_workers} workers")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda request: self.get_chains(request[0], request[1], greeks),
+                requests_list
+            ))
+
+        return dict(zip(requests_list, results))
+
+    def get_expirations(self, symbol: str, include_all_roots: bool = True) -> pd.DataFrame:
+        """
+        Get listed option expirations for a symbol
+
+        Args:
+            symbol: Underlying symbol
+            include_all_roots: Include dates from every option root (e.g. SPXW for SPX)
+
+        Returns:
+            DataFrame with 'date' and 'expiration_type' columns
+            (expiration_type is one of 'standard', 'weeklys', 'quarterlys', 'eom')
+        """
+        endpoint = 'v1/markets/options/expirations'
+        columns = ['date', 'expiration_type']
+        params = {
+            'symbol': symbol.upper(),
+            'includeAllRoots': include_all_roots,
+            'expirationType': True,
+        }
+
+        try:
+            response = self._fetch_url(BASE_URL + endpoint, params)
+            self._handle_api_response(response, symbol, 'expirations')
+
+            if response.status_code == 200:
+                json_response = response.json()
+                expirations = json_response.get('expirations', {})
+                expirations = expirations if expirations is not None else {}
+
+                if 'expiration' in expirations:
+                    data = expirations.get('expiration', [])
+                    data = data if isinstance(data, list) else [data]
+                    records = [
+                        {'date': item.get('date'), 'expiration_type': item.get('expiration_type')}
+                        for item in data
+                    ]
+                else:
+                    # Plain date list when expiration types are not returned
+                    data = expirations.get('date', [])
+                    data = data if isinstance(data, list) else [data]
+                    records = [{'date': date, 'expiration_type': None} for date in data]
+
+                if len(records) > 0:
+                    df = pd.DataFrame(records, columns=columns)
+                    df = df.drop_duplicates(subset='date').sort_values('date').reset_index(drop=True)
+                    logger.info(f"Retrieved {len(df)} expirations for {symbol}")
+                    return df
+
+        except Exception as e:
+            logger.error(f"Error fetching expirations for {symbol}: {str(e)}")
+
         return pd.DataFrame(columns=columns)
 
     def get_strikes(self, symbol: str, expiration: str) -> List[float]:
@@ -5,6 +5,8 @@ import time
 from typing import Optional, List, Literal
 import logging
 
+from .http_transport import get_transport
+
 logger = logging.getLogger('gex_collector')
 
 BASE_URL = 'https://api.tradier.com/'
@@ -15,22 +17,8 @@ def troubleshoot(stream: str):
         f.write(stream)
 
 
-def fetch_url(url: str, params: Optional[dict] = None, headers: Optional[dict] = None, max_retries: int = 3, sleep: float = 2):
-    attempts = 0
-    while attempts < max_retries:
-        try:
-            response = requests.get(url, params, headers=headers)
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            attempts += 1
-            logger.warning(f"Request attempt {attempts} failed: {str(e)}")
-            if attempts < max_retries:
-                logger.info(f"Retrying in {sleep} seconds...")
-                time.sleep(sleep)
-            else:
-                logger.error(f"Max retries ({max_retries}) exceeded for {url}")
-                raise
+def fetch_url(url: str, params: Optional[dict] = None, headers: Optional[dict] = None, max_retries: int = 3):
+    return get_transport().get(url, params=params, headers=headers, max_retries=max_retries)
 
 
 def get_historical_quote(symbol: str, start_date: str, end_date: str, resolution: Literal['daily', 'weekly', 'monthly'] = 'daily', api_key: str = None) -> pd.DataFrame:
@@ -0,0 +1 @@
+# Backtesting Package
\ No newline at end of file
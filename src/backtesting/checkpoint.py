@@ -0,0 +1,86 @@
+"""
+Backtest Checkpoints
+
+Day-by-day backtests (intraday, hedged) save their state after every
+processed day so a rerun can resume instead of replaying the whole range.
+
+Checkpoints live in one directory per strategy and parameter set, one
+JSON file per day. Each file records a running digest of the per-day data
+fingerprints (snapshot count and last snapshot time, see
+load_day_fingerprints) up to that day; a checkpoint is only resumed from
+if that day and every earlier day still have the same data. When snapshots
+are added to a day, the run resumes from the day before it.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger('gex_collector')
+
+
+def fingerprint_chain(fingerprints: Dict[str, Tuple]) -> Dict[str, str]:
+    """Running digest per day, covering that day's fingerprint and all earlier days'"""
+    digest = hashlib.sha256()
+    chain = {}
+    for day in sorted(fingerprints):
+        digest.update(json.dumps([day, list(fingerprints[day])], default=str).encode())
+        chain[day] = digest.hexdigest()
+    return chain
+
+
+class BacktestCheckpoints:
+    """Per-day backtest state on disk, keyed by strategy and parameters"""
+
+    def __init__(self, directory: str, strategy: str, params: Dict[str, Any]):
+        """
+        Initialize checkpoints
+
+        Args:
+            directory: Root checkpoint directory
+            strategy: Strategy name (e.g. the backtester class name)
+            params: Everything that changes results other than the data,
+                including the start date (JSON-serializable)
+        """
+        key = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        self.path = os.path.join(directory, f'{strategy}_{key}')
+        self.chain: Dict[str, str] = {}
+
+    def resume(self, fingerprints: Dict[str, Tuple]) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Latest checkpoint still valid for the current data
+
+        Args:
+            fingerprints: Day -> fingerprint for every day in the backtest range
+
+        Returns:
+            Tuple of (day, state saved after that day), or (None, None)
+        """
+        self.chain = fingerprint_chain(fingerprints)
+        if not os.path.isdir(self.path):
+            return None, None
+
+        days = sorted((name[:-5] for name in os.listdir(self.path) if name.endswith('.json')), reverse=True)
+        for day in days:
+            if day not in self.chain:
+                continue
+            try:
+                with open(os.path.join(self.path, f'{day}.json')) as f:
+                    checkpoint = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable checkpoint {day}: {e}")
+                continue
+            if checkpoint.get('chain') == self.chain[day]:
+                return day, checkpoint['state']
+
+        return None, None
+
+    def save(self, day: str, state: Dict):
+        """Write the state after a processed day (call resume first)"""
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, f'{day}.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'chain': self.chain[day], 'state': state}, f, default=str)
+        os.replace(path + '.tmp', path)
@@ -0,0 +1,128 @@
+"""
+Backtest Result Cache
+
+Results of backtest runs stored on disk under a content hash of what
+determines them: strategy, parameters, date range and the per-day data
+fingerprints (snapshot count and last snapshot time, see
+load_day_fingerprints). Rerunning an identical configuration over
+unchanged data loads the stored results instead of simulating again; any
+new snapshot in the range changes the key.
+
+Results are written as parquet when pyarrow is installed and as gzipped
+pickles otherwise. When the cache grows past max_bytes, the least
+recently used results are deleted.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger('gex_collector')
+
+DEFAULT_CACHE_DIR = 'output/backtest_cache'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def result_key(strategy: str, params: Dict[str, Any], start_date: str, end_date: str,
+               fingerprints: Dict[str, Tuple]) -> str:
+    """
+    Content hash identifying one backtest run
+
+    Args:
+        strategy: Strategy name (e.g. the backtester class name)
+        params: Strategy parameters (JSON-serializable)
+        start_date: First day of the run
+        end_date: Last day of the run
+        fingerprints: Day -> fingerprint for the data the run reads
+
+    Returns:
+        Hex digest
+    """
+    payload = json.dumps({
+        'strategy': strategy,
+        'params': params,
+        'start_date': start_date,
+        'end_date': end_date,
+        'fingerprints': sorted((day, list(fingerprint)) for day, fingerprint in fingerprints.items())
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Backtest results on disk, keyed by result_key, with LRU eviction by size"""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize cache
+
+        Args:
+            directory: Cache directory
+            max_bytes: Total size of stored results to keep
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = '.parquet' if HAS_PYARROW else '.pkl.gz'
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Stored results for a key, or None"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            if HAS_PYARROW:
+                results = pd.read_parquet(path)
+            else:
+                results = pd.read_pickle(path, compression='gzip')
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cached result {key[:12]}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        # Mark as most recently used
+        os.utime(path)
+        return results
+
+    def put(self, key: str, results: pd.DataFrame):
+        """Store results for a key, then evict down to max_bytes"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path + '.tmp'
+        if HAS_PYARROW:
+            results.to_parquet(tmp_path, index=False)
+        else:
+            results.to_pickle(tmp_path, compression='gzip')
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used results until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.extension):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+            logger.debug(f"Evicted cached result {name[:12]}")
@@ -0,0 +1,259 @@
+"""
+Snapshot Store
+
+Option chain snapshots for a whole backtest date range, held as one NumPy
+array per column and sorted by snapshot time, so a backtest loop can walk
+snapshots in memory instead of querying gex_table for every date and
+snapshot.
+
+The store is filled by one streamed query (server-side cursor) or from a
+directory of .npy files written by save(); open() memory-maps those files
+so several processes can share one copy of the data read-only.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('gex_collector')
+
+# Column name in the store -> SQL expression in gex_table
+SNAPSHOT_COLUMNS: Dict[str, str] = {
+    'greeks.updated_at': '"greeks.updated_at"',
+    'expiration_date': 'expiration_date',
+    'strike': 'strike',
+    'option_type': 'option_type',
+    'option_price': 'last',
+    'bid': 'bid',
+    'ask': 'ask',
+    'volume': 'volume',
+    'open_interest': 'open_interest',
+    'gex': 'gex',
+    'greeks.delta': '"greeks.delta"',
+    'greeks.gamma': '"greeks.gamma"',
+    'greeks.theta': '"greeks.theta"',
+    'greeks.vega': '"greeks.vega"',
+    'spx_price': 'spx_price',
+}
+
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def _to_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Convert query rows to fixed-width arrays (no object dtype, so they can be memory-mapped)"""
+    arrays = {}
+    for col in df.columns:
+        if col == 'greeks.updated_at':
+            arrays[col] = pd.to_datetime(df[col]).to_numpy(dtype='datetime64[ns]')
+        elif col == 'expiration_date':
+            arrays[col] = pd.to_datetime(df[col]).to_numpy(dtype='datetime64[D]')
+        elif col == 'option_type':
+            arrays[col] = df[col].to_numpy(dtype='U4')
+        else:
+            arrays[col] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+    return arrays
+
+
+def _stream_query(con, query: str, params: Dict, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield query results in chunks, using a server-side cursor on psycopg2 connections"""
+    if hasattr(con, 'cursor') and not hasattr(con, 'connect'):
+        cursor = con.cursor(name='snapshot_store')
+        cursor.itersize = chunksize
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=[d[0] for d in cursor.description])
+        finally:
+            cursor.close()
+    else:
+        yield from pd.read_sql(query, con, params=params, chunksize=chunksize)
+
+
+def load_day_fingerprints(con, start_date: str, end_date: str) -> Dict[str, Tuple[int, str]]:
+    """
+    Snapshot count and last snapshot time per day in gex_table (PostgreSQL)
+
+    A day's fingerprint changes whenever snapshots are added to it, so it
+    identifies the data a backtest over that day has seen.
+
+    Args:
+        con: psycopg2 connection or SQLAlchemy engine
+        start_date: First day (YYYY-MM-DD, inclusive)
+        end_date: Last day (YYYY-MM-DD, inclusive)
+
+    Returns:
+        Day (YYYY-MM-DD) -> (snapshot count, last snapshot ISO timestamp)
+    """
+    query = """
+    SELECT
+        CAST("greeks.updated_at" AS DATE) AS trade_date,
+        COUNT(DISTINCT "greeks.updated_at") AS snapshots,
+        MAX("greeks.updated_at") AS last_snapshot
+    FROM gex_table
+    WHERE "greeks.updated_at" >= %(start)s::date
+      AND "greeks.updated_at" < %(end)s::date + 1
+    GROUP BY 1
+    ORDER BY 1
+    """
+    days = pd.read_sql(query, con, params={'start': start_date, 'end': end_date})
+    return {
+        str(row['trade_date']): (int(row['snapshots']), pd.Timestamp(row['last_snapshot']).isoformat())
+        for _, row in days.iterrows()
+    }
+
+
+class SnapshotStore:
+    """In-memory columnar option snapshots indexed by timestamp"""
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """
+        Initialize store
+
+        Args:
+            columns: Column name -> array, all the same length and sorted by
+                greeks.updated_at
+        """
+        self.columns = columns
+
+        timestamps = columns['greeks.updated_at']
+        if len(timestamps):
+            starts = np.flatnonzero(np.r_[True, timestamps[1:] != timestamps[:-1]])
+        else:
+            starts = np.array([], dtype=int)
+        self.timestamps = timestamps[starts]
+        self.bounds = np.r_[starts, len(timestamps)]
+
+        if 'days_to_expiry' not in columns and 'expiration_date' in columns:
+            snapshot_day = timestamps.astype('datetime64[D]')
+            columns['days_to_expiry'] = (columns['expiration_date'] - snapshot_day).astype(np.int32)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'SnapshotStore':
+        """Build a store from contract rows (any order)"""
+        df = df.sort_values(['greeks.updated_at', 'expiration_date', 'strike', 'option_type'], kind='stable')
+        return cls(_to_arrays(df.reset_index(drop=True)))
+
+    @classmethod
+    def load(cls, con, start_date: str, end_date: str,
+             max_days_to_expiry: Optional[int] = None,
+             chunksize: int = DEFAULT_CHUNKSIZE) -> 'SnapshotStore':
+        """
+        Load every snapshot between two dates with one streamed query (PostgreSQL)
+
+        Args:
+            con: psycopg2 connection or SQLAlchemy engine
+            start_date: First day (YYYY-MM-DD, inclusive)
+            end_date: Last day (YYYY-MM-DD, inclusive)
+            max_days_to_expiry: Only load options expiring within N days of
+                their snapshot (None = all expirations)
+            chunksize: Rows fetched per round trip
+
+        Returns:
+            SnapshotStore
+        """
+        select = ',\n            '.join(f'{expr} AS "{name}"' for name, expr in SNAPSHOT_COLUMNS.items())
+        expiry_filter = ''
+        if max_days_to_expiry is not None:
+            expiry_filter = ("AND expiration_date <= TO_CHAR(\"greeks.updated_at\" "
+                             "+ %(max_dte)s * INTERVAL '1 day', 'YYYY-MM-DD')")
+
+        query = f"""
+        SELECT
+            {select}
+        FROM gex_table
+        WHERE "greeks.updated_at" >= %(start)s::date
+          AND "greeks.updated_at" < %(end)s::date + 1
+          {expiry_filter}
+        ORDER BY "greeks.updated_at", expiration_date, strike, option_type
+        """
+        params = {'start': start_date, 'end': end_date, 'max_dte': max_days_to_expiry}
+
+        chunks = [_to_arrays(chunk) for chunk in _stream_query(con, query, params, chunksize)]
+        if not chunks:
+            return cls.from_frame(pd.DataFrame(columns=list(SNAPSHOT_COLUMNS)))
+
+        store = cls({col: np.concatenate([chunk[col] for chunk in chunks]) for col in chunks[0]})
+        logger.info(f"Loaded {store.row_count:,} rows in {len(store):,} snapshots "
+                    f"({start_date} to {end_date})")
+        return store
+
+    def save(self, path: str):
+        """Write one .npy file per column plus an index file to a directory"""
+        os.makedirs(path, exist_ok=True)
+        names = {}
+        for i, (col, values) in enumerate(self.columns.items()):
+            names[col] = f'{i:02d}.npy'
+            np.save(os.path.join(path, names[col]), values)
+        with open(os.path.join(path, 'columns.json'), 'w') as f:
+            json.dump(names, f, indent=2)
+
+    @classmethod
+    def open(cls, path: str, mmap: bool = True) -> 'SnapshotStore':
+        """
+        Open a store written by save()
+
+        Args:
+            path: Store directory
+            mmap: Memory-map the column files read-only instead of reading them
+        """
+        with open(os.path.join(path, 'columns.json')) as f:
+            names = json.load(f)
+        mode = 'r' if mmap else None
+        return cls({col: np.load(os.path.join(path, name), mmap_mode=mode) for col, name in names.items()})
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def row_count(self) -> int:
+        return int(self.bounds[-1]) if len(self.bounds) else 0
+
+    def trade_dates(self) -> List[str]:
+        """Days with at least one snapshot (YYYY-MM-DD)"""
+        return [str(day) for day in np.unique(self.timestamps.astype('datetime64[D]'))]
+
+    def day_fingerprints(self) -> Dict[str, Tuple[int, str]]:
+        """Snapshot count and last snapshot time per day (see load_day_fingerprints)"""
+        days = self.timestamps.astype('datetime64[D]')
+        unique_days, first, counts = np.unique(days, return_index=True, return_counts=True)
+        return {
+            str(day): (int(count), pd.Timestamp(self.timestamps[i + count - 1]).isoformat())
+            for day, i, count in zip(unique_days, first, counts)
+        }
+
+    def snapshot_times(self, trade_date: str) -> pd.DatetimeIndex:
+        """Snapshot timestamps on one day"""
+        day = np.datetime64(trade_date, 'D')
+        lo, hi = np.searchsorted(self.timestamps, [day, day + 1])
+        return pd.DatetimeIndex(self.timestamps[lo:hi])
+
+    def index_of(self, snapshot_time) -> Optional[int]:
+        """Position of a snapshot, or None if the store does not hold it"""
+        ts = np.datetime64(pd.Timestamp(snapshot_time), 'ns')
+        i = int(np.searchsorted(self.timestamps, ts))
+        if i < len(self.timestamps) and self.timestamps[i] == ts:
+            return i
+        return None
+
+    def arrays(self, i: int) -> Dict[str, np.ndarray]:
+        """Column slices (views, no copy) for the i-th snapshot"""
+        lo, hi = self.bounds[i], self.bounds[i + 1]
+        return {col: values[lo:hi] for col, values in self.columns.items()}
+
+    def frame(self, i: int) -> pd.DataFrame:
+        """The i-th snapshot as a DataFrame"""
+        return pd.DataFrame(self.arrays(i))
+
+    def snapshot(self, snapshot_time) -> pd.DataFrame:
+        """Rows of one snapshot (empty if the store does not hold it)"""
+        i = self.index_of(snapshot_time)
+        if i is None:
+            return pd.DataFrame(columns=list(self.columns))
+        return self.frame(i)
@@ -0,0 +1,110 @@
+"""
+Snapshot View
+
+Lookup index over one option snapshot. Backtesters and paper traders price
+legs and pick strikes many times per snapshot; instead of boolean-filtering
+the snapshot DataFrame on every call, the view is built once per snapshot:
+
+- (strike, option_type) -> price hash index
+- sorted strikes per option type for nearest-strike search
+- sorted deltas per option type for nearest-delta search
+
+Prices follow the backtesters' rule: last traded price when positive,
+otherwise the bid/ask mid when both sides are positive.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _nearest(sorted_values: np.ndarray, target: float) -> Optional[int]:
+    """Position of the value closest to target (ties go to the lower value)"""
+    if len(sorted_values) == 0:
+        return None
+    i = int(np.searchsorted(sorted_values, target))
+    if i == 0:
+        return 0
+    if i == len(sorted_values):
+        return i - 1
+    return i - 1 if target - sorted_values[i - 1] <= sorted_values[i] - target else i
+
+
+class SnapshotView:
+    """Price, nearest-strike and nearest-delta lookups for one snapshot"""
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        Build the index
+
+        Args:
+            frame: Snapshot rows with strike, option_type, option_price, bid,
+                ask and optionally greeks.delta. When a (strike, option_type)
+                appears more than once, the first row wins.
+        """
+        self.frame = frame
+
+        strikes = pd.to_numeric(frame['strike'], errors='coerce').to_numpy(dtype=float)
+        option_types = frame['option_type'].to_numpy(dtype=str)
+        last = pd.to_numeric(frame['option_price'], errors='coerce').to_numpy(dtype=float)
+        bid = pd.to_numeric(frame['bid'], errors='coerce').to_numpy(dtype=float)
+        ask = pd.to_numeric(frame['ask'], errors='coerce').to_numpy(dtype=float)
+
+        mid = np.where((bid > 0) & (ask > 0), (bid + ask) / 2, np.nan)
+        prices = np.where(last > 0, last, mid)
+
+        # Reversed so the first occurrence of a key is the one kept
+        self._prices: Dict[Tuple[float, str], float] = dict(
+            zip(zip(strikes[::-1].tolist(), option_types[::-1].tolist()), prices[::-1].tolist())
+        )
+
+        if 'greeks.delta' in frame.columns:
+            deltas = pd.to_numeric(frame['greeks.delta'], errors='coerce').to_numpy(dtype=float)
+        else:
+            deltas = np.full(len(frame), np.nan)
+
+        self._strikes: Dict[str, np.ndarray] = {}
+        self._deltas: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for option_type in np.unique(option_types):
+            mask = option_types == option_type
+            self._strikes[option_type] = np.unique(strikes[mask & ~np.isnan(strikes)])
+
+            has_delta = mask & ~np.isnan(deltas)
+            order = np.argsort(deltas[has_delta], kind='stable')
+            self._deltas[option_type] = (deltas[has_delta][order], strikes[has_delta][order])
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def price(self, strike: float, option_type: str) -> Optional[float]:
+        """Option price for a strike, or None if not listed or not priced"""
+        price = self._prices.get((float(strike), option_type))
+        if price is None or np.isnan(price):
+            return None
+        return price
+
+    def strikes(self, option_type: str) -> np.ndarray:
+        """Listed strikes for an option type, ascending"""
+        return self._strikes.get(option_type, np.array([]))
+
+    def nearest_strike(self, target_strike: float, option_type: str) -> Optional[float]:
+        """Listed strike closest to target_strike (None if the type has no strikes)"""
+        strikes = self.strikes(option_type)
+        i = _nearest(strikes, target_strike)
+        return None if i is None else float(strikes[i])
+
+    def nearest_delta(self, target_delta: float, option_type: str) -> Optional[float]:
+        """
+        Strike whose delta is closest to target_delta
+
+        Args:
+            target_delta: Signed delta (e.g. 0.30 for calls, -0.30 for puts)
+            option_type: 'call' or 'put'
+
+        Returns:
+            Strike, or None if no option of that type has a delta
+        """
+        deltas, strikes = self._deltas.get(option_type, (np.array([]), np.array([])))
+        i = _nearest(deltas, target_delta)
+        return None if i is None else float(strikes[i])
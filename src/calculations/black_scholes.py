@@ -9,6 +9,7 @@ greeks.updated_at timestamp.
 
 import numpy as np
 from scipy.stats import norm
+from scipy.special import ndtr
 from typing import Dict, Literal, Optional
 import pandas as pd
 from datetime import datetime, date
@@ -16,6 +17,10 @@ import logging
 
 logger = logging.getLogger('gex_collector')
 
+GREEK_NAMES = ['delta', 'gamma', 'theta', 'vega', 'rho', 'price']
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
 
 class BlackScholesCalculator:
     """
@@ -273,6 +278,83 @@ class BlackScholesCalculator:
             'price': max(0, price)
         }
 
+    def calculate_greeks_vectorized(self, S: np.ndarray, K: np.ndarray, T: np.ndarray,
+                                    sigma: np.ndarray, is_call: np.ndarray,
+                                    r: Optional[float] = None,
+                                    q: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Calculate price and greeks for arrays of options in one pass.
+
+        Same formulas and edge cases as calculate_all_greeks, applied with masks:
+        T <= 0 gives zero greeks and intrinsic price; sigma <= 0, S <= 0, K <= 0
+        or missing inputs give zeros.
+
+        Args:
+            S: Underlying prices
+            K: Strike prices
+            T: Times to expiration (years)
+            sigma: Implied volatilities (annual, as decimal)
+            is_call: True for calls, False for puts
+            r: Risk-free rate (uses instance default if None)
+            q: Dividend yield (uses instance default if None)
+
+        Returns:
+            Dictionary of arrays with keys: delta, gamma, theta, vega, rho, price
+        """
+        r = r if r is not None else self.risk_free_rate
+        q = q if q is not None else self.dividend_yield
+
+        S = np.asarray(S, dtype=float)
+        K = np.asarray(K, dtype=float)
+        T = np.asarray(T, dtype=float)
+        sigma = np.asarray(sigma, dtype=float)
+        is_call = np.asarray(is_call, dtype=bool)
+
+        results = {name: np.zeros(len(S)) for name in GREEK_NAMES}
+
+        valid_inputs = ~(np.isnan(S) | np.isnan(K) | np.isnan(sigma) | np.isnan(T))
+
+        # Expired: intrinsic value only
+        expired = valid_inputs & (T <= 0)
+        intrinsic = np.where(is_call, S - K, K - S)
+        results['price'][expired] = np.maximum(0.0, intrinsic[expired])
+
+        live = valid_inputs & (T > 0) & (sigma > 0) & (S > 0) & (K > 0)
+        if not live.any():
+            return results
+
+        S, K, T, sigma, call = S[live], K[live], T[live], sigma[live], is_call[live]
+
+        sqrt_T = np.sqrt(T)
+        sigma_sqrt_T = sigma * sqrt_T
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma**2) * T) / sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+
+        exp_qt = np.exp(-q * T)
+        exp_rt = np.exp(-r * T)
+        pdf_d1 = np.exp(-0.5 * d1**2) * _INV_SQRT_2PI
+
+        # Calls use N(d), puts N(-d) with the sign flipped
+        sign = np.where(call, 1.0, -1.0)
+        cdf_d1 = ndtr(sign * d1)
+        cdf_d2 = ndtr(sign * d2)
+
+        price = sign * (S * exp_qt * cdf_d1 - K * exp_rt * cdf_d2)
+        delta = sign * exp_qt * cdf_d1
+        theta_term1 = -(S * pdf_d1 * sigma * exp_qt) / (2 * sqrt_T)
+        theta_term2 = sign * q * S * cdf_d1 * exp_qt
+        theta_term3 = -sign * r * K * exp_rt * cdf_d2
+        rho = sign * K * T * exp_rt * cdf_d2
+
+        results['price'][live] = np.maximum(0.0, price)
+        results['delta'][live] = delta
+        results['gamma'][live] = (exp_qt * pdf_d1) / (S * sigma_sqrt_T)
+        results['theta'][live] = (theta_term1 + theta_term2 + theta_term3) / 365  # Daily theta
+        results['vega'][live] = S * exp_qt * pdf_d1 * sqrt_T / 100  # Per 1% vol change
+        results['rho'][live] = rho / 100  # Per 1% rate change
+
+        return results
+
     def years_to_expiration(self, expiration_date: str, current_date: Optional[datetime] = None) -> float:
         """
         Calculate time to expiration in years.
@@ -327,47 +409,24 @@ class BlackScholesCalculator:
         # Create copy to avoid modifying original
         result_df = df.copy()
 
-        # Initialize columns
-        result_df[f'{prefix}delta'] = 0.0
-        result_df[f'{prefix}gamma'] = 0.0
-        result_df[f'{prefix}theta'] = 0.0
-        result_df[f'{prefix}vega'] = 0.0
-        result_df[f'{prefix}rho'] = 0.0
-        result_df[f'{prefix}price'] = 0.0
-
-        # Get current date for time calculations
-        current_date = datetime.now().date()
-
-        # Calculate for each row
-        for idx, row in result_df.iterrows():
-            try:
-                S = row[underlying_price_col]
-                K = row['strike']
-                sigma = row[iv_col]
-                option_type = row['option_type']
-                exp_date_str = row['expiration_date']
-
-                # Skip if missing critical data
-                if pd.isna(S) or pd.isna(K) or pd.isna(sigma) or sigma <= 0:
-                    continue
-
-                # Calculate time to expiration
-                T = self.years_to_expiration(exp_date_str, datetime.now())
-
-                # Calculate all greeks
-                greeks = self.calculate_all_greeks(S, K, T, sigma, option_type)
-
-                # Store in DataFrame
-                result_df.at[idx, f'{prefix}delta'] = greeks['delta']
-                result_df.at[idx, f'{prefix}gamma'] = greeks['gamma']
-                result_df.at[idx, f'{prefix}theta'] = greeks['theta']
-                result_df.at[idx, f'{prefix}vega'] = greeks['vega']
-                result_df.at[idx, f'{prefix}rho'] = greeks['rho']
-                result_df.at[idx, f'{prefix}price'] = greeks['price']
-
-            except Exception as e:
-                logger.debug(f"Error calculating greeks for row {idx}: {e}")
-                continue
+        # Time to expiration in years from whole days remaining (floored at 0)
+        current_date = pd.Timestamp(datetime.now().date())
+        expirations = pd.to_datetime(result_df['expiration_date'], errors='coerce').dt.normalize()
+        T = np.maximum(0.0, (expirations - current_date).dt.days.to_numpy(dtype=float) / 365.0)
+
+        S = pd.to_numeric(result_df[underlying_price_col], errors='coerce').to_numpy(dtype=float)
+        K = pd.to_numeric(result_df['strike'], errors='coerce').to_numpy(dtype=float)
+        sigma = pd.to_numeric(result_df[iv_col], errors='coerce').to_numpy(dtype=float)
+        is_call = (result_df['option_type'] == 'call').to_numpy()
+
+        # Rows missing data or with no volatility keep zero greeks and price
+        sigma = np.where(sigma > 0, sigma, np.nan)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            greeks = self.calculate_greeks_vectorized(S, K, T, sigma, is_call)
+
+        for name in GREEK_NAMES:
+            result_df[f'{prefix}{name}'] = greeks[name]
 
         # Calculate GEX using calculated gamma
         result_df[f'{prefix}gex'] = (
@@ -0,0 +1,174 @@
+"""
+Option Chain Builder
+
+Accumulates the per-expiration chain frames returned by the API and
+assembles them into a single DataFrame in one pass: one concat, GEX
+computed over the combined frame, and the underlying price fields joined
+per symbol in a single vectorized step instead of being broadcast column
+by column onto every chain.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('gex_collector')
+
+# Output column -> key in the underlying price data dict
+UNDERLYING_PRICE_COLUMNS = {
+    # Current price
+    'spx_price': 'last',
+
+    # Daily OHLC
+    'spx_daily_open': 'daily_open',
+    'spx_daily_high': 'daily_high',
+    'spx_daily_low': 'daily_low',
+    'spx_daily_close': 'daily_close',
+
+    # Intraday 15-min bar OHLC
+    'spx_intraday_open': 'intraday_open',
+    'spx_intraday_high': 'intraday_high',
+    'spx_intraday_low': 'intraday_low',
+    'spx_intraday_close': 'intraday_close',
+
+    # Legacy columns for backward compatibility
+    'spx_open': 'open',
+    'spx_high': 'high',
+    'spx_low': 'low',
+    'spx_close': 'close',
+
+    # Other data
+    'spx_bid': 'bid',
+    'spx_ask': 'ask',
+    'spx_change': 'change',
+    'spx_change_pct': 'change_percentage',
+    'spx_prevclose': 'prevclose',
+}
+
+
+def calculate_gex(chains_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate gamma exposure for option chains
+
+    GEX = Strike * Gamma * Open Interest * 100, negative for puts.
+    """
+    if chains_df.empty:
+        return chains_df
+
+    sign = np.where(chains_df['option_type'] == 'put', -1.0, 1.0)
+    chains_df['gex'] = (
+        chains_df['strike'] *
+        chains_df['greeks.gamma'] *
+        chains_df['open_interest'] * 100 * sign
+    )
+
+    return chains_df
+
+
+def attach_underlying_prices(chains_df: pd.DataFrame,
+                             underlying_prices: Dict[str, Optional[Dict]]) -> pd.DataFrame:
+    """
+    Add underlying price columns (spx_price, spx_daily_open, ...) to each row
+
+    Args:
+        chains_df: Chains with an 'underlying_symbol' column
+        underlying_prices: Price data dict per symbol (None if unavailable)
+
+    Returns:
+        DataFrame with the price columns joined on underlying_symbol
+    """
+    available = {symbol: data for symbol, data in underlying_prices.items() if data}
+    if chains_df.empty or not available:
+        return chains_df
+
+    prices = pd.DataFrame.from_dict(
+        {
+            symbol: {column: data.get(key) for column, key in UNDERLYING_PRICE_COLUMNS.items()}
+            for symbol, data in available.items()
+        },
+        orient='index',
+        columns=list(UNDERLYING_PRICE_COLUMNS)
+    )
+
+    price_block = prices.reindex(chains_df['underlying_symbol'].to_numpy())
+    price_block.index = chains_df.index
+
+    existing = [column for column in price_block.columns if column in chains_df.columns]
+    return pd.concat([chains_df.drop(columns=existing), price_block], axis=1)
+
+
+class ChainBuilder:
+    """Collects chain frames per symbol/expiration and concatenates them once"""
+
+    def __init__(self):
+        self._frames: List[pd.DataFrame] = []
+        self._symbols: List[str] = []
+        self._refresh_tiers: List[Optional[str]] = []
+        self._fetched_at: List[Optional[datetime]] = []
+
+    def add(self, symbol: str, chains: pd.DataFrame, refresh_tier: Optional[str] = None,
+            fetched_at: Optional[datetime] = None):
+        """
+        Queue a chain frame for the given underlying
+
+        Args:
+            symbol: Underlying symbol the chain belongs to
+            chains: Option chain for a single expiration
+            refresh_tier: Refresh tier the chain was fetched under (optional)
+            fetched_at: When the chain was fetched (optional)
+        """
+        if chains is None or chains.empty:
+            return
+        self._frames.append(chains)
+        self._symbols.append(symbol)
+        self._refresh_tiers.append(refresh_tier)
+        self._fetched_at.append(fetched_at)
+
+    def __len__(self) -> int:
+        return sum(len(frame) for frame in self._frames)
+
+    def build(self, underlying_prices: Optional[Dict[str, Optional[Dict]]] = None,
+              single_snapshot: bool = False) -> pd.DataFrame:
+        """
+        Assemble all queued chains into one DataFrame
+
+        Args:
+            underlying_prices: Price data dict per symbol to attach (optional)
+            single_snapshot: Key every row by the newest greeks.updated_at.
+                Used with refresh tiers: chains reused from the cache keep the
+                timestamp of their original fetch, and without a common key
+                they would be stored as (skipped) duplicates of an earlier
+                snapshot instead of in this one. The timestamp Tradier
+                reported for each row is kept in greeks_reported_at.
+
+        Returns:
+            Combined chains with underlying_symbol, gex and underlying price columns
+        """
+        if not self._frames:
+            return pd.DataFrame()
+
+        lengths = [len(frame) for frame in self._frames]
+        all_chains = pd.concat(self._frames, ignore_index=True)
+        all_chains['underlying_symbol'] = np.repeat(np.array(self._symbols, dtype=object), lengths)
+
+        # Which refresh tier / fetch each row came from (tiered collection only)
+        if any(tier is not None for tier in self._refresh_tiers):
+            all_chains['refresh_tier'] = np.repeat(np.array(self._refresh_tiers, dtype=object), lengths)
+        if any(fetched_at is not None for fetched_at in self._fetched_at):
+            all_chains['chain_fetched_at'] = pd.to_datetime(
+                np.repeat(np.array(self._fetched_at, dtype=object), lengths)
+            )
+
+        if single_snapshot and 'greeks.updated_at' in all_chains.columns:
+            all_chains['greeks_reported_at'] = pd.to_datetime(all_chains['greeks.updated_at'])
+            all_chains['greeks.updated_at'] = all_chains['greeks.updated_at'].max()
+
+        all_chains = calculate_gex(all_chains)
+
+        if underlying_prices:
+            all_chains = attach_underlying_prices(all_chains, underlying_prices)
+
+        return all_chains
@@ -0,0 +1,317 @@
+"""
+Greek Difference Backfill
+
+Recomputes the *_diff, *_pct_change, prev_timestamp and has_previous_data
+columns of gex_table for a date range, plus the *_diff_open and
+*_diff_prior_close columns of HORIZON_COLUMNS, e.g. after GREEK_COLUMNS
+changes or a fix to the difference calculation.
+
+Each day is one set-based pass in the database: LAG() over each contract's
+rows (seeded with the lookback window before the day), the contract's first
+row of the day and its last row on the previous trading day fill a temporary
+staging table, and a single UPDATE ... FROM staging writes the day back. Days
+run in parallel and completed days are recorded in a progress file so an
+interrupted backfill resumes where it stopped.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+try:
+    from sqlalchemy import text
+    HAS_SQLALCHEMY = True
+except ImportError:
+    HAS_SQLALCHEMY = False
+
+from .greek_diff_calculator import GreekDifferenceCalculator
+
+logger = logging.getLogger('gex_collector')
+
+CONTRACT_COLUMNS = ['option_type', 'strike', 'expiration_date']
+KEY_COLUMNS = CONTRACT_COLUMNS + ['greeks.updated_at']
+STAGING_TABLE = 'greek_diff_staging'
+
+PRIOR_SNAPSHOT_QUERY = 'SELECT MAX("greeks.updated_at") FROM gex_table WHERE "greeks.updated_at" < :day_start'
+
+
+def _q(column: str) -> str:
+    return f'"{column}"'
+
+
+class DiffBackfill:
+    """Recompute Greek differences for historical gex_table rows"""
+
+    def __init__(self, db, greek_columns: Optional[List[str]] = None,
+                 horizon_columns: Optional[List[str]] = None,
+                 lookback_hours: float = 96, workers: int = 4,
+                 progress_path: Optional[str] = None):
+        """
+        Initialize backfill
+
+        Args:
+            db: DatabaseConnection for the gex_table database
+            greek_columns: Columns to diff (default: GreekDifferenceCalculator.GREEK_COLUMNS)
+            horizon_columns: Columns to diff against the session open and prior
+                close (default: GreekDifferenceCalculator.HORIZON_COLUMNS)
+            lookback_hours: How far before each day to look for previous rows
+            workers: Days processed in parallel (SQLite always uses 1)
+            progress_path: JSON file recording completed days; None disables resume
+        """
+        self.db = db
+        self.greek_columns = list(greek_columns or GreekDifferenceCalculator.GREEK_COLUMNS)
+        self.horizon_columns = list(horizon_columns if horizon_columns is not None
+                                    else GreekDifferenceCalculator.HORIZON_COLUMNS)
+        self.lookback = timedelta(hours=lookback_hours)
+        self.workers = max(1, workers) if db.db_type == 'postgresql' else 1
+        self.progress_path = progress_path
+
+    def _existing_columns(self) -> set:
+        info = self.db.get_table_info('gex_table')
+        return set(info['name'] if 'name' in info.columns else info['column_name'])
+
+    def _resolve(self, columns: List[str], suffixes: List[str], existing: set) -> List[str]:
+        resolved = []
+        for col in columns:
+            needed = [col] + [f'{col}{suffix}' for suffix in suffixes]
+            if all(name in existing for name in needed):
+                resolved.append(col)
+            else:
+                logger.warning(f"Skipping {col}: missing {', '.join(n for n in needed if n not in existing)}")
+        return resolved
+
+    def resolve_columns(self) -> List[str]:
+        """Greek columns whose value, _diff and _pct_change columns all exist"""
+        return self._resolve(self.greek_columns, ['_diff', '_pct_change'], self._existing_columns())
+
+    def resolve_horizon_columns(self) -> List[str]:
+        """Horizon columns whose value, _diff_open and _diff_prior_close columns all exist"""
+        suffixes = [f'_diff_{horizon}' for horizon in GreekDifferenceCalculator.HORIZONS]
+        return self._resolve(self.horizon_columns, suffixes, self._existing_columns())
+
+    def trading_days(self, start: date, end: date) -> List[date]:
+        """Days between start and end (inclusive) that have rows in gex_table"""
+        if self.db.db_type == 'postgresql':
+            day_expr, placeholders = 'CAST("greeks.updated_at" AS DATE)', ('%(start)s', '%(end)s')
+        else:
+            day_expr, placeholders = 'DATE("greeks.updated_at")', (':start', ':end')
+
+        query = f"""
+        SELECT DISTINCT {day_expr} AS day
+        FROM gex_table
+        WHERE "greeks.updated_at" >= {placeholders[0]} AND "greeks.updated_at" < {placeholders[1]}
+        ORDER BY day
+        """
+        days = self.db.read_sql(query, {'start': str(start), 'end': str(end + timedelta(days=1))})
+
+        return [pd.Timestamp(day).date() for day in days['day']]
+
+    def _staging_query(self, columns: List[str], horizon_columns: List[str]) -> str:
+        """
+        SELECT computing differences for one day
+
+        LAG() per contract gives the previous row; FIRST_VALUE() over the
+        contract's rows from day_start gives the session open, and the
+        contract's last row between prior_day_start and day_start the prior
+        close, as GreekDifferenceCalculator does for live snapshots.
+        """
+        value_columns = columns + [col for col in horizon_columns if col not in columns]
+        lagged_columns = ',\n'.join(
+            [f'        {_q(col)}, LAG({_q(col)}) OVER w AS {_q(col + "_prev")}' for col in columns] +
+            [f'        {_q(col)}' for col in value_columns if col not in columns] +
+            [f'        FIRST_VALUE({_q(col)}) OVER d AS {_q(col + "_open_ref")}' for col in horizon_columns]
+        )
+        prior_columns = ''.join(f',\n        {_q(col)} AS {_q(col + "_prior_close_ref")}' for col in horizon_columns)
+        diff_columns = ',\n'.join(
+            [f'    l.{_q(col)} - l.{_q(col + "_prev")} AS {_q(col + "_diff")},\n'
+             f'    CASE WHEN l.{_q(col + "_prev")} <> 0 '
+             f'THEN (l.{_q(col)} - l.{_q(col + "_prev")}) / l.{_q(col + "_prev")} * 100 END AS {_q(col + "_pct_change")}'
+             for col in columns] +
+            [f'    l.{_q(col)} - l.{_q(col + "_open_ref")} AS {_q(col + "_diff_open")},\n'
+             f'    l.{_q(col)} - p.{_q(col + "_prior_close_ref")} AS {_q(col + "_diff_prior_close")}'
+             for col in horizon_columns]
+        )
+        keys = ', '.join(_q(col) for col in KEY_COLUMNS)
+        contract = ', '.join(_q(col) for col in CONTRACT_COLUMNS)
+        contract_match = ' AND '.join(f'p.{_q(col)} = l.{_q(col)}' for col in CONTRACT_COLUMNS)
+
+        return f"""
+WITH lagged AS (
+    SELECT {keys},
+{lagged_columns},
+        LAG("greeks.updated_at") OVER w AS prev_timestamp
+    FROM gex_table
+    WHERE "greeks.updated_at" >= :window_start AND "greeks.updated_at" < :day_end
+    WINDOW w AS (PARTITION BY {contract} ORDER BY "greeks.updated_at"),
+           d AS (PARTITION BY {contract}, "greeks.updated_at" >= :day_start ORDER BY "greeks.updated_at")
+),
+prior_close AS (
+    SELECT {contract}{prior_columns},
+        ROW_NUMBER() OVER (PARTITION BY {contract} ORDER BY "greeks.updated_at" DESC) AS row_num
+    FROM gex_table
+    WHERE "greeks.updated_at" >= :prior_day_start AND "greeks.updated_at" < :day_start
+)
+SELECT {', '.join(f'l.{_q(col)}' for col in KEY_COLUMNS)},
+{diff_columns},
+    l.prev_timestamp,
+    l.prev_timestamp IS NOT NULL AS has_previous_data
+FROM lagged AS l
+LEFT JOIN prior_close AS p ON {contract_match} AND p.row_num = 1
+WHERE l."greeks.updated_at" >= :day_start
+"""
+
+    def _update_query(self, columns: List[str], horizon_columns: List[str]) -> str:
+        """UPDATE gex_table from the staging table for one day"""
+        targets = [f'{col}_diff' for col in columns] + [f'{col}_pct_change' for col in columns]
+        targets += [f'{col}_diff_{horizon}' for col in horizon_columns
+                    for horizon in GreekDifferenceCalculator.HORIZONS]
+        targets += ['prev_timestamp', 'has_previous_data']
+        assignments = ', '.join(f'{_q(col)} = s.{_q(col)}' for col in targets)
+        matches = ' AND '.join(f'g.{_q(col)} = s.{_q(col)}' for col in KEY_COLUMNS)
+
+        return f"""
+UPDATE gex_table AS g SET {assignments}
+FROM {STAGING_TABLE} AS s
+WHERE {matches}
+  AND g."greeks.updated_at" >= :day_start AND g."greeks.updated_at" < :day_end
+"""
+
+    @staticmethod
+    def _prior_day_start(prior_snapshot, day_start: pd.Timestamp) -> str:
+        """Start of the last trading day before day_start (day_start itself if there is none)"""
+        if prior_snapshot is None:
+            return str(day_start)
+        return str(pd.Timestamp(prior_snapshot).normalize())
+
+    def backfill_day(self, day: date, columns: List[str],
+                     horizon_columns: Optional[List[str]] = None) -> int:
+        """
+        Recompute differences for every row on one day
+
+        Args:
+            day: Day to recompute
+            columns: Greek columns to diff against the previous row
+            horizon_columns: Columns to diff against the session open and
+                prior close (None = none)
+
+        Returns:
+            Number of rows updated
+        """
+        horizon_columns = horizon_columns or []
+        day_start = pd.Timestamp(day)
+        params = {
+            'window_start': str(day_start - self.lookback),
+            'day_start': str(day_start),
+            'day_end': str(day_start + timedelta(days=1)),
+        }
+        statements = [
+            f'CREATE TEMP TABLE {STAGING_TABLE} AS {self._staging_query(columns, horizon_columns)}',
+            self._update_query(columns, horizon_columns),
+            f'DROP TABLE {STAGING_TABLE}',
+        ]
+
+        if self.db.engine is not None and HAS_SQLALCHEMY:
+            with self.db.engine.begin() as conn:
+                prior_snapshot = conn.execute(text(PRIOR_SNAPSHOT_QUERY), params).scalar()
+                params['prior_day_start'] = self._prior_day_start(prior_snapshot, day_start)
+                conn.execute(text(statements[0]), params)
+                updated = conn.execute(text(statements[1]), params).rowcount
+                conn.execute(text(statements[2]))
+        else:
+            conn = sqlite3.connect(self.db.db_path)
+            try:
+                prior_snapshot = conn.execute(PRIOR_SNAPSHOT_QUERY, params).fetchone()[0]
+                params['prior_day_start'] = self._prior_day_start(prior_snapshot, day_start)
+                conn.execute(statements[0], params)
+                updated = conn.execute(statements[1], params).rowcount
+                conn.execute(statements[2])
+                conn.commit()
+            finally:
+                conn.close()
+
+        return updated
+
+    def load_progress(self, columns: List[str], horizon_columns: Optional[List[str]] = None) -> set:
+        """Completed days from the progress file (ignored if the columns changed)"""
+        if not self.progress_path or not os.path.exists(self.progress_path):
+            return set()
+
+        with open(self.progress_path) as f:
+            progress = json.load(f)
+
+        if progress.get('columns') != columns or progress.get('horizon_columns') != (horizon_columns or []):
+            logger.warning("Progress file was written for different columns - starting over")
+            return set()
+
+        return {date.fromisoformat(day) for day in progress.get('completed', [])}
+
+    def _record_progress(self, completed: set, columns: List[str], horizon_columns: List[str]):
+        if not self.progress_path:
+            return
+
+        directory = os.path.dirname(self.progress_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write then rename so an interrupted run never leaves a partial file
+        tmp_path = f'{self.progress_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'columns': columns,
+                'horizon_columns': horizon_columns,
+                'completed': sorted(day.isoformat() for day in completed)
+            }, f, indent=2)
+        os.replace(tmp_path, self.progress_path)
+
+    def run(self, start: date, end: date, restart: bool = False) -> Dict:
+        """
+        Recompute differences for every day between start and end
+
+        Args:
+            start: First day (inclusive)
+            end: Last day (inclusive)
+            restart: Ignore days recorded in the progress file
+
+        Returns:
+            Summary dict with days, skipped, failed and rows_updated
+        """
+        columns = self.resolve_columns()
+        horizon_columns = self.resolve_horizon_columns()
+        days = self.trading_days(start, end)
+        completed = set() if restart else self.load_progress(columns, horizon_columns)
+        pending = [day for day in days if day not in completed]
+
+        logger.info(f"Backfilling Greek differences for {len(pending)} days "
+                    f"({len(days) - len(pending)} already done, {self.workers} workers)")
+
+        rows_updated = 0
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.backfill_day, day, columns, horizon_columns): day
+                       for day in pending}
+            for future in as_completed(futures):
+                day = futures[future]
+                try:
+                    updated = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to backfill {day}: {e}")
+                    failed.append(day)
+                    continue
+
+                rows_updated += updated
+                completed.add(day)
+                self._record_progress(completed, columns, horizon_columns)
+                logger.info(f"Backfilled {day}: {updated:,} rows")
+
+        return {
+            'days': len(pending) - len(failed),
+            'skipped': len(days) - len(pending),
+            'failed': sorted(failed),
+            'rows_updated': rows_updated,
+        }
@@ -0,0 +1,544 @@
+"""
+GEX Aggregates
+
+Per-snapshot rollups written when a snapshot is saved:
+
+- gex_strike_agg: call/put/net GEX and open interest per strike, split into
+  disjoint DTE buckets so the common expiration filters (0DTE, 0-2 DTE,
+  0-7 DTE, all) are exact sums of buckets
+- gex_snapshot_summary: one row per snapshot and timeframe with spot, the
+  interpolated zero-gamma level, the strongest call/put walls and totals
+
+Consumers read a few hundred aggregate rows, or a single summary row,
+instead of regrouping tens of thousands of contract rows.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('gex_collector')
+
+STRIKE_AGG_TABLE = 'gex_strike_agg'
+STRIKE_AGG_KEY = ['snapshot_ts', 'underlying', 'dte_bucket', 'strike']
+STRIKE_AGG_COLUMNS = STRIKE_AGG_KEY + ['call_gex', 'put_gex', 'net_gex', 'call_oi', 'put_oi']
+
+# Disjoint (min_dte, max_dte) buckets; None = no upper bound
+DTE_BUCKETS: List[Tuple[int, Optional[int]]] = [(0, 0), (1, 2), (3, 7), (8, None)]
+
+SUMMARY_TABLE = 'gex_snapshot_summary'
+SUMMARY_KEY = ['snapshot_ts', 'underlying', 'timeframe']
+
+# Summary timeframe -> max days to expiration (None = all expirations)
+SUMMARY_TIMEFRAMES: Dict[str, Optional[int]] = {
+    '0dte': 0,
+    'short_term': 2,
+    'weekly': 7,
+    'all': None,
+}
+
+# Walls stored per side, strongest first
+WALL_COUNT = 3
+
+# Strikes within this distance of spot make up net_gex_at_price
+AT_PRICE_WINDOW = 5.0
+
+SUMMARY_COLUMNS = SUMMARY_KEY + ['max_dte', 'spot_price', 'zero_gex_level'] + \
+    [f'call_wall_{i}' for i in range(1, WALL_COUNT + 1)] + \
+    [f'put_wall_{i}' for i in range(1, WALL_COUNT + 1)] + \
+    ['total_call_gex', 'total_put_gex', 'net_gex', 'net_gex_at_price',
+     'contract_count', 'call_oi', 'put_oi']
+
+
+def dte_bucket_name(min_dte: int, max_dte: Optional[int]) -> str:
+    """Bucket label, e.g. '0DTE', '1-2DTE', '8+DTE'"""
+    if max_dte is None:
+        return f'{min_dte}+DTE'
+    if min_dte == max_dte:
+        return f'{min_dte}DTE'
+    return f'{min_dte}-{max_dte}DTE'
+
+
+def dte_buckets_through(max_dte: Optional[int]) -> List[str]:
+    """
+    Buckets covering 0..max_dte (None = every bucket)
+
+    Buckets are only included whole, so a max_dte that is not a bucket
+    boundary is rounded down to the nearest one.
+    """
+    return [
+        dte_bucket_name(low, high) for low, high in DTE_BUCKETS
+        if max_dte is None or (high is not None and high <= max_dte)
+    ]
+
+
+def assign_dte_buckets(dte: np.ndarray) -> np.ndarray:
+    """Bucket label for each days-to-expiration value (expired rows count as 0DTE)"""
+    dte = np.maximum(np.asarray(dte), 0)
+    edges = np.array([low for low, _ in DTE_BUCKETS[1:]])
+    names = np.array([dte_bucket_name(low, high) for low, high in DTE_BUCKETS], dtype=object)
+    return names[np.searchsorted(edges, dte, side='right')]
+
+
+def aggregate_strike_gex(df: pd.DataFrame, snapshot_ts=None) -> pd.DataFrame:
+    """
+    Roll contract rows up to call/put/net GEX and open interest per strike
+
+    Args:
+        df: Contract rows with strike, option_type, expiration_date, gex,
+            open_interest and greeks.updated_at
+        snapshot_ts: Snapshot timestamp for every row; None groups rows by
+            their own greeks.updated_at (for rebuilding history)
+
+    Returns:
+        DataFrame with STRIKE_AGG_COLUMNS
+    """
+    if df.empty:
+        return pd.DataFrame(columns=STRIKE_AGG_COLUMNS)
+
+    if snapshot_ts is not None:
+        snapshot = pd.Series(pd.Timestamp(snapshot_ts), index=df.index)
+    else:
+        snapshot = pd.to_datetime(df['greeks.updated_at'])
+
+    underlying = _underlying(df)
+
+    expiration = pd.to_datetime(df['expiration_date']).to_numpy(dtype='datetime64[D]')
+    dte = (expiration - snapshot.to_numpy(dtype='datetime64[D]')).astype(int)
+
+    is_call = (df['option_type'] == 'call').to_numpy()
+    gex = df['gex'].to_numpy(dtype=float, na_value=0.0)
+    open_interest = df['open_interest'].to_numpy(dtype=float, na_value=0.0)
+
+    rows = pd.DataFrame({
+        'snapshot_ts': snapshot.to_numpy(),
+        'underlying': underlying.to_numpy(),
+        'dte_bucket': assign_dte_buckets(dte),
+        'strike': df['strike'].to_numpy(dtype=float),
+        'call_gex': np.where(is_call, gex, 0.0),
+        'put_gex': np.where(is_call, 0.0, gex),
+        'call_oi': np.where(is_call, open_interest, 0.0),
+        'put_oi': np.where(is_call, 0.0, open_interest),
+    })
+
+    agg = rows.groupby(STRIKE_AGG_KEY, sort=True).sum().reset_index()
+    # Put GEX is already negative
+    agg['net_gex'] = agg['call_gex'] + agg['put_gex']
+    agg['call_oi'] = agg['call_oi'].astype('int64')
+    agg['put_oi'] = agg['put_oi'].astype('int64')
+
+    return agg[STRIKE_AGG_COLUMNS]
+
+
+def interpolate_zero_gamma(strikes: np.ndarray, net_gex: np.ndarray,
+                           spot: Optional[float] = None) -> Optional[float]:
+    """
+    Level where net GEX by strike crosses zero
+
+    Each sign change between adjacent strikes is linearly interpolated; the
+    crossing closest to spot is returned (the lowest one if spot is unknown).
+    Strikes with exactly zero net GEX (no open interest) are skipped.
+
+    Args:
+        strikes: Strikes in ascending order
+        net_gex: Net GEX per strike
+        spot: Current underlying price
+
+    Returns:
+        Zero-gamma level or None if net GEX never changes sign
+    """
+    nonzero = net_gex != 0
+    strikes, net_gex = strikes[nonzero], net_gex[nonzero]
+
+    cross = np.flatnonzero(np.sign(net_gex[:-1]) != np.sign(net_gex[1:]))
+    if len(cross) == 0:
+        return None
+
+    k1, k2 = strikes[cross], strikes[cross + 1]
+    g1, g2 = net_gex[cross], net_gex[cross + 1]
+    levels = k1 - g1 * (k2 - k1) / (g2 - g1)
+
+    if spot is None or np.isnan(spot):
+        return float(levels.min())
+    return float(levels[np.argmin(np.abs(levels - spot))])
+
+
+def find_walls(strikes: np.ndarray, net_gex: np.ndarray, spot: float,
+               count: int = WALL_COUNT) -> Tuple[List[float], List[float]]:
+    """
+    Strongest call walls above spot and put walls below spot
+
+    Returns:
+        (call walls, put walls), each strongest first: largest positive net
+        GEX above spot, most negative net GEX below spot
+    """
+    if spot is None or np.isnan(spot):
+        return [], []
+
+    above = strikes > spot
+    below = strikes < spot
+    call_order = np.argsort(-net_gex[above], kind='stable')[:count]
+    put_order = np.argsort(net_gex[below], kind='stable')[:count]
+    return strikes[above][call_order].tolist(), strikes[below][put_order].tolist()
+
+
+def _spot_prices(df: pd.DataFrame, underlying: pd.Series) -> Dict[str, float]:
+    """Spot price per underlying from the snapshot's spx_price column"""
+    if 'spx_price' not in df.columns:
+        return {}
+    prices = pd.to_numeric(df['spx_price'], errors='coerce').groupby(underlying.to_numpy()).median()
+    return prices.dropna().to_dict()
+
+
+def _underlying(df: pd.DataFrame) -> pd.Series:
+    if 'underlying' in df.columns:
+        return df['underlying'].fillna('SPX')
+    if 'underlying_symbol' in df.columns:
+        return df['underlying_symbol']
+    return pd.Series('SPX', index=df.index)
+
+
+def summarize_snapshot(df: pd.DataFrame, strike_agg: pd.DataFrame, snapshot_ts) -> pd.DataFrame:
+    """
+    Headline levels per underlying and timeframe for one snapshot
+
+    Args:
+        df: Contract rows of the snapshot (for spot and contract counts)
+        strike_agg: aggregate_strike_gex output for the same snapshot
+        snapshot_ts: Snapshot timestamp
+
+    Returns:
+        DataFrame with SUMMARY_COLUMNS, one row per underlying and timeframe
+    """
+    if df.empty or strike_agg.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    snapshot_ts = pd.Timestamp(snapshot_ts)
+    underlying = _underlying(df)
+    spots = _spot_prices(df, underlying)
+
+    expiration = pd.to_datetime(df['expiration_date']).to_numpy(dtype='datetime64[D]')
+    dte = (expiration - np.datetime64(snapshot_ts.normalize(), 'D')).astype(int)
+    counts = pd.Series(1, index=df.index).groupby(
+        [underlying.to_numpy(), assign_dte_buckets(dte)]
+    ).sum()
+
+    records = []
+    for name, agg in strike_agg.groupby('underlying', sort=True):
+        spot = spots.get(name, np.nan)
+        for timeframe, max_dte in SUMMARY_TIMEFRAMES.items():
+            buckets = dte_buckets_through(max_dte)
+            by_strike = (agg[agg['dte_bucket'].isin(buckets)]
+                         .groupby('strike', sort=True)[['call_gex', 'put_gex', 'net_gex', 'call_oi', 'put_oi']]
+                         .sum())
+            if by_strike.empty:
+                continue
+
+            strikes = by_strike.index.to_numpy(dtype=float)
+            net_gex = by_strike['net_gex'].to_numpy()
+            call_walls, put_walls = find_walls(strikes, net_gex, spot)
+            near = np.abs(strikes - spot) <= AT_PRICE_WINDOW
+
+            record = {
+                'snapshot_ts': snapshot_ts,
+                'underlying': name,
+                'timeframe': timeframe,
+                'max_dte': max_dte,
+                'spot_price': spot,
+                'zero_gex_level': interpolate_zero_gamma(strikes, net_gex, spot),
+                'total_call_gex': by_strike['call_gex'].sum(),
+                'total_put_gex': by_strike['put_gex'].sum(),
+                'net_gex': net_gex.sum(),
+                'net_gex_at_price': float(net_gex[near].mean()) if near.any() else 0.0,
+                'contract_count': int(counts.reindex([(name, b) for b in buckets]).fillna(0).sum()),
+                'call_oi': int(by_strike['call_oi'].sum()),
+                'put_oi': int(by_strike['put_oi'].sum()),
+            }
+            for i in range(WALL_COUNT):
+                record[f'call_wall_{i + 1}'] = call_walls[i] if i < len(call_walls) else None
+                record[f'put_wall_{i + 1}'] = put_walls[i] if i < len(put_walls) else None
+            records.append(record)
+
+    summary = pd.DataFrame(records, columns=SUMMARY_COLUMNS)
+    summary['max_dte'] = summary['max_dte'].astype('Int64')
+    return summary
+
+
+def batch_zero_gamma(by_strike: pd.DataFrame, group_columns: List[str]) -> pd.Series:
+    """
+    interpolate_zero_gamma for many snapshots at once
+
+    Args:
+        by_strike: Rows sorted by group_columns then strike, with strike,
+            net_gex and spot_price columns
+        group_columns: Columns identifying one strike curve
+
+    Returns:
+        Zero-gamma level indexed by group_columns (groups without a
+        crossing are absent)
+    """
+    curve = by_strike[by_strike['net_gex'] != 0]
+    group = curve.groupby(group_columns, sort=False).ngroup().to_numpy()
+    strikes = curve['strike'].to_numpy(dtype=float)
+    net_gex = curve['net_gex'].to_numpy(dtype=float)
+    spot = curve['spot_price'].to_numpy(dtype=float)
+
+    sign = np.sign(net_gex)
+    cross = np.flatnonzero((group[:-1] == group[1:]) & (sign[:-1] != sign[1:]))
+
+    k1, k2 = strikes[cross], strikes[cross + 1]
+    g1, g2 = net_gex[cross], net_gex[cross + 1]
+    levels = k1 - g1 * (k2 - k1) / (g2 - g1)
+
+    # Closest to spot; lowest crossing when spot is unknown
+    crossing_spot = spot[cross]
+    rank = np.where(np.isnan(crossing_spot), levels, np.abs(levels - crossing_spot))
+
+    crossings = curve.iloc[cross][group_columns].assign(zero_gex_level=levels, rank=rank)
+    crossings = crossings.sort_values('rank', kind='stable').drop_duplicates(group_columns)
+    return crossings.set_index(group_columns)['zero_gex_level']
+
+
+def batch_walls(by_strike: pd.DataFrame, group_columns: List[str],
+                count: int = WALL_COUNT) -> pd.DataFrame:
+    """
+    find_walls for many snapshots at once
+
+    Args:
+        by_strike: Rows with group_columns, strike, net_gex and spot_price
+        group_columns: Columns identifying one strike curve
+        count: Walls per side
+
+    Returns:
+        DataFrame indexed by group_columns with call_wall_1..count and
+        put_wall_1..count
+    """
+    walls = []
+    for side, mask, descending in (
+        ('call_wall', by_strike['strike'] > by_strike['spot_price'], True),
+        ('put_wall', by_strike['strike'] < by_strike['spot_price'], False),
+    ):
+        # Strongest first; equal GEX keeps the lower strike first
+        ranked = by_strike[mask].sort_values(
+            group_columns + ['net_gex', 'strike'],
+            ascending=[True] * len(group_columns) + [not descending, True]
+        )
+        ranked = ranked.assign(wall=ranked.groupby(group_columns).cumcount() + 1)
+        ranked = ranked[ranked['wall'] <= count]
+        side_walls = ranked.pivot_table(index=group_columns, columns='wall', values='strike', aggfunc='first')
+        walls.append(side_walls.reindex(columns=range(1, count + 1))
+                     .rename(columns=lambda i: f'{side}_{i}'))
+
+    return pd.concat(walls, axis=1)
+
+
+def summarize_snapshots(df: pd.DataFrame, strike_agg: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    summarize_snapshot for every snapshot in a set of contract rows
+
+    Rows are grouped by their own greeks.updated_at; zero gamma, walls and
+    totals are computed for all snapshots together instead of one snapshot
+    at a time.
+
+    Args:
+        df: Contract rows with greeks.updated_at, strike, option_type,
+            expiration_date, gex, open_interest and spx_price
+        strike_agg: aggregate_strike_gex output for the same rows (computed
+            when omitted)
+
+    Returns:
+        DataFrame with SUMMARY_COLUMNS ordered by snapshot, underlying and timeframe
+    """
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    snapshot_ts = pd.to_datetime(df['greeks.updated_at'])
+    underlying = _underlying(df)
+    keys = ['snapshot_ts', 'underlying']
+
+    if strike_agg is None:
+        strike_agg = aggregate_strike_gex(df)
+
+    spots = pd.to_numeric(df['spx_price'], errors='coerce') if 'spx_price' in df.columns \
+        else pd.Series(np.nan, index=df.index)
+    spots = spots.groupby([snapshot_ts.to_numpy(), underlying.to_numpy()]).median()
+    spots.index.names = keys
+    spots.name = 'spot_price'
+
+    expiration = pd.to_datetime(df['expiration_date']).to_numpy(dtype='datetime64[D]')
+    dte = (expiration - snapshot_ts.to_numpy(dtype='datetime64[D]')).astype(int)
+    counts = pd.Series(1, index=df.index).groupby(
+        [snapshot_ts.to_numpy(), underlying.to_numpy(), assign_dte_buckets(dte)]
+    ).sum()
+    counts.index.names = keys + ['dte_bucket']
+
+    summaries = []
+    for timeframe, max_dte in SUMMARY_TIMEFRAMES.items():
+        buckets = dte_buckets_through(max_dte)
+        by_strike = (strike_agg[strike_agg['dte_bucket'].isin(buckets)]
+                     .groupby(keys + ['strike'], sort=True)[['call_gex', 'put_gex', 'net_gex', 'call_oi', 'put_oi']]
+                     .sum()
+                     .reset_index()
+                     .join(spots, on=keys))
+        if by_strike.empty:
+            continue
+
+        near = (by_strike['strike'] - by_strike['spot_price']).abs() <= AT_PRICE_WINDOW
+        totals = by_strike.groupby(keys).agg(
+            total_call_gex=('call_gex', 'sum'),
+            total_put_gex=('put_gex', 'sum'),
+            net_gex=('net_gex', 'sum'),
+            call_oi=('call_oi', 'sum'),
+            put_oi=('put_oi', 'sum'),
+        )
+        totals['spot_price'] = spots.reindex(totals.index)
+        totals['net_gex_at_price'] = by_strike[near].groupby(keys)['net_gex'].mean()
+        totals['net_gex_at_price'] = totals['net_gex_at_price'].fillna(0.0)
+        totals['zero_gex_level'] = batch_zero_gamma(by_strike, keys)
+        totals['contract_count'] = counts[counts.index.get_level_values('dte_bucket').isin(buckets)] \
+            .groupby(level=keys).sum()
+        totals = totals.join(batch_walls(by_strike, keys))
+
+        summaries.append(totals.reset_index().assign(timeframe=timeframe, max_dte=max_dte))
+
+    summary = pd.concat(summaries, ignore_index=True)
+    summary['timeframe_order'] = summary['timeframe'].map({name: i for i, name in enumerate(SUMMARY_TIMEFRAMES)})
+    summary = summary.sort_values(keys + ['timeframe_order']).reset_index(drop=True)
+
+    summary['max_dte'] = summary['max_dte'].astype('Int64')
+    summary['contract_count'] = summary['contract_count'].fillna(0).astype('int64')
+    for col in ('call_oi', 'put_oi'):
+        summary[col] = summary[col].astype('int64')
+    return summary[SUMMARY_COLUMNS]
+
+
+def save_snapshot_aggregates(db, df: pd.DataFrame, snapshot_ts=None) -> Tuple[int, int]:
+    """
+    Aggregate a snapshot and write gex_strike_agg and gex_snapshot_summary
+
+    Args:
+        db: DatabaseConnection
+        df: Contract rows of the snapshot
+        snapshot_ts: Snapshot timestamp (defaults to the latest greeks.updated_at)
+
+    Returns:
+        (strike aggregate rows inserted, summary rows inserted)
+    """
+    if df.empty:
+        return 0, 0
+
+    if snapshot_ts is None:
+        snapshot_ts = pd.to_datetime(df['greeks.updated_at']).max()
+
+    strike_agg = aggregate_strike_gex(df, snapshot_ts=snapshot_ts)
+    summary = summarize_snapshot(df, strike_agg, snapshot_ts)
+
+    return (
+        db.bulk_upsert(strike_agg, STRIKE_AGG_TABLE, conflict_columns=STRIKE_AGG_KEY),
+        db.bulk_upsert(summary, SUMMARY_TABLE, conflict_columns=SUMMARY_KEY),
+    )
+
+
+def load_strike_gex(con, snapshot_ts=None, underlying: str = 'SPX',
+                    max_dte: Optional[int] = None) -> pd.DataFrame:
+    """
+    Read net GEX by strike for one snapshot from gex_strike_agg (PostgreSQL)
+
+    Args:
+        con: psycopg2 connection or SQLAlchemy engine
+        snapshot_ts: Snapshot to read (None = latest)
+        underlying: Underlying symbol
+        max_dte: Only expirations within N days (None = all; see dte_buckets_through)
+
+    Returns:
+        DataFrame with snapshot_ts, strike, call_gex, put_gex, net_gex,
+        call_oi, put_oi sorted by strike
+    """
+    snapshot_filter = 'snapshot_ts = %(snapshot_ts)s' if snapshot_ts is not None else \
+        f'snapshot_ts = (SELECT MAX(snapshot_ts) FROM {STRIKE_AGG_TABLE} WHERE underlying = %(underlying)s)'
+
+    query = f"""
+    SELECT snapshot_ts, strike,
+           SUM(call_gex) AS call_gex, SUM(put_gex) AS put_gex, SUM(net_gex) AS net_gex,
+           SUM(call_oi) AS call_oi, SUM(put_oi) AS put_oi
+    FROM {STRIKE_AGG_TABLE}
+    WHERE {snapshot_filter}
+      AND underlying = %(underlying)s
+      AND dte_bucket = ANY(%(buckets)s)
+    GROUP BY snapshot_ts, strike
+    ORDER BY strike
+    """
+    params = {
+        'snapshot_ts': pd.Timestamp(snapshot_ts).to_pydatetime() if snapshot_ts is not None else None,
+        'underlying': underlying,
+        'buckets': dte_buckets_through(max_dte),
+    }
+    return pd.read_sql(query, con, params=params)
+
+
+def load_snapshot_summary(con, snapshot_ts=None, underlying: str = 'SPX') -> pd.DataFrame:
+    """
+    Read the gex_snapshot_summary rows of one snapshot (PostgreSQL)
+
+    Args:
+        con: psycopg2 connection or SQLAlchemy engine
+        snapshot_ts: Snapshot to read (None = latest)
+        underlying: Underlying symbol
+
+    Returns:
+        Summary rows indexed by timeframe (empty if the snapshot has none)
+    """
+    snapshot_filter = 'snapshot_ts = %(snapshot_ts)s' if snapshot_ts is not None else \
+        f'snapshot_ts = (SELECT MAX(snapshot_ts) FROM {SUMMARY_TABLE} WHERE underlying = %(underlying)s)'
+    query = f"""
+    SELECT * FROM {SUMMARY_TABLE}
+    WHERE {snapshot_filter} AND underlying = %(underlying)s
+    """
+    params = {
+        'snapshot_ts': pd.Timestamp(snapshot_ts).to_pydatetime() if snapshot_ts is not None else None,
+        'underlying': underlying,
+    }
+    return pd.read_sql(query, con, params=params).set_index('timeframe')
+
+
+def load_summary_history(db, start, end, timeframe: Optional[str] = None,
+                         underlying: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read gex_snapshot_summary rows between two dates
+
+    Args:
+        db: DatabaseConnection (SQLite or PostgreSQL)
+        start: First day (inclusive)
+        end: Last day (inclusive)
+        timeframe: One of SUMMARY_TIMEFRAMES (None = all)
+        underlying: Underlying symbol (None = all)
+
+    Returns:
+        DataFrame of summary rows ordered by snapshot_ts, underlying and timeframe
+    """
+    def param(name):
+        return f'%({name})s' if db.db_type == 'postgresql' else f':{name}'
+
+    filters = [f'snapshot_ts >= {param("start")}', f'snapshot_ts < {param("end")}']
+    if timeframe is not None:
+        filters.append(f'timeframe = {param("timeframe")}')
+    if underlying is not None:
+        filters.append(f'underlying = {param("underlying")}')
+
+    query = f"""
+    SELECT * FROM {SUMMARY_TABLE}
+    WHERE {' AND '.join(filters)}
+    """
+    params = {'start': str(pd.Timestamp(start).date()),
+              'end': str(pd.Timestamp(end).date() + pd.Timedelta(days=1)),
+              'timeframe': timeframe, 'underlying': underlying}
+    rows = db.read_sql(query, params)
+    if rows.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    rows['snapshot_ts'] = pd.to_datetime(rows['snapshot_ts'])
+    rows['timeframe_order'] = rows['timeframe'].map({name: i for i, name in enumerate(SUMMARY_TIMEFRAMES)})
+    rows = rows.sort_values(['snapshot_ts', 'underlying', 'timeframe_order']).reset_index(drop=True)
+    return rows[SUMMARY_COLUMNS]
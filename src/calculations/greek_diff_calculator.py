@@ -2,14 +2,16 @@
 Greek Difference Calculator
 
 Calculates differences between current Greeks and the most recent available
-for each option type/strike/expiration combination.
+for each option type/strike/expiration combination, and changes in gamma, GEX
+and IV since the session open and the prior close.
 """
 
+import numpy as np
 import pandas as pd
 import sqlite3
 import logging
 from typing import Dict, List, Optional, Union
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 
@@ -25,7 +27,14 @@ class GreekDifferenceCalculator:
         'greeks.ask_iv', 'greeks.smv_vol', 'gex'
     ]
 
-    def __init__(self, db_path: str = None, db_engine: Engine = None, db_type: str = 'sqlite'):
+    KEY_COLUMNS = ['option_type', 'strike', 'expiration_date']
+
+    # Columns also diffed against the session open and prior close snapshots
+    HORIZON_COLUMNS = ['greeks.gamma', 'gex', 'greeks.mid_iv']
+    HORIZONS = ['open', 'prior_close']
+
+    def __init__(self, db_path: str = None, db_engine: Engine = None, db_type: str = 'sqlite',
+                 lookback_hours: float = 96):
         """
         Initialize calculator with either SQLite path or SQLAlchemy engine
 
@@ -33,76 +42,251 @@ class GreekDifferenceCalculator:
             db_path: Path to SQLite database (legacy)
             db_engine: SQLAlchemy engine for PostgreSQL
             db_type: 'sqlite' or 'postgresql'
+            lookback_hours: How far before the previous snapshot to look for
+                options missing from it (covers weekends and tiered refreshes)
         """
         self.db_path = db_path
         self.db_engine = db_engine
         self.db_type = db_type
-    
+        self.lookback = timedelta(hours=lookback_hours)
+
+        # Latest row per option within the lookback window, kept between runs
+        # so a long-running collector does not re-read it from the database
+        self.last_snapshot: Optional[pd.DataFrame] = None
+
+        # Session open and prior close reference snapshots for reference_day
+        self.reference_day: Optional[pd.Timestamp] = None
+        self.session_open: Optional[pd.DataFrame] = None
+        self.prior_close: Optional[pd.DataFrame] = None
+
+    @property
+    def snapshot_columns(self) -> List[str]:
+        """Columns needed from previous rows to calculate differences"""
+        return self.KEY_COLUMNS + self.GREEK_COLUMNS + ['greeks.updated_at']
+
+    def remember_snapshot(self, df: pd.DataFrame):
+        """
+        Keep a saved snapshot in memory as the previous data for the next run
+
+        Rows are merged into the cached snapshot so options missing from this
+        snapshot keep their latest earlier row, and rows older than the
+        lookback window are dropped. Options seen for the first time today
+        are added to the session open reference.
+
+        Args:
+            df: Snapshot that was just saved to the database
+        """
+        if df.empty or 'greeks.updated_at' not in df.columns:
+            return
+
+        snapshot = df[[col for col in self.snapshot_columns if col in df.columns]].copy()
+        snapshot['greeks.updated_at'] = pd.to_datetime(snapshot['greeks.updated_at'])
+
+        if self.reference_day is not None and self.session_open is not None:
+            today = snapshot[snapshot['greeks.updated_at'] >= self.reference_day]
+            if not self.session_open.empty:
+                seen = pd.MultiIndex.from_frame(self.session_open[self.KEY_COLUMNS])
+                today = today[~pd.MultiIndex.from_frame(today[self.KEY_COLUMNS]).isin(seen)]
+            if not today.empty:
+                first_rows = (today.sort_values('greeks.updated_at', kind='stable')
+                              .drop_duplicates(subset=self.KEY_COLUMNS, keep='first'))
+                self.session_open = first_rows.reset_index(drop=True) if self.session_open.empty else \
+                    pd.concat([self.session_open, first_rows], ignore_index=True)
+
+        if self.last_snapshot is not None and not self.last_snapshot.empty:
+            snapshot = pd.concat([self.last_snapshot, snapshot], ignore_index=True)
+
+        snapshot['greeks.updated_at'] = pd.to_datetime(snapshot['greeks.updated_at'])
+        snapshot = (snapshot.sort_values('greeks.updated_at', kind='stable')
+                    .drop_duplicates(subset=self.KEY_COLUMNS, keep='last'))
+
+        cutoff = snapshot['greeks.updated_at'].max() - self.lookback
+        self.last_snapshot = snapshot[snapshot['greeks.updated_at'] >= cutoff].reset_index(drop=True)
+
+    def get_previous_timestamp(self, current_timestamp: pd.Timestamp):
+        """
+        Find the latest snapshot timestamp before the current one
+
+        The primary key leads with "greeks.updated_at", so this is a single
+        backward index probe rather than a scan of the table.
+        """
+        if self.db_type == 'postgresql' and self.db_engine:
+            query = 'SELECT MAX("greeks.updated_at") AS prev_timestamp FROM gex_table WHERE "greeks.updated_at" < %(timestamp)s'
+            result = pd.read_sql(query, self.db_engine, params={'timestamp': current_timestamp.to_pydatetime()})
+        else:
+            conn = sqlite3.connect(self.db_path)
+            query = "SELECT MAX([greeks.updated_at]) AS prev_timestamp FROM gex_table WHERE [greeks.updated_at] < ?"
+            result = pd.read_sql(query, conn, params=[str(current_timestamp)])
+            conn.close()
+
+        # Returned as stored, so it compares equal to the rows it came from
+        prev_timestamp = result['prev_timestamp'].iloc[0] if not result.empty else None
+        return prev_timestamp if pd.notna(prev_timestamp) else None
+
+    def read_rows_per_option(self, start, end, latest: bool = True,
+                             include_end: bool = False) -> pd.DataFrame:
+        """
+        Read the latest (or first) row per option between two timestamps
+
+        Args:
+            start: Window start (inclusive)
+            end: Window end (exclusive unless include_end)
+            latest: Keep each option's latest row, otherwise its first row
+            include_end: Include rows at exactly `end`
+
+        Returns:
+            DataFrame with snapshot_columns, one row per option
+        """
+        end_op = '<=' if include_end else '<'
+        order = 'DESC' if latest else 'ASC'
+
+        if self.db_type == 'postgresql' and self.db_engine:
+            columns = ', '.join(f'"{col}"' for col in self.snapshot_columns)
+            query = f"""
+            SELECT DISTINCT ON (option_type, strike, expiration_date) {columns}
+            FROM gex_table
+            WHERE "greeks.updated_at" >= %(start)s
+              AND "greeks.updated_at" {end_op} %(end)s
+            ORDER BY option_type, strike, expiration_date, "greeks.updated_at" {order}
+            """
+            rows = pd.read_sql(query, self.db_engine, params={
+                'start': pd.Timestamp(start).to_pydatetime(),
+                'end': pd.Timestamp(end).to_pydatetime()
+            })
+        else:
+            columns = ', '.join(f'[{col}]' for col in self.snapshot_columns)
+            conn = sqlite3.connect(self.db_path)
+            query = f"""
+            WITH recent AS (
+                SELECT {columns},
+                       ROW_NUMBER() OVER (
+                           PARTITION BY option_type, strike, expiration_date
+                           ORDER BY [greeks.updated_at] {order}
+                       ) AS row_num
+                FROM gex_table
+                WHERE [greeks.updated_at] >= ? AND [greeks.updated_at] {end_op} ?
+            )
+            SELECT {columns} FROM recent WHERE row_num = 1
+            """
+            # Timestamps are stored as text; stored values are passed through as-is
+            params = [v if isinstance(v, str) else str(pd.Timestamp(v)) for v in (start, end)]
+            rows = pd.read_sql(query, conn, params=params)
+            conn.close()
+
+        rows['greeks.updated_at'] = pd.to_datetime(rows['greeks.updated_at'])
+        return rows
+
     def get_previous_data(self, current_timestamp: str) -> pd.DataFrame:
-        """Get the most recent data before the current timestamp for each option"""
+        """
+        Get the most recent data before the current timestamp for each option
+
+        Uses the in-memory snapshot when it predates the current timestamp.
+        Otherwise finds the previous snapshot timestamp and reads the latest
+        row per option from the lookback window ending there.
+        """
         try:
-            # Convert timestamp to string if it's a pandas Timestamp
-            if hasattr(current_timestamp, 'isoformat'):
-                current_timestamp = current_timestamp.isoformat()
-            elif not isinstance(current_timestamp, str):
-                current_timestamp = str(current_timestamp)
-
-            if self.db_type == 'postgresql' and self.db_engine:
-                # PostgreSQL query with proper column quoting and parameter syntax
-                query = """
-                WITH previous_data AS (
-                    SELECT
-                        option_type,
-                        strike,
-                        expiration_date,
-                        MAX("greeks.updated_at") as prev_timestamp
-                    FROM gex_table
-                    WHERE "greeks.updated_at" < %(timestamp)s
-                    GROUP BY option_type, strike, expiration_date
-                )
-                SELECT g.*
-                FROM gex_table g
-                INNER JOIN previous_data p ON
-                    g.option_type = p.option_type AND
-                    g.strike = p.strike AND
-                    g.expiration_date = p.expiration_date AND
-                    g."greeks.updated_at" = p.prev_timestamp
-                """
-                previous_df = pd.read_sql(query, self.db_engine, params={'timestamp': current_timestamp})
-            else:
-                # SQLite query with square bracket quoting and ? parameter
-                conn = sqlite3.connect(self.db_path)
-                query = """
-                WITH previous_data AS (
-                    SELECT
-                        option_type,
-                        strike,
-                        expiration_date,
-                        MAX([greeks.updated_at]) as prev_timestamp
-                    FROM gex_table
-                    WHERE [greeks.updated_at] < ?
-                    GROUP BY option_type, strike, expiration_date
-                )
-                SELECT g.*
-                FROM gex_table g
-                INNER JOIN previous_data p ON
-                    g.option_type = p.option_type AND
-                    g.strike = p.strike AND
-                    g.expiration_date = p.expiration_date AND
-                    g.[greeks.updated_at] = p.prev_timestamp
-                """
-                previous_df = pd.read_sql(query, conn, params=[current_timestamp])
-                conn.close()
-
-            logger.info(f"Retrieved {len(previous_df)} previous records for comparison")
-            return previous_df
+            current_timestamp = pd.Timestamp(current_timestamp)
+
+            if self.last_snapshot is not None and not self.last_snapshot.empty:
+                if self.last_snapshot['greeks.updated_at'].max() < current_timestamp:
+                    logger.info(f"Using {len(self.last_snapshot)} in-memory previous records for comparison")
+                    return self.last_snapshot.copy()
+
+            prev_timestamp = self.get_previous_timestamp(current_timestamp)
+            if prev_timestamp is None:
+                return pd.DataFrame()
+
+            window_start = pd.Timestamp(prev_timestamp) - self.lookback
+            previous_df = self.read_rows_per_option(window_start, prev_timestamp, include_end=True)
+            self.last_snapshot = previous_df
+
+            logger.info(f"Retrieved {len(previous_df)} previous records for comparison (snapshot {prev_timestamp})")
+            return previous_df.copy()
 
         except Exception as e:
             logger.error(f"Error retrieving previous data: {e}")
             return pd.DataFrame()
-    
+
+    def get_horizon_references(self, current_timestamp) -> Dict[str, pd.DataFrame]:
+        """
+        Get the session open and prior close reference snapshots
+
+        Both are loaded once per trading day. The prior close comes from the
+        in-memory snapshot when it holds only earlier days, and the session
+        open is extended by remember_snapshot as options first appear.
+
+        Returns:
+            Dict of horizon name ('open', 'prior_close') to one row per option
+        """
+        current_timestamp = pd.Timestamp(current_timestamp)
+        day_start = current_timestamp.normalize()
+        if self.reference_day == day_start:
+            return {'open': self.session_open, 'prior_close': self.prior_close}
+
+        try:
+            if (self.last_snapshot is not None and not self.last_snapshot.empty
+                    and self.last_snapshot['greeks.updated_at'].max() < day_start):
+                # Nothing saved yet today: the in-memory snapshot still holds
+                # the latest row per option from before today
+                prior_day = self.last_snapshot['greeks.updated_at'].max().normalize()
+                prior_close = self.last_snapshot[self.last_snapshot['greeks.updated_at'] >= prior_day]
+                session_open = pd.DataFrame(columns=self.snapshot_columns)
+            else:
+                prior_timestamp = self.get_previous_timestamp(day_start)
+                prior_close = pd.DataFrame() if prior_timestamp is None else self.read_rows_per_option(
+                    pd.Timestamp(prior_timestamp).normalize(), day_start
+                )
+                session_open = self.read_rows_per_option(day_start, current_timestamp, latest=False)
+
+        except Exception as e:
+            logger.error(f"Error retrieving horizon reference snapshots: {e}")
+            return {'open': pd.DataFrame(), 'prior_close': pd.DataFrame()}
+
+        self.reference_day = day_start
+        self.prior_close = prior_close.reset_index(drop=True)
+        self.session_open = session_open
+        logger.info(f"Loaded horizon references for {day_start.date()}: "
+                    f"{len(session_open)} session open, {len(prior_close)} prior close records")
+        return {'open': self.session_open, 'prior_close': self.prior_close}
+
+    def _reference_frame(self, df: pd.DataFrame, columns: List[str], suffix: str) -> pd.DataFrame:
+        """Reference rows indexed by option with suffixed value columns"""
+        columns = [col for col in columns if col in df.columns]
+        return (df.drop_duplicates(subset=self.KEY_COLUMNS, keep='last')
+                .set_index(self.KEY_COLUMNS)[columns]
+                .add_suffix(suffix))
+
+    def _open_reference(self, session_open: Optional[pd.DataFrame], current_df: pd.DataFrame) -> pd.DataFrame:
+        """Session open rows, with the current row for options not seen earlier today"""
+        frames = [current_df[[col for col in self.KEY_COLUMNS + self.HORIZON_COLUMNS if col in current_df.columns]]]
+        if session_open is not None and not session_open.empty:
+            frames.append(session_open)
+        # _reference_frame keeps the last row per option, so earlier rows win
+        return pd.concat(frames, ignore_index=True)
+
+    def _empty_difference_columns(self, current_df: pd.DataFrame) -> pd.DataFrame:
+        """Add difference columns with None values (0 since the open: this snapshot is the open)"""
+        for col in self.GREEK_COLUMNS:
+            if col in current_df.columns:
+                current_df[f'{col}_diff'] = None
+                current_df[f'{col}_pct_change'] = None
+        for horizon in self.HORIZONS:
+            for col in self.HORIZON_COLUMNS:
+                if col in current_df.columns:
+                    values = current_df[col].to_numpy(dtype=float, na_value=np.nan)
+                    current_df[f'{col}_diff_{horizon}'] = (
+                        np.where(np.isnan(values), np.nan, 0.0) if horizon == 'open' else None
+                    )
+        return current_df
+
     def calculate_differences(self, current_df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate Greek differences for the current dataframe"""
+        """
+        Calculate Greek differences for the current dataframe
+
+        Adds *_diff and *_pct_change against each option's previous row, plus
+        *_diff_open and *_diff_prior_close for HORIZON_COLUMNS. Options with
+        no earlier row today open at the current snapshot (*_diff_open is 0).
+        """
         if current_df.empty:
             return current_df
         
@@ -115,60 +299,70 @@ class GreekDifferenceCalculator:
         
         if previous_df.empty:
             logger.warning("No previous data found for comparison")
-            # Add difference columns with None values
-            for col in self.GREEK_COLUMNS:
-                if col in current_df.columns:
-                    current_df[f'{col}_diff'] = None
-                    current_df[f'{col}_pct_change'] = None
-            return current_df
-        
-        # Create merge keys
-        merge_keys = ['option_type', 'strike', 'expiration_date']
-        
-        # Prepare previous data for merging
-        prev_subset = previous_df[merge_keys + self.GREEK_COLUMNS + ['greeks.updated_at']].copy()
-        prev_subset = prev_subset.add_suffix('_prev')
-        
-        # Rename merge keys back (remove suffix)
-        for key in merge_keys:
-            prev_subset[key] = prev_subset[f'{key}_prev']
-            prev_subset.drop(f'{key}_prev', axis=1, inplace=True)
-        
-        # Merge current data with previous data
-        merged_df = current_df.merge(prev_subset, on=merge_keys, how='left')
-        
-        # Calculate differences and percentage changes
+            return self._empty_difference_columns(current_df)
+
+        # One reference row per option: previous row plus horizon snapshots
+        reference_frames = [
+            self._reference_frame(previous_df, self.GREEK_COLUMNS + ['greeks.updated_at'], '_prev')
+        ]
+        for horizon, reference_df in self.get_horizon_references(current_timestamp).items():
+            if horizon == 'open':
+                reference_df = self._open_reference(reference_df, current_df)
+            if reference_df is not None and not reference_df.empty:
+                reference_frames.append(
+                    self._reference_frame(reference_df, self.HORIZON_COLUMNS, f'_{horizon}_ref')
+                )
+        reference = pd.concat(reference_frames, axis=1)
+        reference.index.names = self.KEY_COLUMNS
+
+        # Merge current data with all references at once
+        merged_df = current_df.merge(reference.reset_index(), on=self.KEY_COLUMNS, how='left')
+
+        # Calculate differences and percentage changes as whole columns
+        diff_columns = {}
         for col in self.GREEK_COLUMNS:
             if col in current_df.columns:
-                current_col = col
                 prev_col = f'{col}_prev'
                 diff_col = f'{col}_diff'
                 pct_change_col = f'{col}_pct_change'
-                
+
                 if prev_col in merged_df.columns:
-                    # Calculate absolute difference
-                    merged_df[diff_col] = merged_df[current_col] - merged_df[prev_col]
-                    
-                    # Calculate percentage change (handle division by zero)
-                    merged_df[pct_change_col] = merged_df.apply(
-                        lambda row: (
-                            ((row[current_col] - row[prev_col]) / row[prev_col] * 100) 
-                            if pd.notna(row[prev_col]) and row[prev_col] != 0 
-                            else None
-                        ), axis=1
-                    )
+                    current_values = merged_df[col].to_numpy(dtype=float, na_value=np.nan)
+                    prev_values = merged_df[prev_col].to_numpy(dtype=float, na_value=np.nan)
+                    diff = current_values - prev_values
+
+                    # Percentage change only where the previous value is present and non-zero
+                    pct_change = np.full(len(diff), np.nan)
+                    valid = ~np.isnan(prev_values) & (prev_values != 0)
+                    np.divide(diff, prev_values, out=pct_change, where=valid)
+
+                    diff_columns[diff_col] = diff
+                    diff_columns[pct_change_col] = pct_change * 100
                 else:
                     # No previous data available
-                    merged_df[diff_col] = None
-                    merged_df[pct_change_col] = None
-        
+                    diff_columns[diff_col] = None
+                    diff_columns[pct_change_col] = None
+
+        for horizon in self.HORIZONS:
+            for col in self.HORIZON_COLUMNS:
+                if col in current_df.columns:
+                    ref_col = f'{col}_{horizon}_ref'
+                    diff_columns[f'{col}_diff_{horizon}'] = (
+                        merged_df[col].to_numpy(dtype=float, na_value=np.nan) -
+                        merged_df[ref_col].to_numpy(dtype=float, na_value=np.nan)
+                    ) if ref_col in merged_df.columns else None
+
+        merged_df = pd.concat([
+            merged_df.drop(columns=[col for col in diff_columns if col in merged_df.columns]),
+            pd.DataFrame(diff_columns, index=merged_df.index)
+        ], axis=1)
+
         # Add metadata about the comparison
         merged_df['prev_timestamp'] = merged_df.get('greeks.updated_at_prev', None)
         merged_df['has_previous_data'] = merged_df['prev_timestamp'].notna()
         
         # Clean up temporary columns
-        columns_to_drop = [col for col in merged_df.columns if col.endswith('_prev')]
-        merged_df.drop(columns=columns_to_drop, inplace=True)
+        merged_df.drop(columns=list(reference.columns), inplace=True)
         
         # Log statistics
         total_options = len(merged_df)
@@ -182,37 +376,32 @@ class GreekDifferenceCalculator:
         if df.empty:
             return {}
         
+        stat_columns = [
+            stat_col
+            for col in self.GREEK_COLUMNS
+            for stat_col in (f'{col}_diff', f'{col}_pct_change')
+            if stat_col in df.columns
+        ]
+        if not stat_columns:
+            return {}
+
+        # One describe pass over every diff and percentage change column
+        described = df[stat_columns].astype(float).describe(percentiles=[0.5])
+
         stats = {}
-        
-        for col in self.GREEK_COLUMNS:
-            diff_col = f'{col}_diff'
-            pct_change_col = f'{col}_pct_change'
-            
-            if diff_col in df.columns:
-                # Absolute difference statistics
-                diff_data = df[diff_col].dropna()
-                if not diff_data.empty:
-                    stats[f'{col}_diff_stats'] = {
-                        'count': len(diff_data),
-                        'mean': diff_data.mean(),
-                        'std': diff_data.std(),
-                        'min': diff_data.min(),
-                        'max': diff_data.max(),
-                        'median': diff_data.median()
-                    }
-                
-                # Percentage change statistics
-                pct_data = df[pct_change_col].dropna()
-                if not pct_data.empty:
-                    stats[f'{col}_pct_change_stats'] = {
-                        'count': len(pct_data),
-                        'mean': pct_data.mean(),
-                        'std': pct_data.std(),
-                        'min': pct_data.min(),
-                        'max': pct_data.max(),
-                        'median': pct_data.median()
-                    }
-        
+        for stat_col in stat_columns:
+            column_stats = described[stat_col]
+            if column_stats['count'] == 0:
+                continue
+            stats[f'{stat_col}_stats'] = {
+                'count': int(column_stats['count']),
+                'mean': column_stats['mean'],
+                'std': column_stats['std'],
+                'min': column_stats['min'],
+                'max': column_stats['max'],
+                'median': column_stats['50%']
+            }
+
         return stats
     
     def get_significant_changes(self, df: pd.DataFrame, 
@@ -277,6 +466,9 @@ class GreekDifferenceCalculator:
                         report_columns.append(f'{col}_diff')
                     if f'{col}_pct_change' in df.columns:
                         report_columns.append(f'{col}_pct_change')
+                    for horizon in self.HORIZONS:
+                        if f'{col}_diff_{horizon}' in df.columns:
+                            report_columns.append(f'{col}_diff_{horizon}')
 
             # Create report dataframe with only existing columns
             available_columns = [col for col in report_columns if col in df.columns]
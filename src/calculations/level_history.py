@@ -0,0 +1,168 @@
+"""
+GEX Level History
+
+Zero-gamma level and call/put walls for every snapshot in a date range, for
+regime studies over months of history.
+
+Days whose every snapshot already has rows in gex_snapshot_summary (written
+at save time, or by an earlier --persist run) are read from that table with
+load_summary_history. The remaining days are read from gex_table with one
+query each and summarized for all of their snapshots at once
+(summarize_snapshots); those days run in parallel. The result is a compact
+time series with one row per snapshot, underlying and timeframe, and the
+recomputed days can optionally be written back to gex_snapshot_summary.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import List, Optional
+
+import pandas as pd
+
+from .gex_aggregates import (
+    SUMMARY_KEY, SUMMARY_TABLE, WALL_COUNT, load_summary_history, summarize_snapshots
+)
+
+logger = logging.getLogger('gex_collector')
+
+LEVEL_COLUMNS = SUMMARY_KEY + ['spot_price', 'zero_gex_level'] + \
+    [f'call_wall_{i}' for i in range(1, WALL_COUNT + 1)] + \
+    [f'put_wall_{i}' for i in range(1, WALL_COUNT + 1)] + \
+    ['net_gex']
+
+CONTRACT_COLUMNS = ['"greeks.updated_at"', 'underlying', 'expiration_date', 'option_type',
+                    'strike', 'gex', 'open_interest', 'spx_price']
+
+
+class LevelHistory:
+    """Compute zero-gamma and wall time series from gex_table"""
+
+    def __init__(self, db, workers: int = 4):
+        """
+        Initialize level history
+
+        Args:
+            db: DatabaseConnection for the gex_table database
+            workers: Days processed in parallel (SQLite always uses 1)
+        """
+        self.db = db
+        self.workers = max(1, workers) if db.db_type == 'postgresql' else 1
+        self.failed_days: List[date] = []
+
+    def _placeholders(self):
+        if self.db.db_type == 'postgresql':
+            return '%(start)s', '%(end)s'
+        return ':start', ':end'
+
+    def snapshot_times(self, start: date, end: date) -> pd.Series:
+        """Distinct snapshot timestamps between start and end (inclusive) in gex_table"""
+        start_param, end_param = self._placeholders()
+
+        query = f"""
+        SELECT DISTINCT "greeks.updated_at" AS snapshot_ts
+        FROM gex_table
+        WHERE "greeks.updated_at" >= {start_param} AND "greeks.updated_at" < {end_param}
+        ORDER BY snapshot_ts
+        """
+        times = self.db.read_sql(query, {'start': str(start), 'end': str(end + timedelta(days=1))})
+
+        return pd.to_datetime(times['snapshot_ts'])
+
+    def stored_summaries(self, start: date, end: date) -> pd.DataFrame:
+        """gex_snapshot_summary rows between start and end (empty if the table is missing)"""
+        if not self.db.table_exists(SUMMARY_TABLE):
+            return pd.DataFrame(columns=SUMMARY_KEY)
+        return load_summary_history(self.db, start, end)
+
+    def summarize_day(self, day: date, persist: bool = False,
+                      stored_snapshots: frozenset = frozenset()) -> pd.DataFrame:
+        """
+        Summaries for every snapshot on one day
+
+        Args:
+            day: Day to read
+            persist: Insert the summaries into gex_snapshot_summary (existing
+                rows are kept)
+            stored_snapshots: Snapshot timestamps already in gex_snapshot_summary;
+                not written again (SQLite tables created on first save have
+                no primary key to skip them)
+
+        Returns:
+            DataFrame with SUMMARY_COLUMNS
+        """
+        start_param, end_param = self._placeholders()
+        query = f"""
+        SELECT {', '.join(CONTRACT_COLUMNS)}
+        FROM gex_table
+        WHERE "greeks.updated_at" >= {start_param} AND "greeks.updated_at" < {end_param}
+        """
+        rows = self.db.read_sql(query, {'start': str(day), 'end': str(day + timedelta(days=1))})
+        summary = summarize_snapshots(rows)
+
+        if persist and not summary.empty:
+            new_rows = summary[~summary['snapshot_ts'].isin(stored_snapshots)]
+            self.db.bulk_upsert(new_rows, SUMMARY_TABLE, conflict_columns=SUMMARY_KEY)
+
+        return summary
+
+    def run(self, start: date, end: date, timeframes: Optional[List[str]] = None,
+            persist: bool = False) -> pd.DataFrame:
+        """
+        Zero-gamma and wall time series between start and end
+
+        Args:
+            start: First day (inclusive)
+            end: Last day (inclusive)
+            timeframes: SUMMARY_TIMEFRAMES names to keep (None = all)
+            persist: Also write full summaries of recomputed days to gex_snapshot_summary
+
+        Returns:
+            DataFrame with LEVEL_COLUMNS ordered by snapshot_ts; days that
+            failed are logged and listed in failed_days
+        """
+        snapshot_times = self.snapshot_times(start, end)
+        stored = self.stored_summaries(start, end)
+        self.failed_days = []
+
+        # Days whose snapshots are all summarized already are read as stored
+        day_times = snapshot_times.groupby(snapshot_times.dt.date).agg(frozenset)
+        stored_days = pd.to_datetime(stored['snapshot_ts']).dt.date
+        stored_times = stored['snapshot_ts'].groupby(stored_days).agg(frozenset)
+        complete = [day for day, times in day_times.items() if stored_times.get(day) == times]
+        days = [day for day in day_times.index if day not in complete]
+
+        logger.info(f"Computing GEX levels for {len(days)} days ({self.workers} workers), "
+                    f"{len(complete)} days read from {SUMMARY_TABLE}")
+
+        summaries = []
+        if complete:
+            summaries.append(stored[stored_days.isin(complete)][LEVEL_COLUMNS])
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self.summarize_day, day, persist, stored_times.get(day, frozenset())): day
+                for day in days
+            }
+            for future in as_completed(futures):
+                day = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to compute GEX levels for {day}: {e}")
+                    self.failed_days.append(day)
+                    continue
+
+                summaries.append(summary[LEVEL_COLUMNS])
+                logger.info(f"Computed GEX levels for {day}: "
+                            f"{summary['snapshot_ts'].nunique() if not summary.empty else 0} snapshots")
+
+        self.failed_days.sort()
+        if not summaries:
+            return pd.DataFrame(columns=LEVEL_COLUMNS)
+
+        levels = pd.concat(summaries, ignore_index=True)
+        if timeframes is not None:
+            levels = levels[levels['timeframe'].isin(timeframes)]
+
+        return levels.sort_values(['snapshot_ts', 'underlying'], kind='stable').reset_index(drop=True)
@@ -3,6 +3,8 @@ from datetime import datetime, time
 import pytz
 from typing import Optional
 
+from .utils.refresh_tiers import parse_refresh_tiers
+
 class Config:
     """Configuration management for GEX data collector"""
     
@@ -24,6 +26,14 @@ class Config:
         self.postgres_pool_size = int(os.getenv('POSTGRES_POOL_SIZE', '5'))
         self.postgres_max_overflow = int(os.getenv('POSTGRES_MAX_OVERFLOW', '10'))
 
+        # gex_table partitioning (PostgreSQL): 'daily' or 'monthly' partitions,
+        # how many future partitions to pre-create, and retention (0 = keep all)
+        self.partition_interval = os.getenv('GEX_PARTITION_INTERVAL', 'monthly').lower()
+        self.partitions_ahead = int(os.getenv('GEX_PARTITIONS_AHEAD', '3'))
+        self.retention_days = int(os.getenv('GEX_RETENTION_DAYS', '0'))
+        # Detached partitions are moved here; blank leaves them detached in place
+        self.retention_archive_schema = os.getenv('GEX_RETENTION_ARCHIVE_SCHEMA', '')
+
         # Underlying symbols configuration
         self.collect_spx = os.getenv('COLLECT_SPX', 'true').lower() == 'true'
         self.collect_xsp = os.getenv('COLLECT_XSP', 'false').lower() == 'true'
@@ -35,6 +45,32 @@ class Config:
         if self.collect_xsp:
             self.underlying_symbols.append('XSP')
 
+        # Number of option chains fetched concurrently (1 = sequential)
+        self.fetch_workers = int(os.getenv('FETCH_WORKERS', '4'))
+
+        # Check greeks.updated_at on the nearest expiration before fetching every chain
+        self.freshness_probe = os.getenv('FRESHNESS_PROBE', 'true').lower() == 'true'
+
+        # Option chain columns kept: 'default' drops fields unused downstream,
+        # 'all' keeps every field, or a comma-separated list of columns
+        self.chain_columns = os.getenv('CHAIN_COLUMNS', 'default')
+
+        # Per-expiration refresh tiers, e.g. "0-1:2,2-7:10,8-:30"
+        # (DTE range : minutes between fetches; blank = refetch every chain each run)
+        self.refresh_tiers = parse_refresh_tiers(os.getenv('REFRESH_TIERS', ''))
+
+        # Expiration calendar filters (listed expirations from the Tradier calendar)
+        self.expiration_min_dte = int(os.getenv('EXPIRATION_MIN_DTE', '0'))
+        self.expiration_max_dte = int(os.getenv('EXPIRATION_MAX_DTE', '30'))
+        # Comma-separated subset of weekly, monthly, quarterly, eom (empty = all)
+        self.expiration_types = [
+            t.strip() for t in os.getenv('EXPIRATION_TYPES', '').split(',') if t.strip()
+        ]
+
+        # Greek differences compare against the latest row per option within
+        # this many hours before the previous snapshot
+        self.greek_diff_lookback_hours = float(os.getenv('GREEK_DIFF_LOOKBACK_HOURS', '96'))
+
         # Black-Scholes calculation parameters
         self.risk_free_rate = float(os.getenv('RISK_FREE_RATE', '0.045'))  # 4.5% default
         self.dividend_yield = float(os.getenv('DIVIDEND_YIELD', '0.013'))  # 1.3% default (SPX)
@@ -8,7 +8,9 @@ without changing application code.
 
 import os
 import sqlite3
-from typing import Optional, Union, Any
+import logging
+from io import StringIO
+from typing import Optional, Union, Any, Dict, List
 from contextlib import contextmanager
 import pandas as pd
 
@@ -20,6 +22,11 @@ try:
 except ImportError:
     HAS_SQLALCHEMY = False
 
+logger = logging.getLogger('gex_collector')
+
+# Declared column types treated as integers by bulk_upsert
+INTEGER_TYPES = {'integer', 'int', 'bigint', 'smallint'}
+
 
 class DatabaseConnection:
     """
@@ -80,7 +87,8 @@ class DatabaseConnection:
             pool_size = self.kwargs.get('pool_size', 5)
             max_overflow = self.kwargs.get('max_overflow', 10)
 
-            connection_string = f'postgresql://{user}:{password}@{host}:{port}/{database}'
+            # bulk_upsert uses psycopg2's copy_expert; SQLAlchemy 2.1 defaults to psycopg 3
+            connection_string = f'postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}'
 
             self.engine = create_engine(
                 connection_string,
@@ -165,6 +173,149 @@ class DatabaseConnection:
         with self.get_connection() as conn:
             df.to_sql(table_name, conn, if_exists=if_exists, index=index, **kwargs)
 
+    def bulk_upsert(self, df: pd.DataFrame, table_name: str,
+                    conflict_columns: Optional[List[str]] = None) -> int:
+        """
+        Insert rows, skipping any that conflict with existing keys
+
+        PostgreSQL: COPY into a temporary staging table, then
+        INSERT ... SELECT ... ON CONFLICT DO NOTHING. SQLite: staging table
+        plus INSERT OR IGNORE. Either way the cost depends on the batch
+        size, not on how much history the target table holds.
+
+        Columns not present in the target table are dropped with a warning.
+        If the table does not exist yet it is created from the DataFrame.
+
+        Args:
+            df: Rows to insert (index is not written)
+            table_name: Target table
+            conflict_columns: Unique key columns for ON CONFLICT (PostgreSQL);
+                None skips rows violating any unique constraint
+
+        Returns:
+            Number of rows inserted
+        """
+        if df.empty:
+            return 0
+
+        if not self.table_exists(table_name):
+            if self.db_type == 'sqlite':
+                df = self._sqlite_timestamps(df)
+            self.to_sql(df, table_name, if_exists='append', index=False)
+            return len(df)
+
+        column_types = self._get_column_types(table_name)
+        columns = [col for col in df.columns if col in column_types]
+        dropped = [col for col in df.columns if col not in column_types]
+        if dropped:
+            logger.warning(f"Columns not in {table_name} were not saved: {', '.join(dropped)}")
+
+        staged = self._prepare_staging_frame(df[columns], column_types)
+        col_list = ', '.join(self.quote_identifier(col) for col in columns)
+        staging_table = f'{table_name}_staging'
+
+        if self.db_type == 'postgresql':
+            conflict_target = ''
+            if conflict_columns:
+                conflict_target = '(' + ', '.join(self.quote_identifier(col) for col in conflict_columns) + ')'
+
+            buffer = StringIO()
+            staged.to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+
+            conn = self.engine.raw_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f'CREATE TEMP TABLE {staging_table} (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP'
+                )
+                cursor.copy_expert(
+                    f'COPY {staging_table} ({col_list}) FROM STDIN WITH (FORMAT csv)', buffer
+                )
+                cursor.execute(f"""
+                    INSERT INTO {table_name} ({col_list})
+                    SELECT {col_list} FROM {staging_table}
+                    ON CONFLICT {conflict_target} DO NOTHING
+                """)
+                inserted = cursor.rowcount
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+            return inserted
+
+        # SQLite
+        staged = self._sqlite_timestamps(staged)
+        with self.get_connection() as conn:
+            staged.to_sql(staging_table, conn, if_exists='replace', index=False)
+            insert = f'INSERT OR IGNORE INTO {table_name} ({col_list}) SELECT {col_list} FROM {staging_table}'
+            drop = f'DROP TABLE {staging_table}'
+            if self.engine:
+                inserted = conn.execute(text(insert)).rowcount
+                conn.execute(text(drop))
+            else:
+                inserted = conn.execute(insert).rowcount
+                conn.execute(drop)
+            conn.commit()
+
+        return inserted
+
+    def _get_column_types(self, table_name: str) -> Dict[str, str]:
+        """Map column name to lower-cased declared type"""
+        info = self.get_table_info(table_name)
+        if self.db_type == 'sqlite':
+            return dict(zip(info['name'], info['type'].str.lower()))
+        return dict(zip(info['column_name'], info['data_type'].str.lower()))
+
+    @staticmethod
+    def _prepare_staging_frame(df: pd.DataFrame, column_types: Dict[str, str]) -> pd.DataFrame:
+        """
+        Make values loadable into the target column types
+
+        Float columns holding whole numbers (e.g. volume with NaNs) are written
+        as integers for INTEGER columns, and boolean columns are normalised
+        so COPY accepts them.
+        """
+        df = df.copy()
+        for col in df.columns:
+            col_type = column_types.get(col, '')
+            series = df[col]
+
+            if col_type in INTEGER_TYPES and pd.api.types.is_float_dtype(series):
+                values = series.dropna()
+                if (values == values.round()).all():
+                    df[col] = series.round().astype('Int64')
+
+            elif col_type == 'boolean' and not pd.api.types.is_bool_dtype(series):
+                df[col] = series.map({1: True, 0: False, 1.0: True, 0.0: False,
+                                      True: True, False: False}).astype('boolean')
+
+        return df
+
+    @staticmethod
+    def _sqlite_timestamps(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Write datetime columns as the text sqlite3 itself stores
+
+        The SQLAlchemy engine stores datetimes with microseconds
+        ('2025-01-02 10:00:00.000000') while rows written through the raw
+        sqlite3 connection have none ('2025-01-02 10:00:00'). Both must
+        match so primary keys and string lookups on greeks.updated_at work
+        across old and new rows.
+        """
+        datetime_columns = [col for col in df.columns if pd.api.types.is_datetime64_any_dtype(df[col])]
+        if not datetime_columns:
+            return df
+
+        df = df.copy()
+        for col in datetime_columns:
+            text_values = df[col].dt.strftime('%Y-%m-%d %H:%M:%S.%f').str.replace(r'\.000000$', '', regex=True)
+            df[col] = text_values.astype(object).where(df[col].notna(), None)
+        return df
+
     def get_table_info(self, table_name: str) -> pd.DataFrame:
         """
         Get table schema information
@@ -187,7 +338,7 @@ class DatabaseConnection:
                 is_nullable,
                 column_default
             FROM information_schema.columns
-            WHERE table_name = :table_name
+            WHERE table_name = %(table_name)s
             ORDER BY ordinal_position
             """
             return self.read_sql(query, {'table_name': table_name})
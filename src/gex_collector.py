@@ -12,16 +12,22 @@ import sys
 import sqlite3
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 import argparse
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
 
 from .config import Config
+from .database import create_database_from_config
+from .partition_manager import create_partition_manager_from_config
 from .utils.logger import GEXLogger
 from .api.tradier_api import TradierAPI
+from .api.expiration_calendar import ExpirationCalendar
+from .api.chain_decoder import ChainDecoder, resolve_chain_columns
 from .calculations.greek_diff_calculator import GreekDifferenceCalculator
+from .calculations.gex_aggregates import save_snapshot_aggregates
 from .calculations.black_scholes import BlackScholesCalculator
+from .utils.refresh_tiers import TieredChainCache
+from .calculations.chain_builder import ChainBuilder, calculate_gex
 from .indicators.technical_indicators import SPXIndicatorCalculator
 
 
@@ -31,26 +37,35 @@ class GEXCollector:
     def __init__(self, config: Config):
         self.config = config
         self.logger = GEXLogger(config)
-        self.api = TradierAPI(config.tradier_api_key)
+        self.api = TradierAPI(
+            config.tradier_api_key,
+            decoder=ChainDecoder(resolve_chain_columns(config.chain_columns))
+        )
+        self.expiration_calendar = ExpirationCalendar(self.api, config.timezone)
+
+        # Latest chain per expiration when collecting with refresh tiers
+        self.chain_cache = TieredChainCache(config.refresh_tiers) if config.refresh_tiers else None
         self.db_path = config.database_path
 
         # Initialize database engine/connection based on type
+        self.db = create_database_from_config(config)
         if config.database_type == 'postgresql':
-            conn_string = (
-                f"postgresql://{config.postgres_user}:{config.postgres_password}@"
-                f"{config.postgres_host}:{config.postgres_port}/{config.postgres_db}"
-            )
-            self.db_engine = create_engine(conn_string)
+            self.db_engine = self.db.engine
+            self.partition_manager = create_partition_manager_from_config(config, self.db_engine)
             self.greek_calculator = GreekDifferenceCalculator(
                 db_engine=self.db_engine,
-                db_type='postgresql'
+                db_type='postgresql',
+                lookback_hours=config.greek_diff_lookback_hours
             )
         else:
             self.db_engine = None
+            self.partition_manager = None
             self.greek_calculator = GreekDifferenceCalculator(
                 db_path=config.database_path,
-                db_type='sqlite'
+                db_type='sqlite',
+                lookback_hours=config.greek_diff_lookback_hours
             )
+        self.partitions_checked_on = None
 
         self.indicator_calculator = SPXIndicatorCalculator(self.api)
 
@@ -80,23 +95,37 @@ class GEXCollector:
                 trading_days.append(check_date.strftime('%Y-%m-%d'))
         
         return trading_days
-    
+
+    def get_expiration_dates(self, symbol: str) -> List[str]:
+        """
+        Get listed expiration dates to collect for a symbol
+
+        Uses the cached Tradier expiration calendar filtered by the configured
+        DTE window and expiration types. Falls back to probing every weekday
+        in the window only if the calendar itself could not be loaded; an
+        empty result from the filters is returned as is.
+        """
+        if self.expiration_calendar.load(symbol).empty:
+            self.logger.logger.warning(
+                f"Expiration calendar unavailable for {symbol}, probing weekdays instead"
+            )
+            first_date = (datetime.now(self.config.timezone).date()
+                          + timedelta(days=self.config.expiration_min_dte)).strftime('%Y-%m-%d')
+            return [
+                date for date in self.get_trading_days_ahead(self.config.expiration_max_dte + 1)
+                if date >= first_date
+            ]
+
+        return self.expiration_calendar.get_expirations(
+            symbol,
+            min_dte=self.config.expiration_min_dte,
+            max_dte=self.config.expiration_max_dte,
+            types=self.config.expiration_types
+        )
+
     def calculate_gex(self, chains_df: pd.DataFrame) -> pd.DataFrame:
         """Calculate gamma exposure for option chains"""
-        if chains_df.empty:
-            return chains_df
-        
-        # Calculate GEX: Strike * Gamma * Open Interest * 100
-        chains_df["gex"] = (
-            chains_df["strike"] * 
-            chains_df["greeks.gamma"] * 
-            chains_df["open_interest"] * 100
-        )
-        
-        # Put options have negative GEX
-        chains_df.loc[chains_df["option_type"] == "put", "gex"] *= -1
-        
-        return chains_df
+        return calculate_gex(chains_df)
     
     def get_latest_timestamp_from_db(self) -> Optional[str]:
         """Get the most recent timestamp from the database"""
@@ -119,6 +148,68 @@ class GEXCollector:
 
         return None
     
+    def maintain_partitions(self):
+        """
+        Pre-create upcoming gex_table partitions and apply retention (once per day)
+
+        No-op for SQLite or when gex_table is not partitioned.
+        """
+        today = datetime.now(self.config.timezone).date()
+        if self.partition_manager is None or self.partitions_checked_on == today:
+            return
+
+        try:
+            if self.partition_manager.is_partitioned():
+                created = self.partition_manager.ensure_partitions(
+                    ahead=self.config.partitions_ahead, start=today
+                )
+                if created:
+                    self.logger.logger.info(f"Created partitions: {', '.join(created)}")
+
+                if self.config.retention_days > 0:
+                    self.partition_manager.apply_retention(
+                        self.config.retention_days,
+                        archive_schema=self.config.retention_archive_schema or None,
+                        today=today
+                    )
+            self.partitions_checked_on = today
+        except Exception as e:
+            self.logger.log_error("maintaining gex_table partitions", e)
+
+    def check_freshness(self, symbol: str, expiration: str,
+                        latest_db_timestamp: str) -> Tuple[bool, pd.DataFrame]:
+        """
+        Check whether Tradier greeks have updated since the last stored snapshot
+
+        Fetches a single chain (normally the 0DTE/nearest expiration) and
+        compares its greeks.updated_at with the database. Returns the probe
+        chain so it can be reused instead of fetched again.
+
+        Args:
+            symbol: Underlying symbol to probe
+            expiration: Expiration date to probe
+            latest_db_timestamp: Latest greeks.updated_at stored in the database
+
+        Returns:
+            Tuple of (has_new_data, probe chain DataFrame)
+        """
+        probe_chain = self.api.get_chains(symbol, expiration)
+
+        if probe_chain.empty or probe_chain['greeks.updated_at'].isna().all():
+            # Can't tell from the probe - fall back to a full collection
+            self.logger.logger.info(f"Freshness probe ({symbol} {expiration}) returned no greeks, collecting all chains")
+            return True, probe_chain
+
+        latest_probe_timestamp = probe_chain['greeks.updated_at'].max()
+        self.logger.logger.info(f"Freshness probe ({symbol} {expiration}): "
+                                f"API {latest_probe_timestamp}, DB {latest_db_timestamp}")
+
+        if pd.to_datetime(latest_db_timestamp) >= pd.to_datetime(latest_probe_timestamp):
+            self.logger.logger.info("No new data available - greeks.updated_at has not changed. Skipping collection.")
+            return False, probe_chain
+
+        return True, probe_chain
+
     def save_to_database(self, df: pd.DataFrame) -> bool:
         """Save dataframe to database (SQLite or PostgreSQL)"""
         if df.empty:
@@ -134,79 +225,33 @@ class GEXCollector:
 
             index_columns = ["greeks.updated_at", "expiration_date", "option_type", "strike"]
 
-            # Check database type
-            if self.config.database_type == 'postgresql':
-                # Use PostgreSQL with existing engine
-
-                # Remove duplicates within the DataFrame
-                df_dedup = df.drop_duplicates(subset=index_columns, keep='last')
-
-                if len(df) != len(df_dedup):
-                    self.logger.logger.warning(f"Removed {len(df) - len(df_dedup)} duplicate records before saving")
-
-                # Get existing records from database to avoid duplicates
-                try:
-                    existing_query = 'SELECT DISTINCT "greeks.updated_at", expiration_date, option_type, strike FROM gex_table'
-                    existing_df = pd.read_sql(existing_query, self.db_engine)
-
-                    if not existing_df.empty:
-                        # Create a set of existing keys for fast lookup
-                        existing_keys = set(
-                            existing_df.apply(
-                                lambda row: (row['greeks.updated_at'], row['expiration_date'],
-                                           row['option_type'], row['strike']),
-                                axis=1
-                            )
-                        )
-
-                        # Filter out records that already exist
-                        df_new = df_dedup[
-                            df_dedup.apply(
-                                lambda row: (row['greeks.updated_at'], row['expiration_date'],
-                                           row['option_type'], row['strike']) not in existing_keys,
-                                axis=1
-                            )
-                        ]
-
-                        if len(df_dedup) != len(df_new):
-                            self.logger.logger.warning(
-                                f"Filtered out {len(df_dedup) - len(df_new)} records that already exist in database"
-                            )
-                        df_dedup = df_new
-                except Exception as e:
-                    self.logger.logger.warning(f"Could not check for existing records: {e}. Proceeding with save.")
-
-                if df_dedup.empty:
-                    self.logger.logger.info("No new records to save after filtering")
-                    return True
-
-                # Set index for proper database structure
-                df_dedup.set_index(index_columns, inplace=True)
+            # Remove duplicates within the DataFrame
+            df_dedup = df.drop_duplicates(subset=index_columns, keep='last')
 
-                # Save to database
-                df_dedup.to_sql('gex_table', self.db_engine, if_exists='append', index=True)
-
-                self.logger.logger.info(f"Saved {len(df_dedup)} records to PostgreSQL database")
-                return True
-            else:
-                # Use SQLite (original code)
-                conn = sqlite3.connect(self.db_path)
+            if len(df) != len(df_dedup):
+                self.logger.logger.warning(f"Removed {len(df) - len(df_dedup)} duplicate records before saving")
 
-                # Remove duplicates within the DataFrame
-                df_dedup = df.drop_duplicates(subset=index_columns, keep='last')
+            # Staged bulk insert; rows already in the table are skipped by the database
+            inserted = self.db.bulk_upsert(df_dedup, 'gex_table', conflict_columns=index_columns)
 
-                if len(df) != len(df_dedup):
-                    self.logger.logger.warning(f"Removed {len(df) - len(df_dedup)} duplicate records before saving")
+            if inserted < len(df_dedup):
+                self.logger.logger.warning(
+                    f"Filtered out {len(df_dedup) - inserted} records that already exist in database"
+                )
 
-                # Set index for proper database structure
-                df_dedup.set_index(index_columns, inplace=True)
+            db_name = 'PostgreSQL' if self.config.database_type == 'postgresql' else 'SQLite'
+            self.logger.logger.info(f"Saved {inserted} records to {db_name} database")
 
-                # Save to database
-                df_dedup.to_sql('gex_table', conn, if_exists='append', index=True)
-                conn.close()
+            # Strike-level rollup and headline levels for signal/dashboard consumers
+            try:
+                agg_rows, summary_rows = save_snapshot_aggregates(self.db, df_dedup)
+                self.logger.logger.info(
+                    f"Saved {agg_rows} strike aggregate rows and {summary_rows} snapshot summary rows"
+                )
+            except Exception as e:
+                self.logger.log_error("saving snapshot aggregates", e)
 
-                self.logger.logger.info(f"Saved {len(df_dedup)} records to SQLite database")
-                return True
+            return True
 
         except Exception as e:
             self.logger.log_error("saving data to database", e)
@@ -361,6 +406,8 @@ class GEXCollector:
             #     self.logger.logger.info("Outside trading hours, skipping data collection")
             #     return True
         
+        self.maintain_partitions()
+
         try:
             # Get current price data for all configured underlying symbols
             underlying_prices = {}
@@ -379,68 +426,96 @@ class GEXCollector:
                         # Save indicators to dedicated CSV
                         self.indicator_calculator.save_indicators_to_csv(spx_indicators)
 
-            # Get expiration dates for the next 30 days
-            expiration_dates = self.get_trading_days_ahead(30)
-            self.logger.logger.info(f"Collecting data for {len(expiration_dates)} expiration dates")
+            # Get listed expiration dates for each underlying
+            expiration_dates = {}
+            for symbol in self.config.underlying_symbols:
+                expiration_dates[symbol] = self.get_expiration_dates(symbol)
+                self.logger.logger.info(
+                    f"Collecting {symbol} data for {len(expiration_dates[symbol])} expiration dates"
+                )
 
-            all_chains = pd.DataFrame()
+            # Fetch every symbol/expiration chain concurrently
+            chain_requests = [
+                (symbol, date)
+                for symbol in self.config.underlying_symbols
+                for date in expiration_dates[symbol]
+            ]
+            latest_db_timestamp = self.get_latest_timestamp_from_db()
+
+            # With refresh tiers only chains whose tier interval has elapsed are refetched
+            fetched_at = datetime.now(self.config.timezone).replace(tzinfo=None)
+            if self.chain_cache is not None:
+                self.chain_cache.prune(chain_requests)
+                due_requests = self.chain_cache.due_requests(chain_requests, fetched_at)
+                self.logger.logger.info(f"Refreshing {len(due_requests)} of {len(chain_requests)} chains due under refresh tiers")
+                if not due_requests:
+                    return True
+            else:
+                due_requests = chain_requests
+
+            # Probe the nearest expiration before fanning out to every chain
+            fetched_chains = {}
+            if self.config.freshness_probe and latest_db_timestamp and due_requests:
+                probe_request = due_requests[0]
+                has_new_data, probe_chain = self.check_freshness(
+                    probe_request[0], probe_request[1], latest_db_timestamp
+                )
+                if not has_new_data:
+                    return True
+                fetched_chains[probe_request] = probe_chain
+
+            fetched_chains.update(self.api.get_chains_batch(
+                [request for request in due_requests if request not in fetched_chains],
+                max_workers=self.config.fetch_workers
+            ))
+
+            chain_metrics = self.api.get_request_metrics().get('/v1/markets/options/chains')
+            if chain_metrics and chain_metrics['p50_latency_ms'] is not None:
+                self.logger.logger.info(
+                    f"Chain requests: {chain_metrics['requests']} total, "
+                    f"p50 {chain_metrics['p50_latency_ms']:.0f}ms, "
+                    f"p95 {chain_metrics['p95_latency_ms']:.0f}ms, "
+                    f"{chain_metrics['retries']} retries"
+                )
 
             # Collect option chains for each underlying symbol
+            chain_builder = ChainBuilder()
             for symbol in self.config.underlying_symbols:
                 self.logger.logger.info(f"Collecting {symbol} option chains...")
 
-                for date in expiration_dates:
-                    self.logger.logger.debug(f"Fetching option chain for {symbol} {date}")
-                    chains = self.api.get_chains(symbol, date)
-                
+                for date in expiration_dates[symbol]:
+                    request = (symbol, date)
+
+                    if self.chain_cache is not None:
+                        # Latest available chain for this expiration, fresh or cached
+                        if request in fetched_chains:
+                            self.chain_cache.update(request, fetched_chains[request], fetched_at)
+                        cached = self.chain_cache.get(request)
+                        if cached is not None:
+                            chains, tier, chain_fetched_at = cached
+                            chain_builder.add(symbol, chains,
+                                              refresh_tier=tier.name if tier else None,
+                                              fetched_at=chain_fetched_at)
+                        else:
+                            self.logger.logger.warning(f"No option chain data for {symbol} {date}")
+                        continue
+
+                    chains = fetched_chains[request]
+
                     if not chains.empty:
-                        # Add underlying symbol to identify the source
-                        chains['underlying_symbol'] = symbol
-
-                        # Calculate GEX
-                        chains = self.calculate_gex(chains)
-
-                        # Add price data for this underlying
-                        price_data = underlying_prices.get(symbol)
-                        if price_data:
-                            # Current price
-                            chains['spx_price'] = price_data.get('last')
-
-                            # Daily OHLC
-                            chains['spx_daily_open'] = price_data.get('daily_open')
-                            chains['spx_daily_high'] = price_data.get('daily_high')
-                            chains['spx_daily_low'] = price_data.get('daily_low')
-                            chains['spx_daily_close'] = price_data.get('daily_close')
-
-                            # Intraday 15-min bar OHLC
-                            chains['spx_intraday_open'] = price_data.get('intraday_open')
-                            chains['spx_intraday_high'] = price_data.get('intraday_high')
-                            chains['spx_intraday_low'] = price_data.get('intraday_low')
-                            chains['spx_intraday_close'] = price_data.get('intraday_close')
-
-                            # Legacy columns for backward compatibility
-                            chains['spx_open'] = price_data.get('open')
-                            chains['spx_high'] = price_data.get('high')
-                            chains['spx_low'] = price_data.get('low')
-                            chains['spx_close'] = price_data.get('close')
-
-                            # Other data
-                            chains['spx_bid'] = price_data.get('bid')
-                            chains['spx_ask'] = price_data.get('ask')
-                            chains['spx_change'] = price_data.get('change')
-                            chains['spx_change_pct'] = price_data.get('change_percentage')
-                            chains['spx_prevclose'] = price_data.get('prevclose')
-
-                        all_chains = pd.concat([all_chains, chains], ignore_index=True)
+                        chain_builder.add(symbol, chains)
                     else:
                         self.logger.logger.warning(f"No option chain data for {symbol} {date}")
-            
+
+            # Single concat, GEX and underlying price columns for all chains
+            # (tiered chains are stored together under the newest timestamp)
+            all_chains = chain_builder.build(underlying_prices, single_snapshot=self.chain_cache is not None)
+
             if all_chains.empty:
                 self.logger.logger.warning("No option chain data collected")
                 return False
             
             # Check if we have new data compared to database
-            latest_db_timestamp = self.get_latest_timestamp_from_db()
             if not all_chains.empty:
                 latest_api_timestamp = all_chains['greeks.updated_at'].max()
 
@@ -488,6 +563,9 @@ class GEXCollector:
             # Save new data
             success = self.save_to_database(all_chains)
             if success:
+                # Previous snapshot for the next run's differences
+                self.greek_calculator.remember_snapshot(all_chains)
+
                 # Export to CSV for dashboard
                 self.export_to_csv()
                 
@@ -0,0 +1,238 @@
+"""
+Partition management for the time-partitioned gex_table (PostgreSQL)
+
+gex_table is range partitioned on "greeks.updated_at" with one partition per
+day or month (GEX_PARTITION_INTERVAL) plus a DEFAULT partition that catches
+rows outside every range. This module pre-creates upcoming partitions and
+detaches, archives or drops partitions past the retention window, so
+retention is a metadata operation instead of a large DELETE.
+"""
+
+import re
+import logging
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from sqlalchemy import text
+    from sqlalchemy.engine import Engine
+    HAS_SQLALCHEMY = True
+except ImportError:
+    HAS_SQLALCHEMY = False
+
+logger = logging.getLogger('gex_collector')
+
+PARTITION_INTERVALS = ('daily', 'monthly')
+
+_BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+class PartitionManager:
+    """Creates and retires range partitions of gex_table"""
+
+    def __init__(self, engine: 'Engine', table_name: str = 'gex_table',
+                 interval: str = 'monthly'):
+        """
+        Initialize partition manager
+
+        Args:
+            engine: SQLAlchemy engine for the PostgreSQL database
+            table_name: Partitioned parent table
+            interval: Partition size, 'daily' or 'monthly'
+        """
+        if interval not in PARTITION_INTERVALS:
+            raise ValueError(f"Unsupported partition interval: {interval}. "
+                             f"Use one of: {', '.join(PARTITION_INTERVALS)}")
+
+        self.engine = engine
+        self.table_name = table_name
+        self.interval = interval
+        self.default_partition = f'{table_name}_default'
+
+    def is_partitioned(self) -> bool:
+        """Check whether the table is a partitioned parent table"""
+        query = """
+        SELECT c.relkind
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relname = :table_name AND n.nspname = current_schema()
+        """
+        with self.engine.connect() as conn:
+            row = conn.execute(text(query), {'table_name': self.table_name}).fetchone()
+        return row is not None and row[0] == 'p'
+
+    def list_partitions(self) -> pd.DataFrame:
+        """
+        List attached partitions and their bounds
+
+        Returns:
+            DataFrame with partition_name, range_start, range_end, is_default
+            (range_start/range_end are None for the DEFAULT partition)
+        """
+        query = """
+        SELECT c.relname AS partition_name,
+               pg_get_expr(c.relpartbound, c.oid) AS bound
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = :table_name
+        ORDER BY c.relname
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(query), {'table_name': self.table_name}).fetchall()
+
+        records = []
+        for name, bound in rows:
+            match = _BOUND_PATTERN.search(bound or '')
+            records.append({
+                'partition_name': name,
+                'range_start': pd.Timestamp(match.group(1)) if match else None,
+                'range_end': pd.Timestamp(match.group(2)) if match else None,
+                'is_default': bound == 'DEFAULT',
+            })
+
+        return pd.DataFrame(records, columns=['partition_name', 'range_start', 'range_end', 'is_default'])
+
+    def partition_range(self, day: date) -> Tuple[date, date]:
+        """Start (inclusive) and end (exclusive) of the partition containing a day"""
+        if self.interval == 'daily':
+            return day, day + timedelta(days=1)
+
+        start = day.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+        return start, end
+
+    def partition_name(self, start: date) -> str:
+        """Partition table name for a range start"""
+        if self.interval == 'daily':
+            return f"{self.table_name}_p{start.strftime('%Y%m%d')}"
+        return f"{self.table_name}_p{start.strftime('%Y%m')}"
+
+    def ensure_partitions(self, ahead: int = 3, start: Optional[date] = None) -> List[str]:
+        """
+        Create partitions from start through the next `ahead` intervals
+
+        Ranges already covered by an existing partition are skipped.
+
+        Args:
+            ahead: Number of future partitions to pre-create
+            start: First day to cover (defaults to today)
+
+        Returns:
+            Names of partitions created
+        """
+        start = start or date.today()
+        existing = self.list_partitions()
+        existing = existing[~existing['is_default']]
+
+        created = []
+        range_start, range_end = self.partition_range(start)
+        for _ in range(ahead + 1):
+            overlaps = (
+                (existing['range_start'] < pd.Timestamp(range_end)) &
+                (existing['range_end'] > pd.Timestamp(range_start))
+            ).any() if not existing.empty else False
+
+            if not overlaps:
+                self.create_partition(range_start, range_end)
+                created.append(self.partition_name(range_start))
+
+            range_start, range_end = self.partition_range(range_end)
+
+        return created
+
+    def ensure_partitions_between(self, first_day: date, last_day: date) -> List[str]:
+        """Create partitions covering every day from first_day to last_day"""
+        created = []
+        day = first_day
+        while day <= last_day:
+            created.extend(self.ensure_partitions(ahead=0, start=day))
+            day = self.partition_range(day)[1]
+        return created
+
+    def create_partition(self, range_start: date, range_end: date):
+        """
+        Create one partition, moving any matching rows out of the DEFAULT partition
+
+        Args:
+            range_start: First day in the partition (inclusive)
+            range_end: End of the partition (exclusive)
+        """
+        name = self.partition_name(range_start)
+        bounds = f"FROM ('{range_start.isoformat()}') TO ('{range_end.isoformat()}')"
+        in_range = (f'"greeks.updated_at" >= \'{range_start.isoformat()}\' '
+                    f'AND "greeks.updated_at" < \'{range_end.isoformat()}\'')
+
+        with self.engine.begin() as conn:
+            has_default = conn.execute(
+                text("SELECT to_regclass(:name) IS NOT NULL"), {'name': self.default_partition}
+            ).scalar()
+            default_rows = has_default and conn.execute(
+                text(f"SELECT EXISTS (SELECT 1 FROM {self.default_partition} WHERE {in_range})")
+            ).scalar()
+
+            if default_rows:
+                # Rows already landed in DEFAULT: build the partition standalone,
+                # move them across, then attach
+                conn.execute(text(f"CREATE TABLE {name} (LIKE {self.table_name} INCLUDING DEFAULTS)"))
+                conn.execute(text(f"INSERT INTO {name} SELECT * FROM {self.default_partition} WHERE {in_range}"))
+                conn.execute(text(f"DELETE FROM {self.default_partition} WHERE {in_range}"))
+                conn.execute(text(f"ALTER TABLE {self.table_name} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+            else:
+                conn.execute(text(f"CREATE TABLE {name} PARTITION OF {self.table_name} FOR VALUES {bounds}"))
+
+        logger.info(f"Created partition {name} ({range_start} to {range_end})")
+
+    def apply_retention(self, retain_days: int, archive_schema: Optional[str] = None,
+                        drop: bool = False, today: Optional[date] = None) -> List[str]:
+        """
+        Detach partitions that end before the retention window
+
+        Args:
+            retain_days: Days of history to keep attached
+            archive_schema: Move detached partitions into this schema
+            drop: Drop detached partitions instead of keeping them
+            today: Reference day (defaults to today)
+
+        Returns:
+            Names of partitions detached
+        """
+        cutoff = pd.Timestamp((today or date.today()) - timedelta(days=retain_days))
+        partitions = self.list_partitions()
+        expired = partitions[~partitions['is_default'] & (partitions['range_end'] <= cutoff)]
+
+        detached = []
+        for name in expired['partition_name']:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {self.table_name} DETACH PARTITION {name}"))
+                if drop:
+                    conn.execute(text(f"DROP TABLE {name}"))
+                elif archive_schema:
+                    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+                    conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+
+            action = 'dropped' if drop else (f'archived to {archive_schema}' if archive_schema else 'detached')
+            logger.info(f"Partition {name} {action}")
+            detached.append(name)
+
+        return detached
+
+
+def create_partition_manager_from_config(config, engine: 'Engine') -> PartitionManager:
+    """
+    Create partition manager from Config object
+
+    Args:
+        config: Config object with partition settings
+        engine: SQLAlchemy engine for the PostgreSQL database
+
+    Returns:
+        PartitionManager instance
+    """
+    return PartitionManager(
+        engine,
+        table_name='gex_table',
+        interval=getattr(config, 'partition_interval', 'monthly')
+    )
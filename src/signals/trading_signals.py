@@ -16,6 +16,11 @@ from typing import Dict, List, Optional, Tuple
 from enum import Enum
 import logging
 
+from ..calculations.gex_aggregates import (
+    STRIKE_AGG_TABLE, SUMMARY_TABLE, SUMMARY_TIMEFRAMES, WALL_COUNT, interpolate_zero_gamma,
+    load_snapshot_summary, load_strike_gex
+)
+
 
 class SignalType(Enum):
     """Trading signal types"""
@@ -50,35 +55,216 @@ class TradingSignalGenerator:
         self.db = db_connection
         self.logger = logging.getLogger(__name__)
 
+    GEX_COLUMNS = [
+        '"greeks.updated_at"',
+        'expiration_date',
+        'strike',
+        'option_type',
+        'gex',
+        'gex_diff',
+        'gex_pct_change',
+        'open_interest',
+        'spx_price',
+        '"greeks.delta"',
+        '"greeks.gamma"',
+    ]
+
     def get_latest_gex_data(self, lookback_hours: int = 168) -> pd.DataFrame:
         """
         Get latest GEX data for analysis
 
+        Every row in the lookback is returned; prefer get_latest_snapshots
+        when only the most recent snapshots are needed.
+
         Args:
             lookback_hours: Hours of historical data to retrieve (default: 168 = 7 days)
 
         Returns:
             DataFrame with GEX data
         """
-        query = """
-        SELECT
-            "greeks.updated_at",
-            expiration_date,
-            strike,
-            option_type,
-            gex,
-            gex_diff,
-            gex_pct_change,
-            open_interest,
-            spx_price,
-            "greeks.delta",
-            "greeks.gamma"
+        query = f"""
+        SELECT {', '.join(self.GEX_COLUMNS)}
         FROM gex_table
         WHERE "greeks.updated_at" >= NOW() - INTERVAL '%s hours'
         ORDER BY "greeks.updated_at" DESC, expiration_date, strike
         """
         return pd.read_sql(query, self.db, params=(lookback_hours,))
 
+    def get_latest_snapshots(self, num_snapshots: int = 1,
+                             spot: Optional[float] = None,
+                             strike_window_pct: Optional[float] = None,
+                             lookback_hours: int = 24,
+                             underlying: str = 'SPX') -> pd.DataFrame:
+        """
+        Get the contract rows of the most recent snapshots
+
+        Snapshot timestamps are found by stepping down the primary key index
+        one MAX() probe at a time, so the cost depends on num_snapshots and
+        not on how much history the table holds.
+
+        Args:
+            num_snapshots: Number of most recent snapshots to return
+            spot: Center of the strike window (required with strike_window_pct)
+            strike_window_pct: Only return strikes within +/- this percent of spot
+            lookback_hours: Ignore snapshots older than this (default: 24)
+            underlying: Only return contracts on this underlying, like the
+                        gex_strike_agg / gex_snapshot_summary reads (default: SPX)
+
+        Returns:
+            DataFrame with get_latest_gex_data columns, newest snapshot first
+        """
+        params = {'num_snapshots': num_snapshots, 'lookback_hours': lookback_hours,
+                  'underlying': underlying}
+
+        strike_filter = ''
+        if strike_window_pct is not None:
+            if spot is None:
+                raise ValueError("spot is required when strike_window_pct is set")
+            window = spot * strike_window_pct / 100
+            params.update(strike_low=spot - window, strike_high=spot + window)
+            strike_filter = 'AND strike BETWEEN %(strike_low)s AND %(strike_high)s'
+
+        query = f"""
+        WITH RECURSIVE snapshots(ts, depth) AS (
+            SELECT MAX("greeks.updated_at"), 1
+            FROM gex_table
+            WHERE "greeks.updated_at" >= NOW() - %(lookback_hours)s * INTERVAL '1 hour'
+            UNION ALL
+            SELECT (
+                SELECT MAX("greeks.updated_at")
+                FROM gex_table
+                WHERE "greeks.updated_at" < s.ts
+                  AND "greeks.updated_at" >= NOW() - %(lookback_hours)s * INTERVAL '1 hour'
+            ), s.depth + 1
+            FROM snapshots s
+            WHERE s.ts IS NOT NULL AND s.depth < %(num_snapshots)s
+        )
+        SELECT {', '.join(self.GEX_COLUMNS)}
+        FROM gex_table
+        WHERE "greeks.updated_at" IN (SELECT ts FROM snapshots WHERE ts IS NOT NULL)
+          AND COALESCE(underlying, 'SPX') = %(underlying)s
+        {strike_filter}
+        ORDER BY "greeks.updated_at" DESC, expiration_date, strike
+        """
+        return pd.read_sql(query, self.db, params=params)
+
+    def get_latest_snapshot(self, lookback_hours: int = 24, underlying: str = 'SPX') -> pd.DataFrame:
+        """
+        Get every contract row of the most recent snapshot
+
+        Args:
+            lookback_hours: Ignore snapshots older than this (default: 24)
+            underlying: Only return contracts on this underlying (default: SPX)
+
+        Returns:
+            DataFrame with the same columns as get_latest_gex_data, or empty
+            if there is no snapshot within the lookback
+        """
+        return self.get_latest_snapshots(num_snapshots=1, lookback_hours=lookback_hours,
+                                         underlying=underlying)
+
+    def get_latest_snapshot_time(self, lookback_hours: int = 24) -> Optional[pd.Timestamp]:
+        """
+        Timestamp of the most recent snapshot (one probe of the primary key index)
+
+        Args:
+            lookback_hours: Ignore snapshots older than this (default: 24)
+
+        Returns:
+            Latest greeks.updated_at, or None if there is no snapshot within the lookback
+        """
+        query = """
+        SELECT MAX("greeks.updated_at") AS latest
+        FROM gex_table
+        WHERE "greeks.updated_at" >= NOW() - %(lookback_hours)s * INTERVAL '1 hour'
+        """
+        latest = pd.read_sql(query, self.db, params={'lookback_hours': lookback_hours})['latest'].iloc[0]
+        return pd.Timestamp(latest) if pd.notna(latest) else None
+
+    def get_snapshot_summary(self, snapshot_ts) -> pd.DataFrame:
+        """
+        Precomputed gex_snapshot_summary rows of a snapshot, indexed by timeframe
+
+        Empty if the snapshot was saved without aggregates (or the table is missing).
+        """
+        try:
+            return load_snapshot_summary(self.db, snapshot_ts=snapshot_ts)
+        except Exception as e:
+            self.logger.warning(f"Could not read {SUMMARY_TABLE}: {e}")
+            return pd.DataFrame()
+
+    def get_net_gex_by_strike(self, snapshot_ts,
+                              max_days_to_expiry: Optional[int] = None) -> pd.DataFrame:
+        """
+        Net GEX per strike of a snapshot from the precomputed gex_strike_agg
+
+        Args:
+            snapshot_ts: Snapshot to read
+            max_days_to_expiry: Only include options expiring within N days (None = all expirations)
+
+        Returns:
+            DataFrame with strike, call, put, net_gex like calculate_net_gex_by_strike;
+            empty if the snapshot was saved without aggregates
+        """
+        try:
+            agg = load_strike_gex(self.db, snapshot_ts=snapshot_ts, max_dte=max_days_to_expiry)
+        except Exception as e:
+            self.logger.warning(f"Could not read {STRIKE_AGG_TABLE}: {e}")
+            return pd.DataFrame()
+
+        return agg.rename(columns={'call_gex': 'call', 'put_gex': 'put'})[['strike', 'call', 'put', 'net_gex']]
+
+    @staticmethod
+    def days_to_expiry(df: pd.DataFrame) -> np.ndarray:
+        """Calendar days from each row's snapshot date to its expiration date"""
+        expiration = pd.to_datetime(df['expiration_date']).to_numpy(dtype='datetime64[D]')
+        snapshot = pd.to_datetime(df['greeks.updated_at']).to_numpy(dtype='datetime64[D]')
+        return (expiration - snapshot).astype(int)
+
+    def calculate_net_gex_by_timeframe(self, snapshot_df: pd.DataFrame,
+                                       timeframes: Dict[str, Optional[int]]) -> Dict[str, Tuple[pd.DataFrame, int]]:
+        """
+        Calculate net GEX per strike for several expiration timeframes at once
+
+        The snapshot is grouped once by (days to expiry, strike); each
+        timeframe then sums the DTE groups it covers.
+
+        Args:
+            snapshot_df: Contract rows of a single snapshot
+            timeframes: Timeframe label -> max days to expiry (None = all expirations)
+
+        Returns:
+            Dict of label -> (DataFrame with strike, call, put, net_gex; options count)
+        """
+        is_call = (snapshot_df['option_type'] == 'call').to_numpy()
+        gex = snapshot_df['gex'].to_numpy(dtype=float, na_value=0.0)
+
+        by_dte = pd.DataFrame({
+            'days_to_expiry': self.days_to_expiry(snapshot_df),
+            'strike': snapshot_df['strike'].to_numpy(dtype=float),
+            'call': np.where(is_call, gex, 0.0),
+            'put': np.where(is_call, 0.0, gex),
+            'options': 1,
+        }).groupby(['days_to_expiry', 'strike'], sort=True).sum().reset_index()
+
+        results = {}
+        for label, max_days_to_expiry in timeframes.items():
+            selected = by_dte
+            if max_days_to_expiry is not None:
+                selected = by_dte[by_dte['days_to_expiry'] <= max_days_to_expiry]
+
+            if selected.empty:
+                self.logger.warning(f"No options found with max_days_to_expiry={max_days_to_expiry}")
+                results[label] = (pd.DataFrame(columns=['strike', 'net_gex']), 0)
+                continue
+
+            net_gex_df = selected.groupby('strike', sort=True)[['call', 'put']].sum()
+            # Calls are positive, puts are already negative
+            net_gex_df['net_gex'] = net_gex_df['call'] + net_gex_df['put']
+            results[label] = (net_gex_df.reset_index(), int(selected['options'].sum()))
+
+        return results
+
     def calculate_net_gex_by_strike(self, df: pd.DataFrame,
                                    max_days_to_expiry: Optional[int] = None) -> pd.DataFrame:
         """
@@ -93,68 +279,36 @@ class TradingSignalGenerator:
             DataFrame with net GEX by strike
         """
         latest_timestamp = df['greeks.updated_at'].max()
-        latest_df = df[df['greeks.updated_at'] == latest_timestamp].copy()
+        latest_df = df[df['greeks.updated_at'] == latest_timestamp]
 
-        # Filter by expiration if specified
-        if max_days_to_expiry is not None:
-            current_date = pd.to_datetime(latest_timestamp).date()
-            latest_df['expiration_date'] = pd.to_datetime(latest_df['expiration_date'])
-            # Calculate days to expiry
-            latest_df['days_to_expiry'] = (latest_df['expiration_date'].dt.date - current_date).apply(lambda x: x.days)
-            latest_df = latest_df[latest_df['days_to_expiry'] <= max_days_to_expiry].copy()
-
-            if latest_df.empty:
-                self.logger.warning(f"No options found with max_days_to_expiry={max_days_to_expiry}")
-                return pd.DataFrame(columns=['strike', 'net_gex'])
-
-        # Pivot to get calls and puts by strike
-        pivot = latest_df.pivot_table(
-            index='strike',
-            columns='option_type',
-            values='gex',
-            aggfunc='sum'
-        ).fillna(0)
-
-        # Calculate net GEX (calls are positive, puts are already negative)
-        if 'call' in pivot.columns and 'put' in pivot.columns:
-            pivot['net_gex'] = pivot['call'] + pivot['put']  # puts are already negative
-        elif 'call' in pivot.columns:
-            pivot['net_gex'] = pivot['call']
-        elif 'put' in pivot.columns:
-            pivot['net_gex'] = pivot['put']
-        else:
-            pivot['net_gex'] = 0
-
-        return pivot.reset_index()
+        net_gex_df, _ = self.calculate_net_gex_by_timeframe(
+            latest_df, {'selected': max_days_to_expiry}
+        )['selected']
+        return net_gex_df
 
     def find_zero_gex_level(self, net_gex_df: pd.DataFrame, current_price: float) -> Optional[float]:
         """
         Find the "zero GEX" level where net GEX crosses zero
         This is a critical level - market tends to be volatile below it
 
+        The crossing is interpolated between strikes with the same
+        interpolate_zero_gamma used for gex_snapshot_summary, so signals read
+        from stored summaries and from contract rows agree.
+
         Args:
             net_gex_df: DataFrame with net GEX by strike
             current_price: Current SPX price
 
         Returns:
-            Zero GEX strike level or None
+            Zero GEX level (closest crossing to current price) or None
         """
         try:
-            # Sort by strike
             sorted_df = net_gex_df.sort_values('strike')
-
-            # Find where net_gex crosses zero
-            sorted_df['sign_change'] = np.sign(sorted_df['net_gex']).diff()
-            zero_crosses = sorted_df[sorted_df['sign_change'] != 0].copy()
-
-            if len(zero_crosses) == 0:
-                return None
-
-            # Find closest zero cross to current price
-            zero_crosses['distance'] = abs(zero_crosses['strike'] - current_price)
-            closest = zero_crosses.nsmallest(1, 'distance')
-
-            return float(closest['strike'].iloc[0])
+            return interpolate_zero_gamma(
+                sorted_df['strike'].to_numpy(dtype=float),
+                sorted_df['net_gex'].to_numpy(dtype=float),
+                current_price
+            )
 
         except Exception as e:
             self.logger.error(f"Error finding zero GEX level: {e}")
@@ -245,6 +399,9 @@ class TradingSignalGenerator:
                        f"Above zero GEX ({zero_gex:.0f}), market likely to be pinned. "
                        f"Range-bound trading expected.")
 
+    # Strikes within this percent of spot drive the GEX change signal
+    CHANGE_WINDOW_PCT = 2.0
+
     def calculate_gex_change_signal(self, df: pd.DataFrame,
                                     current_price: float,
                                     lookback_periods: int = 3) -> Tuple[SignalType, float, str]:
@@ -268,8 +425,9 @@ class TradingSignalGenerator:
                 return SignalType.NEUTRAL, 0.3, "Insufficient data for GEX change analysis"
 
             # Filter data near current price (+/- 2%)
-            price_window = current_price * 0.02
+            price_window = current_price * self.CHANGE_WINDOW_PCT / 100
             near_price = df[
+                df['greeks.updated_at'].isin(timestamps) &
                 (df['strike'] >= current_price - price_window) &
                 (df['strike'] <= current_price + price_window)
             ].copy()
@@ -414,21 +572,45 @@ class TradingSignalGenerator:
         self.logger.info("Generating comprehensive trading signals...")
 
         # Get data
-        gex_df = self.get_latest_gex_data(lookback_hours=24)
+        latest_timestamp = self.get_latest_snapshot_time(lookback_hours=24)
         ema_df = self.get_ema_signals()
 
-        if gex_df.empty:
+        if latest_timestamp is None:
             return {
                 'error': 'No GEX data available',
                 'timestamp': datetime.now()
             }
 
-        # Get current price
-        current_price = float(gex_df['spx_price'].iloc[0])
-        latest_timestamp = gex_df['greeks.updated_at'].max()
+        # Net GEX by strike and spot from the aggregates written at save time;
+        # snapshots saved without them are aggregated from the contract rows
+        net_gex_df = self.get_net_gex_by_strike(latest_timestamp)
+        summary = self.get_snapshot_summary(latest_timestamp)
+        if not net_gex_df.empty and 'all' in summary.index and pd.notna(summary.loc['all', 'spot_price']):
+            current_price = float(summary.loc['all', 'spot_price'])
+        else:
+            gex_df = self.get_latest_snapshot(lookback_hours=24)
+            if gex_df.empty:
+                return {
+                    'error': 'No GEX data available',
+                    'timestamp': datetime.now()
+                }
+            latest_timestamp = gex_df['greeks.updated_at'].max()
+            spx = gex_df['spx_price'].dropna()
+            if spx.empty:
+                return {
+                    'error': 'No SPX price in snapshot',
+                    'timestamp': latest_timestamp
+                }
+            current_price = float(spx.iloc[0])
+            net_gex_df = self.calculate_net_gex_by_strike(gex_df)
+
+        # Recent snapshots near spot for the change signal
+        change_df = self.get_latest_snapshots(
+            num_snapshots=3, spot=current_price,
+            strike_window_pct=self.CHANGE_WINDOW_PCT, lookback_hours=24
+        )
 
         # Calculate GEX metrics
-        net_gex_df = self.calculate_net_gex_by_strike(gex_df)
         zero_gex = self.find_zero_gex_level(net_gex_df, current_price)
         gex_levels = self.find_max_gex_levels(net_gex_df, current_price)
 
@@ -455,7 +637,7 @@ class TradingSignalGenerator:
 
         # 2. GEX Change Signal
         gex_change_signal, gex_change_conf, gex_change_reason = self.calculate_gex_change_signal(
-            gex_df, current_price
+            change_df, current_price, lookback_periods=3
         )
         signals.append({
             'source': SignalSource.GEX_CHANGE.value,
@@ -599,29 +781,64 @@ class TradingSignalGenerator:
         """
         self.logger.info(f"Generating {timeframe_label} signals (max_days_to_expiry={max_days_to_expiry})...")
 
-        # Get data
-        gex_df = self.get_latest_gex_data(lookback_hours=24)
+        latest_timestamp = self.get_latest_snapshot_time(lookback_hours=24)
+        if latest_timestamp is None:
+            return self._no_data_signal(timeframe_label)
 
-        if gex_df.empty:
-            return {
-                'error': 'No GEX data available',
-                'timestamp': datetime.now(),
-                'timeframe': timeframe_label
-            }
+        # Precomputed summary row when the snapshot was saved with aggregates
+        timeframe = next((key for key, max_dte in SUMMARY_TIMEFRAMES.items()
+                          if max_dte == max_days_to_expiry), None)
+        summary = self.get_snapshot_summary(latest_timestamp) if timeframe else pd.DataFrame()
+        if not summary.empty:
+            return self._summary_signal(summary, latest_timestamp, timeframe,
+                                        max_days_to_expiry, timeframe_label)
+
+        snapshot_df = self.get_latest_snapshot(lookback_hours=24)
+        if snapshot_df.empty:
+            return self._no_data_signal(timeframe_label)
 
-        # Get current price
-        current_price = float(gex_df['spx_price'].iloc[0])
-        latest_timestamp = gex_df['greeks.updated_at'].max()
+        net_gex_df, options_count = self.calculate_net_gex_by_timeframe(
+            snapshot_df, {timeframe_label: max_days_to_expiry}
+        )[timeframe_label]
 
-        # Calculate GEX metrics with expiration filter
-        net_gex_df = self.calculate_net_gex_by_strike(gex_df, max_days_to_expiry=max_days_to_expiry)
+        return self._timeframe_signal(snapshot_df, net_gex_df, options_count,
+                                      max_days_to_expiry, timeframe_label)
+
+    def _no_data_signal(self, timeframe_label: str) -> Dict:
+        return {
+            'error': 'No GEX data available',
+            'timestamp': datetime.now(),
+            'timeframe': timeframe_label
+        }
+
+    def _no_options_signal(self, latest_timestamp, timeframe_label: str) -> Dict:
+        return {
+            'error': f'No options found for timeframe {timeframe_label}',
+            'timestamp': latest_timestamp,
+            'timeframe': timeframe_label
+        }
+
+    def _no_price_signal(self, latest_timestamp, timeframe_label: str) -> Dict:
+        return {
+            'error': 'No SPX price in snapshot',
+            'timestamp': latest_timestamp,
+            'timeframe': timeframe_label
+        }
+
+    def _timeframe_signal(self, snapshot_df: pd.DataFrame, net_gex_df: pd.DataFrame,
+                          options_count: int, max_days_to_expiry: Optional[int],
+                          timeframe_label: str) -> Dict:
+        """Signals and key levels for one timeframe of a snapshot"""
+        latest_timestamp = snapshot_df['greeks.updated_at'].max()
+
+        # Rows collected before spx_price was filled have no spot to anchor levels to
+        spx = snapshot_df['spx_price'].dropna()
+        if spx.empty:
+            return self._no_price_signal(latest_timestamp, timeframe_label)
+        current_price = float(spx.iloc[0])
 
         if net_gex_df.empty:
-            return {
-                'error': f'No options found for timeframe {timeframe_label}',
-                'timestamp': latest_timestamp,
-                'timeframe': timeframe_label
-            }
+            return self._no_options_signal(latest_timestamp, timeframe_label)
 
         zero_gex = self.find_zero_gex_level(net_gex_df, current_price)
         gex_levels = self.find_max_gex_levels(net_gex_df, current_price)
@@ -633,21 +850,45 @@ class TradingSignalGenerator:
         ]
         net_gex_at_price = float(near_price['net_gex'].mean()) if not near_price.empty else 0
 
-        # Generate GEX positioning signal
+        return self._levels_signal(latest_timestamp, timeframe_label, max_days_to_expiry, options_count,
+                                   current_price, zero_gex, gex_levels, net_gex_at_price)
+
+    def _summary_signal(self, summary: pd.DataFrame, latest_timestamp, timeframe: str,
+                        max_days_to_expiry: Optional[int], timeframe_label: str) -> Dict:
+        """
+        Signals for one timeframe from its gex_snapshot_summary row
+
+        The stored zero-gamma level is interpolated between strikes; walls
+        are ordered like find_max_gex_levels.
+        """
+        if timeframe not in summary.index:
+            return self._no_options_signal(latest_timestamp, timeframe_label)
+
+        row = summary.loc[timeframe]
+        if pd.isna(row['spot_price']):
+            return self._no_price_signal(latest_timestamp, timeframe_label)
+
+        resistance = [float(row[f'call_wall_{i}']) for i in range(1, WALL_COUNT + 1)
+                      if pd.notna(row[f'call_wall_{i}'])]
+        support = [float(row[f'put_wall_{i}']) for i in range(1, WALL_COUNT + 1)
+                   if pd.notna(row[f'put_wall_{i}'])]
+        zero_gex = float(row['zero_gex_level']) if pd.notna(row['zero_gex_level']) else None
+
+        return self._levels_signal(
+            latest_timestamp, timeframe_label, max_days_to_expiry, int(row['contract_count']),
+            float(row['spot_price']), zero_gex,
+            {'resistance': sorted(resistance), 'support': sorted(support, reverse=True)},
+            float(row['net_gex_at_price'])
+        )
+
+    def _levels_signal(self, latest_timestamp, timeframe_label: str, max_days_to_expiry: Optional[int],
+                       options_count: int, current_price: float, zero_gex: Optional[float],
+                       gex_levels: Dict[str, List[float]], net_gex_at_price: float) -> Dict:
+        """Positioning signal and output dict for one timeframe's key levels"""
         gex_pos_signal, gex_pos_conf, gex_pos_reason = self.calculate_gex_positioning_signal(
             current_price, zero_gex, net_gex_at_price
         )
 
-        # Count options in this timeframe
-        if max_days_to_expiry is not None:
-            current_date = pd.to_datetime(latest_timestamp).date()
-            latest_df = gex_df[gex_df['greeks.updated_at'] == latest_timestamp].copy()
-            latest_df['expiration_date'] = pd.to_datetime(latest_df['expiration_date'])
-            latest_df['days_to_expiry'] = (latest_df['expiration_date'].dt.date - current_date).apply(lambda x: x.days)
-            options_count = len(latest_df[latest_df['days_to_expiry'] <= max_days_to_expiry])
-        else:
-            options_count = len(gex_df[gex_df['greeks.updated_at'] == latest_timestamp])
-
         return {
             'timestamp': latest_timestamp,
             'timeframe': timeframe_label,
@@ -662,10 +903,17 @@ class TradingSignalGenerator:
             'reasoning': gex_pos_reason
         }
 
-    def generate_multi_timeframe_signals(self) -> Dict:
+    def generate_multi_timeframe_signals(self, snapshot_df: Optional[pd.DataFrame] = None) -> Dict:
         """
         Generate signals for multiple expiration timeframes
 
+        The latest snapshot's gex_snapshot_summary rows are read in one query;
+        snapshots saved without them are loaded once and shared by every
+        timeframe.
+
+        Args:
+            snapshot_df: Contract rows of one snapshot (default: latest from the database)
+
         Returns:
             Dict with signals for different timeframes:
             - 0DTE: Same day expiration only
@@ -675,12 +923,29 @@ class TradingSignalGenerator:
         """
         self.logger.info("Generating multi-timeframe GEX signals...")
 
-        signals = {
-            '0dte': self.generate_signals_for_timeframe(max_days_to_expiry=0, timeframe_label="0DTE"),
-            'short_term': self.generate_signals_for_timeframe(max_days_to_expiry=2, timeframe_label="SHORT_TERM"),
-            'weekly': self.generate_signals_for_timeframe(max_days_to_expiry=7, timeframe_label="WEEKLY"),
-            'all': self.generate_signals_for_timeframe(max_days_to_expiry=None, timeframe_label="ALL")
-        }
+        summary = pd.DataFrame()
+        if snapshot_df is None:
+            latest_timestamp = self.get_latest_snapshot_time(lookback_hours=24)
+            if latest_timestamp is None:
+                snapshot_df = pd.DataFrame()
+            else:
+                summary = self.get_snapshot_summary(latest_timestamp)
+                if summary.empty:
+                    snapshot_df = self.get_latest_snapshot(lookback_hours=24)
+
+        if not summary.empty:
+            signals = {
+                key: self._summary_signal(summary, latest_timestamp, key, max_days_to_expiry, key.upper())
+                for key, max_days_to_expiry in SUMMARY_TIMEFRAMES.items()
+            }
+        elif snapshot_df.empty:
+            signals = {key: self._no_data_signal(key.upper()) for key in SUMMARY_TIMEFRAMES}
+        else:
+            net_gex = self.calculate_net_gex_by_timeframe(snapshot_df, SUMMARY_TIMEFRAMES)
+            signals = {
+                key: self._timeframe_signal(snapshot_df, *net_gex[key], max_days_to_expiry, key.upper())
+                for key, max_days_to_expiry in SUMMARY_TIMEFRAMES.items()
+            }
 
         # Add summary information
         signals['generated_at'] = datetime.now().isoformat()
@@ -0,0 +1,123 @@
+"""
+Tiered Chain Refresh
+
+Lets near-dated expirations be refetched more often than back-month ones.
+Tiers are configured as DTE ranges with a refresh interval, e.g.
+"0-1:2,2-7:10,8-:30" (0-1 DTE every 2 minutes, 2-7 DTE every 10 minutes,
+everything further out every 30 minutes). The chain cache keeps the latest
+chain per (symbol, expiration) so each snapshot can be assembled from the
+most recent fetch of every expiration.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Allowance for scheduler jitter when deciding if a chain is due
+DUE_TOLERANCE = timedelta(seconds=30)
+
+
+@dataclass
+class RefreshTier:
+    """DTE range refreshed at a fixed interval"""
+    min_dte: int
+    max_dte: Optional[int]  # None = no upper bound
+    interval_minutes: int
+
+    @property
+    def name(self) -> str:
+        if self.max_dte is None:
+            return f'{self.min_dte}+DTE'
+        return f'{self.min_dte}-{self.max_dte}DTE'
+
+    def contains(self, dte: int) -> bool:
+        return dte >= self.min_dte and (self.max_dte is None or dte <= self.max_dte)
+
+
+def parse_refresh_tiers(spec: Optional[str]) -> List[RefreshTier]:
+    """
+    Parse a REFRESH_TIERS setting
+
+    Args:
+        spec: Comma-separated "min-max:minutes" entries (max may be blank)
+
+    Returns:
+        Tiers sorted by min_dte (empty list if spec is blank)
+    """
+    tiers = []
+    for entry in (spec or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            dte_range, minutes = entry.split(':')
+            low, _, high = dte_range.partition('-')
+            tiers.append(RefreshTier(
+                min_dte=int(low),
+                max_dte=int(high) if high.strip() else None,
+                interval_minutes=int(minutes)
+            ))
+        except ValueError:
+            raise ValueError(f"Invalid refresh tier '{entry}' - expected format like '0-1:2' or '8-:30'")
+
+    return sorted(tiers, key=lambda tier: tier.min_dte)
+
+
+def tier_for_dte(tiers: List[RefreshTier], dte: int) -> Optional[RefreshTier]:
+    """Find the tier covering a DTE (None if no tier matches)"""
+    for tier in tiers:
+        if tier.contains(dte):
+            return tier
+    return None
+
+
+class TieredChainCache:
+    """Latest chain per (symbol, expiration) with the tier and time it was fetched"""
+
+    def __init__(self, tiers: List[RefreshTier]):
+        self.tiers = tiers
+        self._chains: Dict[Tuple[str, str], Tuple[pd.DataFrame, RefreshTier, datetime]] = {}
+
+    def tier_for(self, expiration: str, today: date) -> Optional[RefreshTier]:
+        """Tier an expiration falls into as of today"""
+        dte = (datetime.strptime(expiration, '%Y-%m-%d').date() - today).days
+        return tier_for_dte(self.tiers, dte)
+
+    def due_requests(self, chain_requests: List[Tuple[str, str]],
+                     now: datetime) -> List[Tuple[str, str]]:
+        """
+        Select the chains whose tier interval has elapsed since their last fetch
+
+        Chains never fetched, or outside every tier, are always due.
+        """
+        due = []
+        for request in chain_requests:
+            cached = self._chains.get(request)
+            tier = self.tier_for(request[1], now.date())
+            if cached is None or tier is None:
+                due.append(request)
+                continue
+            _, _, fetched_at = cached
+            if now - fetched_at + DUE_TOLERANCE >= timedelta(minutes=tier.interval_minutes):
+                due.append(request)
+        return due
+
+    def update(self, request: Tuple[str, str], chain: pd.DataFrame, fetched_at: datetime):
+        """Store a freshly fetched chain"""
+        if chain.empty:
+            return
+        tier = self.tier_for(request[1], fetched_at.date())
+        self._chains[request] = (chain, tier, fetched_at)
+
+    def get(self, request: Tuple[str, str]) -> Optional[Tuple[pd.DataFrame, Optional[RefreshTier], datetime]]:
+        """Latest (chain, tier, fetched_at) for a request, if cached"""
+        return self._chains.get(request)
+
+    def prune(self, chain_requests: List[Tuple[str, str]]):
+        """Drop chains no longer requested (e.g. expired dates)"""
+        keep = set(chain_requests)
+        for request in list(self._chains):
+            if request not in keep:
+                del self._chains[request]
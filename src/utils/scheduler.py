@@ -32,6 +32,10 @@ class GEXScheduler:
         # Collection interval (minutes)
         self.collection_interval = int(os.getenv('COLLECTION_INTERVAL_MINUTES', '15'))
 
+        # With refresh tiers, tick at the fastest tier; the collector decides which chains are due
+        if config.refresh_tiers:
+            self.collection_interval = min(tier.interval_minutes for tier in config.refresh_tiers)
+
         # Pre-market and post-market options
         self.collect_premarket = os.getenv('COLLECT_PREMARKET', 'false').lower() == 'true'
         self.collect_postmarket = os.getenv('COLLECT_POSTMARKET', 'false').lower() == 'true'
@@ -116,6 +120,8 @@ class GEXScheduler:
         self.logger.logger.info("GEX COLLECTION SCHEDULER CONFIGURATION")
         self.logger.logger.info("=" * 80)
         self.logger.logger.info(f"Collection Interval: Every {self.collection_interval} minutes")
+        for tier in self.config.refresh_tiers:
+            self.logger.logger.info(f"  Refresh tier {tier.name}: every {tier.interval_minutes} minutes")
         self.logger.logger.info(f"Market Timezone: {self.config.timezone}")
         self.logger.logger.info(f"Your Local Timezone: {self.local_tz}")
         self.logger.logger.info(f"")
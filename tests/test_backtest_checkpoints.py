@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test Backtest Checkpoints
+
+Intraday and hedged backtests save their state after every day; a rerun
+over more data resumes from the last checkpoint whose data is unchanged
+and gives the same legs as a run from scratch.
+"""
+
+import os
+import sys
+import tempfile
+import logging
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from src.backtesting.checkpoint import BacktestCheckpoints, fingerprint_chain
+from src.backtesting.snapshot_store import SnapshotStore
+from backtest_strangle_intraday import IntradayStrangleBacktester
+from backtest_strangle_hedged import HedgedStrangleBacktester
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+START_DATE = '2025-01-13'
+END_DATE = '2025-01-31'
+
+
+def make_history(days: int = 5, snapshots_per_day: int = 12, seed: int = 8) -> pd.DataFrame:
+    """Random-walk SPX with 0-2 DTE chains every 5 minutes"""
+    rng = np.random.default_rng(seed)
+    strikes = np.arange(5900.0, 6100.0, 5.0)
+    frames = []
+    spot = 6000.0
+    for day in pd.bdate_range(START_DATE, periods=days):
+        for i in range(snapshots_per_day):
+            ts = day + pd.Timedelta(hours=9, minutes=30 + 5 * i)
+            spot += rng.normal(0, 4)
+            for dte in range(3):
+                expiration = (day + pd.Timedelta(days=dte)).strftime('%Y-%m-%d')
+                for option_type in ('call', 'put'):
+                    sign = 1 if option_type == 'call' else -1
+                    intrinsic = np.maximum(sign * (spot - strikes), 0)
+                    price = np.round(intrinsic + 5 + rng.gamma(2.0, 2.0, len(strikes)), 2)
+                    frames.append(pd.DataFrame({
+                        'greeks.updated_at': ts,
+                        'expiration_date': expiration,
+                        'strike': strikes,
+                        'option_type': option_type,
+                        'option_price': price,
+                        'bid': price - 0.5,
+                        'ask': price + 0.5,
+                        'gex': sign * rng.gamma(2.0, 1e6, len(strikes)) + rng.normal(0, 5e5),
+                        'spx_price': spot,
+                    }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class CountingBacktester(HedgedStrangleBacktester):
+    """Counts snapshot reads"""
+
+    def __init__(self, store):
+        super().__init__(None, store=store)
+        self.snapshot_reads = 0
+
+    def get_snapshot_data(self, snapshot_time):
+        self.snapshot_reads += 1
+        return super().get_snapshot_data(snapshot_time)
+
+
+def run_quietly(backtester, method: str, **kwargs) -> pd.DataFrame:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return getattr(backtester, method)(START_DATE, END_DATE, **kwargs)
+
+
+def test_fingerprint_chain():
+    """A day's digest changes when it or any earlier day changes"""
+    fingerprints = {'2025-01-13': (10, 'a'), '2025-01-14': (10, 'b'), '2025-01-15': (10, 'c')}
+    chain = fingerprint_chain(fingerprints)
+
+    changed = fingerprint_chain({**fingerprints, '2025-01-14': (11, 'b2')})
+    assert changed['2025-01-13'] == chain['2025-01-13']
+    assert changed['2025-01-14'] != chain['2025-01-14']
+    assert changed['2025-01-15'] != chain['2025-01-15']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoints = BacktestCheckpoints(tmp, 'Test', {'start_date': '2025-01-13'})
+        assert checkpoints.resume(fingerprints) == (None, None)
+        for day in fingerprints:
+            checkpoints.save(day, {'day': day})
+
+        assert checkpoints.resume(fingerprints) == ('2025-01-15', {'day': '2025-01-15'})
+        assert checkpoints.resume({**fingerprints, '2025-01-14': (11, 'b2')}) == \
+            ('2025-01-13', {'day': '2025-01-13'})
+        other = BacktestCheckpoints(tmp, 'Test', {'start_date': '2025-01-14'})
+        assert other.resume(fingerprints) == (None, None)
+    logger.info("✓ Fingerprint chain")
+
+
+def test_hedged_backtest_resumes():
+    """A rerun after new days arrive processes only those days"""
+    history = make_history()
+    days = history['greeks.updated_at'].dt.strftime('%Y-%m-%d')
+    full_store = SnapshotStore.from_frame(history)
+    first_days = SnapshotStore.from_frame(history[days < '2025-01-16'])
+
+    expected = run_quietly(CountingBacktester(full_store), 'backtest_hedged')
+    assert len(expected) > 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first = CountingBacktester(first_days)
+        run_quietly(first, 'backtest_hedged', checkpoint_dir=tmp)
+        assert first.snapshot_reads >= 36
+
+        resumed = CountingBacktester(full_store)
+        result = run_quietly(resumed, 'backtest_hedged', checkpoint_dir=tmp)
+        pd.testing.assert_frame_equal(result, expected)
+        # Only the two new days are read (plus each day's overnight close)
+        assert resumed.snapshot_reads <= 2 * (12 + 1)
+
+        unchanged = CountingBacktester(full_store)
+        result = run_quietly(unchanged, 'backtest_hedged', checkpoint_dir=tmp)
+        pd.testing.assert_frame_equal(result, expected)
+        assert unchanged.snapshot_reads == 0
+    logger.info(f"✓ Resumed hedged backtest matches ({len(expected)} legs)")
+
+
+def test_intraday_backtest_reprocesses_changed_day():
+    """Snapshots added to an already processed day invalidate it and later days"""
+    history = make_history()
+    days = history['greeks.updated_at'].dt.strftime('%Y-%m-%d')
+    # The first run saw the third day only until 10:00
+    partial = history[(days < '2025-01-15') |
+                      ((days == '2025-01-15') & (history['greeks.updated_at'].dt.hour < 10))]
+
+    expected = run_quietly(IntradayStrangleBacktester(None, store=SnapshotStore.from_frame(history)),
+                           'backtest_intraday')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run_quietly(IntradayStrangleBacktester(None, store=SnapshotStore.from_frame(partial)),
+                    'backtest_intraday', checkpoint_dir=tmp)
+        result = run_quietly(IntradayStrangleBacktester(None, store=SnapshotStore.from_frame(history)),
+                             'backtest_intraday', checkpoint_dir=tmp)
+        pd.testing.assert_frame_equal(result, expected)
+
+        # Different parameters do not share checkpoints
+        other = run_quietly(IntradayStrangleBacktester(None, store=SnapshotStore.from_frame(history)),
+                            'backtest_intraday', checkpoint_dir=tmp, profit_target_pct=10.0)
+        assert len(os.listdir(tmp)) == 2
+        pd.testing.assert_frame_equal(
+            other,
+            run_quietly(IntradayStrangleBacktester(None, store=SnapshotStore.from_frame(history)),
+                        'backtest_intraday', profit_target_pct=10.0))
+    logger.info("✓ Changed day reprocessed")
+
+
+if __name__ == "__main__":
+    test_fingerprint_chain()
+    test_hedged_backtest_resumes()
+    test_intraday_backtest_reprocesses_changed_day()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Test DatabaseConnection.bulk_upsert
+
+Runs against a temporary SQLite database: rows already stored are skipped,
+new rows are inserted and columns unknown to the table are dropped. The
+PostgreSQL path runs against a fake psycopg2 connection that formats
+parameters the way psycopg2 does.
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import tempfile
+import logging
+import warnings
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.database import DatabaseConnection
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ['greeks.updated_at', 'expiration_date', 'option_type', 'strike']
+
+
+def make_snapshot(updated_at: str, strikes) -> pd.DataFrame:
+    strikes = np.asarray(strikes, dtype=float)
+    return pd.DataFrame({
+        'greeks.updated_at': updated_at,
+        'expiration_date': '2025-01-17',
+        'option_type': 'call',
+        'strike': strikes,
+        'open_interest': np.where(strikes > 5000, np.nan, 100.0),
+        'gex': strikes * 0.01,
+    })
+
+
+def create_db(path: str) -> DatabaseConnection:
+    db = DatabaseConnection(db_type='sqlite', db_path=path)
+    db.execute("""
+        CREATE TABLE gex_table (
+            "greeks.updated_at" TIMESTAMP NOT NULL,
+            expiration_date TEXT NOT NULL,
+            option_type TEXT NOT NULL,
+            strike REAL NOT NULL,
+            open_interest INTEGER,
+            gex REAL,
+            PRIMARY KEY ("greeks.updated_at", expiration_date, option_type, strike)
+        )
+    """)
+    return db
+
+
+class FakePostgresCursor:
+    """psycopg2-style cursor answering catalog queries from canned columns"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rowcount = -1
+        self.rows = []
+
+    def execute(self, query, params=None):
+        if params:
+            # psycopg2 only substitutes %(name)s placeholders
+            query = query % {key: f"'{value}'" for key, value in params.items()}
+        if re.search(r'(?<!:):[A-Za-z_]', query):
+            raise RuntimeError(f'syntax error at or near ":" in {query!r}')
+        self.connection.statements.append(query)
+
+        self.description, self.rows = None, []
+        if 'information_schema.columns' in query:
+            table = re.search(r"table_name = '(\w+)'", query).group(1)
+            self.description = [('column_name',), ('data_type',), ('is_nullable',), ('column_default',)]
+            self.rows = [(name, data_type, 'YES', None)
+                         for name, data_type in self.connection.tables.get(table, [])]
+        elif 'information_schema.tables' in query:
+            self.description = [('table_name',)]
+            self.rows = [(table,) for table in self.connection.tables]
+        elif query.lstrip().startswith('INSERT'):
+            self.rowcount = len(self.connection.copied)
+
+    def copy_expert(self, query, buffer):
+        self.connection.statements.append(query)
+        self.connection.copied = buffer.read().splitlines()
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchmany(self, size=None):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakePostgres:
+    """Connection standing in for both engine.connect() and raw_connection()"""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.statements = []
+        self.copied = []
+        self.committed = False
+
+    def cursor(self):
+        return FakePostgresCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def fake_postgres_db(tables) -> DatabaseConnection:
+    """PostgreSQL DatabaseConnection whose connections are a FakePostgres"""
+    db = DatabaseConnection(db_type='postgresql')
+    fake = FakePostgres(tables)
+    db.get_connection = lambda: contextlib.nullcontext(fake)
+    db.engine.raw_connection = lambda: fake
+    db.fake = fake
+    warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy')
+    return db
+
+
+def test_bulk_upsert_skips_existing_rows():
+    """Existing keys are skipped without reading the table first"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_db(os.path.join(tmp, 'test.db'))
+
+        first = make_snapshot('2025-01-02 10:00:00', [4990, 5000, 5010])
+        assert db.bulk_upsert(first, 'gex_table', conflict_columns=KEY_COLUMNS) == 3
+
+        # Two rows overlap the first batch, one is new
+        second = make_snapshot('2025-01-02 10:00:00', [5000, 5010, 5020])
+        assert db.bulk_upsert(second, 'gex_table', conflict_columns=KEY_COLUMNS) == 1
+
+        assert db.get_row_count('gex_table') == 4
+        assert not db.table_exists('gex_table_staging')
+
+        stored = db.read_sql('SELECT open_interest FROM gex_table ORDER BY strike')
+        assert stored['open_interest'].iloc[0] == 100
+        assert stored['open_interest'].isna().sum() == 2
+        db.close()
+    logger.info("✓ Existing rows skipped")
+
+
+def test_bulk_upsert_drops_unknown_columns():
+    """Columns not in the table are ignored instead of failing the save"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_db(os.path.join(tmp, 'test.db'))
+
+        df = make_snapshot('2025-01-02 10:30:00', [5000])
+        df['not_a_column'] = 'x'
+        assert db.bulk_upsert(df, 'gex_table') == 1
+        assert 'not_a_column' not in db.read_sql('SELECT * FROM gex_table').columns
+        db.close()
+    logger.info("✓ Unknown columns dropped")
+
+
+def test_bulk_upsert_creates_missing_table():
+    """First save creates the table from the DataFrame"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseConnection(db_type='sqlite', db_path=os.path.join(tmp, 'test.db'))
+
+        df = make_snapshot('2025-01-02 11:00:00', [5000, 5005])
+        assert db.bulk_upsert(df, 'gex_table') == 2
+        assert db.get_row_count('gex_table') == 2
+        db.close()
+    logger.info("✓ Missing table created")
+
+
+def test_bulk_upsert_matches_sqlite3_timestamps():
+    """Rows saved through sqlite3 before and bulk_upsert now share one key format"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'test.db')
+        db = create_db(path)
+
+        # Saved the way the collector used to: pandas over a raw sqlite3 connection
+        old = make_snapshot('2025-01-02 10:00:00', [4990, 5000])
+        old['greeks.updated_at'] = pd.to_datetime(old['greeks.updated_at'])
+        conn = sqlite3.connect(path)
+        old.to_sql('gex_table', conn, if_exists='append', index=False)
+        conn.close()
+
+        new = make_snapshot('2025-01-02 10:00:00', [4990, 5000, 5010])
+        new['greeks.updated_at'] = pd.to_datetime(new['greeks.updated_at'])
+        assert db.bulk_upsert(new, 'gex_table', conflict_columns=KEY_COLUMNS) == 1
+        assert db.get_row_count('gex_table') == 3
+
+        stored = db.read_sql("""SELECT strike FROM gex_table WHERE "greeks.updated_at" = '2025-01-02 10:00:00'""")
+        assert len(stored) == 3
+
+        # Sub-second timestamps keep their microseconds, as sqlite3 writes them
+        later = make_snapshot('2025-01-02 10:05:00.250000', [5000])
+        later['greeks.updated_at'] = pd.to_datetime(later['greeks.updated_at'])
+        assert db.bulk_upsert(later, 'gex_table') == 1
+        assert db.get_max_timestamp('gex_table') is not None
+        stored = db.read_sql("""SELECT strike FROM gex_table WHERE "greeks.updated_at" = '2025-01-02 10:05:00.250000'""")
+        assert len(stored) == 1
+        db.close()
+    logger.info("✓ Old and new rows share timestamp text")
+
+
+def test_bulk_upsert_postgresql():
+    """Column lookup binds with psycopg2 placeholders, then COPY + ON CONFLICT"""
+    db = fake_postgres_db({'gex_table': [
+        ('greeks.updated_at', 'timestamp without time zone'), ('expiration_date', 'text'),
+        ('option_type', 'text'), ('strike', 'double precision'),
+        ('open_interest', 'integer'), ('gex', 'double precision'),
+    ]})
+
+    info = db.get_table_info('gex_table')
+    assert info['column_name'].tolist()[:2] == ['greeks.updated_at', 'expiration_date']
+
+    df = make_snapshot('2025-01-02 10:00:00', [4990, 5000, 5010])
+    df['not_a_column'] = 'x'
+    assert db.bulk_upsert(df, 'gex_table', conflict_columns=KEY_COLUMNS) == 3
+
+    copy, insert = db.fake.statements[-2:]
+    assert copy.startswith('COPY gex_table_staging') and 'not_a_column' not in copy
+    assert 'ON CONFLICT ("greeks.updated_at", "expiration_date", "option_type", "strike") DO NOTHING' in insert
+    # Whole-number open interest is copied as an integer
+    assert db.fake.copied[0].split(',')[4] == '100'
+    assert db.fake.committed
+    logger.info("✓ PostgreSQL bulk upsert")
+
+
+if __name__ == "__main__":
+    test_bulk_upsert_skips_existing_rows()
+    test_bulk_upsert_drops_unknown_columns()
+    test_bulk_upsert_creates_missing_table()
+    test_bulk_upsert_matches_sqlite3_timestamps()
+    test_bulk_upsert_postgresql()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test Option Chain Builder
+
+Checks that ChainBuilder produces the same frame as the legacy
+per-expiration concat loop in collect_data, and benchmarks both at
+50k+ contracts to guard against the quadratic copy coming back.
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.calculations.chain_builder import ChainBuilder, UNDERLYING_PRICE_COLUMNS
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SYMBOLS = ['SPX', 'XSP']
+EXPIRATIONS = 40
+CONTRACTS_PER_EXPIRATION = 700  # 2 x 40 x 700 = 56,000 contracts
+
+
+def make_chain(expiration_index: int, contracts: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Build a synthetic chain shaped like TradierAPI.get_chains output"""
+    strikes = np.repeat(np.arange(contracts // 2) * 5.0 + 4000.0, 2)[:contracts]
+    return pd.DataFrame({
+        'symbol': [f'SPXW{expiration_index:03d}{i:05d}' for i in range(contracts)],
+        'strike': strikes,
+        'option_type': np.tile(['call', 'put'], contracts // 2 + 1)[:contracts],
+        'expiration_date': f'2025-01-{expiration_index % 28 + 1:02d}',
+        'open_interest': rng.integers(0, 5000, contracts),
+        'volume': rng.integers(0, 1000, contracts),
+        'bid': rng.random(contracts) * 50,
+        'ask': rng.random(contracts) * 50 + 0.5,
+        'greeks.gamma': rng.random(contracts) * 0.01,
+        'greeks.delta': rng.random(contracts),
+        'greeks.mid_iv': rng.random(contracts) * 0.5,
+        'greeks.updated_at': '2025-01-02 15:59:00',
+    })
+
+
+def make_price_data(last: float) -> dict:
+    """Build a synthetic underlying price dict"""
+    return {key: last + i for i, key in enumerate(UNDERLYING_PRICE_COLUMNS.values())}
+
+
+def legacy_build(chains_by_key: dict, underlying_prices: dict) -> pd.DataFrame:
+    """Original collect_data loop: per-column broadcast plus concat in the loop"""
+    all_chains = pd.DataFrame()
+    for (symbol, _), source in chains_by_key.items():
+        chains = source.copy()
+        chains['underlying_symbol'] = symbol
+        chains['gex'] = chains['strike'] * chains['greeks.gamma'] * chains['open_interest'] * 100
+        chains.loc[chains['option_type'] == 'put', 'gex'] *= -1
+
+        price_data = underlying_prices.get(symbol)
+        if price_data:
+            for column, key in UNDERLYING_PRICE_COLUMNS.items():
+                chains[column] = price_data.get(key)
+
+        all_chains = pd.concat([all_chains, chains], ignore_index=True)
+    return all_chains
+
+
+def builder_build(chains_by_key: dict, underlying_prices: dict) -> pd.DataFrame:
+    """New path used by collect_data"""
+    builder = ChainBuilder()
+    for (symbol, _), source in chains_by_key.items():
+        builder.add(symbol, source.copy())
+    return builder.build(underlying_prices)
+
+
+def make_inputs():
+    rng = np.random.default_rng(42)
+    chains_by_key = {
+        (symbol, i): make_chain(i, CONTRACTS_PER_EXPIRATION, rng)
+        for symbol in SYMBOLS
+        for i in range(EXPIRATIONS)
+    }
+    underlying_prices = {'SPX': make_price_data(5000.0), 'XSP': make_price_data(500.0)}
+    return chains_by_key, underlying_prices
+
+
+def test_builder_matches_legacy():
+    """ChainBuilder output equals the legacy loop output"""
+    logger.info("Testing ChainBuilder output against legacy loop...")
+    chains_by_key, underlying_prices = make_inputs()
+
+    expected = legacy_build(chains_by_key, underlying_prices)
+    actual = builder_build(chains_by_key, underlying_prices)
+
+    pd.testing.assert_frame_equal(
+        actual[expected.columns], expected, check_dtype=False
+    )
+    assert (actual.loc[actual['underlying_symbol'] == 'XSP', 'spx_price'] == 500.0).all()
+    logger.info(f"✓ Outputs match ({len(actual):,} contracts)")
+
+
+def test_builder_missing_price_data():
+    """Symbols without price data get empty price columns"""
+    chains_by_key, underlying_prices = make_inputs()
+    underlying_prices['XSP'] = None
+
+    actual = builder_build(chains_by_key, underlying_prices)
+
+    assert actual.loc[actual['underlying_symbol'] == 'XSP', 'spx_price'].isna().all()
+    assert (actual.loc[actual['underlying_symbol'] == 'SPX', 'spx_price'] == 5000.0).all()
+    assert ChainBuilder().build(underlying_prices).empty
+    logger.info("✓ Missing price data handled")
+
+
+def test_builder_benchmark():
+    """ChainBuilder is faster than the legacy loop at 50k+ contracts"""
+    chains_by_key, underlying_prices = make_inputs()
+    contracts = sum(len(chain) for chain in chains_by_key.values())
+    assert contracts >= 50000
+
+    start = time.perf_counter()
+    legacy_build(chains_by_key, underlying_prices)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    builder_build(chains_by_key, underlying_prices)
+    builder_seconds = time.perf_counter() - start
+
+    speedup = legacy_seconds / builder_seconds
+    logger.info(f"Legacy loop:  {legacy_seconds * 1000:.0f}ms for {contracts:,} contracts")
+    logger.info(f"ChainBuilder: {builder_seconds * 1000:.0f}ms for {contracts:,} contracts")
+    logger.info(f"Speedup: {speedup:.1f}x")
+
+    assert builder_seconds < legacy_seconds, (
+        f"ChainBuilder ({builder_seconds:.3f}s) not faster than legacy loop ({legacy_seconds:.3f}s)"
+    )
+    logger.info("✓ Benchmark passed")
+
+
+if __name__ == "__main__":
+    test_builder_matches_legacy()
+    test_builder_missing_price_data()
+    test_builder_benchmark()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test Option Chain Decoder
+
+Compares ChainDecoder output with the previous response.json() +
+pd.json_normalize path and checks column projection.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.chain_decoder import (
+    ChainDecoder, DEFAULT_CHAIN_COLUMNS, FLOAT_COLUMNS, UNUSED_CHAIN_COLUMNS,
+    resolve_chain_columns
+)
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_option(i: int) -> dict:
+    """Build a contract record shaped like the Tradier chains response"""
+    option_type = 'call' if i % 2 == 0 else 'put'
+    strike = 4000 + (i // 2) * 5
+    return {
+        'symbol': f'SPXW250117{option_type[0].upper()}{strike:05d}000',
+        'description': f'SPXW Jan 17 2025 ${strike} {option_type}',
+        'exch': 'C', 'type': 'option',
+        'last': None if i % 7 == 0 else 12.5 + i, 'change': None,
+        'volume': i * 3, 'open': None, 'high': None, 'low': None, 'close': None,
+        'bid': 10.1 + i, 'ask': 10.6 + i, 'underlying': 'SPX', 'strike': strike,
+        'change_percentage': None, 'average_volume': 0, 'last_volume': 1,
+        'trade_date': 1736800000000 + i, 'prevclose': 11.0,
+        'week_52_high': 0.0, 'week_52_low': 0.0,
+        'bidsize': 10, 'bidexch': 'C', 'bid_date': 1736800001000,
+        'asksize': 12, 'askexch': 'C', 'ask_date': 1736800002000,
+        'open_interest': i * 11, 'contract_size': 100,
+        'expiration_date': '2025-01-17', 'expiration_type': 'weeklys',
+        'option_type': option_type, 'root_symbol': 'SPXW',
+        'greeks': {
+            'delta': 0.5, 'gamma': 0.001 * (i % 9), 'theta': -1.2, 'vega': 2.1,
+            'rho': 0.3, 'phi': -0.2, 'bid_iv': 0.15, 'mid_iv': 0.16,
+            'ask_iv': 0.17, 'smv_vol': 0.16, 'updated_at': '2025-01-13 20:59:56'
+        }
+    }
+
+
+def make_response(contracts: int) -> bytes:
+    return json.dumps({'options': {'option': [make_option(i) for i in range(contracts)]}}).encode()
+
+
+def legacy_decode(content: bytes) -> pd.DataFrame:
+    """Previous TradierAPI.get_chains parsing"""
+    data = json.loads(content)['options']['option']
+    df = pd.json_normalize(data)
+    df['trade_date'] = pd.to_datetime(df['trade_date'], unit='ms')
+    df['bid_date'] = pd.to_datetime(df['bid_date'], unit='ms')
+    df['ask_date'] = pd.to_datetime(df['ask_date'], unit='ms')
+    df['greeks.updated_at'] = pd.to_datetime(df['greeks.updated_at'])
+    return df
+
+
+def typed(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast numeric fields the way the decoder does (all-null columns become NaN)"""
+    df = df.copy()
+    for column in FLOAT_COLUMNS & set(df.columns):
+        df[column] = df[column].astype(float)
+    return df
+
+
+def test_decoder_all_columns_matches_json_normalize():
+    """'all' projection reproduces the json_normalize frame"""
+    content = make_response(500)
+
+    expected = typed(legacy_decode(content))
+    actual = ChainDecoder(columns=None).decode(content)
+
+    assert list(actual.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    logger.info("✓ Decoder matches json_normalize")
+
+
+def test_decoder_default_projection():
+    """Default projection drops unused fields and keeps values intact"""
+    content = make_response(200)
+
+    expected = typed(legacy_decode(content)[DEFAULT_CHAIN_COLUMNS])
+    actual = ChainDecoder().decode(content)
+
+    assert list(actual.columns) == DEFAULT_CHAIN_COLUMNS
+    assert not set(UNUSED_CHAIN_COLUMNS) & set(actual.columns)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    assert actual['greeks.gamma'].dtype == float
+    logger.info("✓ Default projection")
+
+
+def test_decoder_edge_cases():
+    """Single-contract, null and custom-projection responses"""
+    single = json.dumps({'options': {'option': make_option(1)}}).encode()
+    assert len(ChainDecoder().decode(single)) == 1
+
+    assert ChainDecoder().decode(b'{"options": null}').empty
+
+    columns = resolve_chain_columns('symbol,bid,ask')
+    df = ChainDecoder(columns).decode(make_response(10))
+    assert {'symbol', 'bid', 'ask', 'strike', 'greeks.gamma'} <= set(df.columns)
+    assert 'description' not in df.columns
+
+    assert resolve_chain_columns('all') is None
+    assert resolve_chain_columns('') == DEFAULT_CHAIN_COLUMNS
+    logger.info("✓ Edge cases")
+
+
+def test_decoder_benchmark():
+    """Report decode time against json_normalize for a large chain"""
+    content = make_response(5000)
+
+    start = time.perf_counter()
+    legacy_decode(content)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ChainDecoder().decode(content)
+    decoder_seconds = time.perf_counter() - start
+
+    logger.info(f"json_normalize: {legacy_seconds * 1000:.1f}ms, "
+                f"ChainDecoder: {decoder_seconds * 1000:.1f}ms (5,000 contracts)")
+    assert decoder_seconds < legacy_seconds
+
+
+if __name__ == "__main__":
+    test_decoder_all_columns_matches_json_normalize()
+    test_decoder_default_projection()
+    test_decoder_edge_cases()
+    test_decoder_benchmark()
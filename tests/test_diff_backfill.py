@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test Greek Difference Backfill
+
+Runs DiffBackfill against a temporary SQLite database and compares the
+recomputed columns with a per-contract shift in pandas, and the session open
+and prior close differences with each contract's first row of the day and
+last row of the previous day. A second run with the same progress file skips
+the completed days. Column resolution is also
+checked against a fake PostgreSQL connection.
+"""
+
+import os
+import sys
+import tempfile
+import logging
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.calculations.diff_backfill import DiffBackfill
+from src.database import DatabaseConnection
+from test_bulk_upsert import fake_postgres_db
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+GREEKS = ['greeks.gamma', 'gex']
+CONTRACT = ['option_type', 'strike', 'expiration_date']
+
+
+def create_db(path: str) -> DatabaseConnection:
+    db = DatabaseConnection(db_type='sqlite', db_path=path)
+    greek_columns = ',\n'.join(
+        f'"{col}" REAL, "{col}_diff" REAL, "{col}_pct_change" REAL, '
+        f'"{col}_diff_open" REAL, "{col}_diff_prior_close" REAL' for col in GREEKS
+    )
+    db.execute(f"""
+        CREATE TABLE gex_table (
+            "greeks.updated_at" TIMESTAMP NOT NULL,
+            expiration_date TEXT NOT NULL,
+            option_type TEXT NOT NULL,
+            strike REAL NOT NULL,
+            {greek_columns},
+            prev_timestamp TIMESTAMP,
+            has_previous_data BOOLEAN,
+            PRIMARY KEY ("greeks.updated_at", expiration_date, option_type, strike)
+        )
+    """)
+    return db
+
+
+def load_history(db: DatabaseConnection) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    snapshots = []
+    for ts in ['2025-01-14 15:55:00', '2025-01-14 16:00:00',
+               '2025-01-15 09:30:00', '2025-01-15 09:35:00', '2025-01-16 09:30:00']:
+        strikes = [5000.0, 5100.0] if ts != '2025-01-15 09:30:00' else [5000.0]
+        df = pd.DataFrame({
+            'greeks.updated_at': pd.Timestamp(ts),
+            'expiration_date': '2025-01-17',
+            'option_type': 'call',
+            'strike': strikes,
+        })
+        for col in GREEKS:
+            df[col] = rng.normal(0, 1, len(df))
+        snapshots.append(df)
+
+    history = pd.concat(snapshots, ignore_index=True)
+    history.loc[3, 'gex'] = 0.0  # zero previous value -> no pct change
+    db.bulk_upsert(history, 'gex_table')
+    return history
+
+
+def test_backfill_matches_shift():
+    """LAG-based backfill matches a per-contract shift"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = create_db(os.path.join(tmp, 'gex.db'))
+        history = load_history(db)
+        progress = os.path.join(tmp, 'progress.json')
+
+        backfill = DiffBackfill(db, greek_columns=GREEKS + ['greeks.delta'], progress_path=progress)
+        summary = backfill.run(date(2025, 1, 14), date(2025, 1, 16))
+
+        assert summary['days'] == 3 and summary['failed'] == []
+        assert summary['rows_updated'] == len(history)
+
+        result = db.read_sql('SELECT * FROM gex_table')
+        result['greeks.updated_at'] = pd.to_datetime(result['greeks.updated_at'])
+        result = result.sort_values(CONTRACT + ['greeks.updated_at']).reset_index(drop=True)
+
+        expected = history.sort_values(CONTRACT + ['greeks.updated_at']).reset_index(drop=True)
+        previous = expected.groupby(CONTRACT)[GREEKS].shift()
+        for col in GREEKS:
+            diff = expected[col] - previous[col]
+            pct = np.where(previous[col] != 0, diff / previous[col] * 100, np.nan)
+            np.testing.assert_allclose(result[f'{col}_diff'], diff)
+            np.testing.assert_allclose(result[f'{col}_pct_change'], pct)
+
+        assert result['has_previous_data'].astype(bool).tolist() == previous['gex'].notna().tolist()
+
+        # Session open: first row of the day; prior close: last row of the previous trading day
+        day = expected['greeks.updated_at'].dt.normalize()
+        session_open = expected.groupby(CONTRACT + [day])[GREEKS].transform('first')
+        closes = expected.groupby(CONTRACT + [day])[GREEKS].last().reset_index()
+        trading_days = sorted(day.unique())
+        closes['greeks.updated_at'] = closes['greeks.updated_at'].map(
+            lambda d: trading_days[trading_days.index(d) + 1] if d != trading_days[-1] else pd.NaT)
+        prior_close = expected[CONTRACT].assign(**{'greeks.updated_at': day}).merge(
+            closes, on=CONTRACT + ['greeks.updated_at'], how='left')
+        for col in GREEKS:
+            np.testing.assert_allclose(result[f'{col}_diff_open'], expected[col] - session_open[col])
+            np.testing.assert_allclose(result[f'{col}_diff_prior_close'], expected[col] - prior_close[col])
+        assert result['gex_diff_prior_close'].isna().sum() == 4  # first day has no prior close
+
+        # Completed days are skipped on the next run
+        summary = backfill.run(date(2025, 1, 14), date(2025, 1, 16))
+        assert summary['days'] == 0 and summary['skipped'] == 3
+        db.close()
+    logger.info("✓ Backfill matches per-contract shift and resumes")
+
+
+def test_resolve_columns_postgresql():
+    """Greek columns are read from information_schema on PostgreSQL"""
+    columns = [('greeks.updated_at', 'timestamp without time zone'), ('strike', 'double precision')]
+    for col in GREEKS:
+        columns += [(col, 'double precision'), (f'{col}_diff', 'double precision'),
+                    (f'{col}_pct_change', 'double precision')]
+    columns += [('gex_diff_open', 'double precision'), ('gex_diff_prior_close', 'double precision')]
+    columns.append(('greeks.delta', 'double precision'))
+    db = fake_postgres_db({'gex_table': columns})
+
+    backfill = DiffBackfill(db, greek_columns=GREEKS + ['greeks.delta'], progress_path=None)
+    assert backfill.resolve_columns() == GREEKS
+    assert backfill.resolve_horizon_columns() == ['gex']
+    logger.info("✓ PostgreSQL columns resolved")
+
+
+if __name__ == "__main__":
+    test_backfill_matches_shift()
+    test_resolve_columns_postgresql()
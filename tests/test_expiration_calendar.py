@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test Expiration Calendar
+
+Checks the daily cache of listed expirations, the expiration type names, and
+that the collector only probes weekdays when the calendar cannot be loaded.
+Runs offline against a fake Tradier client.
+"""
+
+import os
+import sys
+import logging
+from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
+import pytz
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.expiration_calendar import ExpirationCalendar, normalize_expiration_types
+from src.gex_collector import GEXCollector
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+EXPIRATIONS = pd.DataFrame({
+    'date': ['2025-01-15', '2025-01-17', '2025-01-31', '2025-02-21', '2025-03-31'],
+    'expiration_type': ['weeklys', 'weeklys', 'eom', 'standard', 'quarterlys'],
+})
+
+
+class FakeApi:
+    """Answers get_expirations from a fixed frame and counts the requests"""
+
+    def __init__(self, expirations: pd.DataFrame):
+        self.expirations = expirations
+        self.requests = 0
+
+    def get_expirations(self, symbol: str) -> pd.DataFrame:
+        self.requests += 1
+        return self.expirations
+
+
+class FixedDayCalendar(ExpirationCalendar):
+    """Calendar whose trading day is set by the test"""
+
+    def __init__(self, api, today: date):
+        super().__init__(api, pytz.timezone('US/Eastern'))
+        self.today = today
+
+    def _today(self) -> date:
+        return self.today
+
+
+def test_normalize_expiration_types():
+    """User-facing names map to Tradier expiration_type values"""
+    assert normalize_expiration_types(None) is None
+    assert normalize_expiration_types([]) is None
+    assert normalize_expiration_types(['Weekly', ' weeklies ', 'monthly']) == ['standard', 'weeklys']
+    assert normalize_expiration_types(['quarterlies', 'end_of_month']) == ['eom', 'quarterlys']
+    assert normalize_expiration_types(['', ' ']) is None
+
+    try:
+        normalize_expiration_types(['daily'])
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    logger.info("✓ Expiration type names")
+
+
+def test_cache_expires_with_trading_day():
+    """The list is fetched once per trading day unless a refresh is forced"""
+    api = FakeApi(EXPIRATIONS)
+    calendar = FixedDayCalendar(api, date(2025, 1, 15))
+
+    calendar.load('spx')
+    calendar.load('SPX')
+    assert api.requests == 1
+
+    calendar.load('SPX', refresh=True)
+    assert api.requests == 2
+
+    calendar.today = date(2025, 1, 16)
+    calendar.load('SPX')
+    assert api.requests == 3
+
+    # An empty reload keeps serving the previous list
+    api.expirations = EXPIRATIONS.iloc[0:0]
+    calendar.today = date(2025, 1, 17)
+    pd.testing.assert_frame_equal(calendar.load('SPX'), EXPIRATIONS)
+    assert FixedDayCalendar(api, date(2025, 1, 17)).load('SPX').empty
+    logger.info("✓ Daily cache")
+
+
+def test_get_expirations_filters():
+    """DTE window and expiration types select from the listed dates"""
+    calendar = FixedDayCalendar(FakeApi(EXPIRATIONS), date(2025, 1, 15))
+
+    assert calendar.get_expirations('SPX', max_dte=None) == EXPIRATIONS['date'].tolist()
+    assert calendar.get_expirations('SPX', min_dte=1, max_dte=20) == ['2025-01-17', '2025-01-31']
+    assert calendar.get_expirations('SPX', max_dte=None, types=['monthly', 'quarterly']) == \
+        ['2025-02-21', '2025-03-31']
+    assert calendar.get_expirations('SPX', max_dte=30, types=['quarterly']) == []
+    logger.info("✓ Expiration filters")
+
+
+def make_collector(expirations: pd.DataFrame, types=None) -> GEXCollector:
+    """GEXCollector with only what get_expiration_dates reads"""
+    collector = GEXCollector.__new__(GEXCollector)
+    collector.config = SimpleNamespace(
+        timezone=pytz.timezone('US/Eastern'),
+        expiration_min_dte=0,
+        expiration_max_dte=30,
+        expiration_types=types
+    )
+    collector.logger = SimpleNamespace(logger=logger)
+    collector.expiration_calendar = FixedDayCalendar(FakeApi(expirations), date(2025, 1, 15))
+    return collector
+
+
+def test_collector_keeps_empty_filter_result():
+    """No quarterly in the window means no chains, not every weekday"""
+    collector = make_collector(EXPIRATIONS, types=['quarterly'])
+    assert collector.get_expiration_dates('SPX') == []
+
+    collector = make_collector(EXPIRATIONS, types=['weekly'])
+    assert collector.get_expiration_dates('SPX') == ['2025-01-15', '2025-01-17']
+    logger.info("✓ Empty filter result kept")
+
+
+def test_collector_probes_weekdays_without_calendar():
+    """Weekdays in the DTE window are probed when no expirations load"""
+    collector = make_collector(EXPIRATIONS.iloc[0:0], types=['quarterly'])
+    dates = collector.get_expiration_dates('SPX')
+
+    assert dates == collector.get_trading_days_ahead(31)
+    assert all(pd.Timestamp(d).weekday() < 5 for d in dates)
+    logger.info("✓ Weekday probe without calendar")
+
+
+if __name__ == "__main__":
+    test_normalize_expiration_types()
+    test_cache_expires_with_trading_day()
+    test_get_expirations_filters()
+    test_collector_keeps_empty_filter_result()
+    test_collector_probes_weekdays_without_calendar()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test Freshness Probe
+
+Runs GEXCollector.check_freshness and collect_data against a stubbed Tradier
+client: a stale probe skips the full chain fetch, a fresh one reuses the
+probe chain and fetches the remaining expirations.
+"""
+
+import os
+import sys
+import logging
+from types import SimpleNamespace
+
+import pandas as pd
+import pytz
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.gex_collector import GEXCollector
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DB_TIMESTAMP = '2025-01-15 10:00:00'
+EXPIRATIONS = ['2025-01-15', '2025-01-16', '2025-01-17']
+
+
+def make_chain(expiration: str, updated_at) -> pd.DataFrame:
+    return pd.DataFrame({
+        'strike': [6000.0, 6000.0], 'option_type': ['call', 'put'],
+        'expiration_date': expiration, 'greeks.updated_at': updated_at,
+        'greeks.gamma': [0.01, 0.01], 'open_interest': [10, 20]
+    })
+
+
+class StubApi:
+    """Serves chains stamped with a fixed greeks.updated_at and records requests"""
+
+    def __init__(self, updated_at):
+        self.updated_at = updated_at
+        self.probes = []
+        self.batches = []
+
+    def get_chains(self, symbol, expiration):
+        self.probes.append((symbol, expiration))
+        return make_chain(expiration, self.updated_at)
+
+    def get_chains_batch(self, requests, max_workers=4):
+        self.batches.append(list(requests))
+        return {request: make_chain(request[1], self.updated_at) for request in requests}
+
+    def get_request_metrics(self):
+        return {}
+
+
+class StubGreekCalculator:
+    def calculate_differences(self, df):
+        return df
+
+    def get_summary_statistics(self, df):
+        return {}
+
+    def export_difference_report(self, df, output_path):
+        pass
+
+
+class ProbeCollector(GEXCollector):
+    """GEXCollector with no database, prices or config file; records what it would save"""
+
+    def __init__(self, api: StubApi, freshness_probe: bool = True):
+        self.config = SimpleNamespace(
+            timezone=pytz.timezone('US/Eastern'),
+            underlying_symbols=['SPX'],
+            freshness_probe=freshness_probe,
+            fetch_workers=4,
+            calculate_greeks=False
+        )
+        self.logger = SimpleNamespace(logger=logger, log_start=lambda name: None,
+                                      log_error=lambda name, e: logger.error(f"{name}: {e}"))
+        self.api = api
+        self.chain_cache = None
+        self.partition_manager = None
+        self.bs_calculator = None
+        self.greek_calculator = StubGreekCalculator()
+        self.saved = []
+
+    def get_current_underlying_price(self, symbol):
+        return None
+
+    def get_expiration_dates(self, symbol):
+        return EXPIRATIONS
+
+    def get_latest_timestamp_from_db(self):
+        return DB_TIMESTAMP
+
+    def save_to_database(self, df):
+        self.saved.append(df)
+        return False
+
+
+def test_check_freshness():
+    """The probe is stale unless its greeks are newer than the database"""
+    for updated_at, expected in [('2025-01-15 09:59:00', False), (DB_TIMESTAMP, False),
+                                 ('2025-01-15 10:01:00', True)]:
+        api = StubApi(updated_at)
+        has_new_data, probe_chain = ProbeCollector(api).check_freshness('SPX', EXPIRATIONS[0], DB_TIMESTAMP)
+        assert has_new_data is expected, updated_at
+        assert api.probes == [('SPX', EXPIRATIONS[0])]
+        assert len(probe_chain) == 2
+
+    # No greeks in the probe: collect everything rather than guess
+    has_new_data, _ = ProbeCollector(StubApi(None)).check_freshness('SPX', EXPIRATIONS[0], DB_TIMESTAMP)
+    assert has_new_data is True
+    logger.info("✓ Stale/fresh decision")
+
+
+def test_stale_probe_skips_full_fetch():
+    """Unchanged greeks end the collection after a single chain request"""
+    api = StubApi(DB_TIMESTAMP)
+    collector = ProbeCollector(api)
+
+    assert collector.collect_data(force=True) is True
+    assert api.probes == [('SPX', EXPIRATIONS[0])]
+    assert api.batches == []
+    assert collector.saved == []
+    logger.info("✓ Stale probe skips the full fetch")
+
+
+def test_fresh_probe_reuses_probe_chain():
+    """New greeks fetch only the expirations the probe did not cover"""
+    api = StubApi('2025-01-15 10:05:00')
+    collector = ProbeCollector(api)
+    collector.collect_data(force=True)
+
+    assert api.probes == [('SPX', EXPIRATIONS[0])]
+    assert api.batches == [[('SPX', date) for date in EXPIRATIONS[1:]]]
+    assert len(collector.saved) == 1
+    assert sorted(collector.saved[0]['expiration_date'].unique()) == EXPIRATIONS
+
+    # With the probe disabled every chain comes from the batch
+    api = StubApi(DB_TIMESTAMP)
+    ProbeCollector(api, freshness_probe=False).collect_data(force=True)
+    assert api.probes == []
+    assert api.batches == [[('SPX', date) for date in EXPIRATIONS]]
+    logger.info("✓ Fresh probe chain reused")
+
+
+if __name__ == "__main__":
+    test_check_freshness()
+    test_stale_probe_skips_full_fetch()
+    test_fresh_probe_reuses_probe_chain()
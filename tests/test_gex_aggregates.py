@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test GEX Aggregates
+
+Checks the strike-level rollup written to gex_strike_agg against a pivot of
+the contract rows, per DTE bucket and summed across buckets, and the
+zero-gamma level and walls stored in gex_snapshot_summary, including the
+batched multi-snapshot summaries behind the level history.
+"""
+
+import os
+import sys
+import tempfile
+import logging
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.calculations.gex_aggregates import (
+    aggregate_strike_gex, assign_dte_buckets, dte_buckets_through, find_walls,
+    interpolate_zero_gamma, save_snapshot_aggregates, summarize_snapshot, summarize_snapshots
+)
+from src.calculations.level_history import LEVEL_COLUMNS, LevelHistory
+from src.database import DatabaseConnection
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_snapshot(contracts: int = 3000, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    expirations = pd.to_datetime('2025-01-15') + pd.to_timedelta([0, 1, 2, 5, 9, 30], unit='D')
+    return pd.DataFrame({
+        'greeks.updated_at': pd.Timestamp('2025-01-15 10:00:00'),
+        'underlying': 'SPX',
+        'expiration_date': rng.choice(expirations.strftime('%Y-%m-%d'), contracts),
+        'option_type': rng.choice(['call', 'put'], contracts),
+        'strike': rng.choice(np.arange(5800.0, 6200.0, 5.0), contracts),
+        'gex': rng.normal(0, 1e6, contracts),
+        'open_interest': rng.integers(0, 5000, contracts),
+        'spx_price': 6000.0,
+    })
+
+
+def test_dte_buckets():
+    """Disjoint buckets and cumulative bucket lists"""
+    assert list(assign_dte_buckets(np.array([-1, 0, 1, 2, 3, 7, 8, 40]))) == [
+        '0DTE', '0DTE', '1-2DTE', '1-2DTE', '3-7DTE', '3-7DTE', '8+DTE', '8+DTE'
+    ]
+    assert dte_buckets_through(0) == ['0DTE']
+    assert dte_buckets_through(2) == ['0DTE', '1-2DTE']
+    assert dte_buckets_through(7) == ['0DTE', '1-2DTE', '3-7DTE']
+    assert dte_buckets_through(None) == ['0DTE', '1-2DTE', '3-7DTE', '8+DTE']
+    logger.info("✓ DTE buckets")
+
+
+def test_aggregate_matches_pivot():
+    """Rollup matches the pivot consumers used to build from raw rows"""
+    df = make_snapshot()
+    agg = aggregate_strike_gex(df, snapshot_ts=df['greeks.updated_at'].max())
+
+    for max_dte in (0, 2, 7, None):
+        dte = (pd.to_datetime(df['expiration_date']) - pd.Timestamp('2025-01-15')).dt.days
+        subset = df if max_dte is None else df[dte <= max_dte]
+        pivot = subset.pivot_table(index='strike', columns='option_type', values='gex',
+                                   aggfunc='sum').fillna(0)
+        expected = (pivot['call'] + pivot['put']).sort_index()
+
+        summed = (agg[agg['dte_bucket'].isin(dte_buckets_through(max_dte))]
+                  .groupby('strike')['net_gex'].sum().sort_index())
+        np.testing.assert_allclose(summed.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+    assert agg['call_oi'].sum() + agg['put_oi'].sum() == df['open_interest'].sum()
+    assert len(agg) < len(df)
+    logger.info(f"✓ {len(df):,} contracts rolled up to {len(agg):,} strike rows")
+
+
+def test_zero_gamma_and_walls():
+    """Interpolated zero crossing nearest spot and strongest walls"""
+    strikes = np.array([5900.0, 5950.0, 6000.0, 6050.0, 6100.0, 6150.0])
+    net_gex = np.array([-300.0, -100.0, 0.0, 100.0, 50.0, -50.0])
+
+    # -100 at 5950 -> +100 at 6050 (6000 has no open interest): crosses at 6000
+    assert interpolate_zero_gamma(strikes, net_gex, spot=6010.0) == 6000.0
+    assert interpolate_zero_gamma(strikes, net_gex, spot=6140.0) == 6125.0
+    assert interpolate_zero_gamma(strikes, np.abs(net_gex), spot=6000.0) is None
+
+    call_walls, put_walls = find_walls(strikes, net_gex, spot=6000.0, count=2)
+    assert call_walls == [6050.0, 6100.0]
+    assert put_walls == [5900.0, 5950.0]
+    logger.info("✓ Zero gamma and walls")
+
+
+def test_summarize_snapshot():
+    """One summary row per timeframe, consistent with the strike rollup"""
+    df = make_snapshot()
+    snapshot_ts = df['greeks.updated_at'].max()
+    agg = aggregate_strike_gex(df, snapshot_ts=snapshot_ts)
+    summary = summarize_snapshot(df, agg, snapshot_ts).set_index('timeframe')
+
+    assert list(summary.index) == ['0dte', 'short_term', 'weekly', 'all']
+    assert summary.loc['all', 'contract_count'] == len(df)
+    assert np.isclose(summary.loc['all', 'net_gex'], df['gex'].sum())
+    assert summary.loc['0dte', 'contract_count'] == (df['expiration_date'] == '2025-01-15').sum()
+
+    by_strike = agg.groupby('strike')['net_gex'].sum()
+    above = by_strike[by_strike.index > 6000.0]
+    assert summary.loc['all', 'call_wall_1'] == above.idxmax()
+    logger.info("✓ Snapshot summary")
+
+
+def test_save_snapshot_aggregates():
+    """Strike aggregates and summary rows are written once per snapshot"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseConnection(db_type='sqlite', db_path=os.path.join(tmp, 'gex.db'))
+        df = make_snapshot(500)
+
+        agg_rows, summary_rows = save_snapshot_aggregates(db, df)
+        assert agg_rows == len(aggregate_strike_gex(df))
+        assert summary_rows == 4
+        assert db.get_row_count('gex_strike_agg') == agg_rows
+        assert db.get_row_count('gex_snapshot_summary') == summary_rows
+        db.close()
+    logger.info("✓ Snapshot aggregates saved")
+
+
+def make_history() -> pd.DataFrame:
+    """
+    Three snapshots on each of two days; the second day has no spot price
+
+    Expirations start on 2025-01-15, so the first day has no 0DTE summary.
+    """
+    frames = []
+    for day, spot in (('2025-01-14', 5990.0), ('2025-01-15', np.nan)):
+        for i in range(3):
+            df = make_snapshot(600, seed=len(frames))
+            df['greeks.updated_at'] = pd.Timestamp(f'{day} 10:00:00') + pd.Timedelta(minutes=5 * i)
+            df['spx_price'] = spot + i
+            frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_summarize_snapshots_matches_loop():
+    """Batched summaries match summarize_snapshot run per snapshot"""
+    history = make_history()
+    expected = pd.concat([
+        summarize_snapshot(rows, aggregate_strike_gex(rows, snapshot_ts=ts), ts)
+        for ts, rows in history.groupby('greeks.updated_at')
+    ], ignore_index=True)
+
+    walls = [col for col in expected.columns if '_wall_' in col]
+    expected[walls] = expected[walls].astype(float)
+
+    result = summarize_snapshots(history)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result['zero_gex_level'].notna().all()
+
+    # A strike aggregate computed by the caller gives the same summaries
+    pd.testing.assert_frame_equal(summarize_snapshots(history, aggregate_strike_gex(history)), result)
+    logger.info(f"✓ Batched summaries match {history['greeks.updated_at'].nunique()} per-snapshot runs")
+
+
+class CountingLevelHistory(LevelHistory):
+    """Records the days summarized from gex_table"""
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.summarized = []
+
+    def summarize_day(self, day, persist=False, stored_snapshots=frozenset()):
+        self.summarized.append(day)
+        return super().summarize_day(day, persist, stored_snapshots)
+
+
+def test_level_history_reads_stored_summaries():
+    """Days fully covered by gex_snapshot_summary are not recomputed"""
+    start, end = pd.Timestamp('2025-01-14').date(), pd.Timestamp('2025-01-15').date()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseConnection(db_type='sqlite', db_path=os.path.join(tmp, 'gex.db'))
+        history = make_history()
+        db.bulk_upsert(history, 'gex_table')
+        expected = CountingLevelHistory(db).run(start, end)
+
+        # Saved with aggregates: every snapshot of the first day, one of the second
+        snapshots = list(history.groupby('greeks.updated_at'))
+        for _, rows in snapshots[:4]:
+            save_snapshot_aggregates(db, rows)
+
+        history_run = CountingLevelHistory(db)
+        levels = history_run.run(start, end, persist=True)
+        assert history_run.summarized == [end]
+        pd.testing.assert_frame_equal(levels, expected, check_dtype=False)
+
+        # The second day was written back, so nothing is recomputed now
+        assert db.get_row_count('gex_snapshot_summary') == len(summarize_snapshots(history))
+        history_run = CountingLevelHistory(db)
+        levels = history_run.run(start, end, timeframes=['all'])
+        assert history_run.summarized == []
+        pd.testing.assert_frame_equal(
+            levels, expected[expected['timeframe'] == 'all'].reset_index(drop=True), check_dtype=False)
+        db.close()
+    logger.info("✓ Level history reads stored summaries")
+
+
+def test_level_history():
+    """Level time series read per day from gex_table"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseConnection(db_type='sqlite', db_path=os.path.join(tmp, 'gex.db'))
+        history = make_history()
+        db.bulk_upsert(history, 'gex_table')
+
+        levels = LevelHistory(db).run(pd.Timestamp('2025-01-14').date(), pd.Timestamp('2025-01-15').date(),
+                                      timeframes=['0dte', 'all'], persist=True)
+        assert list(levels.columns) == LEVEL_COLUMNS
+        assert len(levels) == 3 + 3 * 2
+        assert levels['timeframe'].tolist()[-2:] == ['0dte', 'all']
+        assert levels['snapshot_ts'].is_monotonic_increasing
+
+        expected = summarize_snapshots(history)
+        assert db.get_row_count('gex_snapshot_summary') == len(expected)
+
+        expected = expected[expected['timeframe'].isin(['0dte', 'all'])].reset_index(drop=True)
+        np.testing.assert_allclose(levels['zero_gex_level'], expected['zero_gex_level'])
+        db.close()
+    logger.info("✓ Level history")
+
+
+if __name__ == "__main__":
+    test_dte_buckets()
+    test_aggregate_matches_pivot()
+    test_zero_gamma_and_walls()
+    test_summarize_snapshot()
+    test_save_snapshot_aggregates()
+    test_summarize_snapshots_matches_loop()
+    test_level_history()
+    test_level_history_reads_stored_summaries()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test Vectorized Greek Differences
+
+Checks calculate_differences and get_summary_statistics against the previous
+row-by-row implementation and times both on a 20k-contract snapshot.
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.calculations.greek_diff_calculator import GreekDifferenceCalculator
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+GREEK_COLUMNS = GreekDifferenceCalculator.GREEK_COLUMNS
+
+
+def make_snapshot(updated_at: str, contracts: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'greeks.updated_at': pd.Timestamp(updated_at),
+        'expiration_date': np.where(np.arange(contracts) % 2 == 0, '2025-01-17', '2025-01-24'),
+        'option_type': np.where(np.arange(contracts) % 4 < 2, 'call', 'put'),
+        'strike': 4000.0 + (np.arange(contracts) // 4) * 5.0,
+    })
+    for col in GREEK_COLUMNS:
+        values = rng.normal(0, 1, contracts)
+        values[rng.random(contracts) < 0.05] = 0.0
+        values[rng.random(contracts) < 0.05] = np.nan
+        df[col] = values
+    return df
+
+
+def legacy_pct_change(merged: pd.DataFrame, col: str) -> pd.Series:
+    """Previous row-by-row percentage change"""
+    prev_col = f'{col}_prev'
+    return merged.apply(
+        lambda row: (
+            ((row[col] - row[prev_col]) / row[prev_col] * 100)
+            if pd.notna(row[prev_col]) and row[prev_col] != 0
+            else None
+        ), axis=1
+    )
+
+
+def test_differences_match_row_by_row():
+    """Masked division matches the row-by-row percentage change"""
+    previous = make_snapshot('2025-01-15 10:00:00', 2000, seed=1)
+    current = make_snapshot('2025-01-15 10:05:00', 2000, seed=2)
+
+    calculator = GreekDifferenceCalculator(db_path=None)
+    calculator.remember_snapshot(previous)
+    result = calculator.calculate_differences(current.copy())
+
+    keys = GreekDifferenceCalculator.KEY_COLUMNS
+    merged = current.merge(previous[keys + GREEK_COLUMNS].set_index(keys).add_suffix('_prev'),
+                           left_on=keys, right_index=True, how='left')
+
+    for col in GREEK_COLUMNS:
+        np.testing.assert_allclose(result[f'{col}_diff'], merged[col] - merged[f'{col}_prev'])
+        expected = legacy_pct_change(merged, col).astype(float)
+        np.testing.assert_allclose(result[f'{col}_pct_change'], expected, err_msg=col)
+
+    assert result['has_previous_data'].all()
+    logger.info("✓ Differences match row-by-row calculation")
+
+
+def test_summary_statistics():
+    """describe-based summary matches per-column statistics"""
+    calculator = GreekDifferenceCalculator(db_path=None)
+    calculator.remember_snapshot(make_snapshot('2025-01-15 10:00:00', 400, seed=3))
+    result = calculator.calculate_differences(make_snapshot('2025-01-15 10:05:00', 400, seed=4))
+
+    stats = calculator.get_summary_statistics(result)
+    for col in GREEK_COLUMNS:
+        data = result[f'{col}_pct_change'].dropna()
+        col_stats = stats[f'{col}_pct_change_stats']
+        assert col_stats['count'] == len(data)
+        assert np.isclose(col_stats['mean'], data.mean())
+        assert np.isclose(col_stats['std'], data.std())
+        assert np.isclose(col_stats['median'], data.median())
+    logger.info("✓ Summary statistics")
+
+
+def test_differences_benchmark():
+    """Diff calculation on a 20k-contract snapshot"""
+    contracts = 20000
+    previous = make_snapshot('2025-01-15 10:00:00', contracts, seed=5)
+    current = make_snapshot('2025-01-15 10:05:00', contracts, seed=6)
+
+    calculator = GreekDifferenceCalculator(db_path=None)
+    calculator.remember_snapshot(previous)
+
+    start = time.perf_counter()
+    result = calculator.calculate_differences(current.copy())
+    calculator.get_summary_statistics(result)
+    vectorized = time.perf_counter() - start
+
+    keys = GreekDifferenceCalculator.KEY_COLUMNS
+    merged = current.merge(previous[keys + GREEK_COLUMNS].set_index(keys).add_suffix('_prev'),
+                           left_on=keys, right_index=True, how='left')
+    start = time.perf_counter()
+    for col in GREEK_COLUMNS:
+        legacy_pct_change(merged, col)
+    legacy = time.perf_counter() - start
+
+    logger.info(f"Row-by-row pct change: {legacy * 1000:8.1f} ms ({contracts:,} contracts)")
+    logger.info(f"Vectorized diffs:      {vectorized * 1000:8.1f} ms ({legacy / vectorized:.0f}x)")
+    assert vectorized < legacy
+
+
+if __name__ == "__main__":
+    test_differences_match_row_by_row()
+    test_summary_statistics()
+    test_differences_benchmark()
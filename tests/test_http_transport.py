@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test HTTP Transport
+
+Runs HTTPTransport against a stubbed requests.Session: 429/5xx retries with
+exponential backoff, per-endpoint metrics, and one rate limiter per Tradier
+endpoint family.
+"""
+
+import os
+import sys
+import logging
+from unittest import mock
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.http_transport import HTTPTransport, endpoint_family
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+BASE_URL = 'https://api.tradier.com/v1/'
+QUOTES_URL = BASE_URL + 'markets/quotes'
+ORDERS_URL = BASE_URL + 'accounts/VA000/orders'
+
+
+def make_response(status_code: int, headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = b'{}'
+    return response
+
+
+class FakeSession:
+    """Returns scripted status codes in order and records each call"""
+
+    def __init__(self, *status_codes, headers: dict = None):
+        self.status_codes = list(status_codes)
+        self.headers = headers
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        return make_response(self.status_codes.pop(0), self.headers)
+
+    def close(self):
+        pass
+
+
+def make_transport(session: FakeSession, **kwargs) -> HTTPTransport:
+    transport = HTTPTransport(**kwargs)
+    transport.session = session
+    return transport
+
+
+def run(transport: HTTPTransport, method: str, url: str, **kwargs):
+    """Send a request with backoff sleeps recorded and the jitter pinned to its cap"""
+    sleeps = []
+    with mock.patch('src.api.http_transport.time.sleep', sleeps.append), \
+            mock.patch('src.api.http_transport.random.uniform', lambda low, high: high):
+        try:
+            response = transport.request(method, url, **kwargs)
+        except requests.HTTPError as e:
+            response = e
+    return response, sleeps
+
+
+def test_retries_429_and_5xx_with_backoff():
+    """Rate-limited and server errors are retried with doubling delays"""
+    session = FakeSession(429, 503, 500, 200)
+    transport = make_transport(session, max_retries=5, backoff_base=0.5, backoff_max=1.5)
+
+    response, sleeps = run(transport, 'GET', QUOTES_URL)
+
+    assert response.status_code == 200
+    assert len(session.calls) == 4
+    # 0.5, 1.0, then capped at backoff_max
+    assert sleeps == [0.5, 1.0, 1.5]
+    logger.info("✓ 429/5xx retried with backoff")
+
+
+def test_gives_up_after_max_retries():
+    """The last error is raised once the attempts are used up"""
+    session = FakeSession(502, 502, 502)
+    transport = make_transport(session, max_retries=3)
+
+    error, sleeps = run(transport, 'GET', QUOTES_URL)
+
+    assert isinstance(error, requests.HTTPError)
+    assert error.response.status_code == 502
+    assert len(session.calls) == 3 and len(sleeps) == 2
+
+    # Without raise_for_status the response is returned as is
+    session = FakeSession(429)
+    response, sleeps = run(make_transport(session), 'GET', QUOTES_URL, raise_for_status=False)
+    assert response.status_code == 429 and sleeps == []
+    logger.info("✓ Max retries")
+
+
+def test_metrics_count_attempts_and_retries():
+    """Each endpoint counts requests, attempts, errors and retries"""
+    session = FakeSession(200, 429, 200, 500, 500)
+    transport = make_transport(session, max_retries=2)
+
+    run(transport, 'GET', QUOTES_URL)
+    run(transport, 'GET', QUOTES_URL)
+    run(transport, 'POST', ORDERS_URL)
+
+    metrics = transport.get_metrics()
+    assert list(metrics) == ['/v1/accounts/VA000/orders', '/v1/markets/quotes']
+
+    quotes = metrics['/v1/markets/quotes']
+    assert (quotes['requests'], quotes['attempts'], quotes['errors'], quotes['retries']) == (2, 3, 1, 1)
+    assert quotes['retry_histogram'] == {0: 1, 1: 1}
+    assert sum(quotes['latency_histogram'].values()) == 3
+
+    orders = metrics['/v1/accounts/VA000/orders']
+    assert (orders['requests'], orders['attempts'], orders['errors'], orders['retries']) == (1, 2, 2, 1)
+
+    transport.reset_metrics()
+    assert transport.get_metrics() == {}
+    logger.info("✓ Metrics")
+
+
+def test_rate_limiter_per_endpoint_family():
+    """Headers from one endpoint family do not throttle the others"""
+    assert endpoint_family(QUOTES_URL) == 'market_data'
+    assert endpoint_family(BASE_URL + 'markets/options/chains') == 'market_data'
+    assert endpoint_family(ORDERS_URL) == 'trading'
+    assert endpoint_family(BASE_URL + 'accounts/VA000/balances') == 'standard'
+    assert endpoint_family(BASE_URL + 'user/profile') == 'standard'
+
+    session = FakeSession(200, 200, headers={'X-Ratelimit-Available': '3'})
+    transport = make_transport(session)
+    run(transport, 'POST', ORDERS_URL)
+
+    trading = transport.rate_limiter(ORDERS_URL)
+    market_data = transport.rate_limiter(QUOTES_URL)
+    assert trading is not market_data
+    assert trading.capacity == 60 and market_data.capacity == 120
+    assert trading.tokens == 3
+    assert market_data.tokens > 100
+
+    run(transport, 'GET', QUOTES_URL)
+    assert transport.rate_limiter(BASE_URL + 'markets/options/chains') is market_data
+    logger.info("✓ One rate limiter per endpoint family")
+
+
+if __name__ == "__main__":
+    test_retries_429_and_5xx_with_backoff()
+    test_gives_up_after_max_retries()
+    test_metrics_count_attempts_and_retries()
+    test_rate_limiter_per_endpoint_family()
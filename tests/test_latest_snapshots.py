@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test Latest Snapshot Queries
+
+Comprehensive signals read the latest snapshot plus the last few snapshots
+near spot; the GEX change signal only looks at those recent snapshots.
+Snapshots saved with aggregates are read from gex_strike_agg and
+gex_snapshot_summary instead of their contract rows.
+"""
+
+import os
+import sys
+import logging
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.signals.trading_signals import TradingSignalGenerator, SignalType
+from src.calculations.gex_aggregates import aggregate_strike_gex, dte_buckets_through, summarize_snapshot
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class HistoryGenerator(TradingSignalGenerator):
+    """Answers snapshot queries from an in-memory history"""
+
+    def __init__(self, history: pd.DataFrame):
+        super().__init__(db_connection=None)
+        self.history = history
+        self.requests = []
+
+    def get_latest_snapshots(self, num_snapshots=1, spot=None, strike_window_pct=None, lookback_hours=24,
+                             underlying='SPX'):
+        self.requests.append((num_snapshots, spot, strike_window_pct))
+        timestamps = sorted(self.history['greeks.updated_at'].unique())[-num_snapshots:]
+        df = self.history[self.history['greeks.updated_at'].isin(timestamps)]
+        if 'underlying' in df.columns:
+            df = df[df['underlying'].fillna('SPX') == underlying]
+        if strike_window_pct is not None:
+            window = spot * strike_window_pct / 100
+            df = df[df['strike'].between(spot - window, spot + window)]
+        return df.sort_values('greeks.updated_at', ascending=False)
+
+    def get_latest_snapshot_time(self, lookback_hours=24):
+        return self.history['greeks.updated_at'].max()
+
+    def get_ema_signals(self) -> pd.DataFrame:
+        return pd.DataFrame()
+
+
+def stored_aggregates(snapshot: pd.DataFrame):
+    """
+    Stand-ins for load_strike_gex / load_snapshot_summary answering from the
+    aggregates save_snapshot_aggregates would have written for a snapshot
+    """
+    snapshot_ts = snapshot['greeks.updated_at'].max()
+    strike_agg = aggregate_strike_gex(snapshot, snapshot_ts=snapshot_ts)
+    summary = summarize_snapshot(snapshot, strike_agg, snapshot_ts).set_index('timeframe')
+
+    def load_strike_gex(con, snapshot_ts=None, underlying='SPX', max_dte=None):
+        rows = strike_agg[strike_agg['dte_bucket'].isin(dte_buckets_through(max_dte))]
+        columns = ['call_gex', 'put_gex', 'net_gex', 'call_oi', 'put_oi']
+        return rows.groupby(['snapshot_ts', 'strike'], as_index=False)[columns].sum()
+
+    def load_snapshot_summary(con, snapshot_ts=None, underlying='SPX'):
+        return summary
+
+    return load_strike_gex, load_snapshot_summary
+
+
+def make_history() -> pd.DataFrame:
+    strikes = np.arange(5000.0, 7000.0, 25.0)
+    snapshots = []
+    # GEX near spot drops sharply early on, then rises 20% over the last three snapshots
+    for minute, level in [(0, 10.0), (5, 1.0), (10, 1.1), (15, 1.2)]:
+        df = pd.DataFrame({
+            'greeks.updated_at': pd.Timestamp('2025-01-15 10:00:00') + pd.Timedelta(minutes=minute),
+            'expiration_date': '2025-01-17',
+            'strike': strikes,
+            'option_type': 'call',
+            'gex': level * 1e6 * np.sign(strikes - 5990.0),
+            'open_interest': 100,
+            'spx_price': 6000.0,
+        })
+        snapshots.append(df)
+    return pd.concat(snapshots, ignore_index=True)
+
+
+def test_change_signal_uses_recent_snapshots():
+    """Comprehensive signals request only recent snapshots near spot"""
+    generator = HistoryGenerator(make_history())
+    signals = generator.generate_comprehensive_signals()
+
+    assert generator.requests == [(1, None, None), (3, 6000.0, TradingSignalGenerator.CHANGE_WINDOW_PCT)]
+    change = next(s for s in signals['individual_signals'] if s['source'] == 'GEX_CHANGE')
+    assert change['signal'] == SignalType.BUY.value
+    assert '20.0%' in change['reasoning']
+    logger.info("✓ Change signal built from the last three snapshots")
+
+
+def test_comprehensive_signals_from_aggregates():
+    """Aggregated snapshots give the same signals without loading contract rows"""
+    history = make_history()
+    expected = HistoryGenerator(history).generate_comprehensive_signals()
+
+    latest = history[history['greeks.updated_at'] == history['greeks.updated_at'].max()]
+    load_strike_gex, load_snapshot_summary = stored_aggregates(latest)
+    generator = HistoryGenerator(history)
+    with mock.patch('src.signals.trading_signals.load_strike_gex', load_strike_gex), \
+            mock.patch('src.signals.trading_signals.load_snapshot_summary', load_snapshot_summary):
+        signals = generator.generate_comprehensive_signals()
+
+    # Only the change signal's window around spot comes from gex_table
+    assert generator.requests == [(3, 6000.0, TradingSignalGenerator.CHANGE_WINDOW_PCT)]
+    for key in ('timestamp', 'current_price', 'zero_gex_level', 'gex_levels', 'net_gex_at_price',
+                'individual_signals', 'composite_signal', 'recommendation'):
+        assert signals[key] == expected[key], key
+    # Interpolated between the 5975 and 6000 strikes
+    assert signals['zero_gex_level'] == 5987.5
+    logger.info("✓ Comprehensive signals from stored aggregates")
+
+
+def test_latest_snapshot_reads_spx_rows_only():
+    """The contract-row fallback filters to SPX like the aggregate tables"""
+    captured = {}
+
+    def read_sql(query, con, params=None):
+        captured.update(query=query, params=params)
+        return pd.DataFrame()
+
+    generator = TradingSignalGenerator(db_connection=None)
+    with mock.patch('src.signals.trading_signals.pd.read_sql', read_sql):
+        generator.get_latest_snapshot()
+
+    assert "COALESCE(underlying, 'SPX') = %(underlying)s" in captured['query']
+    assert captured['params']['underlying'] == 'SPX'
+    logger.info("✓ Latest snapshot reads SPX rows only")
+
+
+def test_snapshot_without_spx_price():
+    """A latest snapshot with no spx_price gives an error instead of raising"""
+    history = make_history()
+    latest = history['greeks.updated_at'] == history['greeks.updated_at'].max()
+    history.loc[latest, 'spx_price'] = np.nan
+
+    generator = HistoryGenerator(history)
+    signals = generator.generate_comprehensive_signals()
+    assert signals['error'] == 'No SPX price in snapshot'
+    assert signals['timestamp'] == history['greeks.updated_at'].max()
+    assert generator.requests == [(1, None, None)]
+    logger.info("✓ Snapshot without SPX price")
+
+
+def test_change_signal_ignores_older_rows():
+    """Rows older than lookback_periods do not affect the change signal"""
+    generator = TradingSignalGenerator(db_connection=None)
+    signal, _, reasoning = generator.calculate_gex_change_signal(make_history(), 6000.0, lookback_periods=3)
+    assert signal == SignalType.BUY and '20.0%' in reasoning
+    logger.info("✓ Older rows ignored")
+
+
+def test_strike_window_requires_spot():
+    generator = TradingSignalGenerator(db_connection=None)
+    try:
+        generator.get_latest_snapshots(num_snapshots=3, strike_window_pct=2.0)
+    except ValueError:
+        logger.info("✓ Strike window without spot rejected")
+    else:
+        raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_change_signal_uses_recent_snapshots()
+    test_comprehensive_signals_from_aggregates()
+    test_latest_snapshot_reads_spx_rows_only()
+    test_snapshot_without_spx_price()
+    test_change_signal_ignores_older_rows()
+    test_strike_window_requires_spot()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test Multi-Timeframe Signals
+
+Builds every timeframe from one snapshot and checks the per-strike net GEX
+against the previous pivot over rows filtered by days to expiry. Snapshots
+with gex_snapshot_summary rows are served from those rows alone.
+"""
+
+import os
+import sys
+import logging
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.signals.trading_signals import TradingSignalGenerator
+from src.calculations.gex_aggregates import aggregate_strike_gex, summarize_snapshot
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class SnapshotGenerator(TradingSignalGenerator):
+    """Serves a fixed snapshot (and optionally its summary rows) and counts the loads"""
+
+    def __init__(self, snapshot: pd.DataFrame, summary: pd.DataFrame = None):
+        super().__init__(db_connection=None)
+        self.snapshot = snapshot
+        self.summary = summary if summary is not None else pd.DataFrame()
+        self.loads = 0
+
+    def get_latest_snapshot_time(self, lookback_hours: int = 24):
+        return self.snapshot['greeks.updated_at'].max() if not self.snapshot.empty else None
+
+    def get_snapshot_summary(self, snapshot_ts) -> pd.DataFrame:
+        return self.summary
+
+    def get_latest_snapshot(self, lookback_hours: int = 24) -> pd.DataFrame:
+        self.loads += 1
+        return self.snapshot
+
+
+def make_snapshot(seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    expirations = ['2025-01-14', '2025-01-15', '2025-01-16', '2025-01-17', '2025-01-22', '2025-02-21']
+    strikes = np.arange(5800.0, 6200.0, 5.0)
+    rows = pd.MultiIndex.from_product(
+        [expirations, strikes, ['call', 'put']], names=['expiration_date', 'strike', 'option_type']
+    ).to_frame(index=False)
+
+    gex = rng.gamma(2.0, 1e6, len(rows))
+    rows['gex'] = np.where(rows['option_type'] == 'call', gex, -gex)
+    rows['greeks.updated_at'] = pd.Timestamp('2025-01-15 10:00:00')
+    rows['spx_price'] = 6005.0
+    return rows
+
+
+def legacy_net_gex(df: pd.DataFrame, max_days_to_expiry) -> pd.DataFrame:
+    """Previous filter + pivot implementation"""
+    latest_df = df.copy()
+    if max_days_to_expiry is not None:
+        current_date = pd.to_datetime(latest_df['greeks.updated_at'].max()).date()
+        latest_df['expiration_date'] = pd.to_datetime(latest_df['expiration_date'])
+        latest_df['days_to_expiry'] = (latest_df['expiration_date'].dt.date - current_date).apply(lambda x: x.days)
+        latest_df = latest_df[latest_df['days_to_expiry'] <= max_days_to_expiry]
+
+    pivot = latest_df.pivot_table(index='strike', columns='option_type', values='gex', aggfunc='sum').fillna(0)
+    pivot['net_gex'] = pivot['call'] + pivot['put']
+    return pivot.reset_index()
+
+
+def test_timeframes_match_pivot():
+    """One groupby reproduces the per-timeframe pivot"""
+    snapshot = make_snapshot()
+    generator = SnapshotGenerator(snapshot)
+    timeframes = {'0dte': 0, 'short_term': 2, 'weekly': 7, 'all': None}
+
+    results = generator.calculate_net_gex_by_timeframe(snapshot, timeframes)
+    for label, max_dte in timeframes.items():
+        net_gex_df, options_count = results[label]
+        expected = legacy_net_gex(snapshot, max_dte)
+        np.testing.assert_array_equal(net_gex_df['strike'], expected['strike'])
+        np.testing.assert_allclose(net_gex_df['net_gex'], expected['net_gex'], err_msg=label)
+
+    assert results['0dte'][1] == 2 * 80 * 2      # expired + same day
+    assert results['all'][1] == len(snapshot)
+    logger.info("✓ Timeframe aggregates match pivot")
+
+
+def test_multi_timeframe_single_load():
+    """All four timeframes come from one snapshot load"""
+    generator = SnapshotGenerator(make_snapshot())
+    signals = generator.generate_multi_timeframe_signals()
+
+    assert generator.loads == 1
+    assert [signals[key]['timeframe'] for key in ['0dte', 'short_term', 'weekly', 'all']] == \
+        ['0DTE', 'SHORT_TERM', 'WEEKLY', 'ALL']
+    assert signals['current_price'] == 6005.0
+    assert signals['weekly']['options_count'] < signals['all']['options_count']
+
+    single = generator.generate_signals_for_timeframe(max_days_to_expiry=2, timeframe_label='SHORT_TERM')
+    assert single == signals['short_term']
+
+    empty = SnapshotGenerator(make_snapshot().iloc[0:0]).generate_multi_timeframe_signals()
+    assert empty['all']['error'] == 'No GEX data available'
+    logger.info("✓ Multi-timeframe signals from a single load")
+
+
+def test_multi_timeframe_from_summary():
+    """Stored summary rows give the same levels without loading the snapshot"""
+    snapshot = make_snapshot()
+    # No 0DTE expirations: that timeframe has no summary row
+    snapshot = snapshot[snapshot['expiration_date'] > '2025-01-15'].assign(open_interest=100)
+    snapshot_ts = snapshot['greeks.updated_at'].max()
+    summary = summarize_snapshot(snapshot, aggregate_strike_gex(snapshot, snapshot_ts=snapshot_ts), snapshot_ts)
+
+    expected = SnapshotGenerator(snapshot).generate_multi_timeframe_signals()
+    generator = SnapshotGenerator(snapshot, summary.set_index('timeframe'))
+    signals = generator.generate_multi_timeframe_signals()
+
+    assert generator.loads == 0
+    assert signals['0dte']['error'] == expected['0dte']['error'] == 'No options found for timeframe 0DTE'
+    for key in ('short_term', 'weekly', 'all'):
+        for field in ('timestamp', 'timeframe', 'max_days_to_expiry', 'options_count',
+                      'current_price', 'gex_levels'):
+            assert signals[key][field] == expected[key][field], (key, field)
+        assert np.isclose(signals[key]['net_gex_at_price'], expected[key]['net_gex_at_price'])
+        assert np.isclose(signals[key]['zero_gex_level'], expected[key]['zero_gex_level'])
+        assert signals[key]['zero_gex_level'] == summary.set_index('timeframe').loc[key, 'zero_gex_level']
+    assert signals['current_price'] == 6005.0
+
+    single = generator.generate_signals_for_timeframe(max_days_to_expiry=7, timeframe_label='WEEKLY')
+    assert single == signals['weekly'] and generator.loads == 0
+    logger.info("✓ Multi-timeframe signals from summary rows")
+
+
+def test_zero_gex_level_matches_summary():
+    """Fallback and summary paths interpolate the same zero-gamma level"""
+    strikes = np.array([4990.0, 5000.0, 5010.0, 5020.0])
+    snapshot = pd.DataFrame({
+        'greeks.updated_at': pd.Timestamp('2025-01-15 10:00:00'),
+        'expiration_date': '2025-01-17',
+        'strike': strikes,
+        'option_type': 'call',
+        'gex': [-5e6, -3e6, 17e6, 20e6],
+        'open_interest': 100,
+        'spx_price': 5003.0,
+    })
+    snapshot_ts = snapshot['greeks.updated_at'].max()
+    summary = summarize_snapshot(snapshot, aggregate_strike_gex(snapshot, snapshot_ts=snapshot_ts), snapshot_ts)
+
+    fallback = SnapshotGenerator(snapshot).generate_multi_timeframe_signals()
+    stored = SnapshotGenerator(snapshot, summary.set_index('timeframe')).generate_multi_timeframe_signals()
+
+    assert fallback['all']['zero_gex_level'] == stored['all']['zero_gex_level'] == 5001.5
+    assert fallback['all']['composite_signal'] == stored['all']['composite_signal']
+    logger.info("✓ Zero GEX level matches summary")
+
+
+def test_snapshot_without_spx_price():
+    """Snapshots with no spx_price give an error per timeframe instead of raising"""
+    snapshot = make_snapshot().assign(spx_price=np.nan, open_interest=100)
+    snapshot_ts = snapshot['greeks.updated_at'].max()
+    summary = summarize_snapshot(snapshot, aggregate_strike_gex(snapshot, snapshot_ts=snapshot_ts), snapshot_ts)
+
+    for generator in (SnapshotGenerator(snapshot), SnapshotGenerator(snapshot, summary.set_index('timeframe'))):
+        signals = generator.generate_multi_timeframe_signals()
+        for key in ('0dte', 'short_term', 'weekly', 'all'):
+            assert signals[key]['error'] == 'No SPX price in snapshot'
+        assert signals['current_price'] is None
+    logger.info("✓ Snapshot without SPX price")
+
+
+if __name__ == "__main__":
+    test_timeframes_match_pivot()
+    test_multi_timeframe_single_load()
+    test_multi_timeframe_from_summary()
+    test_zero_gex_level_matches_summary()
+    test_snapshot_without_spx_price()
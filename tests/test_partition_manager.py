@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test Partition Manager
+
+Checks partition ranges and names for daily and monthly intervals, and runs
+partition creation and retention against a fake engine that records the SQL
+issued in each transaction.
+"""
+
+import os
+import sys
+import re
+import logging
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.partition_manager import PartitionManager
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalar(self):
+        return self.rows[0][0] if self.rows else None
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    """Records statements and answers the catalog queries PartitionManager runs"""
+
+    def __init__(self, engine, statements):
+        self.engine = engine
+        self.statements = statements
+
+    def execute(self, clause, params=None):
+        sql = ' '.join(str(clause).split())
+        self.statements.append(sql)
+        if 'to_regclass' in sql:
+            return FakeResult([(self.engine.has_default,)])
+        if sql.startswith('SELECT EXISTS'):
+            return FakeResult([(self.engine.default_rows,)])
+        if 'pg_get_expr' in sql:
+            return FakeResult(self.engine.partitions)
+        return FakeResult([])
+
+
+class FakeEngine:
+    """
+    Stands in for a SQLAlchemy engine
+
+    Each begin() or connect() block is recorded in transactions as
+    (kind, [statements]).
+    """
+
+    def __init__(self, partitions=None, has_default=True, default_rows=False):
+        self.partitions = partitions or []
+        self.has_default = has_default
+        self.default_rows = default_rows
+        self.transactions = []
+
+    def _block(self, kind):
+        engine = self
+
+        class Block:
+            def __enter__(self):
+                statements = []
+                engine.transactions.append((kind, statements))
+                return FakeConnection(engine, statements)
+
+            def __exit__(self, *exc):
+                return False
+
+        return Block()
+
+    def begin(self):
+        return self._block('begin')
+
+    def connect(self):
+        return self._block('connect')
+
+    def ddl(self):
+        """Statements other than the catalog and DEFAULT-row lookups, in order"""
+        return [sql for _, statements in self.transactions for sql in statements
+                if not sql.startswith('SELECT')]
+
+
+def partition_row(name: str, start: str, end: str):
+    return (name, f"FOR VALUES FROM ('{start} 00:00:00') TO ('{end} 00:00:00')")
+
+
+DEFAULT_ROW = ('gex_table_default', 'DEFAULT')
+
+
+def test_monthly_ranges():
+    """Monthly partitions span calendar months"""
+    manager = PartitionManager(engine=None, interval='monthly')
+
+    assert manager.partition_range(date(2025, 1, 17)) == (date(2025, 1, 1), date(2025, 2, 1))
+    assert manager.partition_range(date(2024, 12, 31)) == (date(2024, 12, 1), date(2025, 1, 1))
+    assert manager.partition_name(date(2025, 1, 1)) == 'gex_table_p202501'
+    logger.info("✓ Monthly ranges")
+
+
+def test_daily_ranges():
+    """Daily partitions span one day"""
+    manager = PartitionManager(engine=None, interval='daily')
+
+    assert manager.partition_range(date(2025, 2, 28)) == (date(2025, 2, 28), date(2025, 3, 1))
+    assert manager.partition_name(date(2025, 2, 28)) == 'gex_table_p20250228'
+    logger.info("✓ Daily ranges")
+
+
+def test_invalid_interval():
+    """Unknown intervals are rejected"""
+    try:
+        PartitionManager(engine=None, interval='weekly')
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    logger.info("✓ Invalid interval rejected")
+
+
+def test_create_partition_moves_default_rows():
+    """Rows in DEFAULT are copied out, deleted and the table attached in one transaction"""
+    engine = FakeEngine(has_default=True, default_rows=True)
+    PartitionManager(engine).create_partition(date(2025, 1, 1), date(2025, 2, 1))
+
+    assert len(engine.transactions) == 1
+    kind, statements = engine.transactions[0]
+    assert kind == 'begin'
+
+    ddl = [sql for sql in statements if not sql.startswith('SELECT')]
+    assert [sql.split()[0] for sql in ddl] == ['CREATE', 'INSERT', 'DELETE', 'ALTER']
+    create, insert, delete, attach = ddl
+    assert create == 'CREATE TABLE gex_table_p202501 (LIKE gex_table INCLUDING DEFAULTS)'
+    assert insert.startswith('INSERT INTO gex_table_p202501 SELECT * FROM gex_table_default WHERE')
+    assert delete.startswith('DELETE FROM gex_table_default WHERE')
+    assert attach == ("ALTER TABLE gex_table ATTACH PARTITION gex_table_p202501 "
+                      "FOR VALUES FROM ('2025-01-01') TO ('2025-02-01')")
+
+    # The same [start, end) predicate finds, copies and deletes the rows
+    predicates = {sql.split(' WHERE ', 1)[1].rstrip(')') for sql in statements
+                  if ' WHERE "greeks.updated_at"' in sql}
+    assert predicates == {"\"greeks.updated_at\" >= '2025-01-01' AND \"greeks.updated_at\" < '2025-02-01'"}
+    logger.info("✓ DEFAULT rows moved into the new partition")
+
+
+def test_create_partition_without_default_rows():
+    """With nothing to move the partition is created attached"""
+    for has_default in (True, False):
+        engine = FakeEngine(has_default=has_default, default_rows=False)
+        PartitionManager(engine, interval='daily').create_partition(date(2025, 2, 28), date(2025, 3, 1))
+
+        assert [kind for kind, _ in engine.transactions] == ['begin']
+        assert engine.ddl() == ["CREATE TABLE gex_table_p20250228 PARTITION OF gex_table "
+                                "FOR VALUES FROM ('2025-02-28') TO ('2025-03-01')"]
+
+    # No DEFAULT partition: its rows are never queried
+    statements = engine.transactions[0][1]
+    assert not any(sql.startswith('SELECT EXISTS') for sql in statements)
+    logger.info("✓ Partition created attached")
+
+
+def test_ensure_partitions_between_spans_months():
+    """Every month or day touched by the range gets a partition; existing ones are kept"""
+    engine = FakeEngine(partitions=[DEFAULT_ROW, partition_row('gex_table_p202502', '2025-02-01', '2025-03-01')])
+    created = PartitionManager(engine).ensure_partitions_between(date(2025, 1, 15), date(2025, 3, 1))
+
+    assert created == ['gex_table_p202501', 'gex_table_p202503']
+    assert [sql.split()[2] for sql in engine.ddl()] == created
+
+    engine = FakeEngine(partitions=[DEFAULT_ROW])
+    created = PartitionManager(engine, interval='daily').ensure_partitions_between(
+        date(2025, 1, 30), date(2025, 2, 2))
+    assert created == ['gex_table_p20250130', 'gex_table_p20250131',
+                       'gex_table_p20250201', 'gex_table_p20250202']
+    assert "FOR VALUES FROM ('2025-01-31') TO ('2025-02-01')" in engine.ddl()[1]
+    logger.info("✓ Partitions across a month boundary")
+
+
+def test_apply_retention():
+    """Only non-DEFAULT partitions ending by the cutoff are detached, then dropped or archived on request"""
+    partitions = [
+        DEFAULT_ROW,
+        partition_row('gex_table_p202410', '2024-10-01', '2024-11-01'),
+        partition_row('gex_table_p202411', '2024-11-01', '2024-12-01'),
+        partition_row('gex_table_p202412', '2024-12-01', '2025-01-01'),
+    ]
+    today = date(2025, 1, 30)  # 60-day cutoff: 2024-12-01
+
+    engine = FakeEngine(partitions=partitions)
+    detached = PartitionManager(engine).apply_retention(60, today=today)
+    assert detached == ['gex_table_p202410', 'gex_table_p202411']
+    assert engine.ddl() == [f'ALTER TABLE gex_table DETACH PARTITION {name}' for name in detached]
+    assert not any('gex_table_default' in sql for sql in engine.ddl())
+
+    # One transaction per partition, after the catalog read
+    assert [kind for kind, _ in engine.transactions] == ['connect', 'begin', 'begin']
+
+    engine = FakeEngine(partitions=partitions)
+    PartitionManager(engine).apply_retention(60, drop=True, archive_schema='gex_archive', today=today)
+    assert engine.ddl() == ['ALTER TABLE gex_table DETACH PARTITION gex_table_p202410',
+                            'DROP TABLE gex_table_p202410',
+                            'ALTER TABLE gex_table DETACH PARTITION gex_table_p202411',
+                            'DROP TABLE gex_table_p202411']
+
+    engine = FakeEngine(partitions=partitions)
+    PartitionManager(engine).apply_retention(60, archive_schema='gex_archive', today=today)
+    assert engine.transactions[1][1] == ['ALTER TABLE gex_table DETACH PARTITION gex_table_p202410',
+                                         'CREATE SCHEMA IF NOT EXISTS gex_archive',
+                                         'ALTER TABLE gex_table_p202410 SET SCHEMA gex_archive']
+    assert not any(sql.startswith('DROP') for sql in engine.ddl())
+
+    # Nothing ends before a one-year-old cutoff
+    engine = FakeEngine(partitions=partitions)
+    assert PartitionManager(engine).apply_retention(365, drop=True, today=today) == []
+    assert engine.ddl() == []
+    logger.info("✓ Retention detaches, drops and archives expired partitions only")
+
+
+if __name__ == "__main__":
+    test_monthly_ranges()
+    test_daily_ranges()
+    test_invalid_interval()
+    test_create_partition_moves_default_rows()
+    test_create_partition_without_default_rows()
+    test_ensure_partitions_between_spans_months()
+    test_apply_retention()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test Previous Snapshot Lookup
+
+Runs GreekDifferenceCalculator against a temporary SQLite database: the
+previous snapshot comes from a bounded window before the current timestamp,
+and remembered snapshots are used without touching the database.
+"""
+
+import os
+import sys
+import tempfile
+import logging
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.calculations.greek_diff_calculator import GreekDifferenceCalculator
+from src.database import DatabaseConnection
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ['greeks.updated_at', 'expiration_date', 'option_type', 'strike']
+
+
+def make_snapshot(updated_at: str, strikes, gex: float) -> pd.DataFrame:
+    df = pd.DataFrame({
+        'greeks.updated_at': pd.Timestamp(updated_at),
+        'expiration_date': '2025-01-17',
+        'option_type': 'call',
+        'strike': [float(s) for s in strikes],
+    })
+    for col in GreekDifferenceCalculator.GREEK_COLUMNS:
+        df[col] = gex
+    return df
+
+
+def save(db: DatabaseConnection, df: pd.DataFrame):
+    db.bulk_upsert(df, 'gex_table', conflict_columns=KEY_COLUMNS)
+
+
+def test_previous_snapshot_from_database():
+    """Latest earlier row per option within the lookback window"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'gex.db')
+        db = DatabaseConnection(db_type='sqlite', db_path=path)
+        save(db, make_snapshot('2025-01-10 10:00:00', [5000], 1.0))      # outside window
+        save(db, make_snapshot('2025-01-14 10:00:00', [5000, 5100], 2.0))
+        save(db, make_snapshot('2025-01-15 10:00:00', [5000], 3.0))
+        save(db, make_snapshot('2025-01-15 10:05:00', [5000, 5100], 9.0))  # current
+        db.close()
+
+        calculator = GreekDifferenceCalculator(db_path=path, lookback_hours=48)
+        current = make_snapshot('2025-01-15 10:05:00', [5000, 5100, 5200], 10.0)
+        result = calculator.calculate_differences(current).set_index('strike')
+
+        assert result.loc[5000.0, 'gex_diff'] == 7.0
+        assert result.loc[5100.0, 'gex_diff'] == 8.0
+        assert pd.isna(result.loc[5200.0, 'gex_diff'])
+        assert result.loc[5000.0, 'prev_timestamp'] == pd.Timestamp('2025-01-15 10:00:00')
+        assert result['has_previous_data'].tolist() == [True, True, False]
+    logger.info("✓ Previous snapshot read from bounded window")
+
+
+def test_remembered_snapshot_skips_database():
+    """A remembered snapshot is used without a database round trip"""
+    calculator = GreekDifferenceCalculator(db_path='/nonexistent/gex.db', lookback_hours=48)
+    calculator.remember_snapshot(make_snapshot('2025-01-15 10:00:00', [5000, 5100], 2.0))
+    calculator.remember_snapshot(make_snapshot('2025-01-15 10:05:00', [5000], 4.0))
+
+    current = make_snapshot('2025-01-15 10:10:00', [5000, 5100], 5.0)
+    result = calculator.calculate_differences(current).set_index('strike')
+
+    assert result.loc[5000.0, 'gex_diff'] == 1.0
+    assert result.loc[5100.0, 'gex_diff'] == 3.0
+
+    # Rows older than the lookback window are dropped from memory
+    calculator.remember_snapshot(make_snapshot('2025-01-20 10:00:00', [5000], 6.0))
+    assert calculator.last_snapshot['strike'].tolist() == [5000.0]
+    logger.info("✓ Remembered snapshot used without database")
+
+
+def test_horizon_differences():
+    """Changes since the session open and the prior close"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'gex.db')
+        db = DatabaseConnection(db_type='sqlite', db_path=path)
+        save(db, make_snapshot('2025-01-14 15:55:00', [5000, 5100], 1.0))
+        save(db, make_snapshot('2025-01-14 16:00:00', [5000], 2.0))       # prior close
+        save(db, make_snapshot('2025-01-15 09:30:00', [5000], 4.0))       # session open
+        save(db, make_snapshot('2025-01-15 09:35:00', [5000, 5100], 5.0))
+        db.close()
+
+        calculator = GreekDifferenceCalculator(db_path=path)
+        current = make_snapshot('2025-01-15 09:40:00', [5000, 5100, 5200], 10.0)
+        result = calculator.calculate_differences(current).set_index('strike')
+
+        assert result.loc[5000.0, 'gex_diff'] == 5.0
+        assert result.loc[5000.0, 'gex_diff_open'] == 6.0
+        assert result.loc[5000.0, 'gex_diff_prior_close'] == 8.0
+        assert result.loc[5100.0, 'greeks.gamma_diff_open'] == 5.0
+        assert result.loc[5100.0, 'greeks.mid_iv_diff_prior_close'] == 9.0
+        assert result.loc[5200.0, 'gex_diff_open'] == 0.0
+        assert 'greeks.delta_diff_open' not in result.columns
+
+        # The next run reuses the day's references; 5200 opens at its first row
+        calculator.remember_snapshot(current)
+        calculator.db_path = '/nonexistent/gex.db'
+        result = calculator.calculate_differences(
+            make_snapshot('2025-01-15 09:45:00', [5000, 5200], 12.0)
+        ).set_index('strike')
+
+        assert result.loc[5000.0, 'gex_diff_open'] == 8.0
+        assert result.loc[5200.0, 'gex_diff_open'] == 2.0
+        assert result.loc[5200.0, 'gex_diff'] == 2.0
+    logger.info("✓ Horizon differences")
+
+
+def test_first_snapshot_of_session_is_open():
+    """The day's first snapshot is its own open, in memory and from the database"""
+    prior_close = make_snapshot('2025-01-14 16:00:00', [5000, 5100], 2.0)
+    first = make_snapshot('2025-01-15 09:30:00', [5000, 5100], 5.0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'gex.db')
+        db = DatabaseConnection(db_type='sqlite', db_path=path)
+        save(db, prior_close)
+        db.close()
+
+        from_database = GreekDifferenceCalculator(db_path=path)
+        expected = from_database.calculate_differences(first.copy()).set_index('strike')
+
+    in_memory = GreekDifferenceCalculator(db_path='/nonexistent/gex.db')
+    in_memory.remember_snapshot(prior_close)
+    result = in_memory.calculate_differences(first.copy()).set_index('strike')
+
+    for col in GreekDifferenceCalculator.HORIZON_COLUMNS:
+        assert result[f'{col}_diff_open'].tolist() == [0.0, 0.0]
+        assert result[f'{col}_diff_prior_close'].tolist() == [3.0, 3.0]
+        pd.testing.assert_series_equal(result[f'{col}_diff_open'], expected[f'{col}_diff_open'])
+        pd.testing.assert_series_equal(result[f'{col}_diff_prior_close'], expected[f'{col}_diff_prior_close'])
+
+    # Later snapshots are measured from it
+    in_memory.remember_snapshot(first)
+    result = in_memory.calculate_differences(
+        make_snapshot('2025-01-15 09:35:00', [5000, 5100], 7.0)
+    ).set_index('strike')
+    assert result['gex_diff_open'].tolist() == [2.0, 2.0]
+
+    # No earlier data at all: still its own open
+    result = GreekDifferenceCalculator(db_path='/nonexistent/gex.db').calculate_differences(first.copy())
+    assert result['gex_diff_open'].tolist() == [0.0, 0.0]
+    assert result['gex_diff_prior_close'].isna().all()
+    logger.info("✓ First snapshot of the session is the open reference")
+
+
+if __name__ == "__main__":
+    test_previous_snapshot_from_database()
+    test_remembered_snapshot_skips_database()
+    test_horizon_differences()
+    test_first_snapshot_of_session_is_open()
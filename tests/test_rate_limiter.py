@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test Rate Limiter
+
+Drives the shared token bucket with a fake clock: refill, blocking at the
+limit, and re-synchronisation from Tradier's X-Ratelimit-* headers.
+"""
+
+import os
+import sys
+import logging
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.rate_limiter import RateLimiter
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    """Stands in for the time module; sleep() advances the clock instead of waiting"""
+
+    def __init__(self, start: float = 1000.0, epoch: float = 1_700_000_000.0):
+        self.now = start
+        self.epoch = epoch
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.epoch + self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(requests_per_minute: int = 120, burst=None):
+    clock = FakeClock()
+    patcher = mock.patch('src.api.rate_limiter.time', clock)
+    patcher.start()
+    limiter = RateLimiter(requests_per_minute=requests_per_minute, burst=burst)
+    return limiter, clock, patcher
+
+
+def test_acquire_blocks_at_limit():
+    """A full bucket serves a burst, then waits one refill interval per token"""
+    limiter, clock, patcher = make_limiter(requests_per_minute=120, burst=3)
+    try:
+        for _ in range(3):
+            limiter.acquire()
+        assert clock.sleeps == []
+
+        limiter.acquire()
+        # 120/min refills one token every 0.5 s
+        assert len(clock.sleeps) == 1 and abs(clock.sleeps[0] - 0.5) < 1e-9
+
+        limiter.acquire()
+        assert abs(sum(clock.sleeps) - 1.0) < 1e-9
+    finally:
+        patcher.stop()
+    logger.info("✓ Acquire blocks at the limit")
+
+
+def test_tokens_refill_up_to_capacity():
+    """Idle time refills the bucket but never beyond its capacity"""
+    limiter, clock, patcher = make_limiter(requests_per_minute=60, burst=2)
+    try:
+        limiter.acquire()
+        limiter.acquire()
+        assert limiter.tokens == 0
+
+        clock.now += 1.0
+        limiter.acquire()
+        assert clock.sleeps == []
+
+        clock.now += 3600.0
+        limiter.acquire()
+        limiter.acquire()
+        assert clock.sleeps == []
+        assert limiter.tokens == 0
+    finally:
+        patcher.stop()
+    logger.info("✓ Refill capped at capacity")
+
+
+def test_update_from_headers():
+    """Headers lower the token count and pause requests until the window resets"""
+    limiter, clock, patcher = make_limiter(requests_per_minute=120)
+    try:
+        limiter.update_from_headers({'X-Ratelimit-Available': '5'})
+        assert limiter.tokens == 5
+
+        # Missing or malformed values leave the bucket alone
+        limiter.update_from_headers({})
+        limiter.update_from_headers({'X-Ratelimit-Available': 'n/a'})
+        assert limiter.tokens == 5
+
+        # More available on the server never adds tokens
+        limiter.update_from_headers({'X-Ratelimit-Available': '500'})
+        assert limiter.tokens == 5
+
+        reset_at_ms = int((clock.time() + 12.0) * 1000)
+        limiter.update_from_headers({'X-Ratelimit-Available': '0', 'X-Ratelimit-Expiry': str(reset_at_ms)})
+        assert limiter.tokens == 0
+
+        limiter.acquire()
+        assert abs(clock.sleeps[0] - 12.0) < 1e-3
+        assert clock.now >= limiter.blocked_until
+
+        # An expiry already in the past does not block
+        blocked_until = limiter.blocked_until
+        limiter.update_from_headers({'X-Ratelimit-Available': '0', 'X-Ratelimit-Expiry': '1000'})
+        assert limiter.blocked_until == blocked_until <= clock.now
+    finally:
+        patcher.stop()
+    logger.info("✓ Header re-synchronisation")
+
+
+if __name__ == "__main__":
+    test_acquire_blocks_at_limit()
+    test_tokens_refill_up_to_capacity()
+    test_update_from_headers()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test Refresh Tiers
+
+Checks REFRESH_TIERS parsing, which chains the tiered cache marks as due,
+and that every saved snapshot holds the full assembled chain.
+"""
+
+import os
+import sys
+import tempfile
+import logging
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.refresh_tiers import TieredChainCache, parse_refresh_tiers
+from src.calculations.chain_builder import ChainBuilder
+from src.database import DatabaseConnection
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TIERS = '0-1:2,2-7:10,8-:30'
+REQUESTS = [('SPX', '2025-01-02'), ('SPX', '2025-01-06'), ('SPX', '2025-01-24')]
+
+
+def test_parse_refresh_tiers():
+    """Tiers parse into DTE ranges and intervals"""
+    tiers = parse_refresh_tiers(TIERS)
+
+    assert [tier.name for tier in tiers] == ['0-1DTE', '2-7DTE', '8+DTE']
+    assert [tier.interval_minutes for tier in tiers] == [2, 10, 30]
+    assert parse_refresh_tiers('') == []
+
+    try:
+        parse_refresh_tiers('0-1')
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    logger.info("✓ Tier parsing")
+
+
+def test_due_requests():
+    """Each expiration is refetched only once its tier interval has elapsed"""
+    cache = TieredChainCache(parse_refresh_tiers(TIERS))
+    now = datetime(2025, 1, 2, 10, 0)
+
+    assert cache.due_requests(REQUESTS, now) == REQUESTS
+    for request in REQUESTS:
+        cache.update(request, pd.DataFrame({'strike': [5000.0]}), now)
+
+    assert cache.due_requests(REQUESTS, now + timedelta(minutes=1)) == []
+    assert cache.due_requests(REQUESTS, now + timedelta(minutes=2)) == REQUESTS[:1]
+    assert cache.due_requests(REQUESTS, now + timedelta(minutes=10)) == REQUESTS[:2]
+    assert cache.due_requests(REQUESTS, now + timedelta(minutes=30)) == REQUESTS
+
+    cache.prune(REQUESTS[1:])
+    assert cache.get(REQUESTS[0]) is None
+    logger.info("✓ Due requests")
+
+
+def test_builder_records_tier():
+    """Rows record the tier and fetch time of their chain"""
+    fetched_at = datetime(2025, 1, 2, 10, 0)
+    chain = pd.DataFrame({
+        'strike': [5000.0, 5000.0], 'option_type': ['call', 'put'],
+        'greeks.gamma': [0.01, 0.01], 'open_interest': [10, 20]
+    })
+
+    builder = ChainBuilder()
+    builder.add('SPX', chain, refresh_tier='0-1DTE', fetched_at=fetched_at)
+    builder.add('SPX', chain, refresh_tier='8+DTE', fetched_at=fetched_at - timedelta(minutes=20))
+    df = builder.build()
+
+    assert df['refresh_tier'].tolist() == ['0-1DTE', '0-1DTE', '8+DTE', '8+DTE']
+    assert df['chain_fetched_at'].iloc[0] == pd.Timestamp(fetched_at)
+    assert 'refresh_tier' not in ChainBuilder().build().columns
+    logger.info("✓ Tier columns")
+
+
+def make_chain(expiration: str, updated_at: datetime) -> pd.DataFrame:
+    return pd.DataFrame({
+        'strike': [5000.0, 5000.0], 'option_type': ['call', 'put'],
+        'expiration_date': expiration, 'greeks.updated_at': pd.Timestamp(updated_at),
+        'greeks.gamma': [0.01, 0.01], 'open_interest': [10, 20]
+    })
+
+
+def test_tiered_cycles_store_full_snapshots():
+    """Chains reused from the cache are saved in the new snapshot, not skipped"""
+    cache = TieredChainCache(parse_refresh_tiers(TIERS))
+    key = ['greeks.updated_at', 'expiration_date', 'option_type', 'strike']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseConnection(db_type='sqlite', db_path=os.path.join(tmp, 'test.db'))
+        db.execute("""
+            CREATE TABLE gex_table (
+                "greeks.updated_at" TIMESTAMP NOT NULL,
+                expiration_date TEXT NOT NULL,
+                option_type TEXT NOT NULL,
+                strike REAL NOT NULL,
+                underlying_symbol TEXT,
+                refresh_tier TEXT,
+                greeks_reported_at TIMESTAMP,
+                "greeks.gamma" REAL,
+                open_interest INTEGER,
+                gex REAL,
+                PRIMARY KEY ("greeks.updated_at", expiration_date, option_type, strike)
+            )
+        """)
+
+        start = datetime(2025, 1, 2, 10, 0)
+        for cycle in range(2):
+            now = start + timedelta(minutes=2 * cycle)
+            # Greeks are stamped a little before the fetch
+            for request in cache.due_requests(REQUESTS, now):
+                cache.update(request, make_chain(request[1], now - timedelta(seconds=45)), now)
+
+            builder = ChainBuilder()
+            for request in REQUESTS:
+                chain, tier, fetched_at = cache.get(request)
+                builder.add(request[0], chain, refresh_tier=tier.name, fetched_at=fetched_at)
+            db.bulk_upsert(builder.build(single_snapshot=True), 'gex_table', conflict_columns=key)
+
+            latest = db.read_sql("""
+                SELECT expiration_date, refresh_tier, greeks_reported_at FROM gex_table
+                WHERE "greeks.updated_at" = (SELECT MAX("greeks.updated_at") FROM gex_table)
+            """)
+            assert sorted(latest['expiration_date'].unique()) == [request[1] for request in REQUESTS]
+            assert len(latest) == 2 * len(REQUESTS)
+
+            # Chains reused from the cache keep the time Tradier reported for them
+            reported = latest.groupby('expiration_date')['greeks_reported_at'].first()
+            first_fetch = str(start - timedelta(seconds=45))
+            assert reported[REQUESTS[1][1]] == reported[REQUESTS[2][1]] == first_fetch
+            assert reported[REQUESTS[0][1]] == str(now - timedelta(seconds=45))
+
+        # Both cycles stored the full chain though the second refetched only 0-1 DTE
+        assert db.get_row_count('gex_table') == 4 * len(REQUESTS)
+        db.close()
+    logger.info("✓ Tiered snapshots hold every expiration")
+
+
+if __name__ == "__main__":
+    test_parse_refresh_tiers()
+    test_due_requests()
+    test_builder_records_tier()
+    test_tiered_cycles_store_full_snapshots()
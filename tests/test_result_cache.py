@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test Backtest Result Cache
+
+Results are stored under a hash of strategy, parameters, date range and
+data fingerprints, evicted least recently used first, and returned by the
+intraday backtester instead of rerunning while the data is unchanged.
+"""
+
+import os
+import sys
+import tempfile
+import logging
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from src.backtesting.result_cache import ResultCache, result_key
+from src.backtesting.snapshot_store import SnapshotStore
+from backtest_strangle_intraday import IntradayStrangleBacktester
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FINGERPRINTS = {'2025-01-13': (78, '2025-01-13T16:00:00'), '2025-01-14': (78, '2025-01-14T16:00:00')}
+
+
+def make_history(days: int = 3, snapshots_per_day: int = 12, seed: int = 4) -> pd.DataFrame:
+    """Random-walk SPX with 0-2 DTE chains every 5 minutes"""
+    rng = np.random.default_rng(seed)
+    strikes = np.arange(5900.0, 6100.0, 5.0)
+    frames = []
+    spot = 6000.0
+    for day in pd.bdate_range('2025-01-13', periods=days):
+        for i in range(snapshots_per_day):
+            ts = day + pd.Timedelta(hours=9, minutes=30 + 5 * i)
+            spot += rng.normal(0, 4)
+            for dte in range(3):
+                expiration = (day + pd.Timedelta(days=dte)).strftime('%Y-%m-%d')
+                for option_type in ('call', 'put'):
+                    sign = 1 if option_type == 'call' else -1
+                    intrinsic = np.maximum(sign * (spot - strikes), 0)
+                    price = np.round(intrinsic + 5 + rng.gamma(2.0, 2.0, len(strikes)), 2)
+                    frames.append(pd.DataFrame({
+                        'greeks.updated_at': ts,
+                        'expiration_date': expiration,
+                        'strike': strikes,
+                        'option_type': option_type,
+                        'option_price': price,
+                        'bid': price - 0.5,
+                        'ask': price + 0.5,
+                        'gex': sign * rng.gamma(2.0, 1e6, len(strikes)) + rng.normal(0, 5e5),
+                        'spx_price': spot,
+                    }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class CountingBacktester(IntradayStrangleBacktester):
+    """Counts snapshot reads"""
+
+    def __init__(self, store):
+        super().__init__(None, store=store)
+        self.snapshot_reads = 0
+
+    def get_snapshot_data(self, snapshot_time):
+        self.snapshot_reads += 1
+        return super().get_snapshot_data(snapshot_time)
+
+
+def run_quietly(backtester, **kwargs) -> pd.DataFrame:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return backtester.backtest_intraday('2025-01-13', '2025-01-31', **kwargs)
+
+
+def test_result_key():
+    """Any change to strategy, parameters, range or data gives a new key"""
+    key = result_key('Strategy', {'stop_loss_pct': 40.0}, '2025-01-13', '2025-01-14', FINGERPRINTS)
+
+    assert key == result_key('Strategy', {'stop_loss_pct': 40.0}, '2025-01-13', '2025-01-14', dict(FINGERPRINTS))
+    assert key != result_key('Other', {'stop_loss_pct': 40.0}, '2025-01-13', '2025-01-14', FINGERPRINTS)
+    assert key != result_key('Strategy', {'stop_loss_pct': 30.0}, '2025-01-13', '2025-01-14', FINGERPRINTS)
+    assert key != result_key('Strategy', {'stop_loss_pct': 40.0}, '2025-01-13', '2025-01-15', FINGERPRINTS)
+    newer = {**FINGERPRINTS, '2025-01-14': (79, '2025-01-14T16:05:00')}
+    assert key != result_key('Strategy', {'stop_loss_pct': 40.0}, '2025-01-13', '2025-01-14', newer)
+    logger.info("✓ Result keys")
+
+
+def test_lru_eviction():
+    """The least recently read results are evicted once the cache is over size"""
+    results = pd.DataFrame({'leg_id': [f'leg_{i}' for i in range(200)],
+                            'pnl': np.linspace(-5, 5, 200),
+                            'exit_reason': [None, 'profit_target_25.0%'] * 100})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(tmp)
+        cache.put('a', results)
+        pd.testing.assert_frame_equal(cache.get('a'), results)
+        assert cache.get('missing') is None
+
+        size = os.path.getsize(os.path.join(tmp, 'a' + cache.extension))
+        cache.max_bytes = int(size * 2.5)
+        cache.put('b', results)
+        os.utime(os.path.join(tmp, 'a' + cache.extension), (0, 0))
+        os.utime(os.path.join(tmp, 'b' + cache.extension), (1, 1))
+        cache.get('a')  # now most recently used
+        cache.put('c', results)
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('c') is not None
+    logger.info(f"✓ LRU eviction ({size:,} bytes per result)")
+
+
+def test_backtest_reuses_cached_results():
+    """A rerun over unchanged data skips the simulation; new data reruns it"""
+    history = make_history()
+    days = history['greeks.updated_at'].dt.strftime('%Y-%m-%d')
+    first_days = SnapshotStore.from_frame(history[days < '2025-01-15'])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(tmp)
+        first = CountingBacktester(first_days)
+        expected = run_quietly(first, cache=cache)
+        assert first.snapshot_reads > 0 and len(expected) > 0
+
+        again = CountingBacktester(first_days)
+        pd.testing.assert_frame_equal(run_quietly(again, cache=cache), expected)
+        assert again.snapshot_reads == 0
+
+        other_params = CountingBacktester(first_days)
+        run_quietly(other_params, cache=cache, stop_loss_pct=20.0)
+        assert other_params.snapshot_reads > 0
+
+        newer = CountingBacktester(SnapshotStore.from_frame(history))
+        result = run_quietly(newer, cache=cache)
+        assert newer.snapshot_reads > 0
+        pd.testing.assert_frame_equal(result, run_quietly(CountingBacktester(SnapshotStore.from_frame(history))))
+    logger.info("✓ Cached backtest results reused until data changes")
+
+
+if __name__ == "__main__":
+    test_result_key()
+    test_lru_eviction()
+    test_backtest_reuses_cached_results()
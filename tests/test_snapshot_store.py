@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test Snapshot Store
+
+Builds a SnapshotStore from synthetic snapshots, round-trips it through
+memory-mapped .npy files, and runs the intraday strangle backtester from the
+store against the per-snapshot query path it replaces.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import logging
+import contextlib
+import io
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from src.backtesting.snapshot_store import SnapshotStore
+from backtest_strangle_intraday import IntradayStrangleBacktester
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_history(days: int = 3, snapshots_per_day: int = 12, seed: int = 5) -> pd.DataFrame:
+    """Random-walk SPX with 0-2 DTE chains every 5 minutes"""
+    rng = np.random.default_rng(seed)
+    strikes = np.arange(5900.0, 6100.0, 5.0)
+    frames = []
+    spot = 6000.0
+    for day in pd.bdate_range('2025-01-13', periods=days):
+        for i in range(snapshots_per_day):
+            ts = day + pd.Timedelta(hours=9, minutes=30 + 5 * i)
+            spot += rng.normal(0, 4)
+            for dte in range(3):
+                expiration = (day + pd.Timedelta(days=dte)).strftime('%Y-%m-%d')
+                for option_type in ('call', 'put'):
+                    sign = 1 if option_type == 'call' else -1
+                    intrinsic = np.maximum(sign * (spot - strikes), 0)
+                    price = np.round(intrinsic + 5 + rng.gamma(2.0, 2.0, len(strikes)), 2)
+                    frames.append(pd.DataFrame({
+                        'greeks.updated_at': ts,
+                        'expiration_date': expiration,
+                        'strike': strikes,
+                        'option_type': option_type,
+                        'option_price': np.where(rng.random(len(strikes)) < 0.1, np.nan, price),
+                        'bid': price - 0.5,
+                        'ask': price + 0.5,
+                        'volume': rng.integers(0, 500, len(strikes)).astype(float),
+                        'open_interest': rng.integers(0, 5000, len(strikes)).astype(float),
+                        'gex': sign * rng.gamma(2.0, 1e6, len(strikes)) + rng.normal(0, 5e5),
+                        'greeks.delta': sign * np.clip(0.5 + (spot - strikes) / 200 * sign, 0.01, 0.99),
+                        'greeks.gamma': rng.random(len(strikes)) / 100,
+                        'greeks.theta': -rng.random(len(strikes)),
+                        'greeks.vega': rng.random(len(strikes)),
+                        'spx_price': spot,
+                    }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class QueryBacktester(IntradayStrangleBacktester):
+    """Per-date and per-snapshot lookups, as the gex_table queries did"""
+
+    def __init__(self, history: pd.DataFrame):
+        super().__init__(db_connection=None)
+        self.history = history
+
+    def get_trading_dates(self, start_date, end_date):
+        days = self.history['greeks.updated_at'].dt.strftime('%Y-%m-%d')
+        return sorted(d for d in days.unique() if start_date <= d <= end_date)
+
+    def get_intraday_snapshots(self, trade_date):
+        times = self.history['greeks.updated_at']
+        day = times[times.dt.strftime('%Y-%m-%d') == trade_date]
+        return pd.DataFrame({'snapshot_time': sorted(day.unique())})
+
+    def get_snapshot_data(self, snapshot_time):
+        df = self.history[self.history['greeks.updated_at'] == snapshot_time]
+        return df.sort_values(['expiration_date', 'strike', 'option_type']).reset_index(drop=True)
+
+
+def run_quietly(backtester, **kwargs) -> pd.DataFrame:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return backtester.backtest_intraday('2025-01-01', '2025-12-31', **kwargs)
+
+
+def test_store_round_trip():
+    """Snapshots are indexed by time and survive save/open with mmap"""
+    history = make_history(days=2, snapshots_per_day=3)
+    store = SnapshotStore.from_frame(history.sample(frac=1.0, random_state=1))
+
+    assert len(store) == 6
+    assert store.row_count == len(history)
+    assert store.trade_dates() == ['2025-01-13', '2025-01-14']
+    assert len(store.snapshot_times('2025-01-14')) == 3
+    assert store.index_of('2025-01-14 09:35:00') == 4
+    assert store.index_of('2025-01-14 09:36:00') is None
+    assert set(store.frame(0)['days_to_expiry']) == {0, 1, 2}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store.save(tmp)
+        mapped = SnapshotStore.open(tmp)
+        assert isinstance(mapped.columns['strike'], np.memmap)
+        pd.testing.assert_frame_equal(mapped.frame(3), store.frame(3))
+        assert mapped.snapshot('2025-01-13 09:30:00').empty is False
+    logger.info("✓ Snapshot store round trip")
+
+
+def test_backtest_from_store_matches_queries():
+    """Backtest over a preloaded store gives the same legs as per-snapshot queries"""
+    history = make_history()
+
+    start = time.perf_counter()
+    expected = run_quietly(QueryBacktester(history), preload=False)
+    query_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = SnapshotStore.from_frame(history)
+    result = run_quietly(IntradayStrangleBacktester(None, store=store))
+    store_time = time.perf_counter() - start
+
+    assert len(expected) > 0
+    pd.testing.assert_frame_equal(result, expected)
+    logger.info(f"Per-snapshot lookups: {query_time:6.2f} s")
+    logger.info(f"Preloaded store:      {store_time:6.2f} s ({query_time / store_time:.1f}x)")
+    logger.info(f"✓ {len(result)} legs match")
+
+
+def test_preloaded_store_released_after_run():
+    """A store the backtest loaded itself is not reused for a later, wider range"""
+    history = make_history()
+    days = history['greeks.updated_at'].dt.strftime('%Y-%m-%d')
+    loads = []
+
+    def load(con, start_date, end_date, max_days_to_expiry=None):
+        loads.append((start_date, end_date))
+        return SnapshotStore.from_frame(history[(days >= start_date) & (days <= end_date)])
+
+    backtester = IntradayStrangleBacktester(None)
+    with mock.patch.object(SnapshotStore, 'load', staticmethod(load)), \
+            contextlib.redirect_stdout(io.StringIO()):
+        first = backtester.backtest_intraday('2025-01-13', '2025-01-13')
+        assert backtester.store is None
+        result = backtester.backtest_intraday('2025-01-13', '2025-01-15')
+
+    assert loads == [('2025-01-13', '2025-01-13'), ('2025-01-13', '2025-01-15')]
+    assert set(first['entry_date']) == {'2025-01-13'}
+    expected = run_quietly(IntradayStrangleBacktester(None, store=SnapshotStore.from_frame(history)))
+    pd.testing.assert_frame_equal(result, expected)
+    logger.info("✓ Preloaded store released after run")
+
+
+if __name__ == "__main__":
+    test_store_round_trip()
+    test_backtest_from_store_matches_queries()
+    test_preloaded_store_released_after_run()
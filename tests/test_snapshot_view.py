@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test Snapshot View
+
+Checks the indexed price, nearest-strike and nearest-delta lookups against
+the DataFrame filters they replace in the backtesters.
+"""
+
+import os
+import sys
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from src.backtesting.snapshot_view import SnapshotView
+from backtest_strangle_strategy import StrangleBacktester, StrikeSelectionMethod
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_snapshot(seed: int = 3) -> pd.DataFrame:
+    """Two expirations of calls and puts with missing and zero prices"""
+    rng = np.random.default_rng(seed)
+    strikes = np.arange(5800.0, 6200.0, 5.0)
+    frames = []
+    for expiration in ('2025-01-15', '2025-01-16'):
+        for option_type in ('call', 'put'):
+            sign = 1 if option_type == 'call' else -1
+            n = len(strikes)
+            last = np.round(rng.gamma(2.0, 5.0, n), 2)
+            last[rng.random(n) < 0.2] = np.nan
+            last[rng.random(n) < 0.1] = 0.0
+            bid = np.round(rng.gamma(2.0, 5.0, n), 2)
+            bid[rng.random(n) < 0.1] = 0.0
+            frames.append(pd.DataFrame({
+                'expiration_date': expiration,
+                'strike': strikes,
+                'option_type': option_type,
+                'option_price': last,
+                'bid': bid,
+                'ask': bid + 1.0,
+                'greeks.delta': sign * np.clip(0.5 + (6000.0 - strikes) / 300 * sign, 0.01, 0.99),
+                'spx_price': 6000.0,
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def filtered_price(df: pd.DataFrame, strike: float, option_type: str):
+    """Price lookup by boolean filter, as the backtesters did before"""
+    option = df[(df['strike'] == strike) & (df['option_type'] == option_type)]
+    if len(option) == 0:
+        return None
+    last_price = option['option_price'].iloc[0]
+    if pd.notna(last_price) and last_price > 0:
+        return last_price
+    bid = option['bid'].iloc[0]
+    ask = option['ask'].iloc[0]
+    if pd.notna(bid) and pd.notna(ask) and bid > 0 and ask > 0:
+        return (bid + ask) / 2
+    return None
+
+
+def test_price_matches_filter():
+    """Indexed prices equal filtered prices, including unlisted strikes"""
+    df = make_snapshot()
+    view = SnapshotView(df)
+    lookups = [(strike, option_type) for strike in np.arange(5790.0, 6210.0, 2.5)
+               for option_type in ('call', 'put')]
+
+    for strike, option_type in lookups:
+        assert view.price(strike, option_type) == filtered_price(df, strike, option_type), (strike, option_type)
+
+    start = time.perf_counter()
+    for strike, option_type in lookups:
+        filtered_price(df, strike, option_type)
+    filter_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    view = SnapshotView(df)
+    for strike, option_type in lookups:
+        view.price(strike, option_type)
+    view_time = time.perf_counter() - start
+
+    logger.info(f"Filtered lookups: {filter_time * 1000:7.1f} ms")
+    logger.info(f"Indexed lookups:  {view_time * 1000:7.1f} ms ({filter_time / view_time:.0f}x)")
+    logger.info(f"✓ {len(lookups)} prices match")
+
+
+def test_nearest_strike_and_delta():
+    df = make_snapshot()
+    view = SnapshotView(df)
+
+    assert view.nearest_strike(6001.0, 'call') == 6000.0
+    assert view.nearest_strike(6002.5, 'put') == 6000.0  # ties go to the lower strike
+    assert view.nearest_strike(5000.0, 'put') == 5800.0
+    assert view.nearest_strike(7000.0, 'call') == 6195.0
+    assert view.nearest_strike(6000.0, 'straddle') is None
+
+    for option_type, target in (('call', 0.30), ('put', -0.30)):
+        options = df[df['option_type'] == option_type]
+        expected = options['strike'].iloc[int(np.argmin((options['greeks.delta'] - target).abs().to_numpy()))]
+        assert view.nearest_delta(target, option_type) == expected
+    logger.info("✓ Nearest strike and delta")
+
+
+def test_strike_selection_on_filtered_frames():
+    """Strike rounding works on frames whose index does not start at 0"""
+    df = make_snapshot()
+    next_day = df[df['expiration_date'] == '2025-01-16']
+    backtester = StrangleBacktester(None)
+
+    call_strike, put_strike = backtester.select_strikes(
+        next_day, StrikeSelectionMethod.ATM_OFFSET, offset_pct=2.0)
+    assert (call_strike, put_strike) == (6120.0, 5880.0)
+
+    call_strike, put_strike = backtester.select_strikes(
+        next_day, StrikeSelectionMethod.DELTA_BASED, target_delta=0.30)
+    assert call_strike == 6060.0 and put_strike == 5940.0
+    logger.info("✓ Strike selection on filtered frames")
+
+
+if __name__ == "__main__":
+    test_price_matches_filter()
+    test_nearest_strike_and_delta()
+    test_strike_selection_on_filtered_frames()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Test Strategy Optimizer
+
+Runs optimizer grids through the process pool over one preloaded snapshot
+store and compares every configuration against a serial backtest that
+selects each day's snapshot on demand. Snapshot queries are answered by an
+in-memory gex_table, so the backtester's own result mapping runs.
+"""
+
+import os
+import sys
+import tempfile
+import logging
+import contextlib
+import io
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from backtest_strangle_strategy import StrangleBacktester
+from optimize_strangle_strategy import StrategyOptimizer
+from src.backtesting.result_cache import ResultCache
+from src.backtesting.snapshot_store import SnapshotStore
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy')
+
+START_DATE = '2025-01-13'
+END_DATE = '2025-01-16'
+
+
+def make_history(days: int = 5, seed: int = 11) -> pd.DataFrame:
+    """Random-walk SPX with 0-2 DTE chains every hour from 9:30 to 16:30"""
+    rng = np.random.default_rng(seed)
+    strikes = np.arange(5850.0, 6150.0, 5.0)
+    frames = []
+    spot = 6000.0
+    for day in pd.bdate_range(START_DATE, periods=days):
+        for hour in range(9, 17):
+            ts = day + pd.Timedelta(hours=hour, minutes=30)
+            spot += rng.normal(0, 10)
+            for dte in range(3):
+                expiration = day + pd.Timedelta(days=dte)
+                for option_type in ('call', 'put'):
+                    sign = 1 if option_type == 'call' else -1
+                    intrinsic = np.maximum(sign * (spot - strikes), 0)
+                    price = np.round(intrinsic + 3 + rng.gamma(2.0, 2.0, len(strikes)), 2)
+                    frames.append(pd.DataFrame({
+                        'greeks.updated_at': ts,
+                        'expiration_date': expiration,
+                        'strike': strikes,
+                        'option_type': option_type,
+                        'option_price': price,
+                        'bid': price - 0.5,
+                        'ask': price + 0.5,
+                        'volume': rng.integers(0, 500, len(strikes)).astype(float),
+                        'open_interest': rng.integers(0, 5000, len(strikes)).astype(float),
+                        'gex': sign * rng.gamma(2.0, 1e6, len(strikes)) + rng.normal(0, 5e5),
+                        'greeks.delta': sign * np.clip(0.5 + (spot - strikes) / 200 * sign, 0.01, 0.99),
+                        'greeks.gamma': rng.random(len(strikes)) / 100,
+                        'greeks.theta': -rng.random(len(strikes)),
+                        'greeks.vega': rng.random(len(strikes)),
+                        'spx_price': spot,
+                    }))
+    return pd.concat(frames, ignore_index=True)
+
+
+SELECTED_COLUMNS = ['greeks.updated_at', 'expiration_date', 'strike', 'option_type', 'option_price',
+                    'bid', 'ask', 'volume', 'open_interest', 'gex', 'greeks.delta', 'greeks.gamma',
+                    'greeks.theta', 'greeks.vega', 'spx_price']
+
+
+class HistoryCursor:
+    """Answers the get_eod_snapshots query from an in-memory gex_table"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rows = []
+
+    def execute(self, query, params=None):
+        assert 'DISTINCT ON (snapshot_time::date, target_hour)' in query
+        assert 'UNNEST(%(hours)s::int[])' in query and 'AS target_hours' in query
+        self.connection.loads += 1
+
+        history = self.connection.history
+        times = history['greeks.updated_at']
+        days = times.dt.strftime('%Y-%m-%d')
+        snapshots = pd.Series(times[(days >= params['start']) & (days <= params['end'])].unique())
+
+        # Closest snapshot to each hour per day, latest on ties
+        target_hours = {}
+        for trade_date, day in snapshots.groupby(snapshots.dt.strftime('%Y-%m-%d')):
+            for hour in params['hours']:
+                ranked = sorted(day, key=lambda ts: (abs(ts.hour - hour), -ts.value))
+                target_hours.setdefault((ranked[0], trade_date), []).append(hour)
+
+        frames = []
+        for (snapshot_time, trade_date), hours in target_hours.items():
+            rows = history[(times == snapshot_time) &
+                           (history['expiration_date'].dt.strftime('%Y-%m-%d') > trade_date)]
+            frames.append(rows[SELECTED_COLUMNS].assign(target_hours=[sorted(hours)] * len(rows)))
+        rows = pd.concat(frames or [pd.DataFrame(columns=SELECTED_COLUMNS + ['target_hours'])]).sort_values(['greeks.updated_at', 'expiration_date', 'strike', 'option_type'])
+
+        columns = ['target_hours'] + SELECTED_COLUMNS
+        self.description = [(column,) for column in columns]
+        self.rows = list(rows[columns].itertuples(index=False, name=None))
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class HistoryConnection:
+    """DBAPI connection over an in-memory history, counting range loads"""
+
+    def __init__(self, history: pd.DataFrame):
+        self.history = history
+        self.loads = 0
+
+    def cursor(self):
+        return HistoryCursor(self)
+
+    def rollback(self):
+        pass
+
+
+class HistoryBacktester(StrangleBacktester):
+    """Snapshot lookups run the real query code against an in-memory history"""
+
+    def __init__(self, history: pd.DataFrame):
+        super().__init__(db_connection=HistoryConnection(history))
+        self.history = history
+
+    @property
+    def range_loads(self) -> int:
+        return self.db.loads
+
+    def day_fingerprints(self, start_date, end_date):
+        fingerprints = SnapshotStore.from_frame(self.history).day_fingerprints()
+        return {day: fp for day, fp in fingerprints.items() if start_date <= day <= end_date}
+
+    def get_trading_dates(self, start_date, end_date):
+        days = self.history['greeks.updated_at'].dt.strftime('%Y-%m-%d')
+        return sorted(d for d in days.unique() if start_date <= d <= end_date)
+
+
+def serial_report(history: pd.DataFrame, config: dict) -> dict:
+    backtester = HistoryBacktester(history)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = backtester.backtest(
+            start_date=START_DATE,
+            end_date=END_DATE,
+            strike_method=config['method'],
+            strike_params=config['params'],
+            exit_strategy=config['exit_strategy'],
+            entry_hour=config['entry_hour'],
+            exit_hour=config['exit_hour'],
+            preload=False
+        )
+    return backtester.generate_performance_report(results)
+
+
+def test_snapshot_times_for_target_hours():
+    """A snapshot closest to several hours is loaded once; 0DTE-only days have none"""
+    history = make_history(days=2)
+    times = history['greeks.updated_at']
+    first_day = times.dt.strftime('%Y-%m-%d') == START_DATE
+    # First day: snapshots at 9:30 and 15:30 only; second day: only 0DTE options
+    history = history[(first_day & times.dt.hour.isin([9, 15])) |
+                      (~first_day & (history['expiration_date'] == times.dt.normalize()))]
+    backtester = HistoryBacktester(history.reset_index(drop=True))
+    morning = pd.Timestamp(f'{START_DATE} 09:30')
+    afternoon = pd.Timestamp(f'{START_DATE} 15:30')
+
+    rows, snapshot_times = backtester.get_eod_snapshots(START_DATE, '2025-01-14', [10, 14, 15])
+
+    assert snapshot_times == {(START_DATE, 10): morning, (START_DATE, 14): afternoon,
+                              (START_DATE, 15): afternoon}
+    assert 'target_hours' not in rows.columns
+    expected = history[(history['greeks.updated_at'].isin([morning, afternoon])) &
+                       (history['expiration_date'] > pd.Timestamp(START_DATE))]
+    assert len(rows) == len(expected)
+    assert rows['greeks.updated_at'].value_counts().to_dict() == \
+        expected['greeks.updated_at'].value_counts().to_dict()
+
+    backtester.preload(START_DATE, START_DATE, [10, 14, 15])
+    assert backtester.range_loads == 2
+    pd.testing.assert_frame_equal(backtester.get_eod_snapshot(START_DATE, 14),
+                                  backtester.get_eod_snapshot(START_DATE, 15))
+    assert len(backtester.get_eod_snapshot('2025-01-14', 15)) == 0
+    assert backtester.range_loads == 2
+    logger.info("✓ Snapshot times for target hours")
+
+
+def test_parallel_grid_matches_serial_backtests():
+    """Every configuration run in the pool reports what a serial backtest reports"""
+    history = make_history()
+    optimizer = StrategyOptimizer(db_connection=None, workers=2)
+    optimizer.backtester = HistoryBacktester(history)
+
+    configs = optimizer.strike_selection_configs() + optimizer.exit_strategy_configs() + \
+        optimizer.entry_time_configs()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = list(optimizer.run_configs(configs, START_DATE, END_DATE))
+
+    assert len(results) == len(configs)
+    assert len(optimizer.backtester.store) > 0
+    for config, performance in results:
+        expected = serial_report(history, config)
+        assert performance == expected, config['label']
+    assert any(performance.get('total_trades', 0) > 0 for _, performance in results)
+    logger.info(f"✓ {len(configs)} configurations match serial backtests")
+
+
+def test_run_grid_keeps_configuration_order():
+    """Grid results come back as one row per configuration, in grid order"""
+    optimizer = StrategyOptimizer(db_connection=None, workers=3)
+    optimizer.backtester = HistoryBacktester(make_history(days=3))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = optimizer.run_grid({
+            'exit_strategy': ('exit_strategy', optimizer.exit_strategy_configs()),
+            'entry_time': ('entry_hour', optimizer.entry_time_configs()),
+        }, START_DATE, '2025-01-14')
+
+    assert list(results['exit_strategy']['exit_strategy']) == ['technical', 'profit_target', 'stop_loss']
+    assert list(results['entry_time']['entry_hour']) == ['14:00 ET', '15:00 ET', '16:00 ET']
+    logger.info("✓ Grid results in configuration order")
+
+
+def test_cached_configurations_skip_loading():
+    """Configurations already run over the same data come from the result cache"""
+    history = make_history(days=3)
+    end_date = '2025-01-14'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        optimizer = StrategyOptimizer(db_connection=None, workers=2, cache=ResultCache(tmp))
+        optimizer.backtester = HistoryBacktester(history)
+        configs = optimizer.exit_strategy_configs()
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = {config['label']: performance
+                     for config, performance in optimizer.run_configs(configs, START_DATE, end_date)}
+        assert optimizer.backtester.range_loads == 1
+
+        # One new configuration: only it is backtested
+        configs = optimizer.exit_strategy_configs() + optimizer.entry_time_configs()[:1]
+        with contextlib.redirect_stdout(io.StringIO()):
+            second = {config['label']: performance
+                      for config, performance in optimizer.run_configs(configs, START_DATE, end_date)}
+        assert optimizer.backtester.range_loads == 2
+        assert {label: second[label] for label in first} == first
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            third = {config['label']: performance
+                     for config, performance in optimizer.run_configs(configs, START_DATE, end_date)}
+        assert optimizer.backtester.range_loads == 2
+        assert third == second
+    logger.info("✓ Cached configurations skip loading")
+
+
+if __name__ == "__main__":
+    test_snapshot_times_for_target_hours()
+    test_parallel_grid_matches_serial_backtests()
+    test_run_grid_keeps_configuration_order()
+    test_cached_configurations_skip_loading()